@@ -14,7 +14,11 @@ import {
 } from '@/components/news'
 import { CategoryDropdown } from '@/components/news/CategoryDropdown'
 import { members } from '@/data/members'
-import { getMemberMeta, formatRelativeTime } from '@/lib/news'
+import { getMemberMeta } from '@/lib/news'
+import { getNewsFacets } from '@/lib/news/facets'
+import { findNewsPage } from '@/lib/news/pagination'
+import { searchNews } from '@/lib/news/search'
+import { newsItemToStory } from '@/lib/news/stories'
 import type { Where } from 'payload'
 
 /**
@@ -63,41 +67,27 @@ export default async function NewsPage({ searchParams }: PageProps) {
     ]
   }
 
-  // Fetch news items
-  const result = await payload.find({
-    collection: 'news-items',
-    where,
-    limit: 30,
-    sort: '-pubDate',
-  })
-
-  // Get all items for category and publisher counts
-  const allItemsResult = await payload.find({
-    collection: 'news-items',
-    limit: 0,
-  })
-
-  // Get unique categories with counts
-  const categoryCounts: Record<string, number> = {}
-  allItemsResult.docs.forEach((doc) => {
-    const cat = doc.category as string
-    if (cat) {
-      categoryCounts[cat] = (categoryCounts[cat] || 0) + 1
-    }
-  })
-
-  const categories = Object.entries(categoryCounts)
-    .sort((a, b) => b[1] - a[1])
-    .map(([name, count]) => ({ name, count }))
+  // Fetch news items: ranked matches when searching, else newest first.
+  // Load More continues from nextCursor, or by offset for search results.
+  const searched = searchQuery
+    ? await searchNews(payload, {
+        search: searchQuery,
+        member: activeMember,
+        category: activeCategory,
+        limit: 30,
+        count: true,
+      })
+    : null
+  const result = searched
+    ? { ...searched, nextCursor: null }
+    : await findNewsPage(payload, where, { limit: 30, count: true })
 
-  // Calculate story counts per publisher
-  const publisherCounts: Record<string, number> = {}
-  allItemsResult.docs.forEach((doc) => {
-    const slug = doc.memberSlug as string
-    if (slug) {
-      publisherCounts[slug] = (publisherCounts[slug] || 0) + 1
-    }
-  })
+  // Category and publisher counts from the cached facet index
+  const facets = await getNewsFacets()
+  const categories = facets.categories
+  const publisherCounts: Record<string, number> = Object.fromEntries(
+    facets.publishers.map((p) => [p.name, p.count])
+  )
 
   // Build publisher data for components
   const publisherFilters: PublisherFilter[] = members
@@ -132,26 +122,8 @@ export default async function NewsPage({ searchParams }: PageProps) {
     }
   })
 
-  // Transform to NewsItem format
-  const newsItems: NewsItem[] = result.docs.map((doc) => {
-    const meta = getMemberMeta(doc.memberSlug as string)
-
-    return {
-      id: String(doc.id),
-      title: doc.title as string,
-      excerpt: (doc.description as string) || '',
-      publication: meta.name,
-      publicationSlug: (doc.memberSlug as string) || '',
-      publicationLogo: meta.logo || undefined,
-      publicationColor: meta.color,
-      category: (doc.category as string) || 'News',
-      timeAgo: formatRelativeTime(doc.pubDate as string),
-      pubDate: doc.pubDate as string,
-      href: doc.url as string,
-      imageUrl: (doc.image as string) || undefined,
-      featured: doc.featured as boolean || false,
-    }
-  })
+  // Same shape /api/news returns for the pages Load More appends
+  const newsItems: NewsItem[] = result.docs.map((doc) => ({ ...newsItemToStory(doc), id: String(doc.id) }))
 
   const hasFiltersActive = activeMember !== 'all' || activeCategory !== 'all' || searchQuery
   const activePublisherCount = publisherFilters.length
@@ -207,8 +179,9 @@ export default async function NewsPage({ searchParams }: PageProps) {
           {newsItems.length > 0 ? (
             <NewsFeedMasonry
               initialItems={newsItems}
-              initialTotal={result.totalDocs}
-              initialHasMore={result.hasNextPage}
+              initialTotal={result.total ?? newsItems.length}
+              initialHasMore={result.hasMore}
+              initialCursor={result.nextCursor}
               filters={{
                 member: activeMember !== 'all' ? activeMember : undefined,
                 category: activeCategory !== 'all' ? activeCategory : undefined,
@@ -1,110 +1,183 @@
 import { NextResponse } from 'next/server'
 import { getPayloadClient } from '@/lib/payload/client'
-import { getMemberMeta, formatRelativeTime } from '@/lib/news'
+import { getNewsFacets, type NewsFacets } from '@/lib/news/facets'
+import {
+  newsPages,
+  newsItemJson,
+  storyPageBody,
+  toStoriesFragment,
+  STORY_SELECT,
+  type NewsItemRecord,
+  type StoryPage,
+} from '@/lib/news/stories'
+import { decodeCursor, encodeCursor, findNewsPage } from '@/lib/news/pagination'
+import { searchNews } from '@/lib/news/search'
 import type { Where } from 'payload'
 
 /**
  * News API - Fetch aggregated news from Payload CMS
  *
  * Supports filtering by member, category, and search.
- * Returns paginated results with "Load More" support.
+ * Returns paginated results with "Load More" support, plus category
+ * filters with story counts from the cached facet index.
+ *
+ * Pagination is by cursor: pass the previous response's `nextCursor` as
+ * `cursor` to get the next page (see lib/news/pagination). `count=true`
+ * adds the number of matching stories as `total`. `offset` still works
+ * for old links, at the cost of an OFFSET query and a count.
+ *
+ * `search` goes through the full-text index (see lib/news/search) and
+ * returns the best matches first; its pages are by `offset`, since
+ * relevance order has no stable key. `searchMode=contains` forces the old
+ * substring match, which the search benchmark compares against. A search
+ * sent with a `cursor` continues a substring-match listing (the page falls
+ * back to one when the index is unavailable), so it skips the index
+ * rather than restarting from the first ranked page.
+ *
+ * Pages are cached as serialized story fragments keyed by the filters
+ * (see lib/news/stories), so repeat queries skip the database and the
+ * per-story projection. A request sent with `Cache-Control: no-cache`
+ * skips that cache, which is how the load harness measures the queries.
  */
 
+// Built once per facet recompute
+const facetFilters = new WeakMap<NewsFacets, { categories: string[]; categoryCounts: NewsFacets['categories'] }>()
+
+function filtersFor(facets: NewsFacets) {
+  let filters = facetFilters.get(facets)
+  if (!filters) {
+    filters = {
+      categories: facets.categories.map((c) => c.name).sort(),
+      categoryCounts: facets.categories,
+    }
+    facetFilters.set(facets, filters)
+  }
+  return filters
+}
+
 export async function GET(request: Request) {
   const { searchParams } = new URL(request.url)
 
   // Parse query parameters
   const limit = Math.min(parseInt(searchParams.get('limit') || '20', 10), 100)
   const offset = parseInt(searchParams.get('offset') || '0', 10)
+  const cursorParam = searchParams.get('cursor')
+  const count = searchParams.get('count') === 'true'
   const member = searchParams.get('member') // member slug
   const category = searchParams.get('category')
   const search = searchParams.get('search')?.trim()
   const featured = searchParams.get('featured') === 'true'
+  const searchMode = searchParams.get('searchMode') === 'contains' ? 'contains' : 'index'
+
+  const cursor = cursorParam ? decodeCursor(cursorParam) : null
+  if (cursorParam && !cursor) {
+    return NextResponse.json({ error: 'Invalid cursor' }, { status: 400 })
+  }
 
   try {
-    const payload = await getPayloadClient()
+    const load = async (): Promise<StoryPage> => {
+      const payload = await getPayloadClient()
+
+      // Ranked search; null when the index isn't available
+      const searched =
+        search && searchMode === 'index' && !cursor
+          ? await searchNews(payload, { search, member, category, featured, limit, offset, count })
+          : null
+      if (searched) {
+        return {
+          stories: toStoriesFragment(searched.docs.map(newsItemJson)),
+          meta: {
+            ...(searched.total !== undefined ? { total: searched.total } : {}),
+            limit,
+            offset,
+            hasMore: searched.hasMore,
+            nextCursor: null,
+          },
+        }
+      }
 
-    // Build where clause
-    const where: Where = {}
+      // Build where clause
+      const where: Where = {}
 
-    // Filter by member slug
-    if (member && member !== 'all') {
-      where.memberSlug = { equals: member }
-    }
+      // Filter by member slug
+      if (member && member !== 'all') {
+        where.memberSlug = { equals: member }
+      }
 
-    // Filter by category
-    if (category && category !== 'all') {
-      where.category = { equals: category }
-    }
+      // Filter by category
+      if (category && category !== 'all') {
+        where.category = { equals: category }
+      }
 
-    // Filter by featured
-    if (featured) {
-      where.featured = { equals: true }
-    }
+      // Filter by featured
+      if (featured) {
+        where.featured = { equals: true }
+      }
 
-    // Search in title and description
-    if (search) {
-      where.or = [
-        { title: { contains: search } },
-        { description: { contains: search } },
-      ]
-    }
+      // Substring search in title and description
+      if (search) {
+        where.or = [
+          { title: { contains: search } },
+          { description: { contains: search } },
+        ]
+      }
 
-    // Query Payload
-    const result = await payload.find({
-      collection: 'news-items',
-      where,
-      limit,
-      page: Math.floor(offset / limit) + 1,
-      sort: '-pubDate',
-    })
+      if (offset > 0 && !cursor) {
+        // Legacy offset pagination
+        const result = await payload.find({
+          collection: 'news-items',
+          where,
+          select: STORY_SELECT,
+          depth: 0,
+          limit,
+          page: Math.floor(offset / limit) + 1,
+          sort: ['-pubDate', '-id'],
+        })
+        const docs = result.docs as unknown as NewsItemRecord[]
+        const last = docs[docs.length - 1]
+
+        return {
+          stories: toStoriesFragment(docs.map(newsItemJson)),
+          meta: {
+            total: result.totalDocs,
+            limit,
+            offset,
+            hasMore: result.hasNextPage,
+            nextCursor: result.hasNextPage && last ? encodeCursor(last) : null,
+            page: result.page,
+            totalPages: result.totalPages,
+          },
+        }
+      }
 
-    // Transform to API response format
-    const stories = result.docs.map((doc) => {
-      const meta = getMemberMeta(doc.memberSlug as string)
+      const result = await findNewsPage(payload, where, { limit, cursor, count })
 
       return {
-        id: doc.id,
-        title: doc.title,
-        excerpt: doc.description || '',
-        publication: meta.name,
-        publicationSlug: doc.memberSlug || '',
-        publicationLogo: meta.logo || undefined,
-        publicationColor: meta.color,
-        category: doc.category || 'News',
-        timeAgo: formatRelativeTime(doc.pubDate as string),
-        pubDate: doc.pubDate,
-        href: doc.url,
-        imageUrl: doc.image || undefined,
-        featured: doc.featured || false,
+        stories: toStoriesFragment(result.docs.map(newsItemJson)),
+        meta: {
+          ...(result.total !== undefined ? { total: result.total } : {}),
+          limit,
+          hasMore: result.hasMore,
+          nextCursor: result.nextCursor,
+        },
       }
-    })
-
-    // Get unique categories for filter UI
-    const categoriesResult = await payload.find({
-      collection: 'news-items',
-      limit: 0,
-    })
-
-    const allCategories = [...new Set(
-      categoriesResult.docs
-        .map((d) => d.category)
-        .filter(Boolean) as string[]
-    )].sort()
-
-    return NextResponse.json({
-      stories,
-      total: result.totalDocs,
-      limit,
-      offset,
-      hasMore: result.hasNextPage,
-      page: result.page,
-      totalPages: result.totalPages,
-      fetchedAt: new Date().toISOString(),
-      filters: {
-        categories: allCategories,
-      },
-    })
+    }
+
+    const key = JSON.stringify([member, category, search, searchMode, featured, limit, offset, cursorParam, count])
+    const bypass = request.headers.get('cache-control')?.includes('no-cache')
+
+    const [page, facets] = await Promise.all([
+      bypass ? load() : newsPages.get(key, load),
+      getNewsFacets(),
+    ])
+
+    return new NextResponse(
+      storyPageBody(page, {
+        fetchedAt: new Date().toISOString(),
+        filters: filtersFor(facets),
+      }),
+      { headers: { 'Content-Type': 'application/json' } }
+    )
   } catch (error) {
     console.error('[News API] Error:', error)
 
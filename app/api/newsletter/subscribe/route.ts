@@ -1,6 +1,7 @@
 import { NextResponse } from 'next/server'
 import { getPayloadClient } from '@/lib/payload/client'
-import { isValidEmail, checkRateLimit } from '@/lib/news'
+import { isValidEmail } from '@/lib/news'
+import { RateLimiter } from '@/lib/ratelimit/limiter'
 
 /**
  * Newsletter Subscribe API
@@ -16,6 +17,9 @@ import { isValidEmail, checkRateLimit } from '@/lib/news'
 // Standard success message (prevents email enumeration attacks)
 const SUCCESS_MESSAGE = 'Thanks for subscribing! Check your inbox for a confirmation.'
 
+// 5 per hour per IP, shared across server instances
+const subscribeLimiter = new RateLimiter({ name: 'newsletter', limit: 5, windowMs: 60 * 60 * 1000 })
+
 export async function POST(request: Request) {
   try {
     // Rate limit by IP address
@@ -23,7 +27,7 @@ export async function POST(request: Request) {
                request.headers.get('x-real-ip') ||
                'unknown'
 
-    const rateLimitResult = checkRateLimit(`newsletter:${ip}`, 5, 3600000) // 5 per hour
+    const rateLimitResult = await subscribeLimiter.check(ip)
 
     if (!rateLimitResult.success) {
       return NextResponse.json(
@@ -2,6 +2,10 @@ import { NextResponse } from 'next/server'
 import { timingSafeEqual } from 'crypto'
 import { getPayloadClient } from '@/lib/payload/client'
 import { extractCategory, sanitizeText, sanitizeUrl } from '@/lib/news'
+import { invalidateNewsFacets } from '@/lib/news/facets'
+import { invalidateStoryPages, newsItemToStory } from '@/lib/news/stories'
+import { storyBroadcaster } from '@/lib/news/broadcast'
+import { ingestNewsItems } from '@/lib/news/ingest'
 
 /**
  * RSS Import API Route
@@ -54,51 +58,27 @@ export async function POST(request: Request) {
 
     const payload = await getPayloadClient()
 
-    let created = 0
-    let skipped = 0
-    const errors: { guid: string; error: string }[] = []
-
-    for (const item of items) {
-      try {
-        // Check if already exists
-        const existing = await payload.find({
-          collection: 'news-items',
-          where: { guid: { equals: item.guid } },
-          limit: 1,
-        })
-
-        if (existing.docs.length > 0) {
-          skipped++
-          continue
-        }
-
-        // Determine category
-        const category = extractCategory(
-          item.category ? [item.category] : [],
-          item.title
-        )
+    // Batched guid lookup + conflict-ignoring bulk insert
+    const { created, createdItems, skipped, errors } = await ingestNewsItems(
+      payload,
+      items.map((item) => ({
+        guid: item.guid,
+        title: sanitizeText(item.title),
+        url: sanitizeUrl(item.url) || item.url,
+        description: sanitizeText(item.description || ''),
+        memberSlug: item.memberSlug,
+        pubDate: item.pubDate,
+        image: item.image ? sanitizeUrl(item.image) : undefined,
+        category: extractCategory(item.category ? [item.category] : [], item.title),
+      }))
+    )
 
-        // Create new item
-        await payload.create({
-          collection: 'news-items',
-          data: {
-            guid: item.guid,
-            title: sanitizeText(item.title),
-            url: sanitizeUrl(item.url) || item.url,
-            description: sanitizeText(item.description || ''),
-            memberSlug: item.memberSlug,
-            pubDate: item.pubDate,
-            image: item.image ? sanitizeUrl(item.image) : undefined,
-            category,
-          },
-        })
-        created++
-      } catch (err) {
-        errors.push({
-          guid: item.guid,
-          error: err instanceof Error ? err.message : 'Unknown error',
-        })
-      }
+    // New items change the category and publisher counts, and every cached page,
+    // and go out to open /api/stories/stream subscribers
+    if (created > 0) {
+      invalidateNewsFacets()
+      invalidateStoryPages()
+      storyBroadcaster.publish(createdItems.map(newsItemToStory), 'import')
     }
 
     return NextResponse.json({
@@ -2,19 +2,25 @@ import { NextResponse } from 'next/server'
 import { timingSafeEqual } from 'crypto'
 import {
   fetchAllMemberFeeds,
-  extractExcerpt,
-  extractImageFromContent,
   isWithinTimeWindow,
   deduplicateByGuid,
+  type FeedValidators,
   type MemberFeed,
 } from '@/lib/rss/poller'
 import { getPayloadClient } from '@/lib/payload/client'
+import { FeedScheduler } from '@/lib/rss/scheduler'
+import { summarizeItem } from '@/lib/rss/html'
+import { loadFeedValidators, saveFeedValidators } from '@/lib/rss/state'
 import {
   extractCategory,
   sanitizeText,
   sanitizeUrl,
   RECENT_STORIES_WINDOW_HOURS,
 } from '@/lib/news'
+import { invalidateNewsFacets } from '@/lib/news/facets'
+import { invalidateStoryPages, newsItemToStory } from '@/lib/news/stories'
+import { storyBroadcaster } from '@/lib/news/broadcast'
+import { ingestNewsItems, type NewsItemInput } from '@/lib/news/ingest'
 
 /**
  * RSS Poll API Route
@@ -23,6 +29,14 @@ import {
  * to poll member RSS feeds and persist to Payload CMS.
  *
  * Security: Requires CRON_SECRET query parameter.
+ *
+ * Feeds are fetched conditionally using the ETag/Last-Modified/content hash
+ * stored from the previous poll; pass force=true to refetch everything.
+ * Setting RSS_FEED_LIST_URL replaces the member feed list (for benchmarks).
+ * Fetches run through a FeedScheduler, so a hanging site only times out
+ * its own feed instead of holding the whole poll. Bodies are parsed with
+ * the streaming parser, which drops items outside the recency window as it
+ * reads and stops early on newest-first feeds.
  */
 
 // Fallback member feeds if Payload query fails or is empty
@@ -108,6 +122,17 @@ function constantTimeEqual(a: string, b: string): boolean {
   }
 }
 
+/**
+ * Load a feed list (JSON array of MemberFeed) from RSS_FEED_LIST_URL
+ */
+async function fetchFeedList(url: string): Promise<MemberFeed[]> {
+  const response = await fetch(url, { cache: 'no-store' })
+  if (!response.ok) {
+    throw new Error(`Feed list returned ${response.status}`)
+  }
+  return response.json()
+}
+
 export async function GET(request: Request) {
   // Verify cron secret for security
   const { searchParams } = new URL(request.url)
@@ -133,42 +158,48 @@ export async function GET(request: Request) {
     // Try to fetch members with RSS URLs from Payload
     let memberFeeds: MemberFeed[] = []
 
-    try {
-      const membersResult = await payload.find({
-        collection: 'members',
-        where: {
-          rssUrl: { exists: true },
-        },
-        limit: 100,
-      })
-
-      memberFeeds = membersResult.docs
-        .filter((m) => m.rssUrl)
-        .map((m) => ({
-          memberId: String(m.id),
-          memberName: m.name as string,
-          memberSlug: m.slug as string,
-          rssUrl: m.rssUrl as string,
-        }))
-
-      console.log(`[RSS Poll] Found ${memberFeeds.length} members with RSS feeds in Payload`)
-
-      // Override incorrect URLs stored in Payload with correct ones
-      const URL_OVERRIDES: Record<string, string> = {
-        'el-tecolote': 'https://eltecolote.org/content/en/feed/',
-        'bay-area-reporter': 'https://www.ebar.com/rss/23/News',
-        'ingleside-light': 'https://www.inglesidelight.com/rss/',
-        'sf-public-press': 'https://www.sfpublicpress.org/feed/',
-      }
+    if (process.env.RSS_FEED_LIST_URL) {
+      // Benchmarks point the poller at a local feed farm (tests/load/feed_farm.py)
+      memberFeeds = await fetchFeedList(process.env.RSS_FEED_LIST_URL)
+      console.log(`[RSS Poll] Using ${memberFeeds.length} feeds from ${process.env.RSS_FEED_LIST_URL}`)
+    } else {
+      try {
+        const membersResult = await payload.find({
+          collection: 'members',
+          where: {
+            rssUrl: { exists: true },
+          },
+          limit: 100,
+        })
 
-      memberFeeds = memberFeeds.map((feed) => {
-        if (URL_OVERRIDES[feed.memberSlug]) {
-          return { ...feed, rssUrl: URL_OVERRIDES[feed.memberSlug] }
+        memberFeeds = membersResult.docs
+          .filter((m) => m.rssUrl)
+          .map((m) => ({
+            memberId: String(m.id),
+            memberName: m.name as string,
+            memberSlug: m.slug as string,
+            rssUrl: m.rssUrl as string,
+          }))
+
+        console.log(`[RSS Poll] Found ${memberFeeds.length} members with RSS feeds in Payload`)
+
+        // Override incorrect URLs stored in Payload with correct ones
+        const URL_OVERRIDES: Record<string, string> = {
+          'el-tecolote': 'https://eltecolote.org/content/en/feed/',
+          'bay-area-reporter': 'https://www.ebar.com/rss/23/News',
+          'ingleside-light': 'https://www.inglesidelight.com/rss/',
+          'sf-public-press': 'https://www.sfpublicpress.org/feed/',
         }
-        return feed
-      })
-    } catch (err) {
-      console.warn('[RSS Poll] Failed to fetch members from Payload, using fallback:', err)
+
+        memberFeeds = memberFeeds.map((feed) => {
+          if (URL_OVERRIDES[feed.memberSlug]) {
+            return { ...feed, rssUrl: URL_OVERRIDES[feed.memberSlug] }
+          }
+          return feed
+        })
+      } catch (err) {
+        console.warn('[RSS Poll] Failed to fetch members from Payload, using fallback:', err)
+      }
     }
 
     // Use fallback if no members found
@@ -177,73 +208,97 @@ export async function GET(request: Request) {
       memberFeeds = FALLBACK_FEEDS
     }
 
+    // Validators from the previous poll, unless a full refetch was requested
+    let validators = new Map<string, FeedValidators>()
+    if (searchParams.get('force') !== 'true') {
+      try {
+        validators = await loadFeedValidators(payload, memberFeeds.map((feed) => feed.rssUrl))
+      } catch (err) {
+        console.warn('[RSS Poll] Failed to load feed state, fetching unconditionally:', err)
+      }
+    }
+
     // Fetch all feeds
-    const { items, errors } = await fetchAllMemberFeeds(memberFeeds)
+    const fetchStart = Date.now()
+    const { items, errors, feeds, requests, timings: feedTimings } = await fetchAllMemberFeeds(
+      memberFeeds,
+      validators,
+      new FeedScheduler(),
+      { windowHours: RECENT_STORIES_WINDOW_HOURS, content: 'lean' }
+    )
+    const fetchMs = Date.now() - fetchStart
 
     // Log any feed errors
     if (errors.length > 0) {
       console.warn('[RSS Poll] Some feeds failed:', errors)
     }
 
+    const dedupeStart = Date.now()
+
     // Filter to recent items (last 7 days)
     const recentItems = items.filter((item) => isWithinTimeWindow(item.pubDate, RECENT_STORIES_WINDOW_HOURS))
 
     // Deduplicate by GUID
     const uniqueItems = deduplicateByGuid(recentItems)
 
-    // Track upsert stats
-    let created = 0
-    let updated = 0
-    let skipped = 0
-    const upsertErrors: { guid: string; error: string }[] = []
+    const dedupeMs = Date.now() - dedupeStart
+    const prepareStart = Date.now()
 
-    // Upsert each item to Payload
-    for (const item of uniqueItems) {
-      try {
-        // Check if item already exists by GUID
-        const existing = await payload.find({
-          collection: 'news-items',
-          where: { guid: { equals: item.guid } },
-          limit: 1,
-        })
+    // Sanitize all text content to prevent XSS
+    let itemsWithUnsafeMarkup = 0
+    const newsItems: NewsItemInput[] = uniqueItems.map((item) => {
+      const summary = summarizeItem(item, 200)
+      if (summary.verdict === 'unsafe') itemsWithUnsafeMarkup++
+      const imageUrl = summary.image ? sanitizeUrl(summary.image) : undefined
 
-        const category = extractCategory(item.categories, item.title)
-        const rawImageUrl = item.enclosure?.url || extractImageFromContent(item.content)
-        const imageUrl = rawImageUrl ? sanitizeUrl(rawImageUrl) : undefined
-
-        // Sanitize all text content to prevent XSS
-        const newsItemData = {
-          guid: item.guid,
-          title: sanitizeText(item.title),
-          url: sanitizeUrl(item.link) || item.link, // Keep original if sanitization fails
-          description: sanitizeText(extractExcerpt(item.description || item.content, 200)),
-          memberSlug: item.memberSlug,
-          pubDate: new Date(item.pubDate).toISOString(),
-          image: imageUrl || undefined,
-          category,
-        }
-
-        if (existing.docs.length > 0) {
-          // Item exists - skip (or update if we want to refresh content)
-          skipped++
-        } else {
-          // Create new item
-          await payload.create({
-            collection: 'news-items',
-            data: newsItemData,
-          })
-          created++
-        }
-      } catch (err) {
-        const errorMessage = err instanceof Error ? err.message : 'Unknown error'
-        console.error(`[RSS Poll] Failed to upsert item ${item.guid}:`, errorMessage)
-        upsertErrors.push({ guid: item.guid, error: errorMessage })
+      return {
+        guid: item.guid,
+        title: sanitizeText(item.title),
+        url: sanitizeUrl(item.link) || item.link, // Keep original if sanitization fails
+        description: summary.text,
+        memberSlug: item.memberSlug,
+        pubDate: new Date(item.pubDate).toISOString(),
+        image: imageUrl || undefined,
+        category: extractCategory(item.categories, item.title),
       }
+    })
+
+    const prepareMs = Date.now() - prepareStart
+
+    // Batched guid lookup + conflict-ignoring bulk insert
+    const { created, createdItems, skipped, errors: upsertErrors, timings: ingestTimings } =
+      await ingestNewsItems(payload, newsItems)
+    const updated = 0
+
+    for (const { guid, error } of upsertErrors) {
+      console.error(`[RSS Poll] Failed to upsert item ${guid}:`, error)
     }
 
+    // Remember validators for every feed whose new items all made it in
+    const failedSlugs = new Set(
+      upsertErrors.map(({ guid }) => newsItems.find((item) => item.guid === guid)?.memberSlug)
+    )
+    try {
+      await saveFeedValidators(payload, feeds.filter((feed) => !failedSlugs.has(feed.memberSlug)))
+    } catch (err) {
+      console.warn('[RSS Poll] Failed to save feed state:', err)
+    }
+
+    // New items change the category and publisher counts, and every cached page,
+    // and go out to open /api/stories/stream subscribers
+    if (created > 0) {
+      invalidateNewsFacets()
+      invalidateStoryPages()
+      storyBroadcaster.publish(createdItems.map(newsItemToStory), 'poll')
+    }
+
+    const notModified = feeds.filter((feed) => feed.status === 'not-modified').length
+    const unchanged = feeds.filter((feed) => feed.status === 'unchanged').length
+
     const duration = Date.now() - startTime
     console.log(
-      `[RSS Poll] Completed in ${duration}ms. Created: ${created}, Skipped: ${skipped}, Errors: ${upsertErrors.length}`
+      `[RSS Poll] Completed in ${duration}ms. Created: ${created}, Skipped: ${skipped}, Errors: ${upsertErrors.length}, ` +
+        `Not modified: ${notModified}, Unchanged: ${unchanged}`
     )
 
     return NextResponse.json({
@@ -261,6 +316,42 @@ export async function GET(request: Request) {
         updated,
         skipped,
         upsertErrors: upsertErrors.length,
+        itemsWithUnsafeMarkup,
+        feedsNotModified: notModified,
+        feedsUnchanged: unchanged,
+        notModifiedRate: feeds.length > 0 ? Math.round((notModified / feeds.length) * 1000) / 1000 : 0,
+        bytesDownloaded: feeds.reduce((sum, feed) => sum + feed.bytes, 0),
+        feedTimeouts: requests.reduce((sum, r) => sum + r.timeouts, 0),
+        feedRetries: requests.reduce((sum, r) => sum + r.attempts - 1, 0),
+        itemsOutsideWindow: feeds.reduce((sum, feed) => sum + (feed.parseStats?.itemsOutsideWindow ?? 0), 0),
+        feedsStoppedEarly: feeds.filter((feed) => feed.parseStats?.stoppedEarly).length,
+        perFeed: memberFeeds.map((member) => {
+          const feed = feeds.find((f) => f.url === member.rssUrl)
+          const fetchStats = requests.find((r) => r.url === member.rssUrl)
+          return {
+            memberSlug: member.memberSlug,
+            status: feed?.status ?? 'failed',
+            httpStatus: fetchStats?.status,
+            latencyMs: fetchStats ? Math.round(fetchStats.latencyMs) : undefined,
+            attempts: fetchStats?.attempts ?? 0,
+            timeouts: fetchStats?.timeouts ?? 0,
+            bytes: feed?.bytes ?? 0,
+            parseMs: feed ? Math.round(feed.parseMs) : 0,
+            newItems: feed?.feed?.items.length ?? 0,
+            itemsOutsideWindow: feed?.parseStats?.itemsOutsideWindow ?? 0,
+            stoppedEarly: feed?.parseStats?.stoppedEarly ?? false,
+            error: feed ? undefined : fetchStats?.error,
+          }
+        }),
+        // Per-phase milliseconds; parse is summed across feeds fetched in parallel
+        timings: {
+          fetch: fetchMs,
+          parse: Math.round(feedTimings.parseMs),
+          dedupe: dedupeMs,
+          prepare: prepareMs,
+          lookup: Math.round(ingestTimings.lookupMs),
+          insert: Math.round(ingestTimings.insertMs),
+        },
       },
       feedErrors: errors.length > 0 ? errors : undefined,
       upsertErrors: upsertErrors.length > 0 ? upsertErrors.slice(0, 10) : undefined,
@@ -0,0 +1,46 @@
+import { NextResponse } from 'next/server'
+import { timingSafeEqual } from 'crypto'
+import { feedCache } from '@/lib/rss/cache'
+import { storyBroadcaster } from '@/lib/news/broadcast'
+
+/**
+ * GET /api/stories/metrics
+ *
+ * Feed cache counters for this server process (hits, stale hits, misses,
+ * coalesced and background refreshes) and story stream counters
+ * (subscribers, events, drops), read by the load harnesses before and
+ * after a run.
+ *
+ * Security: Requires CRON_SECRET query parameter, like the other
+ * operational routes.
+ */
+
+function constantTimeEqual(a: string, b: string): boolean {
+  if (a.length !== b.length) return false
+  try {
+    return timingSafeEqual(Buffer.from(a), Buffer.from(b))
+  } catch {
+    return false
+  }
+}
+
+export async function GET(request: Request) {
+  const { searchParams } = new URL(request.url)
+  const secret = searchParams.get('secret')
+
+  if (!process.env.CRON_SECRET) {
+    return NextResponse.json({ error: 'Server misconfigured' }, { status: 500 })
+  }
+
+  if (!secret || !constantTimeEqual(secret, process.env.CRON_SECRET)) {
+    return NextResponse.json({ error: 'Unauthorized' }, { status: 401 })
+  }
+
+  return NextResponse.json({
+    feedCache: feedCache.metrics(),
+    stream: storyBroadcaster.metrics(),
+    at: new Date().toISOString(),
+  })
+}
+
+export const dynamic = 'force-dynamic'
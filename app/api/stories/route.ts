@@ -1,18 +1,12 @@
-import { NextResponse } from 'next/server'
+import { NextResponse, after } from 'next/server'
+import { getCachedMemberFeeds } from '@/lib/rss/cache'
 import {
-  fetchAllMemberFeeds,
-  extractExcerpt,
-  extractImageFromContent,
   isWithinTimeWindow,
   deduplicateByGuid,
   type MemberFeed,
 } from '@/lib/rss/poller'
-import {
-  getMemberMeta,
-  formatRelativeTime,
-  extractCategory,
-  RECENT_STORIES_WINDOW_HOURS,
-} from '@/lib/news'
+import { RECENT_STORIES_WINDOW_HOURS } from '@/lib/news'
+import { StoryPageCache, feedItemJson, storyPageBody, toStoriesFragment } from '@/lib/news/stories'
 
 // Member RSS feeds
 // Note: Some feeds are temporarily disabled due to URL changes or access issues
@@ -50,59 +44,53 @@ const memberFeeds: MemberFeed[] = [
   // },
 ]
 
+// Pages by feed version, limit and offset; a feed change makes new keys,
+// and the TTL re-applies the time window
+const storyPages = new StoryPageCache({ ttlMs: 60 * 1000, maxEntries: 50 })
+
 export async function GET(request: Request) {
   const { searchParams } = new URL(request.url)
   const limit = parseInt(searchParams.get('limit') || '10', 10)
   const offset = parseInt(searchParams.get('offset') || '0', 10)
 
   try {
-    // Fetch all feeds
-    const { items, errors } = await fetchAllMemberFeeds(memberFeeds)
+    // Served from the shared feed cache; stale feeds refresh in the background
+    const { items, errors, states, refreshes, version } = await getCachedMemberFeeds(memberFeeds)
+    after(refreshes)
 
     // Log errors but continue
     if (errors.length > 0) {
       console.warn('[Stories API] Some feeds failed:', errors)
     }
 
-    // Filter to recent items (last 7 days)
-    const recentItems = items.filter((item) => isWithinTimeWindow(item.pubDate, RECENT_STORIES_WINDOW_HOURS))
-
-    // Deduplicate
-    const uniqueItems = deduplicateByGuid(recentItems)
+    const page = await storyPages.get(`${version}|${limit}|${offset}`, async () => {
+      // Filter to recent items (last 7 days)
+      const recentItems = items.filter((item) => isWithinTimeWindow(item.pubDate, RECENT_STORIES_WINDOW_HOURS))
 
-    // Process and enrich items
-    const stories = uniqueItems.map((item) => {
-      const meta = getMemberMeta(item.memberSlug)
+      // Deduplicate
+      const uniqueItems = deduplicateByGuid(recentItems)
 
+      // Each item is enriched and serialized once per cached feed
       return {
-        id: item.guid,
-        title: item.title,
-        excerpt: extractExcerpt(item.description || item.content, 150),
-        publication: meta.name,
-        publicationSlug: item.memberSlug,
-        publicationLogo: meta.logo || undefined,
-        publicationColor: meta.color,
-        category: extractCategory(item.categories, item.title),
-        timeAgo: formatRelativeTime(item.pubDate),
-        pubDate: item.pubDate,
-        href: item.link,
-        imageUrl: item.enclosure?.url || extractImageFromContent(item.content) || undefined,
+        stories: toStoriesFragment(uniqueItems.slice(offset, offset + limit).map(feedItemJson)),
+        meta: {
+          total: uniqueItems.length,
+          limit,
+          offset,
+          hasMore: offset + limit < uniqueItems.length,
+        },
       }
     })
 
-    // Apply pagination
-    const paginatedStories = stories.slice(offset, offset + limit)
-
-    return NextResponse.json({
-      stories: paginatedStories,
-      total: stories.length,
-      limit,
-      offset,
-      hasMore: offset + limit < stories.length,
-      fetchedAt: new Date().toISOString(),
-      feedsSuccessful: memberFeeds.length - errors.length,
-      feedsTotal: memberFeeds.length,
-    })
+    return new NextResponse(
+      storyPageBody(page, {
+        fetchedAt: new Date().toISOString(),
+        feedsSuccessful: memberFeeds.length - errors.length,
+        feedsTotal: memberFeeds.length,
+        cache: states,
+      }),
+      { headers: { 'Content-Type': 'application/json' } }
+    )
   } catch (error) {
     console.error('[Stories API] Error:', error)
 
@@ -116,5 +104,5 @@ export async function GET(request: Request) {
   }
 }
 
-// Revalidate every 5 minutes
-export const revalidate = 300
+// Freshness is handled by the feed cache, not the route cache
+export const dynamic = 'force-dynamic'
@@ -0,0 +1,31 @@
+import { storyBroadcaster } from '@/lib/news/broadcast'
+
+/**
+ * GET /api/stories/stream
+ *
+ * Server-sent events for newly ingested stories, replacing client polling.
+ * The RSS poll and import routes publish a `stories` event whenever they
+ * create items; a `: ping` comment keeps idle connections open.
+ *
+ * Reconnecting clients resume with the Last-Event-ID header (EventSource
+ * sends it automatically) or a `lastEventId` query parameter. When the
+ * missed events are no longer buffered, a `reset` event tells the client
+ * to refetch instead.
+ */
+export async function GET(request: Request) {
+  const { searchParams } = new URL(request.url)
+  const lastEventId = request.headers.get('last-event-id') || searchParams.get('lastEventId')
+
+  return new Response(storyBroadcaster.stream(lastEventId, request.signal), {
+    headers: {
+      'Content-Type': 'text/event-stream; charset=utf-8',
+      'Cache-Control': 'no-cache, no-transform',
+      Connection: 'keep-alive',
+      // Stop nginx-style proxies from buffering the stream
+      'X-Accel-Buffering': 'no',
+    },
+  })
+}
+
+export const dynamic = 'force-dynamic'
+export const runtime = 'nodejs'
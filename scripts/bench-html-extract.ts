@@ -0,0 +1,245 @@
+/**
+ * Micro-benchmark: single-pass HTML extractor vs the regex chains it replaced
+ * Run with: npx tsx scripts/bench-html-extract.ts [posts] [iterations]
+ *
+ * Builds a deterministic corpus of WordPress-sized posts (figures with
+ * srcset and lazy-load attributes, embeds, inline scripts and styles,
+ * entities), checks that extractExcerpt, extractImageFromContent and
+ * sanitizeText give byte-identical output to the old regex versions on the
+ * corpus, a set of edge cases and random fuzz, then times both.
+ */
+
+import { extractExcerpt, extractHtml, extractImageFromContent, sanitizeText } from '../src/lib/rss/html'
+
+// ===========================================
+// The regex versions, as they were
+// ===========================================
+
+function regexImage(content?: string): string | null {
+  if (!content) return null
+  const imgMatch = content.match(/<img[^>]+src=["']([^"']+)["']/i)
+  if (imgMatch) return imgMatch[1]
+  const srcMatch = content.match(/src=["']([^"']+\.(jpg|jpeg|png|gif|webp))["']/i)
+  if (srcMatch) return srcMatch[1]
+  return null
+}
+
+function regexExcerpt(content?: string, maxLength = 200): string {
+  if (!content) return ''
+  const text = content
+    .replace(/<script[^>]*>[\s\S]*?<\/script>/gi, '')
+    .replace(/<style[^>]*>[\s\S]*?<\/style>/gi, '')
+    .replace(/<[^>]+>/g, ' ')
+    .replace(/\s+/g, ' ')
+    .trim()
+  if (text.length <= maxLength) return text
+  const truncated = text.slice(0, maxLength)
+  const lastSpace = truncated.lastIndexOf(' ')
+  return `${truncated.slice(0, lastSpace)}...`
+}
+
+function regexSanitize(text: string | undefined | null): string {
+  if (!text) return ''
+  return text
+    .replace(/<[^>]*>/g, '')
+    .replace(/&amp;/g, '&')
+    .replace(/&lt;/g, '<')
+    .replace(/&gt;/g, '>')
+    .replace(/&quot;/g, '"')
+    .replace(/&#39;/g, "'")
+    .replace(/&nbsp;/g, ' ')
+    .replace(/javascript:/gi, '')
+    .replace(/on\w+=/gi, '')
+    .replace(/\s+/g, ' ')
+    .trim()
+}
+
+// ===========================================
+// Corpus
+// ===========================================
+
+const WORDS = (
+  'mission district supervisors housing tenants rent board election ballot school teachers ' +
+  'police commission transit muni bart budget mayor community neighborhood small business ' +
+  'festival mural artists library park recreation health clinic &amp; &nbsp; &#8217; “quoted” — ' +
+  'café niño 2024 $1.2M 50% e.g. U.S.'
+).split(' ')
+
+function rng(seed: number) {
+  let state = seed
+  return () => {
+    state = (state * 1664525 + 1013904223) >>> 0
+    return state / 2 ** 32
+  }
+}
+
+function makePost(seed: number): string {
+  const random = rng(seed)
+  const pick = <T,>(list: T[]) => list[Math.floor(random() * list.length)]
+  const words = (n: number) => Array.from({ length: n }, () => pick(WORDS)).join(' ')
+  const parts: string[] = []
+
+  if (random() < 0.3) parts.push('<style>.wp-block-image{margin:0 auto}</style>')
+  for (let p = 0, count = 4 + Math.floor(random() * 14); p < count; p++) {
+    const roll = random()
+    if (roll < 0.15) {
+      const n = Math.floor(random() * 1e6)
+      const lazy = random() < 0.5
+      parts.push(
+        `<figure class="wp-block-image size-large"><img decoding="async" width="1024" height="683" ` +
+          (lazy ? `data-lazy-src="https://example.org/wp-content/uploads/2024/05/${n}.jpg" ` : '') +
+          `src="https://example.org/wp-content/uploads/2024/05/${n}-1024x683.jpg" alt="${words(4)}" ` +
+          `class="wp-image-${n}" srcset="https://example.org/${n}-300x200.jpg 300w, https://example.org/${n}-768x512.jpg 768w" ` +
+          `sizes="(max-width: 1024px) 100vw, 1024px" /><figcaption>${words(12)}</figcaption></figure>`
+      )
+    } else if (roll < 0.2) {
+      parts.push(
+        `<figure class="wp-block-embed"><div class="wp-block-embed__wrapper">` +
+          `<iframe title="${words(3)}" width="500" height="281" src="https://www.youtube.com/embed/x${p}" ` +
+          `frameborder="0" allowfullscreen></iframe></div></figure>`
+      )
+    } else if (roll < 0.24) {
+      parts.push(`<script type="text/javascript">window.dataLayer = window.dataLayer || []; if (a < b && c > d) {}</script>`)
+    } else if (roll < 0.3) {
+      parts.push(`<ul>${Array.from({ length: 4 }, () => `<li>${words(10)}</li>`).join('')}</ul>`)
+    } else if (roll < 0.34) {
+      parts.push(`<blockquote class="wp-block-quote"><p>${words(30)}</p><cite>${words(2)}</cite></blockquote>`)
+    } else {
+      parts.push(
+        `<p>${words(20 + Math.floor(random() * 80))} <a href="https://example.org/${p}" onclick="track()">` +
+          `${words(3)}</a> <strong>${words(5)}</strong>\n${words(20)}</p>`
+      )
+    }
+  }
+  parts.push(`<p>The post <a href="https://example.org">${words(5)}</a> appeared first on Example.</p>`)
+  return parts.join('\n')
+}
+
+const EDGE_CASES = [
+  '',
+  'plain text',
+  '   leading and trailing   ',
+  '<p>a</p><p>b</p>',
+  '<>',
+  'a <> b',
+  'a < b',
+  'a < b > c',
+  '<<b>>',
+  '<p title="<script>">x</script> tail',
+  '<style><script></style></script>after',
+  '<style>a<script></style></script>b</style>c',
+  '<script>no close',
+  '<SCRIPT>x</SCRIPT>y<Style>z</STYLE>w',
+  '<img src="">',
+  '<img data-src="a.jpg" src="b.jpg">',
+  '<img src="a>b.jpg">',
+  '<img\nsrc=\'x.png\'>',
+  '<imgx src="y.gif">',
+  '<img src=x.jpg>',
+  '<source src="fallback.webp"><img alt="no src">',
+  'text src="https://x/a.JPEG" more',
+  '<script>document.write(\'<img src="in-script.jpg">\')</script><img src="after.jpg">',
+  '<a title="<img src=\'attr.jpg\'>">x</a>',
+  '&amp;lt;b&amp;gt; &amp;amp; &amp;nbsp;x &#39;q&#39; &quot;',
+  '&lt;script&gt;alert(1)&lt;/script&gt;',
+  'javajavascript:script: onclick=x o<b>nclick=</b>y',
+  'Conditions= apply; location=here',
+  'a b c﻿d e',
+  '&am<b>p;</b>lt;',
+  'x'.repeat(300),
+  ('word '.repeat(60)).trim(),
+  'a'.repeat(250) + ' tail',
+]
+
+function fuzz(seed: number): string {
+  const random = rng(seed)
+  const atoms = ['<', '>', '<p>', '</p>', '<img src="f.jpg">', '<script>', '</script>', '<style>', '</style>', '&amp;', '&lt;',
+    '&nbsp;', ' ', '\n', 'javascript:', 'onload=', 'src="a.png"', '"', "'", 'word', 'é', '=', ':']
+  return Array.from({ length: Math.floor(random() * 40) }, () => atoms[Math.floor(random() * atoms.length)]).join('')
+}
+
+// ===========================================
+// Checks and timing
+// ===========================================
+
+function check(inputs: string[]): number {
+  let failures = 0
+  for (const input of inputs) {
+    for (const maxLength of [150, 200]) {
+      const expected = regexExcerpt(input, maxLength)
+      const actual = extractExcerpt(input, maxLength)
+      const extracted = extractHtml(input, maxLength)
+      if (actual !== expected || extracted.text !== regexSanitize(expected)) {
+        failures++
+        if (failures <= 5) console.log(`  ❌ excerpt(${maxLength}) differs for ${JSON.stringify(input.slice(0, 80))}`)
+      }
+    }
+    if (extractImageFromContent(input) !== regexImage(input)) {
+      failures++
+      if (failures <= 5) console.log(`  ❌ image differs for ${JSON.stringify(input.slice(0, 80))}`)
+    }
+    if (sanitizeText(input) !== regexSanitize(input)) {
+      failures++
+      if (failures <= 5) console.log(`  ❌ sanitize differs for ${JSON.stringify(input.slice(0, 80))}`)
+    }
+  }
+  return failures
+}
+
+function time(label: string, iterations: number, fn: () => void): number {
+  fn()
+  const start = performance.now()
+  for (let i = 0; i < iterations; i++) fn()
+  const ms = (performance.now() - start) / iterations
+  console.log(`  ${label.padEnd(44)}${ms.toFixed(3).padStart(10)} ms/pass`)
+  return ms
+}
+
+function main() {
+  const postCount = parseInt(process.argv[2] || '200', 10)
+  const iterations = parseInt(process.argv[3] || '50', 10)
+  const posts = Array.from({ length: postCount }, (_, i) => makePost(i + 1))
+  const bytes = posts.reduce((sum, post) => sum + post.length, 0)
+
+  console.log('\n' + '='.repeat(60))
+  console.log('HTML EXTRACTOR BENCHMARK')
+  console.log('='.repeat(60))
+  console.log(`  Corpus: ${postCount} posts, ${(bytes / 1024).toFixed(0)}KB, avg ${(bytes / postCount / 1024).toFixed(1)}KB`)
+
+  console.log('\n🔍 Byte-identical output')
+  const failures = check([...posts, ...EDGE_CASES, ...Array.from({ length: 20000 }, (_, i) => fuzz(i))])
+  console.log(failures ? `  ❌ ${failures} mismatches` : '  ✅ corpus, edge cases and 20000 fuzz inputs match')
+
+  console.log(`\n⏱️  Per pass over the corpus (${iterations} iterations)`)
+  // What the poll route does per item: excerpt + sanitize of the body, plus the image
+  const before = time('regex: image + excerpt + sanitize', iterations, () => {
+    for (const post of posts) {
+      regexImage(post)
+      regexSanitize(regexExcerpt(post, 200))
+    }
+  })
+  const after = time('single pass: extractHtml', iterations, () => {
+    for (const post of posts) extractHtml(post, 200)
+  })
+  time('regex: image only', iterations, () => {
+    for (const post of posts) regexImage(post)
+  })
+  time('single pass: image only', iterations, () => {
+    for (const post of posts) extractImageFromContent(post)
+  })
+  const titles = posts.map((_, i) => {
+    const random = rng(i)
+    return Array.from({ length: 6 + Math.floor(random() * 10) }, () => WORDS[Math.floor(random() * WORDS.length)]).join(' ')
+  })
+  time('regex: sanitize (titles)', iterations, () => {
+    for (const title of titles) regexSanitize(title)
+  })
+  time('single pass: sanitize (titles)', iterations, () => {
+    for (const title of titles) sanitizeText(title)
+  })
+  console.log(`\n  Speedup (excerpt + image + sanitize): ${(before / after).toFixed(1)}x`)
+
+  process.exit(failures ? 1 : 0)
+}
+
+main()
@@ -0,0 +1,71 @@
+/**
+ * Integration check: the shared Postgres rate limit store, both algorithms
+ * Run with: npx tsx scripts/check-rate-limit-store.ts [concurrency]
+ *
+ * Calls PostgresRateLimitStore directly, with no memory fallback, so a
+ * statement Postgres rejects fails the check instead of being absorbed.
+ * For each algorithm it uses a rule with a fractional per-ms rate (5 per
+ * hour) and checks:
+ * - `concurrency` simultaneous requests on a fresh key let exactly
+ *   `limit` through, as two instances racing for one key would
+ * - every decision and `remaining` count agrees with the in-memory
+ *   store's arithmetic for the same sequence
+ * Keys are namespaced per run and deleted afterwards.
+ */
+
+import { getPayload } from 'payload'
+import { sql, type PostgresAdapter } from '@payloadcms/db-postgres'
+import config from '../src/payload.config'
+import type { RateLimitAlgorithm, RateLimitRule } from '../src/lib/ratelimit/algorithms'
+import { MemoryRateLimitStore } from '../src/lib/ratelimit/memory'
+import { PostgresRateLimitStore } from '../src/lib/ratelimit/postgres'
+
+const ALGORITHMS: RateLimitAlgorithm[] = ['token-bucket', 'sliding-window']
+const LIMIT = 5
+const WINDOW_MS = 60 * 60 * 1000
+
+async function checkRateLimitStore() {
+  const concurrency = Number(process.argv[2] ?? 20)
+  const payload = await getPayload({ config })
+  const store = new PostgresRateLimitStore(async () => payload)
+  const run = `check-${Date.now()}`
+  const failures: string[] = []
+
+  for (const algorithm of ALGORITHMS) {
+    const rule: RateLimitRule = { name: `${run}-${algorithm}`, limit: LIMIT, windowMs: WINDOW_MS, algorithm }
+    console.log(`\n🚦 ${algorithm}: ${LIMIT} per hour`)
+
+    // Racing requests on one key
+    const raced = await Promise.all(Array.from({ length: concurrency }, () => store.consume(rule, 'race')))
+    const through = raced.filter((r) => r.success).length
+    console.log(`  ${concurrency} concurrent requests: ${through} got through`)
+    if (through !== LIMIT) failures.push(`${algorithm}: ${through} of ${concurrency} racing requests got through`)
+
+    // The same sequence against the memory store
+    const memory = new MemoryRateLimitStore()
+    for (let i = 0; i < LIMIT + 2; i++) {
+      const shared = await store.consume(rule, 'sequence')
+      const local = await memory.consume(rule, 'sequence')
+      if (shared.success !== local.success || shared.remaining !== local.remaining) {
+        failures.push(
+          `${algorithm}: request ${i + 1} was ${JSON.stringify(shared)} in Postgres, ` +
+            `${JSON.stringify(local)} in memory`
+        )
+      }
+    }
+    console.log(`  ${LIMIT + 2} sequential requests compared with the memory store`)
+  }
+
+  const db = payload.db as unknown as PostgresAdapter
+  await db.drizzle.execute(sql`DELETE FROM rate_limits WHERE key LIKE ${`${run}-%`}`)
+
+  console.log()
+  for (const failure of failures) console.log(`  ❌ ${failure}`)
+  if (!failures.length) console.log('  ✅ Both algorithms hold their limit in the shared store')
+  process.exit(failures.length ? 1 : 0)
+}
+
+checkRateLimitStore().catch((error) => {
+  console.error('❌ Rate limit store check failed:', error)
+  process.exit(1)
+})
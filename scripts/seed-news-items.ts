@@ -0,0 +1,106 @@
+/**
+ * Seed synthetic news items for pagination and load testing
+ * Run with: npx tsx scripts/seed-news-items.ts <count> [--days 365] [--clear]
+ *
+ * Replaces any previously seeded items (guids starting with "seed:") with
+ * <count> new ones spread over the last --days days, newest first, across
+ * the coalition's member slugs and a handful of categories. Titles and
+ * descriptions are drawn from a local-news word list that includes the
+ * load mix's search terms, so search has realistic hit rates. Every 50th
+ * item shares its pubDate with the one before it, so pages have to break
+ * ties on id. Rows are generated inside Postgres, so a million takes
+ * seconds. --clear only removes the seeded items.
+ */
+
+import { getPayload } from 'payload'
+import { sql, type PostgresAdapter } from '@payloadcms/db-postgres'
+import config from '../src/payload.config'
+import { members } from '../src/data/members'
+
+const CATEGORIES = ['Housing', 'Public Safety', 'Education', 'Health', 'Politics', 'Business', 'Culture', 'News']
+
+// Includes every search term in tests/load/news_mix.json
+const WORDS = (
+  'housing mission election transit chinatown school budget police tenderloin arts ' +
+  'supervisors tenants rent board ballot teachers commission muni bart mayor community ' +
+  'neighborhood small business festival mural artists library park recreation health clinic ' +
+  'district city hall residents families workers youth seniors street safety development ' +
+  'affordable eviction shelter homeless vote measure campaign funding program center plan ' +
+  'report meeting hearing protest music food restaurant market history culture local'
+).split(' ')
+
+// Rows per INSERT statement
+const BATCH_SIZE = 100_000
+
+function parseArgs(argv: string[]) {
+  const args = { count: 0, days: 365, clear: false }
+  for (let i = 0; i < argv.length; i++) {
+    if (argv[i] === '--days') args.days = Number(argv[++i])
+    else if (argv[i] === '--clear') args.clear = true
+    else args.count = Number(argv[i])
+  }
+  return args
+}
+
+async function seedNewsItems() {
+  const { count, days, clear } = parseArgs(process.argv.slice(2))
+  if (!clear && !(count > 0)) {
+    console.error('Usage: npx tsx scripts/seed-news-items.ts <count> [--days 365] [--clear]')
+    process.exit(1)
+  }
+
+  const payload = await getPayload({ config })
+  const db = payload.db as unknown as PostgresAdapter
+
+  const started = Date.now()
+  const removed = await db.drizzle.execute(sql`DELETE FROM news_items WHERE guid LIKE 'seed:%'`)
+  console.log(`🧹 Removed ${removed.rowCount ?? 0} previously seeded items`)
+
+  if (!clear) {
+    console.log(`🌱 Seeding ${count.toLocaleString()} news items over ${days} days...`)
+    const slugs = `{${members.map((m) => `"${m.slug}"`).join(',')}}`
+    const categories = `{${CATEGORIES.map((c) => `"${c}"`).join(',')}}`
+    const words = `{${WORDS.join(',')}}`
+    // Seconds between consecutive items
+    const step = (days * 86400) / count
+
+    for (let start = 0; start < count; start += BATCH_SIZE) {
+      const end = Math.min(start + BATCH_SIZE, count) - 1
+      await db.drizzle.execute(sql`
+        WITH w AS (SELECT ${words}::text[] AS words)
+        INSERT INTO news_items
+          (title, url, description, member_slug, pub_date, guid, category, featured, promoted, updated_at, created_at)
+        SELECT
+          initcap((
+            SELECT string_agg(w.words[1 + ((hashint4(n * 7 + i)::bigint + 2147483648) % cardinality(w.words))::int], ' ')
+            FROM generate_series(1, 6) AS i
+          )),
+          'https://example.org/seed/' || n,
+          (
+            SELECT string_agg(w.words[1 + ((hashint4(n * 31 + i)::bigint + 2147483648) % cardinality(w.words))::int], ' ')
+            FROM generate_series(1, 30) AS i
+          ) || '.',
+          (${slugs}::text[])[1 + n % ${members.length}],
+          now() - make_interval(secs => (n - (n % 50 = 1)::int) * ${step}::float8),
+          'seed:' || n,
+          (${categories}::text[])[1 + n % ${CATEGORIES.length}],
+          n % 500 = 0,
+          false,
+          now(),
+          now()
+        FROM generate_series(${start}::int, ${end}::int) AS n, w
+      `)
+      console.log(`  ✅ ${(end + 1).toLocaleString()} / ${count.toLocaleString()}`)
+    }
+  }
+
+  // Fresh statistics so the planner sees the new table size
+  await db.drizzle.execute(sql`ANALYZE news_items`)
+  console.log(`\n✨ Done in ${((Date.now() - started) / 1000).toFixed(1)}s`)
+  process.exit(0)
+}
+
+seedNewsItems().catch((error) => {
+  console.error('❌ Seed failed:', error)
+  process.exit(1)
+})
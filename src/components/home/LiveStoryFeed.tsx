@@ -3,14 +3,21 @@
 import Link from 'next/link'
 import Image from 'next/image'
 import { useEffect, useState, useRef, useCallback } from 'react'
+import { formatRelativeTime } from '@/lib/news/time'
+import { useStoryStream } from '@/hooks/useStoryStream'
 
 /**
  * LiveStoryFeed - A dynamic teaser of recent stories from member publications
  *
  * Design: Newsroom ticker energy meets editorial grid
  * Stories flow in like a live feed, enticing visitors to explore
+ *
+ * New stories are pushed over /api/stories/stream as members publish;
+ * the feed only polls when the stream isn't available.
  */
 
+const STORY_COUNT = 5
+
 interface Story {
   id: string
   title: string
@@ -20,7 +27,6 @@ interface Story {
   publicationLogo?: string
   publicationColor: string
   category: string
-  timeAgo: string
   pubDate: string
   href: string
   imageUrl?: string
@@ -42,7 +48,6 @@ export function LiveStoryFeed() {
   const [lastFetched, setLastFetched] = useState<string | null>(null)
   const [isVisible, setIsVisible] = useState(false)
   const sectionRef = useRef<HTMLElement>(null)
-  const refreshIntervalRef = useRef<NodeJS.Timeout | null>(null)
 
   // Fetch stories from API
   const fetchStories = useCallback(async (showLoading = true) => {
@@ -50,7 +55,7 @@ export function LiveStoryFeed() {
     setError(null)
 
     try {
-      const res = await fetch('/api/stories?limit=5')
+      const res = await fetch(`/api/stories?limit=${STORY_COUNT}`)
       if (!res.ok) throw new Error('Failed to fetch stories')
 
       const data: StoriesResponse = await res.json()
@@ -69,18 +74,23 @@ export function LiveStoryFeed() {
     fetchStories()
   }, [fetchStories])
 
-  // Auto-refresh every 5 minutes
-  useEffect(() => {
-    refreshIntervalRef.current = setInterval(() => {
-      fetchStories(false) // Silent refresh
-    }, 5 * 60 * 1000)
-
-    return () => {
-      if (refreshIntervalRef.current) {
-        clearInterval(refreshIntervalRef.current)
-      }
-    }
-  }, [fetchStories])
+  // Merge pushed stories in, newest first; poll every 5 minutes only as a fallback
+  useStoryStream({
+    onStories: (incoming) => {
+      setStories((current) => {
+        const byHref = new Map(current.map((story) => [story.href, story]))
+        for (const story of incoming) {
+          byHref.set(story.href, { ...story, id: String(story.id) })
+        }
+        return Array.from(byHref.values())
+          .sort((a, b) => new Date(b.pubDate).getTime() - new Date(a.pubDate).getTime())
+          .slice(0, STORY_COUNT)
+      })
+      setLastFetched(new Date().toISOString())
+    },
+    onReset: () => fetchStories(false),
+    onPoll: () => fetchStories(false), // Silent refresh
+  })
 
   // Intersection observer for entrance animation
   useEffect(() => {
@@ -230,7 +240,7 @@ export function LiveStoryFeed() {
                     )}
                     <span className="live-story-pub-name">{stories[0].publication}</span>
                     <span className="live-story-separator">·</span>
-                    <span className="live-story-time">{stories[0].timeAgo}</span>
+                    <span className="live-story-time">{formatRelativeTime(stories[0].pubDate)}</span>
                   </div>
                   <h3 className="live-story-title">{stories[0].title}</h3>
                   <p className="live-story-excerpt">{stories[0].excerpt}</p>
@@ -278,7 +288,7 @@ export function LiveStoryFeed() {
                     )}
                     <span className="live-story-pub-name">{story.publication}</span>
                     <span className="live-story-separator">·</span>
-                    <span className="live-story-time">{story.timeAgo}</span>
+                    <span className="live-story-time">{formatRelativeTime(story.pubDate)}</span>
                   </div>
                   <h3 className="live-story-title">{story.title}</h3>
                   <div className="live-story-category">
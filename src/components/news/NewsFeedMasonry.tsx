@@ -6,6 +6,7 @@ import { Loader2, Grid3X3, Layers } from 'lucide-react'
 import { StoryCard, type Story } from '@/components/cards'
 import { PublisherAvatar } from '@/components/publishers'
 import { PublisherLane } from './PublisherLane'
+import { useStoryStream } from '@/hooks/useStoryStream'
 import Link from 'next/link'
 import Image from 'next/image'
 
@@ -18,7 +19,6 @@ export interface NewsItem {
   publicationLogo?: string
   publicationColor: string
   category: string
-  timeAgo: string
   pubDate: string
   href: string
   imageUrl?: string
@@ -39,6 +39,8 @@ interface NewsFeedMasonryProps {
   initialTotal: number
   /** Whether there are more items to load */
   initialHasMore: boolean
+  /** Cursor for the page after the initial items */
+  initialCursor?: string | null
   /** Active filters to pass to API */
   filters?: {
     member?: string
@@ -64,11 +66,14 @@ type ViewMode = 'timeline' | 'by-publisher'
  * - Zone C: Masonry grid
  * - Zone D: Publisher lanes (alternate view)
  * - Infinite scroll
+ * - New stories pushed over /api/stories/stream wait behind a
+ *   "Show new stories" button instead of shifting the page
  */
 export function NewsFeedMasonry({
   initialItems,
   initialTotal,
   initialHasMore,
+  initialCursor = null,
   filters = {},
   showFeatured = true,
   publishers = [],
@@ -76,9 +81,11 @@ export function NewsFeedMasonry({
 }: NewsFeedMasonryProps) {
   const [items, setItems] = useState<NewsItem[]>(initialItems)
   const [hasMore, setHasMore] = useState(initialHasMore)
+  const [cursor, setCursor] = useState<string | null>(initialCursor)
   const [isLoading, setIsLoading] = useState(false)
   const [error, setError] = useState<string | null>(null)
   const [viewMode, setViewMode] = useState<ViewMode>('timeline')
+  const [pendingItems, setPendingItems] = useState<NewsItem[]>([])
   const loadMoreRef = useRef<HTMLDivElement>(null)
 
   // Persist view mode preference
@@ -151,10 +158,10 @@ export function NewsFeedMasonry({
     setError(null)
 
     try {
-      const params = new URLSearchParams({
-        offset: items.length.toString(),
-        limit: '20',
-      })
+      // Continue from the last item shown; fall back to offset without a cursor
+      const params = new URLSearchParams(
+        cursor ? { cursor, limit: '20' } : { offset: items.length.toString(), limit: '20' }
+      )
 
       if (filters.member) params.set('member', filters.member)
       if (filters.category) params.set('category', filters.category)
@@ -168,13 +175,63 @@ export function NewsFeedMasonry({
 
       setItems((prev) => [...prev, ...data.stories])
       setHasMore(data.hasMore)
+      setCursor(data.nextCursor ?? null)
     } catch (err) {
       console.error('Failed to load more:', err)
       setError(err instanceof Error ? err.message : 'Failed to load more stories')
     } finally {
       setIsLoading(false)
     }
-  }, [items.length, hasMore, isLoading, filters])
+  }, [items.length, cursor, hasMore, isLoading, filters])
+
+  const shownItems = useRef(items)
+  shownItems.current = items
+
+  // Hold stories that arrive after render until the reader asks for them
+  const queueNewItems = useCallback((incoming: NewsItem[]) => {
+    const matching = incoming.filter(
+      (item) =>
+        (!filters.member || item.publicationSlug === filters.member) &&
+        (!filters.category || item.category === filters.category)
+    )
+    if (matching.length === 0) return
+
+    setPendingItems((pending) => {
+      const seen = new Set([...shownItems.current, ...pending].map((item) => item.href))
+      const fresh = matching.filter((item) => !seen.has(item.href))
+      return fresh.length > 0 ? [...fresh, ...pending] : pending
+    })
+  }, [filters.member, filters.category])
+
+  // Fallback when the stream is unavailable: check the first page for new stories
+  const pollNewItems = useCallback(async () => {
+    const params = new URLSearchParams({ limit: '20' })
+    if (filters.member) params.set('member', filters.member)
+    if (filters.category) params.set('category', filters.category)
+
+    try {
+      const res = await fetch(`/api/news?${params}`)
+      if (!res.ok) return
+      const data = await res.json()
+      queueNewItems(data.stories)
+    } catch (err) {
+      console.error('Failed to check for new stories:', err)
+    }
+  }, [filters.member, filters.category, queueNewItems])
+
+  // Search results are ranked, so new stories aren't pushed into them
+  useStoryStream({
+    onStories: (incoming) => queueNewItems(incoming.map((story) => ({ ...story, id: String(story.id) }))),
+    onReset: pollNewItems,
+    onPoll: pollNewItems,
+    enabled: !filters.search,
+  })
+
+  const showPendingItems = () => {
+    setItems((prev) => [...pendingItems, ...prev])
+    setPendingItems([])
+    window.scrollTo({ top: 0, behavior: 'smooth' })
+  }
 
   // Infinite scroll observer
   useEffect(() => {
@@ -232,6 +289,18 @@ export function NewsFeedMasonry({
         </div>
       )}
 
+      {/* New stories since the page loaded */}
+      {pendingItems.length > 0 && (
+        <div className="flex justify-center" aria-live="polite">
+          <button
+            onClick={showPendingItems}
+            className="px-4 py-2 rounded-full text-sm font-medium bg-[var(--color-ink)] text-white shadow-sm hover:opacity-90 transition-opacity"
+          >
+            Show {pendingItems.length} new {pendingItems.length === 1 ? 'story' : 'stories'}
+          </button>
+        </div>
+      )}
+
       {/* Timeline View */}
       {viewMode === 'timeline' && (
         <>
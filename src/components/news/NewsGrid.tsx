@@ -20,7 +20,6 @@ export interface NewsItem {
   publicationLogo?: string
   publicationColor: string
   category: string
-  timeAgo: string
   pubDate: string
   href: string
   imageUrl?: string
@@ -34,6 +33,8 @@ interface NewsGridProps {
   initialTotal: number
   /** Whether there are more items to load */
   initialHasMore: boolean
+  /** Cursor for the page after the initial items */
+  initialCursor?: string | null
   /** Active filters to pass to API */
   filters?: {
     member?: string
@@ -48,11 +49,13 @@ export function NewsGrid({
   initialItems,
   initialTotal,
   initialHasMore,
+  initialCursor = null,
   filters = {},
   showFeatured = true,
 }: NewsGridProps) {
   const [items, setItems] = useState<NewsItem[]>(initialItems)
   const [hasMore, setHasMore] = useState(initialHasMore)
+  const [cursor, setCursor] = useState<string | null>(initialCursor)
   const [isLoading, setIsLoading] = useState(false)
   const [error, setError] = useState<string | null>(null)
 
@@ -69,10 +72,10 @@ export function NewsGrid({
     setError(null)
 
     try {
-      const params = new URLSearchParams({
-        offset: items.length.toString(),
-        limit: '20',
-      })
+      // Continue from the last item shown; fall back to offset without a cursor
+      const params = new URLSearchParams(
+        cursor ? { cursor, limit: '20' } : { offset: items.length.toString(), limit: '20' }
+      )
 
       if (filters.member) params.set('member', filters.member)
       if (filters.category) params.set('category', filters.category)
@@ -88,13 +91,14 @@ export function NewsGrid({
 
       setItems((prev) => [...prev, ...data.stories])
       setHasMore(data.hasMore)
+      setCursor(data.nextCursor ?? null)
     } catch (err) {
       console.error('Failed to load more:', err)
       setError(err instanceof Error ? err.message : 'Failed to load more stories')
     } finally {
       setIsLoading(false)
     }
-  }, [items.length, hasMore, isLoading, filters])
+  }, [items.length, cursor, hasMore, isLoading, filters])
 
   // Transform NewsItem to StoryCard props
   const toStoryCardProps = (item: NewsItem) => ({
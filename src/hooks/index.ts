@@ -4,3 +4,4 @@ export {
   useCountUp,
   useParallax,
 } from './useScrollAnimation'
+export { useStoryStream } from './useStoryStream'
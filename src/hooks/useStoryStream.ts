@@ -0,0 +1,100 @@
+'use client'
+
+import { useEffect, useRef, useState } from 'react'
+import type { StoriesEvent } from '@/lib/news/broadcast'
+
+interface UseStoryStreamOptions {
+  /** Called with each batch of newly ingested stories, newest first */
+  onStories: (stories: StoriesEvent['stories'], event: StoriesEvent) => void
+  /** Called when missed events can't be replayed; refetch instead */
+  onReset?: () => void
+  /** Called on an interval when the stream isn't available */
+  onPoll?: () => void
+  pollIntervalMs?: number
+  /** Consecutive connection errors before falling back to polling */
+  maxErrors?: number
+  enabled?: boolean
+}
+
+type StreamMode = 'connecting' | 'live' | 'polling'
+
+/**
+ * Hook to receive new stories pushed from /api/stories/stream
+ *
+ * EventSource reconnects on its own and resumes from the last event id.
+ * If the browser has no EventSource, or the stream keeps failing, the
+ * hook closes it and calls `onPoll` every `pollIntervalMs` instead.
+ *
+ * @example
+ * ```tsx
+ * function Feed() {
+ *   const [stories, setStories] = useState<Story[]>([])
+ *   useStoryStream({
+ *     onStories: (incoming) => setStories((current) => [...incoming, ...current]),
+ *     onPoll: refetch,
+ *   })
+ * }
+ * ```
+ */
+export function useStoryStream({
+  onStories,
+  onReset,
+  onPoll,
+  pollIntervalMs = 5 * 60 * 1000,
+  maxErrors = 3,
+  enabled = true,
+}: UseStoryStreamOptions) {
+  const [mode, setMode] = useState<StreamMode>('connecting')
+  // Latest callbacks, so changing them doesn't reopen the stream
+  const handlers = useRef({ onStories, onReset, onPoll })
+  handlers.current = { onStories, onReset, onPoll }
+
+  useEffect(() => {
+    if (!enabled) return
+
+    let pollTimer: ReturnType<typeof setInterval> | null = null
+    const startPolling = () => {
+      setMode('polling')
+      pollTimer = setInterval(() => handlers.current.onPoll?.(), pollIntervalMs)
+    }
+
+    if (typeof EventSource === 'undefined') {
+      startPolling()
+      return () => {
+        if (pollTimer) clearInterval(pollTimer)
+      }
+    }
+
+    const source = new EventSource('/api/stories/stream')
+    let errors = 0
+
+    source.addEventListener('open', () => {
+      errors = 0
+      setMode('live')
+    })
+    source.addEventListener('stories', (message) => {
+      try {
+        const event: StoriesEvent = JSON.parse((message as MessageEvent<string>).data)
+        handlers.current.onStories(event.stories, event)
+      } catch (err) {
+        console.error('Error reading story stream:', err)
+      }
+    })
+    source.addEventListener('reset', () => handlers.current.onReset?.())
+    source.addEventListener('error', () => {
+      errors++
+      // CLOSED means the browser won't retry (e.g. a non-stream response)
+      if (source.readyState === EventSource.CLOSED || errors >= maxErrors) {
+        source.close()
+        startPolling()
+      }
+    })
+
+    return () => {
+      source.close()
+      if (pollTimer) clearInterval(pollTimer)
+    }
+  }, [enabled, pollIntervalMs, maxErrors])
+
+  return { mode }
+}
@@ -0,0 +1,211 @@
+import type { Story } from './stories'
+
+/**
+ * In-process fan-out of "new stories" events to server-sent-event streams
+ *
+ * The RSS poll and import routes publish the stories they just created;
+ * GET /api/stories/stream subscribers receive them instead of polling.
+ * Each event is serialized and encoded once and the same bytes are queued
+ * on every subscriber's stream. One shared timer sends the heartbeats.
+ *
+ * Recent events stay in a ring buffer so a client that reconnects with
+ * Last-Event-ID gets what it missed. Event ids carry a per-process epoch;
+ * an id from another process (or one already pushed out of the buffer)
+ * gets a `reset` event instead, telling the client to refetch.
+ *
+ * Subscribers that stop reading (queue past maxQueuedBytes) are dropped;
+ * EventSource reconnects and resumes from its last id. Only subscribers
+ * on the instance that ran the poll are reached, which matches the rest
+ * of the in-memory caches.
+ */
+
+export interface StoriesEvent {
+  /** Newest first, at most MAX_EVENT_STORIES */
+  stories: Story[]
+  /** How many stories were created, including any not listed */
+  created: number
+  source: 'poll' | 'import'
+  at: string
+}
+
+export interface BroadcasterOptions {
+  /** Events kept for Last-Event-ID resume */
+  bufferSize: number
+  heartbeatMs: number
+  /** Reconnect delay suggested to clients */
+  retryMs: number
+  /** Unread bytes after which a subscriber is dropped */
+  maxQueuedBytes: number
+}
+
+export interface BroadcasterMetrics {
+  subscribers: number
+  peakSubscribers: number
+  connects: number
+  resumes: number
+  resets: number
+  published: number
+  /** Event frames queued across all subscribers */
+  delivered: number
+  heartbeats: number
+  dropped: number
+}
+
+export const MAX_EVENT_STORIES = 20
+
+interface Subscriber {
+  controller: ReadableStreamDefaultController<Uint8Array>
+}
+
+const encoder = new TextEncoder()
+
+function frame(id: string | null, event: string, data: unknown): Uint8Array {
+  return encoder.encode(`${id ? `id: ${id}\n` : ''}event: ${event}\ndata: ${JSON.stringify(data)}\n\n`)
+}
+
+export class StoryBroadcaster {
+  private options: BroadcasterOptions
+  private subscribers = new Set<Subscriber>()
+  private buffer: { seq: number; bytes: Uint8Array }[] = []
+  private seq = 0
+  private epoch = Date.now().toString(36)
+  private heartbeat: ReturnType<typeof setInterval> | null = null
+  private counters = {
+    peakSubscribers: 0,
+    connects: 0,
+    resumes: 0,
+    resets: 0,
+    published: 0,
+    delivered: 0,
+    heartbeats: 0,
+    dropped: 0,
+  }
+
+  constructor(options: Partial<BroadcasterOptions> = {}) {
+    this.options = {
+      bufferSize: 100,
+      heartbeatMs: 25 * 1000,
+      retryMs: 5 * 1000,
+      maxQueuedBytes: 1024 * 1024,
+      ...options,
+    }
+  }
+
+  /**
+   * A text/event-stream body for one subscriber, starting after
+   * `lastEventId` when given. The subscription ends when `signal` aborts.
+   */
+  stream(lastEventId: string | null, signal: AbortSignal): ReadableStream<Uint8Array> {
+    let subscriber: Subscriber | null = null
+
+    return new ReadableStream<Uint8Array>(
+      {
+        start: (controller) => {
+          subscriber = { controller }
+          this.counters.connects++
+          controller.enqueue(encoder.encode(`retry: ${this.options.retryMs}\n\n`))
+          this.replay(controller, lastEventId)
+
+          this.subscribers.add(subscriber)
+          this.counters.peakSubscribers = Math.max(this.counters.peakSubscribers, this.subscribers.size)
+          this.startHeartbeat()
+
+          signal.addEventListener('abort', () => this.remove(subscriber!, true), { once: true })
+        },
+        cancel: () => {
+          if (subscriber) this.remove(subscriber, false)
+        },
+      },
+      // Queue size in bytes, so desiredSize says how far behind a subscriber is
+      { highWaterMark: this.options.maxQueuedBytes, size: (chunk) => chunk.byteLength }
+    )
+  }
+
+  /**
+   * Send newly created stories to every subscriber
+   */
+  publish(stories: Story[], source: StoriesEvent['source']): void {
+    const seq = ++this.seq
+    const event: StoriesEvent = {
+      stories: [...stories]
+        .sort((a, b) => new Date(b.pubDate).getTime() - new Date(a.pubDate).getTime())
+        .slice(0, MAX_EVENT_STORIES),
+      created: stories.length,
+      source,
+      at: new Date().toISOString(),
+    }
+    const bytes = frame(`${this.epoch}-${seq}`, 'stories', event)
+
+    this.buffer.push({ seq, bytes })
+    if (this.buffer.length > this.options.bufferSize) this.buffer.shift()
+    this.counters.published++
+    this.send(bytes, 'delivered')
+  }
+
+  metrics(): BroadcasterMetrics {
+    return { ...this.counters, subscribers: this.subscribers.size }
+  }
+
+  /**
+   * Queue missed events after `lastEventId`, or a reset when they're gone
+   */
+  private replay(controller: ReadableStreamDefaultController<Uint8Array>, lastEventId: string | null): void {
+    if (!lastEventId) return
+    const [epoch, seqText] = lastEventId.split('-')
+    const lastSeq = Number(seqText)
+    const oldest = this.buffer[0]?.seq ?? this.seq + 1
+
+    if (epoch === this.epoch && Number.isInteger(lastSeq) && lastSeq <= this.seq && lastSeq >= oldest - 1) {
+      this.counters.resumes++
+      for (const entry of this.buffer) {
+        if (entry.seq > lastSeq) controller.enqueue(entry.bytes)
+      }
+      return
+    }
+
+    this.counters.resets++
+    controller.enqueue(frame(`${this.epoch}-${this.seq}`, 'reset', { at: new Date().toISOString() }))
+  }
+
+  private send(bytes: Uint8Array, counter: 'delivered' | 'heartbeats'): void {
+    for (const subscriber of this.subscribers) {
+      const { controller } = subscriber
+      if ((controller.desiredSize ?? 0) <= 0) {
+        this.counters.dropped++
+        this.remove(subscriber, true)
+        continue
+      }
+      controller.enqueue(bytes)
+      if (counter === 'delivered') this.counters.delivered++
+    }
+    if (counter === 'heartbeats') this.counters.heartbeats++
+  }
+
+  private startHeartbeat(): void {
+    if (this.heartbeat) return
+    const ping = encoder.encode(': ping\n\n')
+    this.heartbeat = setInterval(() => this.send(ping, 'heartbeats'), this.options.heartbeatMs)
+    // Don't keep the process alive just for heartbeats
+    this.heartbeat.unref?.()
+  }
+
+  private remove(subscriber: Subscriber, close: boolean): void {
+    if (!this.subscribers.delete(subscriber)) return
+    if (close) {
+      try {
+        subscriber.controller.close()
+      } catch {
+        // Already closed or errored
+      }
+    }
+    if (this.subscribers.size === 0 && this.heartbeat) {
+      clearInterval(this.heartbeat)
+      this.heartbeat = null
+    }
+  }
+}
+
+/**
+ * The broadcaster shared by the stream route and the routes that publish
+ */
+export const storyBroadcaster = new StoryBroadcaster()
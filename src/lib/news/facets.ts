@@ -0,0 +1,138 @@
+import { sql, type PostgresAdapter } from '@payloadcms/db-postgres'
+import { getPayloadClient } from '@/lib/payload/client'
+
+/**
+ * News facets - distinct categories and publishers with story counts
+ *
+ * Computed with one GROUP BY over the indexed category/member_slug columns
+ * instead of loading every news item, then cached in memory. The RSS poll
+ * and import routes call invalidateNewsFacets() after creating items; the
+ * TTL covers edits made through the admin panel.
+ */
+
+export interface FacetCount {
+  name: string
+  count: number
+}
+
+export interface NewsFacets {
+  /** Categories sorted by story count, most stories first */
+  categories: FacetCount[]
+  /** Publisher slugs sorted by story count, most stories first */
+  publishers: FacetCount[]
+  total: number
+  computedAt: string
+}
+
+// Matches the news routes' revalidate window
+const FACETS_TTL_MS = 5 * 60 * 1000
+
+// Fallback scan page size when the database can't be queried directly
+const SCAN_PAGE_SIZE = 1000
+
+let cached: { facets: NewsFacets; expiresAt: number } | null = null
+let pending: { facets: Promise<NewsFacets>; generation: number } | null = null
+let generation = 0
+
+/**
+ * Get category and publisher counts, computing them at most once per TTL.
+ * Concurrent callers during a recompute share the same query, unless it
+ * started before the last invalidation: those counts may predate the
+ * items that caused it, so a fresh query starts instead.
+ */
+export async function getNewsFacets(): Promise<NewsFacets> {
+  if (cached && Date.now() < cached.expiresAt) {
+    return cached.facets
+  }
+  if (pending && pending.generation === generation) {
+    return pending.facets
+  }
+
+  const startedGeneration = generation
+  const current = {
+    generation: startedGeneration,
+    facets: computeFacets()
+      .then((facets) => {
+        // Don't cache a result that an invalidation raced past
+        if (startedGeneration === generation) {
+          cached = { facets, expiresAt: Date.now() + FACETS_TTL_MS }
+        }
+        return facets
+      })
+      .finally(() => {
+        // A newer compute may have replaced this one
+        if (pending === current) pending = null
+      }),
+  }
+  pending = current
+
+  return current.facets
+}
+
+/**
+ * Drop the cached facets; the next getNewsFacets() call recomputes them
+ */
+export function invalidateNewsFacets(): void {
+  cached = null
+  generation++
+}
+
+function toSortedCounts(counts: Map<string, number>): FacetCount[] {
+  return [...counts.entries()]
+    .map(([name, count]) => ({ name, count }))
+    .sort((a, b) => b.count - a.count || a.name.localeCompare(b.name))
+}
+
+async function computeFacets(): Promise<NewsFacets> {
+  const payload = await getPayloadClient()
+  const categories = new Map<string, number>()
+  const publishers = new Map<string, number>()
+  let total = 0
+
+  try {
+    const db = payload.db as unknown as PostgresAdapter
+    const result = await db.drizzle.execute(sql`
+      SELECT category, member_slug, count(*)::int AS count
+      FROM news_items
+      GROUP BY category, member_slug
+    `)
+
+    for (const row of result.rows as { category: string | null; member_slug: string | null; count: number }[]) {
+      total += row.count
+      if (row.category) categories.set(row.category, (categories.get(row.category) || 0) + row.count)
+      if (row.member_slug) publishers.set(row.member_slug, (publishers.get(row.member_slug) || 0) + row.count)
+    }
+  } catch (err) {
+    console.warn('[News Facets] Grouped query failed, scanning categories instead:', err)
+    categories.clear()
+    publishers.clear()
+    total = 0
+
+    // Only the two facet fields, a page at a time
+    for (let page = 1, hasNextPage = true; hasNextPage; page++) {
+      const result = await payload.find({
+        collection: 'news-items',
+        select: { category: true, memberSlug: true },
+        depth: 0,
+        limit: SCAN_PAGE_SIZE,
+        page,
+        pagination: true,
+      })
+      for (const doc of result.docs) {
+        total++
+        const category = doc.category as string | undefined
+        const slug = doc.memberSlug as string | undefined
+        if (category) categories.set(category, (categories.get(category) || 0) + 1)
+        if (slug) publishers.set(slug, (publishers.get(slug) || 0) + 1)
+      }
+      hasNextPage = result.hasNextPage
+    }
+  }
+
+  return {
+    categories: toSortedCounts(categories),
+    publishers: toSortedCounts(publishers),
+    total,
+    computedAt: new Date().toISOString(),
+  }
+}
@@ -0,0 +1,144 @@
+import type { PostgresAdapter } from '@payloadcms/db-postgres'
+import type { getPayloadClient } from '@/lib/payload/client'
+import { storeNewsItems, type NewsItemRecord } from './stories'
+import { searchVocabulary } from './search'
+
+/**
+ * Bulk news item ingestion for the RSS poll and import routes
+ *
+ * Replaces a find + create per item (2N sequential round trips) with one
+ * `guid in [...]` lookup and one multi-row INSERT ... ON CONFLICT DO NOTHING
+ * per batch. The unique guid index keeps concurrent polls from creating
+ * duplicates; if the bulk insert fails, that batch falls back to
+ * payload.create per item so one bad row doesn't drop the rest.
+ *
+ * Created items are projected into their API shape right away (see
+ * lib/news/stories), so the first page that shows them doesn't have to.
+ * Postgres indexes them for search on insert; their words are added to
+ * the search vocabulary here.
+ */
+
+type PayloadInstance = Awaited<ReturnType<typeof getPayloadClient>>
+
+export interface NewsItemInput {
+  guid: string
+  title: string
+  url: string
+  description: string
+  memberSlug: string
+  pubDate: string
+  image?: string
+  category: string
+}
+
+export interface IngestResult {
+  created: number
+  skipped: number
+  errors: { guid: string; error: string }[]
+  /** The items this call inserted, for publishing to live subscribers */
+  createdItems: NewsItemRecord[]
+  timings: {
+    /** Milliseconds spent on guid lookups */
+    lookupMs: number
+    /** Milliseconds spent inserting new items */
+    insertMs: number
+  }
+}
+
+// Items per lookup query and INSERT statement
+export const INGEST_BATCH_SIZE = 100
+
+export async function ingestNewsItems(
+  payload: PayloadInstance,
+  items: NewsItemInput[],
+  batchSize: number = INGEST_BATCH_SIZE
+): Promise<IngestResult> {
+  const result: IngestResult = {
+    created: 0,
+    skipped: 0,
+    errors: [],
+    createdItems: [],
+    timings: { lookupMs: 0, insertMs: 0 },
+  }
+
+  for (let start = 0; start < items.length; start += batchSize) {
+    const batch = items.slice(start, start + batchSize)
+
+    // One lookup for the whole batch
+    const lookupStart = performance.now()
+    const existing = await payload.find({
+      collection: 'news-items',
+      where: { guid: { in: batch.map((item) => item.guid) } },
+      select: { guid: true },
+      depth: 0,
+      limit: batch.length,
+      pagination: false,
+    })
+    result.timings.lookupMs += performance.now() - lookupStart
+
+    const existingGuids = new Set(existing.docs.map((doc) => doc.guid as string))
+    const newItems = batch.filter((item) => !existingGuids.has(item.guid))
+    result.skipped += batch.length - newItems.length
+    if (newItems.length === 0) continue
+
+    const insertStart = performance.now()
+    try {
+      const inserted = await bulkInsert(payload, newItems)
+      result.created += inserted.length
+      result.createdItems.push(...inserted)
+      // Rows another poll inserted between our lookup and insert
+      result.skipped += newItems.length - inserted.length
+    } catch (err) {
+      console.warn('[News Ingest] Bulk insert failed, inserting batch item by item:', err)
+      for (const item of newItems) {
+        try {
+          const doc = await payload.create({ collection: 'news-items', data: item })
+          storeNewsItems([doc as unknown as NewsItemRecord])
+          result.createdItems.push(doc as unknown as NewsItemRecord)
+          searchVocabulary.add([item.title, item.description, item.category, item.memberSlug.replace(/-/g, ' ')])
+          result.created++
+        } catch (itemErr) {
+          const errorMessage = itemErr instanceof Error ? itemErr.message : 'Unknown error'
+          result.errors.push({ guid: item.guid, error: errorMessage })
+        }
+      }
+    }
+    result.timings.insertMs += performance.now() - insertStart
+  }
+
+  return result
+}
+
+/**
+ * Insert items in a single statement, ignoring guids that already exist.
+ * Returns the rows actually inserted.
+ */
+async function bulkInsert(payload: PayloadInstance, items: NewsItemInput[]): Promise<NewsItemRecord[]> {
+  const db = payload.db as unknown as PostgresAdapter
+  const table = db.tables.news_items
+  const now = new Date().toISOString()
+
+  const rows = await db.drizzle
+    .insert(table)
+    .values(
+      items.map((item) => ({
+        ...item,
+        image: item.image ?? null,
+        featured: false,
+        promoted: false,
+        createdAt: now,
+        updatedAt: now,
+      }))
+    )
+    .onConflictDoNothing({ target: table.guid })
+    .returning({ id: table.id, guid: table.guid })
+
+  const byGuid = new Map(items.map((item) => [item.guid, item]))
+  const created = rows.map((row) => ({ ...byGuid.get(row.guid as string)!, id: row.id as number, updatedAt: now }))
+  storeNewsItems(created)
+  searchVocabulary.add(
+    created.flatMap((item) => [item.title, item.description, item.category, item.memberSlug.replace(/-/g, ' ')])
+  )
+
+  return created
+}
@@ -0,0 +1,111 @@
+import type { Where } from 'payload'
+import type { getPayloadClient } from '@/lib/payload/client'
+import { STORY_SELECT, type NewsItemRecord } from './stories'
+
+/**
+ * Keyset (cursor) pagination over news items, newest first
+ *
+ * A page is "the next `limit` items after (pubDate, id)" instead of
+ * "skip offset items", so the database walks the pubDate index from the
+ * cursor rather than counting past every earlier row, and a page doesn't
+ * shift when the poller inserts newer stories. The id breaks ties between
+ * items published at the same instant.
+ *
+ * Cursors are opaque to clients: base64url JSON of the last item's key.
+ * Counting matching items is a separate, optional query.
+ */
+
+type PayloadInstance = Awaited<ReturnType<typeof getPayloadClient>>
+
+export interface NewsCursor {
+  pubDate: string
+  id: string | number
+}
+
+export interface NewsPage {
+  docs: NewsItemRecord[]
+  hasMore: boolean
+  /** Cursor for the page after this one; null on the last page */
+  nextCursor: string | null
+  /** Items matching the filters, only when asked for */
+  total?: number
+}
+
+export function encodeCursor(doc: NewsCursor): string {
+  return Buffer.from(JSON.stringify([doc.pubDate, doc.id])).toString('base64url')
+}
+
+/**
+ * Decode a cursor from a request; null when it isn't one of ours
+ */
+export function decodeCursor(cursor: string): NewsCursor | null {
+  try {
+    const value = JSON.parse(Buffer.from(cursor, 'base64url').toString('utf8'))
+    if (
+      Array.isArray(value) &&
+      value.length === 2 &&
+      typeof value[0] === 'string' &&
+      !Number.isNaN(Date.parse(value[0])) &&
+      (typeof value[1] === 'number' || typeof value[1] === 'string')
+    ) {
+      return { pubDate: value[0], id: value[1] }
+    }
+  } catch {
+    // Fall through
+  }
+  return null
+}
+
+/**
+ * Items strictly after the cursor in (-pubDate, -id) order
+ *
+ * Written as `pubDate <= c AND (pubDate < c OR id < c.id)` rather than a
+ * plain OR, so the first term bounds the index range scan.
+ */
+function afterCursor(cursor: NewsCursor): Where {
+  return {
+    and: [
+      { pubDate: { less_than_equal: cursor.pubDate } },
+      {
+        or: [{ pubDate: { less_than: cursor.pubDate } }, { id: { less_than: cursor.id } }],
+      },
+    ],
+  }
+}
+
+/**
+ * One page of news items after `cursor` (or the first page without one)
+ */
+export async function findNewsPage(
+  payload: PayloadInstance,
+  where: Where,
+  options: { limit: number; cursor?: NewsCursor | null; count?: boolean }
+): Promise<NewsPage> {
+  const { limit, cursor, count = false } = options
+  const pageWhere: Where = cursor ? { and: [where, afterCursor(cursor)] } : where
+
+  const [result, counted] = await Promise.all([
+    // One extra row says whether there is a next page without counting
+    payload.find({
+      collection: 'news-items',
+      where: pageWhere,
+      select: STORY_SELECT,
+      depth: 0,
+      limit: limit + 1,
+      pagination: false,
+      sort: ['-pubDate', '-id'],
+    }),
+    count ? payload.count({ collection: 'news-items', where }) : null,
+  ])
+
+  const docs = result.docs.slice(0, limit) as unknown as NewsItemRecord[]
+  const hasMore = result.docs.length > limit
+  const last = docs[docs.length - 1]
+
+  return {
+    docs,
+    hasMore,
+    nextCursor: hasMore && last ? encodeCursor(last) : null,
+    ...(counted ? { total: counted.totalDocs } : {}),
+  }
+}
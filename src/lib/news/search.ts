@@ -0,0 +1,284 @@
+import { sql, type PostgresAdapter } from '@payloadcms/db-postgres'
+import type { getPayloadClient } from '@/lib/payload/client'
+import type { NewsItemRecord } from './stories'
+
+/**
+ * Ranked full-text search over news items
+ *
+ * Matches the search_document column (payload/db/newsSearch) through its
+ * GIN index instead of substring-scanning title and description:
+ * - every word is matched as a prefix, so results show up while typing
+ * - a word that isn't in the index (and doesn't start any word that is)
+ *   also matches its closest indexed words by edit distance, so "housng"
+ *   finds "housing"
+ * - results are ordered by text rank, boosted by recency: a story
+ *   published today counts double, one RECENCY_HALF_LIFE_DAYS old 1.5x
+ *
+ * The typo vocabulary is read from the index once per VOCABULARY_TTL_MS,
+ * in the background, and ingest adds new items' words to it as they
+ * arrive. Until it first loads, searches run without typo correction.
+ * searchNews() returns null when the index can't be queried (e.g. the
+ * column hasn't been migrated yet) so callers can fall back to `contains`.
+ */
+
+type PayloadInstance = Awaited<ReturnType<typeof getPayloadClient>>
+
+export interface NewsSearchOptions {
+  search: string
+  member?: string | null
+  category?: string | null
+  featured?: boolean
+  limit: number
+  offset?: number
+  count?: boolean
+}
+
+export interface NewsSearchResult {
+  docs: NewsItemRecord[]
+  hasMore: boolean
+  total?: number
+}
+
+export const RECENCY_HALF_LIFE_DAYS = 30
+
+const VOCABULARY_TTL_MS = 60 * 60 * 1000
+// Words considered per search, and corrections per misspelled word
+const MAX_TERMS = 8
+const MAX_SUGGESTIONS = 3
+
+/**
+ * Lowercase letter/digit runs, roughly how the 'simple' parser splits text
+ */
+export function searchTerms(text: string): string[] {
+  return text.toLowerCase().match(/[\p{L}\p{N}]+/gu) ?? []
+}
+
+/**
+ * Edit distance between a and b counting an adjacent swap as one edit,
+ * or max + 1 once it must exceed max
+ */
+function editDistance(a: string, b: string, max: number): number {
+  if (Math.abs(a.length - b.length) > max) return max + 1
+  let beforePrevious: number[] = []
+  let previous = Array.from({ length: b.length + 1 }, (_, j) => j)
+  for (let i = 1; i <= a.length; i++) {
+    const current = [i]
+    let rowMin = i
+    for (let j = 1; j <= b.length; j++) {
+      const cost = a.charCodeAt(i - 1) === b.charCodeAt(j - 1) ? 0 : 1
+      current[j] = Math.min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + cost)
+      if (i > 1 && j > 1 && a[i - 1] === b[j - 2] && a[i - 2] === b[j - 1]) {
+        current[j] = Math.min(current[j], beforePrevious[j - 2] + 1)
+      }
+      if (current[j] < rowMin) rowMin = current[j]
+    }
+    if (rowMin > max) return max + 1
+    beforePrevious = previous
+    previous = current
+  }
+  return previous[b.length]
+}
+
+/**
+ * Indexed words with document counts, for typo correction
+ */
+export class SearchVocabulary {
+  private counts = new Map<string, number>()
+  private sorted: string[] | null = null
+  private byLength = new Map<number, string[]>()
+  private loadedAt = 0
+  private pending: Promise<void> | null = null
+
+  get ready(): boolean {
+    return this.loadedAt > 0
+  }
+
+  /**
+   * Reload from the index when missing or older than the TTL, without
+   * waiting for it
+   */
+  refresh(payload: PayloadInstance): void {
+    if (this.pending || Date.now() - this.loadedAt < VOCABULARY_TTL_MS) return
+    const db = payload.db as unknown as PostgresAdapter
+    this.pending = db.drizzle
+      .execute(sql`SELECT word, ndoc FROM ts_stat('SELECT search_document FROM news_items')`)
+      .then((result) => {
+        this.counts = new Map(
+          (result.rows as { word: string; ndoc: number }[]).map((row) => [row.word, Number(row.ndoc)])
+        )
+        this.reindex()
+        this.loadedAt = Date.now()
+      })
+      .catch((err) => {
+        console.warn('[News Search] Failed to load vocabulary:', err)
+        // Don't retry on every search
+        this.loadedAt = Date.now() - VOCABULARY_TTL_MS + 60 * 1000
+      })
+      .finally(() => {
+        this.pending = null
+      })
+  }
+
+  /**
+   * Count the words of newly ingested text
+   */
+  add(texts: string[]): void {
+    if (!this.ready) return
+    let added = false
+    for (const text of texts) {
+      for (const word of new Set(searchTerms(text))) {
+        const count = this.counts.get(word)
+        if (count === undefined) added = true
+        this.counts.set(word, (count ?? 0) + 1)
+      }
+    }
+    if (added) this.reindex()
+  }
+
+  has(word: string): boolean {
+    return this.counts.has(word)
+  }
+
+  /**
+   * Whether any indexed word starts with `prefix`
+   */
+  hasPrefix(prefix: string): boolean {
+    const sorted = this.sortedWords()
+    let low = 0
+    let high = sorted.length
+    while (low < high) {
+      const mid = (low + high) >>> 1
+      if (sorted[mid] < prefix) low = mid + 1
+      else high = mid
+    }
+    return low < sorted.length && sorted[low].startsWith(prefix)
+  }
+
+  /**
+   * Indexed words within edit distance 1 (2 for words of 8+ letters),
+   * most common first. Words under 4 letters aren't corrected.
+   */
+  suggest(word: string): string[] {
+    if (word.length < 4) return []
+    const max = word.length >= 8 ? 2 : 1
+    const matches: { word: string; distance: number; count: number }[] = []
+    for (let length = word.length - max; length <= word.length + max; length++) {
+      for (const candidate of this.byLength.get(length) ?? []) {
+        const distance = editDistance(word, candidate, max)
+        if (distance <= max) matches.push({ word: candidate, distance, count: this.counts.get(candidate) ?? 0 })
+      }
+    }
+    return matches
+      .sort((a, b) => a.distance - b.distance || b.count - a.count)
+      .slice(0, MAX_SUGGESTIONS)
+      .map((match) => match.word)
+  }
+
+  private reindex(): void {
+    this.sorted = null
+    this.byLength.clear()
+    for (const word of this.counts.keys()) {
+      const bucket = this.byLength.get(word.length)
+      if (bucket) bucket.push(word)
+      else this.byLength.set(word.length, [word])
+    }
+  }
+
+  private sortedWords(): string[] {
+    if (!this.sorted) this.sorted = [...this.counts.keys()].sort()
+    return this.sorted
+  }
+}
+
+export const searchVocabulary = new SearchVocabulary()
+
+/**
+ * to_tsquery('simple', ...) text for a search box value: every word as a
+ * prefix, OR'd with its corrections when it looks misspelled. Null when
+ * there is nothing to search for.
+ */
+export function buildSearchQuery(search: string, vocabulary: SearchVocabulary = searchVocabulary): string | null {
+  const terms = [...new Set(searchTerms(search))].slice(0, MAX_TERMS)
+  if (terms.length === 0) return null
+
+  return terms
+    .map((term) => {
+      const corrections =
+        vocabulary.ready && !vocabulary.has(term) && !vocabulary.hasPrefix(term) ? vocabulary.suggest(term) : []
+      return corrections.length > 0 ? `(${[`${term}:*`, ...corrections].join(' | ')})` : `${term}:*`
+    })
+    .join(' & ')
+}
+
+function toIso(value: unknown): string | null {
+  if (value === null || value === undefined) return null
+  return new Date(value as string).toISOString()
+}
+
+/**
+ * One page of search results, best first; null if the index is unavailable
+ */
+export async function searchNews(
+  payload: PayloadInstance,
+  options: NewsSearchOptions
+): Promise<NewsSearchResult | null> {
+  const { search, member, category, featured, limit, offset = 0, count = false } = options
+  searchVocabulary.refresh(payload)
+
+  const tsquery = buildSearchQuery(search)
+  if (!tsquery) return { docs: [], hasMore: false, ...(count ? { total: 0 } : {}) }
+
+  const db = payload.db as unknown as PostgresAdapter
+  const conditions = [sql`n.search_document @@ q.query`]
+  if (member && member !== 'all') conditions.push(sql`n.member_slug = ${member}`)
+  if (category && category !== 'all') conditions.push(sql`n.category = ${category}`)
+  if (featured) conditions.push(sql`n.featured = true`)
+  const where = sql.join(conditions, sql` AND `)
+
+  try {
+    const [page, counted] = await Promise.all([
+      db.drizzle.execute(sql`
+        SELECT n.id, n.title, n.url, n.description, n.member_slug, n.category, n.pub_date, n.image,
+          n.featured, n.updated_at
+        FROM news_items n, to_tsquery('simple', ${tsquery}) AS q(query)
+        WHERE ${where}
+        ORDER BY
+          ts_rank(n.search_document, q.query, 32) *
+            (1 + power(0.5, extract(epoch FROM now() - n.pub_date) / 86400 / ${RECENCY_HALF_LIFE_DAYS})) DESC,
+          n.pub_date DESC,
+          n.id DESC
+        LIMIT ${limit + 1} OFFSET ${offset}
+      `),
+      count
+        ? db.drizzle.execute(sql`
+            SELECT count(*)::int AS count
+            FROM news_items n, to_tsquery('simple', ${tsquery}) AS q(query)
+            WHERE ${where}
+          `)
+        : null,
+    ])
+
+    const rows = page.rows as Record<string, unknown>[]
+    const docs: NewsItemRecord[] = rows.slice(0, limit).map((row) => ({
+      id: row.id as number,
+      title: row.title as string,
+      url: row.url as string,
+      description: row.description as string | null,
+      memberSlug: row.member_slug as string | null,
+      category: row.category as string | null,
+      pubDate: toIso(row.pub_date)!,
+      image: row.image as string | null,
+      featured: row.featured as boolean | null,
+      updatedAt: toIso(row.updated_at),
+    }))
+
+    return {
+      docs,
+      hasMore: rows.length > limit,
+      ...(counted ? { total: (counted.rows[0] as { count: number }).count } : {}),
+    }
+  } catch (err) {
+    console.warn('[News Search] Index query failed, falling back to substring search:', err)
+    return null
+  }
+}
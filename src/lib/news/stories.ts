@@ -0,0 +1,255 @@
+import { summarizeItem } from '@/lib/rss/html'
+import type { RSSItem } from '@/lib/rss/poller'
+import { getMemberMeta, extractCategory } from './utils'
+
+/**
+ * Story DTOs - stories in the shape /api/news and /api/stories ship them
+ *
+ * Each story is projected and serialized once: news items when they are
+ * ingested (or the first time a page needs them, after a restart or an
+ * admin edit), feed items the first time a page needs them. Pages are kept
+ * as ready-made JSON array fragments in a StoryPageCache keyed by filter,
+ * so a cached request costs a Map lookup and a string concat no matter how
+ * much enrichment went into its stories.
+ *
+ * Relative times ("2 hours ago") are not part of a story; clients format
+ * pubDate themselves so cached stories never go stale.
+ */
+
+export interface Story {
+  id: string | number
+  title: string
+  excerpt: string
+  publication: string
+  publicationSlug: string
+  publicationLogo?: string
+  publicationColor: string
+  category: string
+  pubDate: string
+  href: string
+  imageUrl?: string
+  featured?: boolean
+}
+
+/**
+ * The news-items fields a story is built from
+ */
+export interface NewsItemRecord {
+  id: string | number
+  title: string
+  url: string
+  description?: string | null
+  memberSlug?: string | null
+  category?: string | null
+  pubDate: string
+  image?: string | null
+  featured?: boolean | null
+  updatedAt?: string | null
+}
+
+// Pass as `select` to payload.find so only these columns are read
+export const STORY_SELECT = {
+  title: true,
+  url: true,
+  description: true,
+  memberSlug: true,
+  category: true,
+  pubDate: true,
+  image: true,
+  featured: true,
+  updatedAt: true,
+} as const
+
+/**
+ * Project a news item into its API shape
+ */
+export function newsItemToStory(doc: NewsItemRecord): Story {
+  const meta = getMemberMeta(doc.memberSlug || '')
+
+  return {
+    id: doc.id,
+    title: doc.title,
+    excerpt: doc.description || '',
+    publication: meta.name,
+    publicationSlug: doc.memberSlug || '',
+    publicationLogo: meta.logo || undefined,
+    publicationColor: meta.color,
+    category: doc.category || 'News',
+    pubDate: doc.pubDate,
+    href: doc.url,
+    imageUrl: doc.image || undefined,
+    featured: doc.featured || false,
+  }
+}
+
+/**
+ * Project a live feed item into its API shape
+ */
+export function feedItemToStory(item: RSSItem & { memberSlug: string }, excerptLength = 150): Story {
+  const meta = getMemberMeta(item.memberSlug)
+  const summary = summarizeItem(item, excerptLength)
+
+  return {
+    id: item.guid,
+    title: item.title,
+    excerpt: summary.excerpt,
+    publication: meta.name,
+    publicationSlug: item.memberSlug,
+    publicationLogo: meta.logo || undefined,
+    publicationColor: meta.color,
+    category: extractCategory(item.categories, item.title),
+    pubDate: item.pubDate,
+    href: item.link,
+    imageUrl: summary.image || undefined,
+  }
+}
+
+// ===========================================
+// Serialized story store
+// ===========================================
+
+// News items kept serialized; least recently used are dropped past this
+const MAX_STORED_STORIES = 5000
+
+const storedNewsItems = new Map<string, { updatedAt: number; json: string }>()
+const storedFeedItems = new WeakMap<RSSItem, string>()
+
+function updatedAtOf(doc: NewsItemRecord): number {
+  return doc.updatedAt ? Date.parse(doc.updatedAt) : 0
+}
+
+/**
+ * Project, serialize and remember news items. The ingest path calls this
+ * with the rows it just inserted.
+ */
+export function storeNewsItems(docs: NewsItemRecord[]): void {
+  for (const doc of docs) {
+    const key = String(doc.id)
+    storedNewsItems.delete(key)
+    storedNewsItems.set(key, { updatedAt: updatedAtOf(doc), json: JSON.stringify(newsItemToStory(doc)) })
+  }
+  while (storedNewsItems.size > MAX_STORED_STORIES) {
+    storedNewsItems.delete(storedNewsItems.keys().next().value as string)
+  }
+}
+
+/**
+ * Serialized story for a news item, projected only if it isn't stored yet
+ * or the row has been updated since
+ */
+export function newsItemJson(doc: NewsItemRecord): string {
+  const stored = storedNewsItems.get(String(doc.id))
+  if (stored && stored.updatedAt === updatedAtOf(doc)) return stored.json
+  storeNewsItems([doc])
+  return storedNewsItems.get(String(doc.id))!.json
+}
+
+/**
+ * Serialized story for a feed item. Feed items are immutable while their
+ * feed stays cached, so they are remembered by identity.
+ */
+export function feedItemJson(item: RSSItem & { memberSlug: string }): string {
+  let json = storedFeedItems.get(item)
+  if (json === undefined) {
+    json = JSON.stringify(feedItemToStory(item))
+    storedFeedItems.set(item, json)
+  }
+  return json
+}
+
+// ===========================================
+// Page fragments
+// ===========================================
+
+export interface StoryPage {
+  /** Serialized JSON array of the page's stories */
+  stories: string
+  /** Everything else the response carries for this page (total, hasMore, ...) */
+  meta: Record<string, unknown>
+}
+
+export interface StoryPageCacheOptions {
+  ttlMs: number
+  maxEntries: number
+}
+
+/**
+ * Story pages by filter key, with a TTL, least-recently-used eviction and
+ * single-flight loads. invalidate() drops everything and keeps loads that
+ * were already running from caching their (possibly outdated) result.
+ */
+export class StoryPageCache {
+  private options: StoryPageCacheOptions
+  private pages = new Map<string, { page: StoryPage; expiresAt: number }>()
+  private pending = new Map<string, Promise<StoryPage>>()
+  private generation = 0
+
+  constructor(options: Partial<StoryPageCacheOptions> = {}) {
+    this.options = { ttlMs: 5 * 60 * 1000, maxEntries: 200, ...options }
+  }
+
+  async get(key: string, load: () => Promise<StoryPage>): Promise<StoryPage> {
+    const cached = this.pages.get(key)
+    if (cached && Date.now() < cached.expiresAt) {
+      // Re-insert to mark as most recently used
+      this.pages.delete(key)
+      this.pages.set(key, cached)
+      return cached.page
+    }
+
+    const inFlight = this.pending.get(key)
+    if (inFlight) return inFlight
+
+    const startedGeneration = this.generation
+    const promise = load()
+      .then((page) => {
+        if (startedGeneration === this.generation) {
+          this.pages.delete(key)
+          this.pages.set(key, { page, expiresAt: Date.now() + this.options.ttlMs })
+          while (this.pages.size > this.options.maxEntries) {
+            this.pages.delete(this.pages.keys().next().value as string)
+          }
+        }
+        return page
+      })
+      .finally(() => {
+        // An invalidate() may have let a newer load take this key
+        if (this.pending.get(key) === promise) this.pending.delete(key)
+      })
+
+    this.pending.set(key, promise)
+    return promise
+  }
+
+  invalidate(): void {
+    this.pages.clear()
+    this.pending.clear()
+    this.generation++
+  }
+}
+
+/**
+ * /api/news pages; the RSS poll and import routes invalidate them after
+ * creating items, the TTL covers edits made through the admin panel
+ */
+export const newsPages = new StoryPageCache()
+
+export function invalidateStoryPages(): void {
+  newsPages.invalidate()
+}
+
+/**
+ * Join serialized stories into a page fragment
+ */
+export function toStoriesFragment(json: string[]): string {
+  return `[${json.join(',')}]`
+}
+
+/**
+ * JSON body for a page: the ready-made stories fragment spliced in front
+ * of the per-response fields, without re-serializing the stories
+ */
+export function storyPageBody(page: StoryPage, extra: Record<string, unknown> = {}): string {
+  const rest = JSON.stringify({ ...page.meta, ...extra })
+  return rest === '{}' ? `{"stories":${page.stories}}` : `{"stories":${page.stories},${rest.slice(1)}`
+}
@@ -1,4 +1,9 @@
 import { members } from '@/data/members'
+import type { RateLimitResult } from '@/lib/ratelimit/algorithms'
+import { MemoryRateLimitStore } from '@/lib/ratelimit/memory'
+
+// Lives in ./time so client components can import it without this module
+export { formatRelativeTime } from './time'
 
 /**
  * News utilities shared across API routes and components
@@ -23,64 +28,45 @@ const DEFAULT_MEMBER_META: MemberMeta = {
   color: '#78716c',
 }
 
+// Map slug to logo path (consistent naming convention)
+// Empty string means no logo available yet
+const PUBLISHER_LOGOS: { [key: string]: string } = {
+  'el-tecolote': '/images/publishers/el-tecolote.png',
+  'mission-local': '/images/publishers/mission-local.png',
+  'the-bay-view': '/images/publishers/bayview-hp.png',
+  'sf-public-press': '/images/publishers/sf-public-press.png',
+  'bay-area-reporter': '/images/publishers/bayarea-reporter.png',
+  'nichi-bei': '/images/publishers/nichibei.png',
+  'j-weekly': '/images/publishers/jnews.png',
+  'richmond-review': '/images/publishers/richmond-review.png',
+  'sunset-beacon': '/images/publishers/sunset-beacon.png',
+  'wind-newspaper': '/images/publishers/wind-newspaper.png',
+  '48-hills': '/images/publishers/48-hills.png',
+  'broke-ass-stuart': '',
+  'ingleside-light': '/images/publishers/ingleside-light.png',
+  'potrero-view': '/images/publishers/potrero-view.png',
+}
+
+// Built once from the members data; lookups are by slug
+const MEMBER_META_BY_SLUG = new Map<string, MemberMeta>(
+  members.map((member) => [
+    member.slug,
+    {
+      name: member.name,
+      logo: PUBLISHER_LOGOS[member.slug] ?? '',
+      color: member.color || DEFAULT_MEMBER_META.color,
+    },
+  ])
+)
+
 /**
  * Get member metadata for display (logo, color, name)
  * Uses the centralized members data source
+ *
+ * The returned object is shared between callers; don't mutate it.
  */
 export function getMemberMeta(slug: string): MemberMeta {
-  const member = members.find((m) => m.slug === slug)
-  if (!member) {
-    return { ...DEFAULT_MEMBER_META, name: slug || 'Unknown' }
-  }
-
-  // Map slug to logo path (consistent naming convention)
-  // Empty string means no logo available yet
-  const logoMap: { [key: string]: string } = {
-    'el-tecolote': '/images/publishers/el-tecolote.png',
-    'mission-local': '/images/publishers/mission-local.png',
-    'the-bay-view': '/images/publishers/bayview-hp.png',
-    'sf-public-press': '/images/publishers/sf-public-press.png',
-    'bay-area-reporter': '/images/publishers/bayarea-reporter.png',
-    'nichi-bei': '/images/publishers/nichibei.png',
-    'j-weekly': '/images/publishers/jnews.png',
-    'richmond-review': '/images/publishers/richmond-review.png',
-    'sunset-beacon': '/images/publishers/sunset-beacon.png',
-    'wind-newspaper': '/images/publishers/wind-newspaper.png',
-    '48-hills': '/images/publishers/48-hills.png',
-    'broke-ass-stuart': '',
-    'ingleside-light': '/images/publishers/ingleside-light.png',
-    'potrero-view': '/images/publishers/potrero-view.png',
-  }
-
-  const logoValue = logoMap[slug]
-
-  return {
-    name: member.name,
-    logo: typeof logoValue === 'string' ? logoValue : '',
-    color: member.color || DEFAULT_MEMBER_META.color,
-  }
-}
-
-/**
- * Format date as relative time (e.g., "2 hours ago")
- */
-export function formatRelativeTime(dateString: string): string {
-  const date = new Date(dateString)
-  const now = new Date()
-  const diffMs = now.getTime() - date.getTime()
-  const diffMins = Math.floor(diffMs / (1000 * 60))
-  const diffHours = Math.floor(diffMs / (1000 * 60 * 60))
-  const diffDays = Math.floor(diffMs / (1000 * 60 * 60 * 24))
-
-  if (diffMins < 60) {
-    return `${diffMins} min${diffMins !== 1 ? 's' : ''} ago`
-  } else if (diffHours < 24) {
-    return `${diffHours} hour${diffHours !== 1 ? 's' : ''} ago`
-  } else if (diffDays < 7) {
-    return `${diffDays} day${diffDays !== 1 ? 's' : ''} ago`
-  } else {
-    return date.toLocaleDateString('en-US', { month: 'short', day: 'numeric' })
-  }
+  return MEMBER_META_BY_SLUG.get(slug) ?? { ...DEFAULT_MEMBER_META, name: slug || 'Unknown' }
 }
 
 /**
@@ -120,30 +106,8 @@ export function isValidEmail(email: string): boolean {
   return EMAIL_REGEX.test(email.toLowerCase().trim())
 }
 
-/**
- * Sanitize text content from RSS feeds
- * Removes HTML tags and dangerous content
- */
-export function sanitizeText(text: string | undefined | null): string {
-  if (!text) return ''
-
-  return text
-    // Remove HTML tags
-    .replace(/<[^>]*>/g, '')
-    // Decode common HTML entities
-    .replace(/&amp;/g, '&')
-    .replace(/&lt;/g, '<')
-    .replace(/&gt;/g, '>')
-    .replace(/&quot;/g, '"')
-    .replace(/&#39;/g, "'")
-    .replace(/&nbsp;/g, ' ')
-    // Remove potential script injections
-    .replace(/javascript:/gi, '')
-    .replace(/on\w+=/gi, '')
-    // Normalize whitespace
-    .replace(/\s+/g, ' ')
-    .trim()
-}
+// Lives with the other feed HTML helpers
+export { sanitizeText } from '@/lib/rss/html'
 
 /**
  * Validate and sanitize URL
@@ -165,56 +129,18 @@ export function sanitizeUrl(url: string | undefined | null): string {
 }
 
 /**
- * Simple in-memory rate limiter for API routes
- * Note: This resets on server restart. For production, use Redis.
+ * In-process rate limit check (sliding window), for callers that can't
+ * await. API routes should use a RateLimiter from lib/ratelimit/limiter,
+ * which shares limits across server instances.
  */
-const rateLimitMap = new Map<string, { count: number; resetTime: number }>()
+const localRateLimits = new MemoryRateLimitStore()
 
-export interface RateLimitResult {
-  success: boolean
-  remaining: number
-  resetInSeconds: number
-}
+export type { RateLimitResult }
 
 export function checkRateLimit(
   key: string,
   maxRequests: number = 5,
   windowMs: number = 3600000 // 1 hour
 ): RateLimitResult {
-  const now = Date.now()
-  const record = rateLimitMap.get(key)
-
-  // Clean up expired entries periodically
-  if (rateLimitMap.size > 10000) {
-    for (const [k, v] of rateLimitMap) {
-      if (now > v.resetTime) {
-        rateLimitMap.delete(k)
-      }
-    }
-  }
-
-  if (!record || now > record.resetTime) {
-    // Create new record
-    rateLimitMap.set(key, { count: 1, resetTime: now + windowMs })
-    return {
-      success: true,
-      remaining: maxRequests - 1,
-      resetInSeconds: Math.ceil(windowMs / 1000),
-    }
-  }
-
-  if (record.count >= maxRequests) {
-    return {
-      success: false,
-      remaining: 0,
-      resetInSeconds: Math.ceil((record.resetTime - now) / 1000),
-    }
-  }
-
-  record.count++
-  return {
-    success: true,
-    remaining: maxRequests - record.count,
-    resetInSeconds: Math.ceil((record.resetTime - now) / 1000),
-  }
+  return localRateLimits.consumeNow({ name: `${maxRequests}/${windowMs}`, limit: maxRequests, windowMs }, key)
 }
@@ -0,0 +1,144 @@
+/**
+ * Rate limiting algorithms, as pure state transitions
+ *
+ * Both allow `limit` requests per `windowMs` without the burst a fixed
+ * window allows at its boundary:
+ * - sliding-window counts requests in the current fixed window plus the
+ *   previous window's count weighted by how much of it still overlaps
+ *   the trailing window (two counters per key)
+ * - token-bucket holds up to `limit` tokens, refilled continuously at
+ *   limit / windowMs; each request takes one
+ *
+ * Stores keep a RateLimitState per key and apply these transitions;
+ * the Postgres store (./postgres) performs the same arithmetic in SQL.
+ */
+
+export type RateLimitAlgorithm = 'sliding-window' | 'token-bucket'
+
+export interface RateLimitRule {
+  /** Namespaces keys, so rules sharing a store never collide */
+  name: string
+  limit: number
+  windowMs: number
+  algorithm?: RateLimitAlgorithm
+}
+
+export interface RateLimitResult {
+  success: boolean
+  remaining: number
+  resetInSeconds: number
+}
+
+/**
+ * sliding-window: value = current window's count, previous = last
+ * window's count, stamp = current window start (ms).
+ * token-bucket: value = tokens left, stamp = last refill (ms).
+ */
+export interface RateLimitState {
+  value: number
+  previous: number
+  stamp: number
+}
+
+export interface RateLimitStep {
+  state: RateLimitState
+  result: RateLimitResult
+  /** When the state has decayed to "never seen", and can be dropped */
+  expiresAt: number
+}
+
+/**
+ * Apply one request to `state` (null for an unseen key)
+ */
+export function consume(rule: RateLimitRule, state: RateLimitState | null, now: number): RateLimitStep {
+  return rule.algorithm === 'token-bucket' ? tokenBucket(rule, state, now) : slidingWindow(rule, state, now)
+}
+
+function slidingWindow(rule: RateLimitRule, state: RateLimitState | null, now: number): RateLimitStep {
+  const { windowMs } = rule
+  const windowStart = Math.floor(now / windowMs) * windowMs
+
+  let current = 0
+  let previous = 0
+  if (state?.stamp === windowStart) {
+    current = state.value
+    previous = state.previous
+  } else if (state?.stamp === windowStart - windowMs) {
+    previous = state.value
+  }
+
+  const result = slidingWindowResult(rule, current, previous, now)
+  return {
+    state: { value: current + (result.success ? 1 : 0), previous, stamp: windowStart },
+    result,
+    expiresAt: windowStart + 2 * windowMs,
+  }
+}
+
+/**
+ * The decision for a sliding-window key holding `current` and `previous`
+ * before this request
+ */
+export function slidingWindowResult(
+  rule: RateLimitRule,
+  current: number,
+  previous: number,
+  now: number
+): RateLimitResult {
+  const { limit, windowMs } = rule
+  const windowStart = Math.floor(now / windowMs) * windowMs
+  const overlap = 1 - (now - windowStart) / windowMs
+  const used = previous * overlap + current
+  const success = used + 1 <= limit
+
+  if (success) {
+    return {
+      success,
+      remaining: Math.max(0, Math.floor(limit - used - 1)),
+      resetInSeconds: Math.ceil((windowStart + windowMs - now) / 1000),
+    }
+  }
+
+  // Time until the weighted previous window has decayed enough for one more
+  let waitMs: number
+  if (current + 1 <= limit && previous > 0) {
+    waitMs = windowMs * (1 - (limit - 1 - current) / previous) - (now - windowStart)
+  } else {
+    // This window is full: wait for it to become the previous one and decay
+    waitMs = windowStart + windowMs - now + windowMs * (1 - (limit - 1) / Math.max(current, 1))
+  }
+  return { success, remaining: 0, resetInSeconds: Math.max(1, Math.ceil(waitMs / 1000)) }
+}
+
+function tokenBucket(rule: RateLimitRule, state: RateLimitState | null, now: number): RateLimitStep {
+  const { limit, windowMs } = rule
+  const tokens = state ? refill(rule, state.value, state.stamp, now) : limit
+  const result = tokenBucketResult(rule, tokens)
+  const left = tokens - (result.success ? 1 : 0)
+
+  return {
+    state: { value: left, previous: 0, stamp: now },
+    result,
+    expiresAt: now + Math.ceil(((limit - left) * windowMs) / limit),
+  }
+}
+
+export function refill(rule: RateLimitRule, tokens: number, stamp: number, now: number): number {
+  return Math.min(rule.limit, tokens + ((now - stamp) * rule.limit) / rule.windowMs)
+}
+
+/**
+ * The decision for a token bucket holding `tokens` after refill
+ */
+export function tokenBucketResult(rule: RateLimitRule, tokens: number): RateLimitResult {
+  const msPerToken = rule.windowMs / rule.limit
+  if (tokens >= 1) {
+    return {
+      success: true,
+      remaining: Math.floor(tokens - 1),
+      // Until the bucket is full again
+      resetInSeconds: Math.ceil(((rule.limit - tokens + 1) * msPerToken) / 1000),
+    }
+  }
+  return { success: false, remaining: 0, resetInSeconds: Math.max(1, Math.ceil(((1 - tokens) * msPerToken) / 1000)) }
+}
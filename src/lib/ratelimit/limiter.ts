@@ -0,0 +1,106 @@
+import { getPayloadClient } from '@/lib/payload/client'
+import type { RateLimitResult, RateLimitRule } from './algorithms'
+import { MemoryRateLimitStore } from './memory'
+import { PostgresRateLimitStore } from './postgres'
+
+/**
+ * Rate limiting for API routes
+ *
+ * A RateLimiter applies one rule (limit per window, algorithm) to client
+ * keys through a store. The default store is picked by RATE_LIMIT_STORE:
+ * - postgres (default): shared by all server instances
+ * - memory: per process, for single-instance deploys and local runs
+ * If the shared store fails, checks fall back to the in-process store
+ * rather than failing open or erroring the request. A lost database
+ * connection is logged once, as a warning. Any other error (a missing
+ * rate_limits table, a bad statement) won't clear by itself and means
+ * limits no longer hold across instances, so it is logged as an error,
+ * at most once a minute, for as long as it keeps happening.
+ */
+
+export interface RateLimitStore {
+  consume(rule: RateLimitRule, key: string): Promise<RateLimitResult>
+}
+
+export const memoryRateLimitStore = new MemoryRateLimitStore()
+
+const QUERY_ERROR_LOG_INTERVAL_MS = 60 * 1000
+
+// SQLSTATE classes for a lost or refused connection: 08 connection
+// exception, 57P0x server shutdown, 53300 too many connections
+const CONNECTION_SQLSTATE = /^(08|57P0|53300)/
+const CONNECTION_MESSAGE = /connection terminated|timeout exceeded when trying to connect|connection refused/i
+
+/**
+ * Whether `err` is a connection failure rather than the statement failing
+ * (drizzle wraps the driver's error in `cause`)
+ */
+function isConnectionError(err: unknown): boolean {
+  for (let e = err as { code?: unknown; message?: unknown; cause?: unknown } | undefined; e; e = e.cause as typeof e) {
+    if (typeof e.code === 'string' && (/^E[A-Z]+$/.test(e.code) || CONNECTION_SQLSTATE.test(e.code))) return true
+    if (typeof e.message === 'string' && CONNECTION_MESSAGE.test(e.message)) return true
+  }
+  return false
+}
+
+/**
+ * Tries `primary`, falling back to `fallback` while it errors
+ */
+class FallbackRateLimitStore implements RateLimitStore {
+  private failing = false
+  private loggedQueryErrorAt = 0
+
+  constructor(private primary: RateLimitStore, private fallback: RateLimitStore) {}
+
+  async consume(rule: RateLimitRule, key: string): Promise<RateLimitResult> {
+    try {
+      const result = await this.primary.consume(rule, key)
+      if (this.failing) {
+        console.log('[Rate Limit] Shared store recovered')
+        this.failing = false
+      }
+      return result
+    } catch (err) {
+      if (!isConnectionError(err)) {
+        // Once a minute at most, so a flood doesn't bury the rest of the log
+        if (Date.now() - this.loggedQueryErrorAt > QUERY_ERROR_LOG_INTERVAL_MS) {
+          console.error(
+            '[Rate Limit] Shared store query failed; limits are NOT shared across instances until fixed:',
+            err
+          )
+          this.loggedQueryErrorAt = Date.now()
+        }
+      } else if (!this.failing) {
+        console.warn('[Rate Limit] Shared store unreachable, limiting per process:', err)
+      }
+      this.failing = true
+      return this.fallback.consume(rule, key)
+    }
+  }
+}
+
+let defaultStore: RateLimitStore | null = null
+
+export function getRateLimitStore(): RateLimitStore {
+  if (!defaultStore) {
+    defaultStore =
+      process.env.RATE_LIMIT_STORE === 'memory'
+        ? memoryRateLimitStore
+        : new FallbackRateLimitStore(new PostgresRateLimitStore(getPayloadClient), memoryRateLimitStore)
+  }
+  return defaultStore
+}
+
+export class RateLimiter {
+  constructor(
+    private rule: RateLimitRule,
+    private store?: RateLimitStore
+  ) {}
+
+  /**
+   * Count one request from `key` (e.g. a client IP)
+   */
+  check(key: string): Promise<RateLimitResult> {
+    return (this.store ?? getRateLimitStore()).consume(this.rule, key)
+  }
+}
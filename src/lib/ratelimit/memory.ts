@@ -0,0 +1,140 @@
+import { consume, type RateLimitResult, type RateLimitRule, type RateLimitState } from './algorithms'
+
+/**
+ * In-process rate limit store with timing-wheel expiry
+ *
+ * Keys are scheduled into a wheel of `slots` buckets, `tickMs` wide, by
+ * when their state expires. Each call first advances the wheel over the
+ * ticks that have passed: a due key is dropped, or, if it was hit again
+ * since it was scheduled, moved to the slot for its new expiry. Every key
+ * is handled a bounded number of times over its life, and no call does
+ * more than `maxExpirePerCall` of that work, so expiry never turns into a
+ * sweep of the whole map inside one unlucky request.
+ *
+ * Expiries further out than the wheel spans are parked in its last slot
+ * and rescheduled from there. Past `maxKeys` the oldest key is evicted,
+ * which forgets (resets) its limit rather than growing without bound.
+ *
+ * Limits hold per process only; see ./postgres for a store shared across
+ * server instances. This store is also the local stand-in for it.
+ */
+
+export interface MemoryStoreOptions {
+  tickMs: number
+  slots: number
+  maxExpirePerCall: number
+  maxKeys: number
+}
+
+export interface MemoryStoreMetrics {
+  keys: number
+  expired: number
+  evicted: number
+  rescheduled: number
+}
+
+interface Entry {
+  key: string
+  state: RateLimitState
+  expiresAt: number
+}
+
+export class MemoryRateLimitStore {
+  private options: MemoryStoreOptions
+  private entries = new Map<string, Entry>()
+  private wheel: Set<Entry>[]
+  // Next tick to process
+  private tick: number
+  private counters = { expired: 0, evicted: 0, rescheduled: 0 }
+
+  constructor(options: Partial<MemoryStoreOptions> = {}) {
+    this.options = {
+      tickMs: 1000,
+      slots: 4096,
+      maxExpirePerCall: 256,
+      maxKeys: 100_000,
+      ...options,
+    }
+    this.wheel = Array.from({ length: this.options.slots }, () => new Set<Entry>())
+    this.tick = Math.floor(Date.now() / this.options.tickMs)
+  }
+
+  /**
+   * Count one request against `key` under `rule`
+   */
+  consumeNow(rule: RateLimitRule, key: string, now: number = Date.now()): RateLimitResult {
+    this.advance(now)
+
+    const storeKey = `${rule.name}:${key}`
+    const entry = this.entries.get(storeKey)
+    const live = entry && entry.expiresAt > now ? entry : null
+    const step = consume(rule, live?.state ?? null, now)
+
+    if (live) {
+      // Still scheduled at its old expiry; the wheel moves it when it gets there
+      live.state = step.state
+      live.expiresAt = step.expiresAt
+    } else {
+      if (entry) this.entries.delete(storeKey)
+      const created: Entry = { key: storeKey, state: step.state, expiresAt: step.expiresAt }
+      this.entries.set(storeKey, created)
+      this.schedule(created)
+      if (this.entries.size > this.options.maxKeys) {
+        this.entries.delete(this.entries.keys().next().value as string)
+        this.counters.evicted++
+      }
+    }
+
+    return step.result
+  }
+
+  async consume(rule: RateLimitRule, key: string): Promise<RateLimitResult> {
+    return this.consumeNow(rule, key)
+  }
+
+  metrics(): MemoryStoreMetrics {
+    return { keys: this.entries.size, ...this.counters }
+  }
+
+  /**
+   * Put `entry` in the slot for its expiry, no earlier than tick `earliest`
+   * and no further than the wheel's last slot
+   */
+  private schedule(entry: Entry, earliest: number = this.tick): void {
+    const { tickMs, slots } = this.options
+    const due = Math.min(Math.max(Math.floor(entry.expiresAt / tickMs), earliest), this.tick + slots - 1)
+    this.wheel[due % slots].add(entry)
+  }
+
+  /**
+   * Process the slots of the ticks up to `now`, within the per-call budget
+   */
+  private advance(now: number): void {
+    const { tickMs, slots } = this.options
+    const target = Math.floor(now / tickMs)
+    // Every slot holds only entries due within one rotation of this.tick,
+    // so after a long idle spell one rotation covers them all
+    if (target - this.tick >= slots) this.tick = target - slots + 1
+
+    let budget = this.options.maxExpirePerCall
+    while (this.tick <= target) {
+      const slot = this.wheel[this.tick % slots]
+      for (const entry of slot) {
+        if (budget-- <= 0) return
+        slot.delete(entry)
+        // Evicted, or replaced after expiring
+        if (this.entries.get(entry.key) !== entry) continue
+
+        if (entry.expiresAt <= now) {
+          this.entries.delete(entry.key)
+          this.counters.expired++
+        } else {
+          // Hit again since it was scheduled (or parked): move it on
+          this.schedule(entry, this.tick + 1)
+          this.counters.rescheduled++
+        }
+      }
+      this.tick++
+    }
+  }
+}
@@ -0,0 +1,139 @@
+import { sql, type PostgresAdapter } from '@payloadcms/db-postgres'
+import type { getPayloadClient } from '@/lib/payload/client'
+import {
+  slidingWindowResult,
+  tokenBucketResult,
+  type RateLimitResult,
+  type RateLimitRule,
+} from './algorithms'
+
+/**
+ * Rate limit store shared by every server instance, in Postgres
+ *
+ * Each check is one INSERT ... ON CONFLICT DO UPDATE on the rate_limits
+ * table (payload/db/rateLimits) that applies the algorithm's transition
+ * to the key's row atomically, so concurrent requests on different
+ * instances can't both take the last slot. The arithmetic mirrors
+ * ./algorithms; the decision is read back from the row.
+ *
+ * Parameters are cast explicitly: Postgres otherwise infers an untyped
+ * parameter's type from the column it meets, and a fractional rate or
+ * overlap next to the bigint `stamp` fails as invalid bigint input.
+ * scripts/check-rate-limit-store.ts runs both algorithms against a live
+ * database.
+ *
+ * Expired rows are deleted in bounded batches at most once per
+ * SWEEP_INTERVAL_MS per process, after the check, not on its path.
+ * Instances use their own clocks, so they should be NTP-synced.
+ */
+
+type PayloadInstance = Awaited<ReturnType<typeof getPayloadClient>>
+
+const SWEEP_INTERVAL_MS = 60 * 1000
+const SWEEP_BATCH = 5000
+
+export class PostgresRateLimitStore {
+  private lastSweep = 0
+
+  constructor(private getPayload: () => Promise<PayloadInstance>) {}
+
+  async consume(rule: RateLimitRule, key: string): Promise<RateLimitResult> {
+    const db = (await this.getPayload()).db as unknown as PostgresAdapter
+    const now = Date.now()
+    const storeKey = `${rule.name}:${key}`
+
+    const result =
+      rule.algorithm === 'token-bucket'
+        ? await this.tokenBucket(db, rule, storeKey, now)
+        : await this.slidingWindow(db, rule, storeKey, now)
+
+    if (now - this.lastSweep > SWEEP_INTERVAL_MS) {
+      this.lastSweep = now
+      this.sweep(db)
+    }
+    return result
+  }
+
+  private async slidingWindow(
+    db: PostgresAdapter,
+    rule: RateLimitRule,
+    key: string,
+    now: number
+  ): Promise<RateLimitResult> {
+    const { limit, windowMs } = rule
+    const windowStart = Math.floor(now / windowMs) * windowMs
+    const overlap = 1 - (now - windowStart) / windowMs
+
+    const current = sql`(CASE WHEN r.stamp = ${windowStart}::bigint THEN r.value ELSE 0 END)`
+    const previous = sql`(CASE WHEN r.stamp = ${windowStart}::bigint THEN r.previous
+      WHEN r.stamp = ${windowStart - windowMs}::bigint THEN r.value ELSE 0 END)`
+    const allowed = sql`(${previous} * ${overlap}::double precision + ${current} + 1 <= ${limit}::double precision)`
+    const expiresAt = sql`to_timestamp(${(windowStart + 2 * windowMs) / 1000}::double precision)`
+
+    const { rows } = await db.drizzle.execute(sql`
+      INSERT INTO rate_limits AS r (key, value, previous, stamp, allowed, expires_at)
+      VALUES (${key}, 1, 0, ${windowStart}::bigint, true, ${expiresAt})
+      ON CONFLICT (key) DO UPDATE SET
+        value = ${current} + CASE WHEN ${allowed} THEN 1 ELSE 0 END,
+        previous = ${previous},
+        stamp = ${windowStart}::bigint,
+        allowed = ${allowed},
+        expires_at = ${expiresAt}
+      RETURNING value, previous, allowed
+    `)
+
+    const row = rows[0] as { value: number; previous: number; allowed: boolean }
+    const before = Number(row.value) - (row.allowed ? 1 : 0)
+    return { ...slidingWindowResult(rule, before, Number(row.previous), now), success: row.allowed }
+  }
+
+  private async tokenBucket(
+    db: PostgresAdapter,
+    rule: RateLimitRule,
+    key: string,
+    now: number
+  ): Promise<RateLimitResult> {
+    const { limit, windowMs } = rule
+    const msPerToken = windowMs / limit
+
+    const tokens = sql`least(
+      ${limit}::double precision,
+      r.value + (${now}::bigint - r.stamp)::double precision * ${limit / windowMs}::double precision
+    )`
+    const allowed = sql`(${tokens} >= 1)`
+    const left = sql`(${tokens} - CASE WHEN ${allowed} THEN 1 ELSE 0 END)`
+
+    const { rows } = await db.drizzle.execute(sql`
+      INSERT INTO rate_limits AS r (key, value, previous, stamp, allowed, expires_at)
+      VALUES (
+        ${key}, ${limit - 1}::double precision, 0, ${now}::bigint, true,
+        to_timestamp(${(now + msPerToken) / 1000}::double precision)
+      )
+      ON CONFLICT (key) DO UPDATE SET
+        value = ${left},
+        stamp = ${now}::bigint,
+        allowed = ${allowed},
+        expires_at = to_timestamp(
+          (${now}::double precision + (${limit}::double precision - ${left}) * ${msPerToken}::double precision) / 1000
+        )
+      RETURNING value, allowed
+    `)
+
+    const row = rows[0] as { value: number; allowed: boolean }
+    const before = Number(row.value) + (row.allowed ? 1 : 0)
+    return { ...tokenBucketResult(rule, before), success: row.allowed }
+  }
+
+  /**
+   * Delete one batch of expired rows, without waiting for it
+   */
+  private sweep(db: PostgresAdapter): void {
+    db.drizzle
+      .execute(
+        sql`DELETE FROM rate_limits WHERE ctid = ANY(ARRAY(
+          SELECT ctid FROM rate_limits WHERE expires_at < now() LIMIT ${SWEEP_BATCH}
+        ))`
+      )
+      .catch((err) => console.warn('[Rate Limit] Failed to sweep expired keys:', err))
+  }
+}
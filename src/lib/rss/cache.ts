@@ -0,0 +1,303 @@
+import { RECENT_STORIES_WINDOW_HOURS } from '@/lib/news'
+import { fetchFeedConditional, type MemberFeed, type RSSFeed, type RSSItem } from './poller'
+import { FeedScheduler } from './scheduler'
+import type { StreamParseOptions } from './stream'
+
+/**
+ * Process-wide feed cache with stale-while-revalidate
+ *
+ * Sits in front of the poller for routes that render member feeds live
+ * (GET /api/stories), so visitors never wait on an external site:
+ * - fresh entries are served as-is
+ * - stale entries (past freshMs, within maxAgeMs) are served immediately
+ *   while one background refresh runs
+ * - only a missing or expired entry makes the caller wait, and concurrent
+ *   callers for the same feed share that one fetch
+ *
+ * Refreshes are conditional (ETag / Last-Modified / body hash), so an
+ * unchanged feed costs a 304 and no parse. A feed that fails is not
+ * retried for errorMs, and entries beyond maxEntries are evicted least
+ * recently used first.
+ */
+
+export interface FeedCacheOptions {
+  /** Age up to which an entry is served without refreshing */
+  freshMs: number
+  /** Age after which an entry is no longer served, even stale */
+  maxAgeMs: number
+  /** How long a failed fetch is remembered before trying the feed again */
+  errorMs: number
+  maxEntries: number
+  /** Parse with the streaming parser using these options */
+  stream?: StreamParseOptions
+}
+
+export const DEFAULT_FEED_CACHE_OPTIONS: FeedCacheOptions = {
+  freshMs: 5 * 60 * 1000,
+  maxAgeMs: 60 * 60 * 1000,
+  errorMs: 60 * 1000,
+  maxEntries: 100,
+}
+
+export type FeedCacheState = 'hit' | 'stale' | 'miss'
+
+export interface FeedCacheMetrics {
+  /** Served fresh from cache */
+  hits: number
+  /** Served stale from cache while a refresh ran */
+  staleHits: number
+  /** Caller had to wait for a fetch */
+  misses: number
+  /** Served a remembered failure without fetching */
+  errorHits: number
+  /** Callers that joined a fetch already in flight */
+  coalesced: number
+  /** Fetches started, foreground and background */
+  refreshes: number
+  refreshErrors: number
+  /** Refreshes answered 304 or with an identical body */
+  notModified: number
+  evictions: number
+  entries: number
+  inFlight: number
+}
+
+interface CacheEntry {
+  feed: RSSFeed
+  etag?: string | null
+  lastModified?: string | null
+  contentHash?: string | null
+  fetchedAt: number
+}
+
+export interface CachedFeed {
+  feed: RSSFeed
+  state: FeedCacheState
+  ageMs: number
+}
+
+export class FeedCache {
+  private options: FeedCacheOptions
+  private entries = new Map<string, CacheEntry>()
+  private failures = new Map<string, { error: Error; failedAt: number }>()
+  private pending = new Map<string, Promise<CacheEntry>>()
+  private counters = {
+    hits: 0,
+    staleHits: 0,
+    misses: 0,
+    errorHits: 0,
+    coalesced: 0,
+    refreshes: 0,
+    refreshErrors: 0,
+    notModified: 0,
+    evictions: 0,
+  }
+
+  constructor(
+    options: Partial<FeedCacheOptions> = {},
+    private scheduler: FeedScheduler = new FeedScheduler()
+  ) {
+    this.options = { ...DEFAULT_FEED_CACHE_OPTIONS, ...options }
+  }
+
+  /**
+   * Get a feed, fetching only on a miss. A stale hit also returns the
+   * background refresh it started (or joined) as `refresh`, so callers on
+   * request-scoped runtimes can keep it alive past the response.
+   */
+  async get(url: string): Promise<CachedFeed & { refresh?: Promise<unknown> }> {
+    const { freshMs, maxAgeMs, errorMs } = this.options
+    const now = Date.now()
+    const entry = this.entries.get(url)
+
+    if (entry && now - entry.fetchedAt < maxAgeMs) {
+      // Re-insert to mark as most recently used
+      this.entries.delete(url)
+      this.entries.set(url, entry)
+      const ageMs = now - entry.fetchedAt
+
+      if (ageMs < freshMs) {
+        this.counters.hits++
+        return { feed: entry.feed, state: 'hit', ageMs }
+      }
+
+      this.counters.staleHits++
+      const refresh = this.refresh(url, entry).catch(() => undefined)
+      return { feed: entry.feed, state: 'stale', ageMs, refresh }
+    }
+
+    const failure = this.failures.get(url)
+    if (failure && now - failure.failedAt < errorMs && !this.pending.has(url)) {
+      this.counters.errorHits++
+      throw failure.error
+    }
+
+    this.counters.misses++
+    const fresh = await this.refresh(url, entry)
+    return { feed: fresh.feed, state: 'miss', ageMs: Date.now() - fresh.fetchedAt }
+  }
+
+  /**
+   * Counters since startup plus the current entry and in-flight counts
+   */
+  metrics(): FeedCacheMetrics {
+    return { ...this.counters, entries: this.entries.size, inFlight: this.pending.size }
+  }
+
+  /**
+   * Drop every entry and remembered failure; counters are kept
+   */
+  clear(): void {
+    this.entries.clear()
+    this.failures.clear()
+  }
+
+  /**
+   * Fetch a feed, or join the fetch already in flight for it
+   */
+  private refresh(url: string, previous?: CacheEntry): Promise<CacheEntry> {
+    const inFlight = this.pending.get(url)
+    if (inFlight) {
+      this.counters.coalesced++
+      return inFlight
+    }
+
+    this.counters.refreshes++
+    const validators = previous
+      ? { etag: previous.etag, lastModified: previous.lastModified, contentHash: previous.contentHash }
+      : {}
+
+    const promise = fetchFeedConditional(url, validators, this.scheduler, this.options.stream)
+      .then((result) => {
+        if (!result.feed) this.counters.notModified++
+        const entry: CacheEntry = {
+          // Only conditional requests can come back without a feed
+          feed: result.feed ?? previous!.feed,
+          etag: result.validators.etag,
+          lastModified: result.validators.lastModified,
+          contentHash: result.validators.contentHash,
+          fetchedAt: Date.now(),
+        }
+        this.store(url, entry)
+        this.failures.delete(url)
+        return entry
+      })
+      .catch((error) => {
+        this.counters.refreshErrors++
+        const err = error instanceof Error ? error : new Error(String(error))
+        this.failures.set(url, { error: err, failedAt: Date.now() })
+        console.warn(`[Feed Cache] Refresh failed for ${url}:`, err.message)
+        throw err
+      })
+      .finally(() => {
+        this.pending.delete(url)
+      })
+
+    this.pending.set(url, promise)
+    return promise
+  }
+
+  private store(url: string, entry: CacheEntry): void {
+    this.entries.delete(url)
+    this.entries.set(url, entry)
+    while (this.entries.size > this.options.maxEntries) {
+      const oldest = this.entries.keys().next().value as string
+      this.entries.delete(oldest)
+      this.counters.evictions++
+    }
+  }
+}
+
+/**
+ * The cache shared by every request in this server process. Its callers
+ * only show recent stories, so older items and unneeded bodies are skipped
+ * while parsing.
+ */
+export const feedCache = new FeedCache({
+  stream: { windowHours: RECENT_STORIES_WINDOW_HOURS, content: 'lean' },
+})
+
+type MemberItem = RSSItem & { memberId: string; memberSlug: string }
+
+// A serial per cached feed object; refreshes that change a feed replace it
+const feedSerials = new WeakMap<RSSFeed, number>()
+let nextFeedSerial = 1
+// Each feed's items tagged with their member, made once per feed object
+const memberItems = new WeakMap<RSSFeed, MemberItem[]>()
+// The last merge, reused while no member's feed has changed
+let lastMerge: { version: string; items: MemberItem[] } | null = null
+
+/**
+ * fetchAllMemberFeeds over the shared cache
+ *
+ * Items come back merged and newest first. `refreshes` settles once every
+ * background refresh started by this call has finished; it never rejects.
+ *
+ * `version` changes whenever the merged items do. While it doesn't, the
+ * same item objects (and the same array) come back, so callers can cache
+ * whatever they derive from them.
+ */
+export async function getCachedMemberFeeds(
+  memberFeeds: MemberFeed[],
+  cache: FeedCache = feedCache
+): Promise<{
+  items: MemberItem[]
+  errors: { memberId: string; error: string }[]
+  states: { memberSlug: string; state: FeedCacheState; ageMs: number }[]
+  refreshes: Promise<unknown>
+  version: string
+}> {
+  const results = await Promise.allSettled(memberFeeds.map((member) => cache.get(member.rssUrl)))
+
+  const feeds: (RSSFeed | null)[] = []
+  const errors: { memberId: string; error: string }[] = []
+  const states: { memberSlug: string; state: FeedCacheState; ageMs: number }[] = []
+  const refreshes: Promise<unknown>[] = []
+  const serials: string[] = []
+
+  results.forEach((result, index) => {
+    const member = memberFeeds[index]
+    if (result.status === 'rejected') {
+      errors.push({
+        memberId: member.memberId,
+        error: `Failed to fetch feed for ${member.memberName}`,
+      })
+      feeds.push(null)
+      serials.push(`${member.memberSlug}:x`)
+      return
+    }
+
+    const { feed, state, ageMs, refresh } = result.value
+    states.push({ memberSlug: member.memberSlug, state, ageMs: Math.round(ageMs) })
+    if (refresh) refreshes.push(refresh)
+    let serial = feedSerials.get(feed)
+    if (serial === undefined) {
+      serial = nextFeedSerial++
+      feedSerials.set(feed, serial)
+    }
+    feeds.push(feed)
+    serials.push(`${member.memberSlug}:${serial}`)
+  })
+
+  const version = serials.join(',')
+  let merge = lastMerge
+  if (merge?.version !== version) {
+    const items: MemberItem[] = []
+    feeds.forEach((feed, index) => {
+      if (!feed) return
+      let tagged = memberItems.get(feed)
+      if (!tagged) {
+        const member = memberFeeds[index]
+        tagged = feed.items.map((item) => ({ ...item, memberId: member.memberId, memberSlug: member.memberSlug }))
+        memberItems.set(feed, tagged)
+      }
+      items.push(...tagged)
+    })
+
+    // Sort by publication date, newest first
+    items.sort((a, b) => new Date(b.pubDate).getTime() - new Date(a.pubDate).getTime())
+    merge = lastMerge = { version, items }
+  }
+
+  return { items: merge.items, errors, states, refreshes: Promise.all(refreshes), version }
+}
@@ -0,0 +1,348 @@
+/**
+ * HTML helpers for feed item bodies (excerpts, lead images, plain text)
+ *
+ * Everything here walks the HTML once, left to right, instead of running
+ * a chain of global regex replaces over the whole body. Output is
+ * byte-identical to the regex versions these replaced; the rare inputs
+ * where a single pass can't reproduce their ordering (a '<' inside a tag,
+ * a <script inside a <style> block) go through those regexes instead.
+ * scripts/bench-html-extract.ts checks both and times them.
+ */
+
+/**
+ * What an item body contained that sanitizing had to remove
+ * - clean: plain text
+ * - markup: ordinary tags only
+ * - unsafe: script blocks, event-handler attributes or javascript: URLs
+ */
+export type SanitizeVerdict = 'clean' | 'markup' | 'unsafe'
+
+export interface HtmlExtract {
+  /** Same as extractExcerpt(html, maxLength) */
+  excerpt: string
+  /** Same as sanitizeText(excerpt): entity-decoded, safe to store */
+  text: string
+  /** Same as extractImageFromContent(html) */
+  image: string | null
+  /** For the part of the body the excerpt was read from */
+  verdict: SanitizeVerdict
+}
+
+// Tried at each '<' in document order; the first position that matches wins
+const IMG_AT = /<img[^>]+src=["']([^"']+)["']/iy
+const SCRIPT_AT = /<script[^>]*>[\s\S]*?<\/script>/iy
+const STYLE_AT = /<style[^>]*>[\s\S]*?<\/style>/iy
+// Only consulted when no <img> has a src
+const IMAGE_SRC = /src=["']([^"']+\.(jpg|jpeg|png|gif|webp))["']/i
+const UNSAFE_TAG = /\son\w+\s*=|javascript:/i
+
+const ENTITIES: [string, string][] = [
+  ['lt;', '<'],
+  ['gt;', '>'],
+  ['quot;', '"'],
+  ['#39;', "'"],
+  ['nbsp;', ' '],
+]
+
+/**
+ * Same set as the regex \s class
+ */
+function isSpace(c: number): boolean {
+  return (
+    c === 32 ||
+    (c >= 9 && c <= 13) ||
+    c === 0xa0 ||
+    c === 0x1680 ||
+    (c >= 0x2000 && c <= 0x200a) ||
+    c === 0x2028 ||
+    c === 0x2029 ||
+    c === 0x202f ||
+    c === 0x205f ||
+    c === 0x3000 ||
+    c === 0xfeff
+  )
+}
+
+/**
+ * Case-insensitive check for a lowercase ASCII word at `index`
+ */
+function hasWordAt(html: string, index: number, word: string): boolean {
+  for (let i = 0; i < word.length; i++) {
+    if ((html.charCodeAt(index + i) | 0x20) !== word.charCodeAt(i)) return false
+  }
+  return true
+}
+
+function execAt(pattern: RegExp, html: string, index: number): RegExpExecArray | null {
+  pattern.lastIndex = index
+  return pattern.exec(html)
+}
+
+function imageAt(html: string, index: number): string | null {
+  if (!hasWordAt(html, index + 1, 'img')) return null
+  return execAt(IMG_AT, html, index)?.[1] ?? null
+}
+
+/**
+ * First <img> src starting at a '<' in [from, to)
+ */
+function findImage(html: string, from: number, to: number): string | null {
+  for (let lt = html.indexOf('<', from); lt !== -1 && lt < to; lt = html.indexOf('<', lt + 1)) {
+    const src = imageAt(html, lt)
+    if (src) return src
+  }
+  return null
+}
+
+/**
+ * Cut collapsed text down to an excerpt at a word boundary
+ */
+function truncate(text: string, maxLength: number): string {
+  if (text.length <= maxLength) return text
+  const truncated = text.slice(0, maxLength)
+  const lastSpace = truncated.lastIndexOf(' ')
+  return `${truncated.slice(0, lastSpace)}...`
+}
+
+/**
+ * Excerpt, lead image, plain text and sanitize verdict in one walk
+ *
+ * Stops collecting text once it has more than maxLength characters; after
+ * that only '<' positions are visited, until the first image is found.
+ */
+export function extractHtml(html?: string, maxLength = 200): HtmlExtract {
+  if (!html) return { excerpt: '', text: '', image: null, verdict: 'clean' }
+
+  const length = html.length
+  let out = ''
+  let pendingSpace = false
+  let image: string | null = null
+  let verdict: SanitizeVerdict = 'clean'
+  let i = 0
+
+  while (i < length) {
+    if (out.length > maxLength) {
+      if (image === null) image = findImage(html, i, length)
+      break
+    }
+
+    const lt = html.indexOf('<', i)
+    const textEnd = lt === -1 ? length : lt
+
+    // Text: collapse whitespace runs to one space, never leading
+    let runStart = -1
+    for (let j = i; j < textEnd; j++) {
+      if (isSpace(html.charCodeAt(j))) {
+        if (runStart !== -1) {
+          out += html.slice(runStart, j)
+          runStart = -1
+        }
+        pendingSpace = out.length > 0
+      } else if (runStart === -1) {
+        if (pendingSpace) {
+          out += ' '
+          pendingSpace = false
+        }
+        runStart = j
+      }
+    }
+    if (runStart !== -1) out += html.slice(runStart, textEnd)
+    if (lt === -1) break
+
+    if (image === null) image = imageAt(html, lt)
+
+    const block = hasWordAt(html, lt + 1, 'script')
+      ? execAt(SCRIPT_AT, html, lt)
+      : hasWordAt(html, lt + 1, 'style')
+        ? execAt(STYLE_AT, html, lt)
+        : null
+    if (block) {
+      const end = lt + block[0].length
+      const isScript = hasWordAt(html, lt + 1, 'script')
+      // Scripts are removed before styles, so one inside a style can change the result
+      if (!isScript && /<script/i.test(block[0])) return extractHtmlWithRegex(html, maxLength)
+      if (image === null) image = findImage(html, lt + 1, end)
+      verdict = isScript ? 'unsafe' : verdict === 'clean' ? 'markup' : verdict
+      i = end
+      continue
+    }
+
+    const gt = html.indexOf('>', lt + 1)
+    if (gt === -1 || gt === lt + 1) {
+      // Not a tag: '<' is text
+      if (pendingSpace) {
+        out += ' '
+        pendingSpace = false
+      }
+      out += '<'
+      i = lt + 1
+      continue
+    }
+
+    const inner = html.indexOf('<', lt + 1)
+    if (inner !== -1 && inner < gt) return extractHtmlWithRegex(html, maxLength)
+
+    const tag = html.slice(lt, gt + 1)
+    if (verdict !== 'unsafe') verdict = UNSAFE_TAG.test(tag) ? 'unsafe' : 'markup'
+    pendingSpace = out.length > 0
+    i = gt + 1
+  }
+
+  if (image === null) image = IMAGE_SRC.exec(html)?.[1] ?? null
+
+  const excerpt = truncate(out, maxLength)
+  return { excerpt, text: sanitizeText(excerpt), image, verdict }
+}
+
+/**
+ * The regex chain extractHtml replaced, for inputs it can't walk in one pass
+ */
+function extractHtmlWithRegex(html: string, maxLength: number): HtmlExtract {
+  const text = html
+    .replace(/<script[^>]*>[\s\S]*?<\/script>/gi, '')
+    .replace(/<style[^>]*>[\s\S]*?<\/style>/gi, '')
+    .replace(/<[^>]+>/g, ' ')
+    .replace(/\s+/g, ' ')
+    .trim()
+  const excerpt = truncate(text, maxLength)
+
+  const image = html.match(/<img[^>]+src=["']([^"']+)["']/i)?.[1] ?? IMAGE_SRC.exec(html)?.[1] ?? null
+
+  let verdict: SanitizeVerdict = 'clean'
+  if (/<script[^>]*>[\s\S]*?<\/script>/i.test(html) || /<[^>]*(\son\w+\s*=|javascript:)[^>]*>/i.test(html)) {
+    verdict = 'unsafe'
+  } else if (/<[^>]+>/.test(html)) {
+    verdict = 'markup'
+  }
+
+  return { excerpt, text: sanitizeText(excerpt), image, verdict }
+}
+
+/**
+ * Extract first image from HTML content
+ */
+export function extractImageFromContent(content?: string): string | null {
+  if (!content) return null
+  return findImage(content, 0, content.length) ?? IMAGE_SRC.exec(content)?.[1] ?? null
+}
+
+/**
+ * Clean HTML and extract plain text excerpt
+ */
+export function extractExcerpt(content?: string, maxLength = 200): string {
+  return extractHtml(content, maxLength).excerpt
+}
+
+/**
+ * Excerpt, plain text and image for a feed item, the way the routes build
+ * them: text from the description (or the body when there is none), image
+ * from the enclosure, the parser's lead image or the body. The body is
+ * walked at most once.
+ */
+export function summarizeItem(
+  item: { description?: string; content?: string; image?: string; enclosure?: { url: string } },
+  maxLength: number
+): HtmlExtract {
+  const source = item.description || item.content
+  const extracted = extractHtml(source, maxLength)
+  const image =
+    item.enclosure?.url ||
+    item.image ||
+    (source === item.content ? extracted.image : extractImageFromContent(item.content))
+  return { ...extracted, image }
+}
+
+/**
+ * Sanitize text content from RSS feeds
+ * Removes HTML tags and dangerous content
+ *
+ * Tags are cut out with indexOf jumps, then one pass decodes entities and
+ * collapses whitespace. The javascript: and on*= patterns are only
+ * searched for when a ':' or '=' survived.
+ */
+export function sanitizeText(text: string | undefined | null): string {
+  if (!text) return ''
+
+  // Remove HTML tags
+  let stripped = text
+  if (text.includes('<')) {
+    stripped = ''
+    let i = 0
+    for (;;) {
+      const lt = text.indexOf('<', i)
+      const gt = lt === -1 ? -1 : text.indexOf('>', lt + 1)
+      if (gt === -1) {
+        stripped += text.slice(i)
+        break
+      }
+      stripped += text.slice(i, lt)
+      i = gt + 1
+    }
+  }
+
+  let out = ''
+  let pendingSpace = false
+  let sawColon = false
+  let sawEquals = false
+  let runStart = -1
+  const length = stripped.length
+
+  for (let k = 0; k < length; k++) {
+    const c = stripped.charCodeAt(k)
+    if (c !== 38 /* & */ && !isSpace(c)) {
+      if (runStart === -1) {
+        if (pendingSpace) {
+          out += ' '
+          pendingSpace = false
+        }
+        runStart = k
+      }
+      if (c === 58) sawColon = true
+      else if (c === 61) sawEquals = true
+      continue
+    }
+    if (runStart !== -1) {
+      out += stripped.slice(runStart, k)
+      runStart = -1
+    }
+    if (c !== 38) {
+      pendingSpace = out.length > 0
+      continue
+    }
+
+    // Decode common HTML entities; "&amp;" is decoded first, so an entity
+    // written as "&amp;lt;" decodes all the way to "<"
+    let next = k + 1
+    if (stripped.startsWith('amp;', next)) next += 4
+    let decoded = '&'
+    for (const [name, value] of ENTITIES) {
+      if (stripped.startsWith(name, next)) {
+        decoded = value
+        next += name.length
+        break
+      }
+    }
+    k = next - 1
+
+    if (decoded === ' ') {
+      pendingSpace = out.length > 0
+    } else {
+      if (pendingSpace) {
+        out += ' '
+        pendingSpace = false
+      }
+      out += decoded
+    }
+  }
+  if (runStart !== -1) out += stripped.slice(runStart)
+
+  // Remove potential script injections
+  if (sawColon || sawEquals) {
+    let cleaned = out
+    if (sawColon) cleaned = cleaned.replace(/javascript:/gi, '')
+    if (sawEquals) cleaned = cleaned.replace(/on\w+=/gi, '')
+    if (cleaned !== out) out = cleaned.replace(/\s+/g, ' ').trim()
+  }
+
+  return out
+}
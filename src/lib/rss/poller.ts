@@ -1,4 +1,9 @@
+import { createHash } from 'crypto'
 import Parser from 'rss-parser'
+import { FeedScheduler, type RequestStats } from './scheduler'
+import { bufferChunks, parseFeedStream, type StreamParseOptions, type StreamParseStats } from './stream'
+
+export { extractImageFromContent, extractExcerpt } from './html'
 
 export interface RSSItem {
   guid: string
@@ -6,6 +11,8 @@ export interface RSSItem {
   link: string
   description?: string
   content?: string
+  /** Lead image from the content body, when lean parsing dropped the body */
+  image?: string
   pubDate: string
   creator?: string
   categories?: string[]
@@ -30,6 +37,58 @@ export interface MemberFeed {
   rssUrl: string
 }
 
+export interface FeedTimings {
+  /** Milliseconds spent downloading feed bodies (retries included), summed across feeds */
+  fetchMs: number
+  /** Milliseconds spent parsing feed XML, summed across feeds */
+  parseMs: number
+}
+
+/**
+ * What we remember about a feed between polls
+ */
+export interface FeedValidators {
+  etag?: string | null
+  lastModified?: string | null
+  /** sha256 of the last body we parsed */
+  contentHash?: string | null
+  /** GUIDs from the last parsed body, newest first */
+  lastSeenGuids?: string[] | null
+}
+
+/**
+ * Outcome of one conditional feed fetch
+ *
+ * - fetched: a new body was parsed; `feed` only holds items not in lastSeenGuids
+ * - not-modified: the server answered 304
+ * - unchanged: the body hashed the same as last time, so it wasn't parsed
+ */
+export interface FeedFetchResult {
+  url: string
+  status: 'fetched' | 'not-modified' | 'unchanged'
+  feed: RSSFeed | null
+  httpStatus: number
+  /** Bytes received on the wire, before decompression */
+  bytes: number
+  fetchMs: number
+  parseMs: number
+  /** Set when the body went through the streaming parser */
+  parseStats?: StreamParseStats
+  /** Validators to store once this fetch's items are safely persisted */
+  validators: FeedValidators
+}
+
+// How many GUIDs to remember per feed (feeds carry 10-50 items)
+const MAX_SEEN_GUIDS = 200
+
+const FEED_HEADERS = {
+  'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
+  'Accept': 'application/rss+xml, application/xml, text/xml, */*',
+}
+
+// Used when a caller doesn't bring its own scheduler
+const defaultScheduler = new FeedScheduler()
+
 const parser = new Parser({
   customFields: {
     item: [
@@ -38,12 +97,6 @@ const parser = new Parser({
       ['media:content', 'mediaContent'],
     ],
   },
-  requestOptions: {
-    headers: {
-      'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
-      'Accept': 'application/rss+xml, application/xml, text/xml, */*',
-    },
-  },
 })
 
 /**
@@ -51,69 +104,180 @@ const parser = new Parser({
  */
 export async function fetchFeed(url: string): Promise<RSSFeed | null> {
   try {
-    const feed = await parser.parseURL(url)
-
-    return {
-      title: feed.title || '',
-      description: feed.description,
-      link: feed.link || url,
-      items: feed.items.map((item) => ({
-        guid: item.guid || item.link || `${url}-${item.title}-${item.pubDate}`,
-        title: item.title || 'Untitled',
-        link: item.link || '',
-        description: item.contentSnippet || item.summary,
-        content: (item as any).contentEncoded || item.content,
-        pubDate: item.pubDate || item.isoDate || new Date().toISOString(),
-        creator: (item as any).creator || (item as any).author,
-        categories: item.categories,
-        enclosure: item.enclosure
-          ? {
-              url: item.enclosure.url,
-              type: item.enclosure.type,
-              length: item.enclosure.length,
-            }
-          : undefined,
-      })),
-    }
+    return (await fetchFeedConditional(url)).feed
   } catch (error) {
     console.error(`Failed to fetch feed from ${url}:`, error)
     return null
   }
 }
 
+/**
+ * Fetch a feed using the validators from the previous poll
+ *
+ * Sends If-None-Match / If-Modified-Since and stops before parsing on a 304
+ * or when the body hashes the same as last time. Items whose GUIDs were in
+ * the previous body are dropped after parsing, so only new items reach the
+ * database. Throws on network errors, timeouts and error statuses once the
+ * scheduler's retries are used up.
+ *
+ * Pass `stream` to parse with the streaming parser instead of rss-parser,
+ * e.g. to drop items outside a recency window while reading.
+ */
+export async function fetchFeedConditional(
+  url: string,
+  previous: FeedValidators = {},
+  scheduler: FeedScheduler = defaultScheduler,
+  stream?: StreamParseOptions
+): Promise<FeedFetchResult> {
+  const headers: Record<string, string> = { ...FEED_HEADERS }
+  if (previous.etag) headers['If-None-Match'] = previous.etag
+  if (previous.lastModified) headers['If-Modified-Since'] = previous.lastModified
+
+  const fetchStart = performance.now()
+  const response = await scheduler.get(url, headers)
+
+  if (response.status === 304) {
+    return {
+      url,
+      status: 'not-modified',
+      feed: null,
+      httpStatus: 304,
+      bytes: 0,
+      fetchMs: performance.now() - fetchStart,
+      parseMs: 0,
+      validators: previous,
+    }
+  }
+  const body = response.body
+  const fetchMs = performance.now() - fetchStart
+  const contentHash = createHash('sha256').update(body).digest('hex')
+  const validators: FeedValidators = {
+    etag: (response.headers.etag as string | undefined) ?? null,
+    lastModified: (response.headers['last-modified'] as string | undefined) ?? null,
+    contentHash,
+    lastSeenGuids: previous.lastSeenGuids,
+  }
+
+  if (previous.contentHash === contentHash) {
+    return {
+      url,
+      status: 'unchanged',
+      feed: null,
+      httpStatus: response.status,
+      bytes: response.wireBytes,
+      fetchMs,
+      parseMs: 0,
+      validators,
+    }
+  }
+
+  const parseStart = performance.now()
+  let feed: RSSFeed
+  let parseStats: StreamParseStats | undefined
+  if (stream) {
+    ;({ feed, stats: parseStats } = await parseFeedStream(bufferChunks(body), { ...stream, url }))
+  } else {
+    feed = await parseBuffered(url, body)
+  }
+  const parseMs = performance.now() - parseStart
+
+  const seen = new Set(previous.lastSeenGuids || [])
+  validators.lastSeenGuids = feed.items.map((item) => item.guid).slice(0, MAX_SEEN_GUIDS)
+  feed.items = feed.items.filter((item) => !seen.has(item.guid))
+
+  return {
+    url,
+    status: 'fetched',
+    feed,
+    httpStatus: response.status,
+    bytes: response.wireBytes,
+    fetchMs,
+    parseMs,
+    parseStats,
+    validators,
+  }
+}
+
+/**
+ * Parse a whole feed body with rss-parser
+ */
+async function parseBuffered(url: string, body: Buffer): Promise<RSSFeed> {
+  const parsed = await parser.parseString(body.toString('utf8'))
+  return {
+    title: parsed.title || '',
+    description: parsed.description,
+    link: parsed.link || url,
+    items: parsed.items.map((item) => ({
+      guid: item.guid || item.link || `${url}-${item.title}-${item.pubDate}`,
+      title: item.title || 'Untitled',
+      link: item.link || '',
+      description: item.contentSnippet || item.summary,
+      content: (item as any).contentEncoded || item.content,
+      pubDate: item.pubDate || item.isoDate || new Date().toISOString(),
+      creator: (item as any).creator || (item as any).author,
+      categories: item.categories,
+      enclosure: item.enclosure
+        ? {
+            url: item.enclosure.url,
+            type: item.enclosure.type,
+            length: item.enclosure.length,
+          }
+        : undefined,
+    })),
+  }
+}
+
 /**
  * Fetch all member feeds and aggregate items
+ *
+ * Pass the previous poll's validators (keyed by feed URL) to fetch
+ * conditionally; `feeds` reports each successful fetch and the validators
+ * to store for next time. Requests go through `scheduler`, which bounds
+ * concurrency and deadlines; `requests` holds its per-URL latency stats.
+ * `stream` selects the streaming parser (see fetchFeedConditional).
  */
 export async function fetchAllMemberFeeds(
-  memberFeeds: MemberFeed[]
+  memberFeeds: MemberFeed[],
+  validators: Map<string, FeedValidators> = new Map(),
+  scheduler: FeedScheduler = new FeedScheduler(),
+  stream?: StreamParseOptions
 ): Promise<{
   items: (RSSItem & { memberId: string; memberSlug: string })[]
   errors: { memberId: string; error: string }[]
+  feeds: (FeedFetchResult & { memberSlug: string })[]
+  requests: RequestStats[]
+  timings: FeedTimings
 }> {
   const results = await Promise.allSettled(
     memberFeeds.map(async (member) => {
-      const feed = await fetchFeed(member.rssUrl)
-      if (!feed) {
+      try {
+        return {
+          member,
+          result: await fetchFeedConditional(member.rssUrl, validators.get(member.rssUrl), scheduler, stream),
+        }
+      } catch (error) {
+        console.error(`Failed to fetch feed from ${member.rssUrl}:`, error)
         throw new Error(`Failed to fetch feed for ${member.memberName}`)
       }
-      return {
-        memberId: member.memberId,
-        memberSlug: member.memberSlug,
-        items: feed.items,
-      }
     })
   )
 
   const items: (RSSItem & { memberId: string; memberSlug: string })[] = []
   const errors: { memberId: string; error: string }[] = []
+  const feeds: (FeedFetchResult & { memberSlug: string })[] = []
+  const timings: FeedTimings = { fetchMs: 0, parseMs: 0 }
 
   results.forEach((result, index) => {
     if (result.status === 'fulfilled') {
-      result.value.items.forEach((item) => {
+      const { member, result: fetched } = result.value
+      feeds.push({ ...fetched, memberSlug: member.memberSlug })
+      timings.fetchMs += fetched.fetchMs
+      timings.parseMs += fetched.parseMs
+      fetched.feed?.items.forEach((item) => {
         items.push({
           ...item,
-          memberId: result.value.memberId,
-          memberSlug: result.value.memberSlug,
+          memberId: member.memberId,
+          memberSlug: member.memberSlug,
         })
       })
     } else {
@@ -127,47 +291,7 @@ export async function fetchAllMemberFeeds(
   // Sort by publication date, newest first
   items.sort((a, b) => new Date(b.pubDate).getTime() - new Date(a.pubDate).getTime())
 
-  return { items, errors }
-}
-
-/**
- * Extract first image from HTML content
- */
-export function extractImageFromContent(content?: string): string | null {
-  if (!content) return null
-
-  // Try to find img tag
-  const imgMatch = content.match(/<img[^>]+src=["']([^"']+)["']/i)
-  if (imgMatch) return imgMatch[1]
-
-  // Try to find figure/picture tag
-  const srcMatch = content.match(/src=["']([^"']+\.(jpg|jpeg|png|gif|webp))["']/i)
-  if (srcMatch) return srcMatch[1]
-
-  return null
-}
-
-/**
- * Clean HTML and extract plain text excerpt
- */
-export function extractExcerpt(content?: string, maxLength = 200): string {
-  if (!content) return ''
-
-  // Remove HTML tags
-  const text = content
-    .replace(/<script[^>]*>[\s\S]*?<\/script>/gi, '')
-    .replace(/<style[^>]*>[\s\S]*?<\/style>/gi, '')
-    .replace(/<[^>]+>/g, ' ')
-    .replace(/\s+/g, ' ')
-    .trim()
-
-  if (text.length <= maxLength) return text
-
-  // Truncate at word boundary
-  const truncated = text.slice(0, maxLength)
-  const lastSpace = truncated.lastIndexOf(' ')
-
-  return `${truncated.slice(0, lastSpace)}...`
+  return { items, errors, feeds, requests: scheduler.stats(), timings }
 }
 
 /**
@@ -0,0 +1,302 @@
+import http from 'http'
+import https from 'https'
+import zlib from 'zlib'
+import type { Readable } from 'stream'
+
+/**
+ * Feed fetch scheduler
+ *
+ * Bounds how hard a poll hits member sites and how long one slow site can
+ * hold it up:
+ * - a global cap on concurrent feed requests
+ * - a per-host cap (Richmond Review and Sunset Beacon share a host)
+ * - connect, idle-read and total deadlines on every attempt
+ * - capped retries with full-jitter exponential backoff for timeouts,
+ *   network errors, 429 and 5xx
+ * - keep-alive agents so feeds on the same host reuse connections
+ *
+ * Every request's latency, attempts and timeouts are kept per URL so the
+ * poll can report which feed was slow.
+ */
+
+export interface SchedulerOptions {
+  /** Concurrent feed requests across all hosts */
+  globalConcurrency: number
+  /** Concurrent feed requests to one host */
+  perHostConcurrency: number
+  /** Time allowed to open a new connection */
+  connectTimeoutMs: number
+  /** Longest gap allowed between bytes once connected */
+  readTimeoutMs: number
+  /** Time allowed for one attempt, redirects and body included */
+  attemptTimeoutMs: number
+  /** Retries after the first attempt */
+  retries: number
+  backoffBaseMs: number
+  backoffMaxMs: number
+}
+
+export const DEFAULT_SCHEDULER_OPTIONS: SchedulerOptions = {
+  globalConcurrency: 6,
+  perHostConcurrency: 1,
+  connectTimeoutMs: 5000,
+  readTimeoutMs: 10000,
+  attemptTimeoutMs: 20000,
+  retries: 2,
+  backoffBaseMs: 500,
+  backoffMaxMs: 4000,
+}
+
+export interface HttpResponse {
+  status: number
+  headers: http.IncomingHttpHeaders
+  /** Decoded body */
+  body: Buffer
+  /** Bytes received on the wire (before decompression) */
+  wireBytes: number
+  /** Final URL after redirects */
+  url: string
+}
+
+export interface RequestStats {
+  url: string
+  /** Wall time from first attempt to final outcome, backoff included */
+  latencyMs: number
+  attempts: number
+  timeouts: number
+  status?: number
+  error?: string
+}
+
+export class FeedTimeoutError extends Error {
+  constructor(
+    public phase: 'connect' | 'read' | 'attempt',
+    url: string,
+    ms: number
+  ) {
+    super(`${phase} timeout after ${ms}ms: ${url}`)
+    this.name = 'FeedTimeoutError'
+  }
+}
+
+class HttpStatusError extends Error {
+  constructor(public status: number) {
+    super(`Status code ${status}`)
+    this.name = 'HttpStatusError'
+  }
+}
+
+const MAX_REDIRECTS = 5
+
+// Shared across polls so idle connections survive between them
+const agents = {
+  'http:': new http.Agent({ keepAlive: true, keepAliveMsecs: 30000 }),
+  'https:': new https.Agent({ keepAlive: true, keepAliveMsecs: 30000 }),
+}
+
+/**
+ * Counting semaphore; waiters are served in arrival order
+ */
+class Semaphore {
+  private waiters: (() => void)[] = []
+
+  constructor(private available: number) {}
+
+  async acquire(): Promise<void> {
+    if (this.available > 0) {
+      this.available--
+      return
+    }
+    await new Promise<void>((resolve) => this.waiters.push(resolve))
+  }
+
+  release(): void {
+    const next = this.waiters.shift()
+    if (next) {
+      next()
+    } else {
+      this.available++
+    }
+  }
+}
+
+function sleep(ms: number): Promise<void> {
+  return new Promise((resolve) => setTimeout(resolve, ms))
+}
+
+function isRetryable(error: unknown): boolean {
+  if (error instanceof HttpStatusError) {
+    return error.status === 429 || error.status >= 500
+  }
+  // Timeouts, resets, DNS hiccups, truncated bodies
+  return true
+}
+
+export class FeedScheduler {
+  private options: SchedulerOptions
+  private global: Semaphore
+  private hosts = new Map<string, Semaphore>()
+  private requestStats = new Map<string, RequestStats>()
+
+  constructor(options: Partial<SchedulerOptions> = {}) {
+    this.options = { ...DEFAULT_SCHEDULER_OPTIONS, ...options }
+    this.global = new Semaphore(this.options.globalConcurrency)
+  }
+
+  /**
+   * GET a URL within the concurrency limits, retrying transient failures.
+   * Resolves with any final response below 400 (304 included); throws on
+   * other statuses once retries are exhausted.
+   */
+  async get(url: string, headers: Record<string, string>): Promise<HttpResponse> {
+    const { retries, backoffBaseMs, backoffMaxMs } = this.options
+    const host = new URL(url).host
+    if (!this.hosts.has(host)) {
+      this.hosts.set(host, new Semaphore(this.options.perHostConcurrency))
+    }
+    const hostLimit = this.hosts.get(host)!
+
+    const stats: RequestStats = { url, latencyMs: 0, attempts: 0, timeouts: 0 }
+    this.requestStats.set(url, stats)
+    const started = performance.now()
+
+    try {
+      for (let attempt = 0; ; attempt++) {
+        // Hold the limits only while a request is in flight, not while backing off
+        await this.global.acquire()
+        await hostLimit.acquire()
+        stats.attempts++
+        try {
+          const response = await this.request(url, headers)
+          if (response.status >= 400) {
+            throw new HttpStatusError(response.status)
+          }
+          stats.status = response.status
+          return response
+        } catch (error) {
+          if (error instanceof FeedTimeoutError) stats.timeouts++
+          if (error instanceof HttpStatusError) stats.status = error.status
+          stats.error = error instanceof Error ? error.message : String(error)
+          if (attempt >= retries || !isRetryable(error)) {
+            throw error
+          }
+        } finally {
+          hostLimit.release()
+          this.global.release()
+        }
+
+        // Full jitter: anywhere from 0 to the capped exponential step
+        await sleep(Math.random() * Math.min(backoffMaxMs, backoffBaseMs * 2 ** attempt))
+      }
+    } finally {
+      stats.latencyMs = performance.now() - started
+    }
+  }
+
+  /**
+   * Stats for every URL requested through this scheduler
+   */
+  stats(): RequestStats[] {
+    return [...this.requestStats.values()]
+  }
+
+  /**
+   * One attempt, following redirects, under connect/read/attempt deadlines
+   */
+  private request(url: string, headers: Record<string, string>): Promise<HttpResponse> {
+    const { connectTimeoutMs, readTimeoutMs, attemptTimeoutMs } = this.options
+
+    return new Promise((resolve, reject) => {
+      let settled = false
+      let current: http.ClientRequest | null = null
+
+      const fail = (error: Error) => {
+        if (settled) return
+        settled = true
+        clearTimeout(attemptTimer)
+        current?.destroy()
+        reject(error)
+      }
+
+      const attemptTimer = setTimeout(
+        () => fail(new FeedTimeoutError('attempt', url, attemptTimeoutMs)),
+        attemptTimeoutMs
+      )
+
+      const send = (target: URL, redirects: number) => {
+        const transport = target.protocol === 'https:' ? https : http
+        const req = transport.request(target, {
+          method: 'GET',
+          agent: agents[target.protocol as 'http:' | 'https:'],
+          headers: { ...headers, 'Accept-Encoding': 'gzip, deflate, br' },
+        })
+        current = req
+
+        req.on('socket', (socket) => {
+          // Reused keep-alive sockets are already connected
+          if (!socket.connecting) return
+          const connectTimer = setTimeout(
+            () => fail(new FeedTimeoutError('connect', target.href, connectTimeoutMs)),
+            connectTimeoutMs
+          )
+          socket.once('connect', () => clearTimeout(connectTimer))
+          socket.once('close', () => clearTimeout(connectTimer))
+        })
+
+        req.setTimeout(readTimeoutMs, () => fail(new FeedTimeoutError('read', target.href, readTimeoutMs)))
+        req.on('error', fail)
+
+        req.on('response', (res) => {
+          const status = res.statusCode || 0
+          const location = res.headers.location
+
+          if (status >= 300 && status < 400 && status !== 304 && location) {
+            res.resume()
+            if (redirects >= MAX_REDIRECTS) {
+              fail(new Error(`Too many redirects: ${url}`))
+              return
+            }
+            send(new URL(location, target), redirects + 1)
+            return
+          }
+
+          let wireBytes = 0
+          res.on('data', (chunk: Buffer) => {
+            wireBytes += chunk.length
+          })
+
+          const encoding = String(res.headers['content-encoding'] || '').toLowerCase()
+          let stream: Readable = res
+          if (encoding === 'gzip' || encoding === 'x-gzip') stream = res.pipe(zlib.createGunzip())
+          else if (encoding === 'deflate') stream = res.pipe(zlib.createInflate())
+          else if (encoding === 'br') stream = res.pipe(zlib.createBrotliDecompress())
+
+          const chunks: Buffer[] = []
+          stream.on('data', (chunk: Buffer) => chunks.push(chunk))
+          stream.on('error', fail)
+          res.on('aborted', () => fail(new Error(`Response aborted: ${target.href}`)))
+          stream.on('end', () => {
+            if (settled) return
+            if (!res.complete) {
+              fail(new Error(`Truncated response: ${target.href}`))
+              return
+            }
+            settled = true
+            clearTimeout(attemptTimer)
+            resolve({
+              status,
+              headers: res.headers,
+              body: Buffer.concat(chunks),
+              wireBytes,
+              url: target.href,
+            })
+          })
+        })
+
+        req.end()
+      }
+
+      send(new URL(url), 0)
+    })
+  }
+}
@@ -0,0 +1,77 @@
+import type { getPayloadClient } from '@/lib/payload/client'
+import type { FeedFetchResult, FeedValidators } from './poller'
+
+/**
+ * Persistence for per-feed poll state (the feed-states collection)
+ */
+
+type PayloadInstance = Awaited<ReturnType<typeof getPayloadClient>>
+
+/**
+ * Load stored validators for the given feed URLs, keyed by URL
+ */
+export async function loadFeedValidators(
+  payload: PayloadInstance,
+  urls: string[]
+): Promise<Map<string, FeedValidators>> {
+  const result = await payload.find({
+    collection: 'feed-states',
+    where: { url: { in: urls } },
+    depth: 0,
+    limit: urls.length,
+    pagination: false,
+  })
+
+  return new Map(
+    result.docs.map((doc) => [
+      doc.url,
+      {
+        etag: doc.etag,
+        lastModified: doc.lastModified,
+        contentHash: doc.contentHash,
+        lastSeenGuids: Array.isArray(doc.lastSeenGuids) ? (doc.lastSeenGuids as string[]) : null,
+      },
+    ])
+  )
+}
+
+/**
+ * Store each feed's new validators. Call only for feeds whose items were
+ * all persisted, or a failed item would be skipped as "seen" next poll.
+ */
+export async function saveFeedValidators(
+  payload: PayloadInstance,
+  feeds: (FeedFetchResult & { memberSlug: string })[]
+): Promise<void> {
+  if (feeds.length === 0) return
+
+  const existing = await payload.find({
+    collection: 'feed-states',
+    where: { url: { in: feeds.map((feed) => feed.url) } },
+    select: { url: true },
+    depth: 0,
+    limit: feeds.length,
+    pagination: false,
+  })
+  const ids = new Map(existing.docs.map((doc) => [doc.url, doc.id]))
+  const fetchedAt = new Date().toISOString()
+
+  await Promise.all(
+    feeds.map((feed) => {
+      const data = {
+        url: feed.url,
+        memberSlug: feed.memberSlug,
+        etag: feed.validators.etag ?? null,
+        lastModified: feed.validators.lastModified ?? null,
+        contentHash: feed.validators.contentHash ?? null,
+        lastSeenGuids: feed.validators.lastSeenGuids ?? null,
+        lastStatus: feed.status,
+        lastFetchedAt: fetchedAt,
+      }
+      const id = ids.get(feed.url)
+      return id
+        ? payload.update({ collection: 'feed-states', id, data })
+        : payload.create({ collection: 'feed-states', data })
+    })
+  )
+}
@@ -0,0 +1,503 @@
+import { StringDecoder } from 'string_decoder'
+import { extractImageFromContent } from './html'
+import type { RSSFeed, RSSItem } from './poller'
+
+/**
+ * Streaming, window-aware RSS/Atom parser
+ *
+ * rss-parser builds a DOM of the whole document (every item, every
+ * content:encoded body) before the poller throws most of it away as too
+ * old. This parser scans the body a chunk at a time and emits each item
+ * as soon as its closing tag is read:
+ * - items older than windowHours are dropped without being kept, and
+ *   their content bodies aren't even accumulated once the date is known
+ * - in a reverse-chronological feed, reading stops after a few
+ *   consecutive out-of-window items, so archive feeds cost only the
+ *   part of the document that matters
+ * - in lean mode, an item's content body is reduced to its lead image
+ *   when the item has a description to excerpt from
+ *
+ * Items come out shaped exactly like the rss-parser path in the poller
+ * (same guid/link/description/content/pubDate fallbacks).
+ */
+
+export interface StreamParseOptions {
+  /** Drop items older than this; omit to keep every item */
+  windowHours?: number
+  /**
+   * 'full' keeps content bodies; 'lean' drops a body once its lead image is
+   * noted, unless the item has no description and the body is the excerpt
+   */
+  content?: 'full' | 'lean'
+  /** Feed URL, for the guid fallback */
+  url?: string
+  /** Reference time for the window (default: now) */
+  now?: number
+}
+
+export interface StreamParseStats {
+  /** Decoded characters scanned before the document ended or reading stopped */
+  charsScanned: number
+  itemsRead: number
+  itemsOutsideWindow: number
+  /** Stopped before the end of the document because items fell out of the window */
+  stoppedEarly: boolean
+}
+
+// Consecutive out-of-window items, in a feed that has been newest-first so
+// far, before the rest of the document is skipped
+const STOP_AFTER_OLD_ITEMS = 3
+
+// How much newer than its predecessor an item may be before the feed is
+// treated as unordered (publishers backdate and reorder by minutes)
+const ORDER_TOLERANCE_MS = 60 * 60 * 1000
+
+const XML_ENTITIES: Record<string, string> = { amp: '&', lt: '<', gt: '>', quot: '"', apos: "'" }
+
+// Named entities that show up in feed descriptions once tags are stripped
+const HTML_ENTITIES: Record<string, string> = {
+  ...XML_ENTITIES,
+  nbsp: ' ',
+  hellip: '…',
+  mdash: '—',
+  ndash: '–',
+  lsquo: '‘',
+  rsquo: '’',
+  ldquo: '“',
+  rdquo: '”',
+  copy: '©',
+  reg: '®',
+  trade: '™',
+}
+
+function decodeEntities(text: string, named: Record<string, string>): string {
+  if (!text.includes('&')) return text
+  return text.replace(/&(#x[0-9a-f]+|#[0-9]+|[a-z]+);/gi, (match, entity: string) => {
+    if (entity[0] === '#') {
+      const code = entity[1] === 'x' || entity[1] === 'X' ? parseInt(entity.slice(2), 16) : parseInt(entity.slice(1), 10)
+      return Number.isFinite(code) && code <= 0x10ffff ? String.fromCodePoint(code) : match
+    }
+    return named[entity] ?? named[entity.toLowerCase()] ?? match
+  })
+}
+
+/**
+ * Plain-text snippet of an HTML fragment, as rss-parser's contentSnippet
+ */
+function snippet(html: string): string {
+  const text = html
+    .replace(/([^\n])<\/?(h|br|p|ul|ol|li|blockquote|section|table|tr|div)(?:.|\n)*?>([^\n])/gm, '$1\n$3')
+    .replace(/<(?:.|\n)*?>/gm, '')
+  return decodeEntities(text, HTML_ENTITIES).trim()
+}
+
+function parseAttributes(raw: string): Record<string, string> {
+  const attributes: Record<string, string> = {}
+  for (const match of raw.matchAll(/([^\s=/]+)\s*=\s*(?:"([^"]*)"|'([^']*)')/g)) {
+    attributes[match[1]] = decodeEntities(match[2] ?? match[3], XML_ENTITIES)
+  }
+  return attributes
+}
+
+/**
+ * Index of the '>' closing a tag that starts before `from`, skipping quoted
+ * attribute values; -1 if the tag isn't complete yet
+ */
+function findTagEnd(buffer: string, from: number): number {
+  let quote = 0
+  for (let i = from; i < buffer.length; i++) {
+    const c = buffer.charCodeAt(i)
+    if (quote) {
+      if (c === quote) quote = 0
+    } else if (c === 34 || c === 39) {
+      quote = c
+    } else if (c === 62) {
+      return i
+    }
+  }
+  return -1
+}
+
+interface ItemFields {
+  title?: string
+  link?: string
+  guid?: string
+  pubDate?: string
+  isoDate?: string
+  description?: string
+  summary?: string
+  content?: string
+  contentEncoded?: string
+  creator?: string
+  author?: string
+  categories?: string[]
+  enclosure?: RSSItem['enclosure']
+  /** Parsed pubDate, once known; NaN when invalid */
+  time?: number
+}
+
+// Item children whose text is captured, by element name
+const ITEM_TEXT_FIELDS: Record<string, keyof ItemFields> = {
+  'title': 'title',
+  'link': 'link',
+  'guid': 'guid',
+  'id': 'guid',
+  'pubDate': 'pubDate',
+  'published': 'pubDate',
+  'dc:date': 'isoDate',
+  'updated': 'isoDate',
+  'description': 'description',
+  'summary': 'summary',
+  'content': 'content',
+  'content:encoded': 'contentEncoded',
+  'dc:creator': 'creator',
+  'author': 'author',
+  'category': 'categories',
+}
+
+// Fields that can be large and are worth skipping for out-of-window items
+const BODY_FIELDS = new Set<keyof ItemFields>(['content', 'contentEncoded', 'description', 'summary'])
+
+/**
+ * Push-based parser: write() chunks as they arrive and collect the items
+ * each call completes. Once `done`, further input is ignored.
+ */
+export class FeedStreamParser {
+  title = ''
+  link = ''
+  description?: string
+  done = false
+  readonly stats: StreamParseStats = { charsScanned: 0, itemsRead: 0, itemsOutsideWindow: 0, stoppedEarly: false }
+
+  private options: StreamParseOptions
+  private cutoff: number
+  private decoder = new StringDecoder('utf8')
+  private buffer = ''
+  private stack: string[] = []
+  private isAtom = false
+  private completed: RSSItem[] = []
+
+  private item: ItemFields | null = null
+  private itemDepth = -1
+  private lastTime: number | null = null
+  private ordered = true
+  private oldInARow = 0
+
+  // Text capture for the element currently being read
+  private captureKey: string | null = null
+  private captureDepth = -1
+  private captureSkip = false
+  private text = ''
+
+  constructor(options: StreamParseOptions = {}) {
+    this.options = options
+    this.cutoff =
+      options.windowHours === undefined
+        ? -Infinity
+        : (options.now ?? Date.now()) - options.windowHours * 60 * 60 * 1000
+  }
+
+  write(chunk: Buffer | string): RSSItem[] {
+    if (this.done) return []
+    this.buffer += typeof chunk === 'string' ? chunk : this.decoder.write(chunk)
+    this.scan(false)
+    return this.drain()
+  }
+
+  end(): RSSItem[] {
+    if (!this.done) {
+      this.buffer += this.decoder.end()
+      this.scan(true)
+      this.done = true
+    }
+    return this.drain()
+  }
+
+  private drain(): RSSItem[] {
+    const items = this.completed
+    this.completed = []
+    return items
+  }
+
+  private scan(final: boolean): void {
+    const buffer = this.buffer
+    let pos = 0
+
+    while (pos < buffer.length && !this.done) {
+      const lt = buffer.indexOf('<', pos)
+      if (lt === -1) {
+        // Text may continue (or an entity may be split) in the next chunk
+        if (final) {
+          this.onText(decodeEntities(buffer.slice(pos), XML_ENTITIES))
+          pos = buffer.length
+        }
+        break
+      }
+      if (lt > pos) {
+        this.onText(decodeEntities(buffer.slice(pos, lt), XML_ENTITIES))
+        pos = lt
+      }
+
+      if (buffer.startsWith('<![CDATA[', pos)) {
+        const end = buffer.indexOf(']]>', pos + 9)
+        if (end === -1) break
+        this.onText(buffer.slice(pos + 9, end))
+        pos = end + 3
+      } else if (buffer.startsWith('<!--', pos)) {
+        const end = buffer.indexOf('-->', pos + 4)
+        if (end === -1) break
+        pos = end + 3
+      } else if (buffer[pos + 1] === '?') {
+        const end = buffer.indexOf('?>', pos + 2)
+        if (end === -1) break
+        pos = end + 2
+      } else if (buffer[pos + 1] === '!') {
+        // Not enough yet to tell a split CDATA/comment opener from a DOCTYPE
+        if (buffer.length - pos < 9 && !final) break
+        const subset = buffer.indexOf('[', pos)
+        const close = buffer.indexOf('>', pos)
+        const end = subset !== -1 && subset < close ? buffer.indexOf(']>', subset) + 1 : close
+        if (end <= 0) break
+        pos = end + 1
+      } else {
+        const end = findTagEnd(buffer, pos + 1)
+        if (end === -1) break
+        this.onTag(buffer.slice(pos + 1, end))
+        pos = end + 1
+      }
+    }
+
+    this.stats.charsScanned += pos
+    this.buffer = this.done ? '' : buffer.slice(pos)
+  }
+
+  private onText(text: string): void {
+    if (this.captureKey !== null && !this.captureSkip) {
+      this.text += text
+    }
+  }
+
+  private onTag(raw: string): void {
+    if (raw[0] === '/') {
+      this.onClose()
+      return
+    }
+
+    const selfClosing = raw.endsWith('/')
+    const nameEnd = raw.search(/[\s/]/)
+    const name = nameEnd === -1 ? raw : raw.slice(0, nameEnd)
+    const attributes = nameEnd === -1 ? '' : raw.slice(nameEnd)
+    this.onOpen(name, attributes)
+    if (selfClosing) {
+      this.onClose()
+    }
+  }
+
+  private onOpen(name: string, rawAttributes: string): void {
+    const depth = this.stack.length
+    const parent = this.stack[depth - 1]
+    this.stack.push(name)
+
+    if (depth === 0) {
+      this.isAtom = name === 'feed'
+      return
+    }
+    // Nested markup inside a captured element (e.g. Atom xhtml content)
+    if (this.captureKey !== null) return
+
+    if (!this.item) {
+      if (name === 'item' || name === 'entry') {
+        this.item = {}
+        this.itemDepth = depth
+      } else if (parent === 'channel' || (this.isAtom && depth === 1)) {
+        if (name === 'link' && this.isAtom) {
+          const { href, rel } = parseAttributes(rawAttributes)
+          if (href && !this.link && (!rel || rel === 'alternate')) this.link = href
+        } else if (name === 'title' || name === 'link' || name === 'description' || name === 'subtitle') {
+          this.startCapture(`feed:${name}`, depth)
+        }
+      }
+      return
+    }
+
+    const item = this.item
+    if (depth === this.itemDepth + 1) {
+      if (name === 'enclosure') {
+        const { url, type, length } = parseAttributes(rawAttributes)
+        if (url) item.enclosure = { url, type, length }
+        return
+      }
+      if (name === 'link' && this.isAtom) {
+        const { href, rel } = parseAttributes(rawAttributes)
+        if (href && !item.link && (!rel || rel === 'alternate')) item.link = href
+        return
+      }
+      if (name === 'category' && this.isAtom) {
+        const { term } = parseAttributes(rawAttributes)
+        if (term) (item.categories ||= []).push(term)
+        return
+      }
+      const key = ITEM_TEXT_FIELDS[name]
+      // Atom authors carry their name in a child element
+      if (key && !(key === 'author' && this.isAtom)) {
+        this.startCapture(key, depth)
+      }
+    } else if (depth === this.itemDepth + 2 && parent === 'author' && name === 'name') {
+      this.startCapture('author', depth)
+    }
+  }
+
+  private startCapture(key: string, depth: number): void {
+    this.captureKey = key
+    this.captureDepth = depth
+    this.text = ''
+    // Once an item's date puts it outside the window, don't build its bodies
+    const time = this.item?.time
+    this.captureSkip =
+      BODY_FIELDS.has(key as keyof ItemFields) && time !== undefined && !Number.isNaN(time) && time < this.cutoff
+  }
+
+  private onClose(): void {
+    this.stack.pop()
+    const depth = this.stack.length
+
+    if (this.captureKey !== null && depth === this.captureDepth) {
+      this.commitCapture(this.captureKey, this.text)
+      this.captureKey = null
+      this.text = ''
+    }
+
+    if (this.item && depth === this.itemDepth) {
+      this.finishItem(this.item)
+      this.item = null
+    }
+  }
+
+  private commitCapture(key: string, text: string): void {
+    if (key.startsWith('feed:')) {
+      const field = key.slice(5)
+      if (field === 'title' && !this.title) this.title = text
+      else if (field === 'link' && !this.link) this.link = text
+      else if ((field === 'description' || field === 'subtitle') && this.description === undefined) this.description = text
+      return
+    }
+
+    const item = this.item!
+    const field = key as keyof ItemFields
+    if (field === 'categories') {
+      if (text) (item.categories ||= []).push(text)
+    } else if (item[field] === undefined) {
+      ;(item as Record<string, unknown>)[field] = text
+    }
+
+    if (field === 'pubDate' || (field === 'isoDate' && item.pubDate === undefined)) {
+      item.time = Date.parse(text)
+    }
+  }
+
+  private finishItem(fields: ItemFields): void {
+    this.stats.itemsRead++
+
+    // pubDate (Atom: published), else dc:date (Atom: updated)
+    const rawDate = fields.pubDate ?? fields.isoDate
+    const time = rawDate !== undefined ? Date.parse(rawDate) : NaN
+
+    if (!Number.isNaN(time)) {
+      if (this.lastTime !== null && time > this.lastTime + ORDER_TOLERANCE_MS) {
+        this.ordered = false
+      }
+      this.lastTime = time
+
+      if (time < this.cutoff) {
+        this.stats.itemsOutsideWindow++
+        this.oldInARow++
+        if (this.ordered && this.oldInARow >= STOP_AFTER_OLD_ITEMS) {
+          this.stats.stoppedEarly = true
+          this.done = true
+        }
+        return
+      }
+    }
+    this.oldInARow = 0
+
+    // Same shape and fallbacks as the rss-parser mapping in the poller
+    const rssContent = this.isAtom ? fields.content : fields.description
+    const description = (rssContent ? snippet(rssContent) : '') || fields.summary || undefined
+    let content = fields.contentEncoded || rssContent || undefined
+    let image: string | undefined
+
+    if (this.options.content === 'lean' && content && description) {
+      if (!fields.enclosure?.url) {
+        image = extractImageFromContent(content) || undefined
+      }
+      content = undefined
+    }
+
+    this.completed.push({
+      guid: fields.guid || fields.link || `${this.options.url}-${fields.title}-${fields.pubDate}`,
+      title: fields.title || 'Untitled',
+      link: fields.link || '',
+      description,
+      content,
+      image,
+      pubDate:
+        fields.pubDate ||
+        (fields.isoDate && !Number.isNaN(Date.parse(fields.isoDate)) ? new Date(fields.isoDate).toISOString() : '') ||
+        new Date().toISOString(),
+      creator: fields.creator || fields.author,
+      categories: fields.categories,
+      enclosure: fields.enclosure,
+    })
+  }
+}
+
+/**
+ * Yield a feed's items as they are parsed from a chunked body. Stops
+ * pulling chunks as soon as the parser has seen enough.
+ */
+export async function* streamFeedItems(
+  source: Iterable<Buffer | string> | AsyncIterable<Buffer | string>,
+  parser: FeedStreamParser
+): AsyncGenerator<RSSItem> {
+  for await (const chunk of source) {
+    yield* parser.write(chunk)
+    if (parser.done) return
+  }
+  yield* parser.end()
+}
+
+// Slice size when parsing an already-buffered body
+const CHUNK_SIZE = 64 * 1024
+
+/**
+ * Split a buffered body into chunks for the streaming parser
+ */
+export function* bufferChunks(body: Buffer, size = CHUNK_SIZE): Generator<Buffer> {
+  for (let offset = 0; offset < body.length; offset += size) {
+    yield body.subarray(offset, offset + size)
+  }
+}
+
+/**
+ * Parse a whole feed with the streaming parser
+ */
+export async function parseFeedStream(
+  source: Iterable<Buffer | string> | AsyncIterable<Buffer | string>,
+  options: StreamParseOptions = {}
+): Promise<{ feed: RSSFeed; stats: StreamParseStats }> {
+  const parser = new FeedStreamParser(options)
+  const items: RSSItem[] = []
+  for await (const item of streamFeedItems(source, parser)) {
+    items.push(item)
+  }
+
+  return {
+    feed: {
+      title: parser.title,
+      description: parser.description,
+      link: parser.link || options.url || '',
+      items,
+    },
+    stats: parser.stats,
+  }
+}
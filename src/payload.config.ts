@@ -8,11 +8,14 @@ import { fileURLToPath } from 'url'
 import { Members } from './payload/collections/Members'
 import { Stories } from './payload/collections/Stories'
 import { NewsItems } from './payload/collections/NewsItems'
+import { FeedStates } from './payload/collections/FeedStates'
 import { Subscribers } from './payload/collections/Subscribers'
 import { Newsletters } from './payload/collections/Newsletters'
 import { Pages } from './payload/collections/Pages'
 import { Media } from './payload/collections/Media'
 import { Users } from './payload/collections/Users'
+import { addNewsSearchIndex } from './payload/db/newsSearch'
+import { addRateLimitTable } from './payload/db/rateLimits'
 
 const filename = fileURLToPath(import.meta.url)
 const dirname = path.dirname(filename)
@@ -39,6 +42,7 @@ export default buildConfig({
     Members,
     Stories,
     NewsItems,
+    FeedStates,
     Subscribers,
     Newsletters,
     Pages,
@@ -58,6 +62,8 @@ export default buildConfig({
     pool: {
       connectionString: process.env.DATABASE_URL || '',
     },
+    // Full-text search column and index on news_items; shared rate limit table
+    afterSchemaInit: [addNewsSearchIndex, addRateLimitTable],
   }),
 
   // Cloudflare R2 storage (S3-compatible)
@@ -0,0 +1,80 @@
+import type { CollectionConfig } from 'payload'
+
+/**
+ * Feed States Collection
+ *
+ * Per-feed HTTP validators and the GUIDs seen on the last poll, so the
+ * RSS poller can send conditional requests and skip unchanged feeds.
+ * Written only by the poll route; no public access.
+ */
+export const FeedStates: CollectionConfig = {
+  slug: 'feed-states',
+  admin: {
+    useAsTitle: 'url',
+    defaultColumns: ['url', 'memberSlug', 'lastStatus', 'lastFetchedAt'],
+    description: 'RSS poller cache validators per feed',
+    group: 'Aggregator',
+  },
+  fields: [
+    {
+      name: 'url',
+      type: 'text',
+      required: true,
+      unique: true,
+      index: true,
+      label: 'Feed URL',
+    },
+    {
+      name: 'memberSlug',
+      type: 'text',
+      label: 'Member Slug',
+      index: true,
+    },
+    {
+      name: 'etag',
+      type: 'text',
+      label: 'ETag',
+    },
+    {
+      name: 'lastModified',
+      type: 'text',
+      label: 'Last-Modified',
+    },
+    {
+      name: 'contentHash',
+      type: 'text',
+      label: 'Content Hash',
+      admin: {
+        description: 'sha256 of the last parsed feed body',
+      },
+    },
+    {
+      name: 'lastSeenGuids',
+      type: 'json',
+      label: 'Last Seen GUIDs',
+      admin: {
+        description: 'GUIDs in the last parsed feed body, newest first',
+      },
+    },
+    {
+      name: 'lastStatus',
+      type: 'select',
+      options: [
+        { label: 'Fetched', value: 'fetched' },
+        { label: 'Not Modified (304)', value: 'not-modified' },
+        { label: 'Unchanged (same hash)', value: 'unchanged' },
+      ],
+      admin: {
+        position: 'sidebar',
+      },
+    },
+    {
+      name: 'lastFetchedAt',
+      type: 'date',
+      label: 'Last Fetched',
+      admin: {
+        position: 'sidebar',
+      },
+    },
+  ],
+}
@@ -0,0 +1,44 @@
+import type { PostgresAdapterArgs } from '@payloadcms/db-postgres'
+import { sql } from '@payloadcms/db-postgres/drizzle'
+import { customType, index } from '@payloadcms/db-postgres/drizzle/pg-core'
+
+/**
+ * Full-text search column for news items
+ *
+ * Adds a generated `search_document` tsvector to news_items, weighted
+ * title (A) > publication and category (B) > description (C), with a GIN
+ * index. Postgres keeps it up to date on every insert and update, so
+ * ingested items and admin edits are searchable immediately. The
+ * publication is the member slug with dashes as spaces ("mission local").
+ *
+ * The 'simple' configuration lowercases without stemming, so prefix
+ * queries and typo corrections work on the words as written
+ * (see lib/news/search).
+ */
+
+const tsvector = customType<{ data: string }>({
+  dataType() {
+    return 'tsvector'
+  },
+})
+
+type AfterSchemaInitHook = NonNullable<PostgresAdapterArgs['afterSchemaInit']>[number]
+
+export const addNewsSearchIndex: AfterSchemaInitHook = ({ schema, extendTable }) => {
+  extendTable({
+    table: schema.tables.news_items,
+    columns: {
+      searchDocument: tsvector('search_document').generatedAlwaysAs(
+        sql`setweight(to_tsvector('simple', coalesce(title, '')), 'A') ||
+          setweight(to_tsvector('simple', replace(coalesce(member_slug, ''), '-', ' ')), 'B') ||
+          setweight(to_tsvector('simple', coalesce(category, '')), 'B') ||
+          setweight(to_tsvector('simple', coalesce(description, '')), 'C')`
+      ),
+    },
+    extraConfig: (table) => ({
+      news_items_search_document_idx: index('news_items_search_document_idx').using('gin', table.searchDocument),
+    }),
+  })
+
+  return schema
+}
@@ -0,0 +1,43 @@
+import type { PostgresAdapterArgs } from '@payloadcms/db-postgres'
+import {
+  bigint,
+  boolean,
+  doublePrecision,
+  index,
+  pgTable,
+  text,
+  timestamp,
+} from '@payloadcms/db-postgres/drizzle/pg-core'
+
+/**
+ * Table for the shared rate limit store (lib/ratelimit/postgres)
+ *
+ * One row per rule and client key. It isn't a collection: rows are
+ * written on every rate-limited request and never edited by hand.
+ * `value`, `previous` and `stamp` hold the algorithm state (see
+ * lib/ratelimit/algorithms); expires_at is indexed for the sweep.
+ */
+
+type AfterSchemaInitHook = NonNullable<PostgresAdapterArgs['afterSchemaInit']>[number]
+
+export const rateLimits = pgTable(
+  'rate_limits',
+  {
+    key: text('key').primaryKey(),
+    value: doublePrecision('value').notNull(),
+    previous: doublePrecision('previous').notNull().default(0),
+    stamp: bigint('stamp', { mode: 'number' }).notNull(),
+    allowed: boolean('allowed').notNull(),
+    expiresAt: timestamp('expires_at', { withTimezone: true, mode: 'string' }).notNull(),
+  },
+  (table) => ({
+    expiresAtIdx: index('rate_limits_expires_at_idx').on(table.expiresAt),
+  })
+)
+
+export const addRateLimitTable: AfterSchemaInitHook = ({ schema }) => {
+  return {
+    ...schema,
+    tables: { ...schema.tables, rate_limits: rateLimits },
+  }
+}
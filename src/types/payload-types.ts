@@ -70,6 +70,7 @@ export interface Config {
     members: Member;
     stories: Story;
     'news-items': NewsItem;
+    'feed-states': FeedState;
     subscribers: Subscriber;
     newsletters: Newsletter;
     pages: Page;
@@ -85,6 +86,7 @@ export interface Config {
     members: MembersSelect<false> | MembersSelect<true>;
     stories: StoriesSelect<false> | StoriesSelect<true>;
     'news-items': NewsItemsSelect<false> | NewsItemsSelect<true>;
+    'feed-states': FeedStatesSelect<false> | FeedStatesSelect<true>;
     subscribers: SubscribersSelect<false> | SubscribersSelect<true>;
     newsletters: NewslettersSelect<false> | NewslettersSelect<true>;
     pages: PagesSelect<false> | PagesSelect<true>;
@@ -295,6 +297,39 @@ export interface NewsItem {
   updatedAt: string;
   createdAt: string;
 }
+/**
+ * RSS poller cache validators per feed
+ *
+ * This interface was referenced by `Config`'s JSON-Schema
+ * via the `definition` "feed-states".
+ */
+export interface FeedState {
+  id: number;
+  url: string;
+  memberSlug?: string | null;
+  etag?: string | null;
+  lastModified?: string | null;
+  /**
+   * sha256 of the last parsed feed body
+   */
+  contentHash?: string | null;
+  /**
+   * GUIDs in the last parsed feed body, newest first
+   */
+  lastSeenGuids?:
+    | {
+        [k: string]: unknown;
+      }
+    | unknown[]
+    | string
+    | number
+    | boolean
+    | null;
+  lastStatus?: ('fetched' | 'not-modified' | 'unchanged') | null;
+  lastFetchedAt?: string | null;
+  updatedAt: string;
+  createdAt: string;
+}
 /**
  * Newsletter subscribers
  *
@@ -478,6 +513,10 @@ export interface PayloadLockedDocument {
         relationTo: 'news-items';
         value: number | NewsItem;
       } | null)
+    | ({
+        relationTo: 'feed-states';
+        value: number | FeedState;
+      } | null)
     | ({
         relationTo: 'subscribers';
         value: number | Subscriber;
@@ -604,6 +643,22 @@ export interface NewsItemsSelect<T extends boolean = true> {
   updatedAt?: T;
   createdAt?: T;
 }
+/**
+ * This interface was referenced by `Config`'s JSON-Schema
+ * via the `definition` "feed-states_select".
+ */
+export interface FeedStatesSelect<T extends boolean = true> {
+  url?: T;
+  memberSlug?: T;
+  etag?: T;
+  lastModified?: T;
+  contentHash?: T;
+  lastSeenGuids?: T;
+  lastStatus?: T;
+  lastFetchedAt?: T;
+  updatedAt?: T;
+  createdAt?: T;
+}
 /**
  * This interface was referenced by `Config`'s JSON-Schema
  * via the `definition` "subscribers_select".
@@ -0,0 +1,188 @@
+#!/usr/bin/env python3
+"""
+SFIMC E2E Browser Pool
+Launches Chromium once per worker process and hands each unit an isolated
+BrowserContext, recording launch, context and teardown costs.
+
+Context policies:
+    fresh    - a new context per unit, closed as soon as the unit finishes
+    recycle  - reuse one context for up to `recycle_after` units, clearing
+               cookies, permissions and storage between them
+"""
+
+from contextlib import contextmanager
+import os
+import time
+
+from suite import DEFAULT_VIEWPORT
+
+CONTEXT_POLICIES = ("fresh", "recycle")
+
+# Run in each page before it is closed so a recycled context starts clean
+CLEAR_STORAGE_JS = """() => {
+    try { localStorage.clear() } catch (e) {}
+    try { sessionStorage.clear() } catch (e) {}
+}"""
+
+
+def process_tree_rss_mb(root_pid=None):
+    """
+    Resident memory of a process and all of its descendants, in MB.
+
+    Chromium runs as grandchildren of the Python process (via the Playwright
+    driver), so this walks /proc. Returns None where /proc is unavailable.
+    """
+    root_pid = root_pid or os.getpid()
+    if not os.path.isdir("/proc"):
+        return None
+
+    children = {}
+    rss_pages = {}
+    for entry in os.listdir("/proc"):
+        if not entry.isdigit():
+            continue
+        try:
+            with open(f"/proc/{entry}/stat") as f:
+                # Field 2 (comm) may contain spaces; everything after ")" is fixed
+                fields = f.read().rsplit(")", 1)[1].split()
+            with open(f"/proc/{entry}/statm") as f:
+                rss_pages[int(entry)] = int(f.read().split()[1])
+        except (OSError, IndexError, ValueError):
+            continue
+        children.setdefault(int(fields[1]), []).append(int(entry))
+
+    total, stack = 0, [root_pid]
+    while stack:
+        pid = stack.pop()
+        total += rss_pages.get(pid, 0)
+        stack.extend(children.get(pid, []))
+
+    return round(total * os.sysconf("SC_PAGE_SIZE") / (1024 * 1024), 1)
+
+
+class BrowserPool:
+    """Session-scoped Chromium with per-unit BrowserContexts"""
+
+    def __init__(self, policy="fresh", recycle_after=20, launch_options=None):
+        if policy not in CONTEXT_POLICIES:
+            raise ValueError(f"Unknown context policy {policy!r}: expected one of {CONTEXT_POLICIES}")
+        self.policy = policy
+        self.recycle_after = max(1, recycle_after)
+        self.launch_options = launch_options or {"headless": True}
+        self._playwright = None
+        self.browser = None
+        self._context = None
+        self._context_uses = 0
+        self._stats = {
+            "pid": os.getpid(),
+            "policy": policy,
+            "launch_time": 0.0,
+            "contexts_created": 0,
+            "contexts_reused": 0,
+            "context_create_time": 0.0,
+            "context_teardown_time": 0.0,
+            "peak_rss_mb": None,
+        }
+
+    def start(self):
+        from playwright.sync_api import sync_playwright
+
+        start = time.perf_counter()
+        self._playwright = sync_playwright().start()
+        self.browser = self._playwright.chromium.launch(**self.launch_options)
+        self._stats["launch_time"] = time.perf_counter() - start
+        self._sample_memory()
+        return self
+
+    def close(self):
+        if self._context:
+            self._close_context(self._context)
+            self._context = None
+        if self.browser:
+            self.browser.close()
+            self.browser = None
+        if self._playwright:
+            self._playwright.stop()
+            self._playwright = None
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.close()
+
+    # ===========================================
+    # Pages
+    # ===========================================
+
+    def open_page(self, viewport=None):
+        """Return a new page in an isolated (fresh or freshly reset) context"""
+        viewport = viewport or DEFAULT_VIEWPORT
+
+        if self.policy == "recycle" and self._context and self._context_uses < self.recycle_after:
+            self._context_uses += 1
+            self._stats["contexts_reused"] += 1
+            page = self._context.new_page()
+            page.set_viewport_size(viewport)
+            return page
+
+        if self._context:
+            self._close_context(self._context)
+
+        start = time.perf_counter()
+        context = self.browser.new_context(viewport=viewport)
+        self._stats["context_create_time"] += time.perf_counter() - start
+        self._stats["contexts_created"] += 1
+
+        if self.policy == "recycle":
+            self._context, self._context_uses = context, 1
+
+        return context.new_page()
+
+    def release(self, page):
+        """Hand a page back; its context is torn down or reset per policy"""
+        if self.policy == "fresh":
+            self._close_context(page.context)
+        else:
+            self._reset_page(page)
+        self._sample_memory()
+
+    @contextmanager
+    def page(self, viewport=None):
+        page = self.open_page(viewport)
+        try:
+            yield page
+        finally:
+            self.release(page)
+
+    def stats(self):
+        return {k: round(v, 3) if isinstance(v, float) else v for k, v in self._stats.items()}
+
+    # ===========================================
+    # Internals
+    # ===========================================
+
+    def _close_context(self, context):
+        start = time.perf_counter()
+        context.close()
+        self._stats["context_teardown_time"] += time.perf_counter() - start
+        if context is self._context:
+            self._context = None
+
+    def _reset_page(self, page):
+        # Only the released page is closed: other pages in a recycled context
+        # may still be held warm by the navigation cache
+        start = time.perf_counter()
+        try:
+            page.evaluate(CLEAR_STORAGE_JS)
+        except Exception:
+            pass  # Page may be mid-navigation or on about:blank
+        page.close()
+        page.context.clear_cookies()
+        page.context.clear_permissions()
+        self._stats["context_teardown_time"] += time.perf_counter() - start
+
+    def _sample_memory(self):
+        rss = process_tree_rss_mb()
+        if rss is not None and (self._stats["peak_rss_mb"] is None or rss > self._stats["peak_rss_mb"]):
+            self._stats["peak_rss_mb"] = rss
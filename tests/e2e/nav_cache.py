@@ -0,0 +1,152 @@
+#!/usr/bin/env python3
+"""
+SFIMC E2E Navigation Cache
+Keeps one warm, already-loaded page per route in each worker so consecutive
+units on the same route don't refetch the page, /api/stories and every image.
+
+After a unit finishes, the page's interactive state is fingerprinted. If it
+matches the fingerprint taken right after load, the page is kept and the
+next unit gets it back with scroll, focus, hover and viewport restored in
+place. Anything else (URL changed, menu left open, status/alert shown, form
+edited, scroll animations triggered) counts as dirty and the next unit falls
+back to a full navigation.
+"""
+
+import time
+
+from suite import BASE_URL
+import vitals
+
+# State a unit can leave behind that an in-place restore cannot undo.
+# Form values are compared rather than reset: the site's inputs are
+# React-controlled, so form.reset() would desync them from component state.
+FINGERPRINT_JS = """() => ({
+    url: location.href,
+    expanded: document.querySelectorAll('[aria-expanded="true"]').length,
+    statuses: document.querySelectorAll('[role="status"], [role="alert"]').length,
+    inView: document.querySelectorAll('.in-view').length,
+    bodyOverflow: document.body.style.overflow,
+    editedFields: Array.from(document.querySelectorAll('input, textarea')).filter((el) =>
+        el.type === 'checkbox' || el.type === 'radio'
+            ? el.checked !== el.defaultChecked
+            : el.type !== 'hidden' && el.value !== el.defaultValue
+    ).length,
+})"""
+
+# Scroll to the top, drop focus and move the sequential focus navigation
+# starting point back to the start of <body> so the next Tab lands on the
+# skip link, exactly as after a fresh load.
+RESTORE_JS = """async () => {
+    window.scrollTo(0, 0)
+    if (document.activeElement && document.activeElement !== document.body) {
+        document.activeElement.blur()
+    }
+    const marker = document.createElement('span')
+    marker.tabIndex = -1
+    document.body.prepend(marker)
+    marker.focus({ preventScroll: true })
+    marker.blur()
+    marker.remove()
+    await new Promise((resolve) => requestAnimationFrame(() => requestAnimationFrame(resolve)))
+}"""
+
+
+class NavigationCache:
+    """Per-worker route -> warm page cache in front of the browser pool"""
+
+    def __init__(self, pool, enabled=True):
+        self.pool = pool
+        self.enabled = enabled
+        self._warm = {}
+        self._fingerprints = {}
+        self._nav_times = {}
+        self._loads = {}
+
+    def checkout(self, route, viewport, on_console=None):
+        """
+        Return (page, info) for a unit starting on `route` (None: blank page).
+
+        `on_console` is attached before any navigation so load-time errors are
+        seen. `info` says whether the page was restored in place and how long
+        the restore or full navigation took.
+        """
+        warm = self._warm.pop(route, None) if self.enabled else None
+        if warm is not None and warm.is_closed():
+            # Its recycled context was replaced underneath it
+            self._fingerprints.pop(warm, None)
+            warm = None
+        if warm is not None:
+            if on_console:
+                warm.on("console", on_console)
+            start = time.perf_counter()
+            if warm.viewport_size != viewport:
+                warm.set_viewport_size(viewport)
+            warm.mouse.move(0, 0)
+            warm.evaluate(RESTORE_JS)
+            restore_ms = (time.perf_counter() - start) * 1000
+            nav_ms = self.average_navigation_ms(route)
+            self._loads[warm] = 0
+            return warm, {
+                "restored": True,
+                "restore_ms": round(restore_ms, 1),
+                "saved_ms": round(max(0.0, nav_ms - restore_ms), 1) if nav_ms else 0.0,
+            }
+
+        page = self.pool.open_page(viewport)
+        vitals.attach(page)
+        self._loads[page] = 0
+        page.on("load", lambda _: self._count_load(page))
+        if on_console:
+            page.on("console", on_console)
+        if route is None:
+            return page, {"restored": False, "navigation_ms": 0.0, "saved_ms": 0.0}
+
+        start = time.perf_counter()
+        vitals.navigate(page, f"{BASE_URL}{route}")
+        nav_ms = (time.perf_counter() - start) * 1000
+        self._nav_times.setdefault(route, []).append(nav_ms)
+
+        if self.enabled:
+            self._fingerprints[page] = page.evaluate(FINGERPRINT_JS)
+        return page, {"restored": False, "navigation_ms": round(nav_ms, 1), "saved_ms": 0.0}
+
+    def checkin(self, route, page):
+        """
+        Take a page back after its unit. Returns the number of full document
+        loads that happened on it during the unit and whether it was dirty.
+        """
+        loads = self._loads.pop(page, 0)
+        fingerprint = self._fingerprints.get(page)
+
+        if fingerprint is not None and not page.is_closed():
+            try:
+                clean = page.evaluate(FINGERPRINT_JS) == fingerprint
+            except Exception:
+                clean = False  # Mid-navigation or crashed: treat as dirty
+            if clean:
+                stale = self._warm.pop(route, None)
+                if stale is not None and stale is not page:
+                    self._discard(stale)
+                self._warm[route] = page
+                return loads, False
+
+        self._discard(page)
+        return loads, fingerprint is not None
+
+    def average_navigation_ms(self, route):
+        times = self._nav_times.get(route)
+        return sum(times) / len(times) if times else 0.0
+
+    def close(self):
+        for page in list(self._warm.values()):
+            self._discard(page)
+        self._warm.clear()
+
+    def _count_load(self, page):
+        if page in self._loads:
+            self._loads[page] += 1
+
+    def _discard(self, page):
+        self._fingerprints.pop(page, None)
+        if not page.is_closed():
+            self.pool.release(page)
@@ -0,0 +1,423 @@
+#!/usr/bin/env python3
+"""
+SFIMC E2E Network Waterfall
+Records every request made while a route loads and checks the waterfall for
+waste.
+
+`vitals.navigate()` starts a log on the page's CDP session before page.goto
+and attaches it to the visit once the page is idle, so every cold visit
+carries its requests (URL, type, priority, initiator, status, headers,
+timing, transferred and decoded bytes). Suites with `network=True` then run
+`check()` over their visits, which flags:
+
+    duplicate        the same URL fetched more than once in one load
+    uncompressed     text responses over 1 KB sent without Content-Encoding
+    uncached         static assets (/_next/static, /images, next/image)
+                     without a positive max-age
+    render-blocking  resources the browser held first paint for
+    critical path    chains of high-priority requests each discovered by
+                     the previous one (document -> css -> font) deeper
+                     than MAX_CHAIN_DEPTH
+    oversized image  images over IMAGE_BYTES on the wire, decoded at more
+                     than OVERSIZE_AREA times the area they're drawn at, or
+                     resized from a public/images file over SOURCE_IMAGE_BYTES
+
+Findings are warnings. Request counts, bytes by resource type and findings
+per route go into the suite's results JSON under "network", and the first
+cold load of each route is written as a HAR file to SCREENSHOT_DIR/har.
+"""
+
+from datetime import datetime, timezone
+from statistics import median
+from urllib.parse import parse_qs, urlparse
+import json
+import os
+import re
+import weakref
+
+from suite import SCREENSHOT_DIR
+
+HAR_DIR = f"{SCREENSHOT_DIR}/har"
+PUBLIC_DIR = os.path.normpath(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "public"))
+
+COMPRESSIBLE = re.compile(r"^text/|javascript|json|xml|svg")
+MIN_COMPRESS_BYTES = 1024
+STATIC_PATHS = ("/_next/static/", "/_next/image", "/images/")
+IMAGE_BYTES = 200 * 1024
+SOURCE_IMAGE_BYTES = 300 * 1024
+OVERSIZE_AREA = 4
+CRITICAL_TYPES = ("Document", "Stylesheet", "Script", "Font")
+CRITICAL_PRIORITIES = ("VeryHigh", "High")
+MAX_CHAIN_DEPTH = 3
+
+# What the document looked like once idle: render-blocking resources and drawn image sizes
+PROBE_JS = """() => ({
+    dpr: window.devicePixelRatio || 1,
+    blocking: performance.getEntriesByType('resource')
+        .filter((r) => r.renderBlockingStatus === 'blocking')
+        .map((r) => r.name),
+    images: Array.from(document.images)
+        .filter((img) => img.complete && img.naturalWidth > 0 && img.clientWidth > 0)
+        .map((img) => ({
+            url: img.currentSrc || img.src,
+            natural: [img.naturalWidth, img.naturalHeight],
+            drawn: [img.clientWidth, img.clientHeight],
+        })),
+})"""
+
+
+class NetworkLog:
+    """Requests seen by one page's CDP session since the last reset()"""
+
+    def __init__(self, session):
+        self.session = session
+        self.entries = []
+        self._pending = {}
+        session.on("Network.requestWillBeSent", self._on_request)
+        session.on("Network.responseReceived", self._on_response)
+        session.on("Network.dataReceived", self._on_data)
+        session.on("Network.loadingFinished", self._on_finished)
+        session.on("Network.loadingFailed", self._on_failed)
+        session.send("Network.enable")
+
+    def reset(self):
+        self.entries = []
+        self._pending = {}
+
+    def _on_request(self, event):
+        request_id = event["requestId"]
+        if event["request"]["url"].startswith("data:"):
+            return
+        previous = self._pending.pop(request_id, None)
+        if previous is not None and "redirectResponse" in event:
+            # The id carries on after a redirect; close the hop that redirected
+            self._read_response(previous, event["redirectResponse"])
+            previous["end"] = event["timestamp"]
+
+        initiator = event.get("initiator", {})
+        frames = (initiator.get("stack") or {}).get("callFrames") or []
+        entry = {
+            "url": event["request"]["url"],
+            "method": event["request"]["method"],
+            "type": event.get("type", "Other"),
+            "priority": event["request"].get("initialPriority"),
+            "initiator": initiator.get("url") or (frames[0]["url"] if frames else None),
+            "start": event["timestamp"],
+            "wall_time": event["wallTime"],
+            "end": None,
+            "status": None,
+            "mime": None,
+            "protocol": None,
+            "headers": {},
+            "timing": None,
+            "from_cache": False,
+            "encoded_bytes": 0,
+            "decoded_bytes": 0,
+            "error": None,
+        }
+        self.entries.append(entry)
+        self._pending[request_id] = entry
+
+    def _read_response(self, entry, response):
+        entry["status"] = response["status"]
+        entry["mime"] = response.get("mimeType")
+        entry["protocol"] = response.get("protocol")
+        entry["headers"] = {k.lower(): v for k, v in response.get("headers", {}).items()}
+        entry["timing"] = response.get("timing")
+        entry["from_cache"] = bool(response.get("fromDiskCache") or response.get("fromServiceWorker"))
+
+    def _on_response(self, event):
+        entry = self._pending.get(event["requestId"])
+        if entry is not None:
+            self._read_response(entry, event["response"])
+
+    def _on_data(self, event):
+        entry = self._pending.get(event["requestId"])
+        if entry is not None:
+            entry["decoded_bytes"] += event["dataLength"]
+
+    def _on_finished(self, event):
+        entry = self._pending.pop(event["requestId"], None)
+        if entry is not None:
+            entry["end"] = event["timestamp"]
+            entry["encoded_bytes"] = event["encodedDataLength"]
+
+    def _on_failed(self, event):
+        entry = self._pending.pop(event["requestId"], None)
+        if entry is not None:
+            entry["end"] = event["timestamp"]
+            entry["error"] = event["errorText"]
+
+
+_logs = weakref.WeakKeyDictionary()
+
+
+def start(page):
+    """Start a fresh request log for the page's next navigation"""
+    log = _logs.get(page)
+    if log is None:
+        try:
+            log = _logs[page] = NetworkLog(page.context.new_cdp_session(page))
+        except Exception:
+            return  # Not Chromium: visits just don't carry a waterfall
+    log.reset()
+
+
+def stop(page):
+    """The requests logged since start() plus a probe of the idle document, as plain data"""
+    log = _logs.get(page)
+    if log is None:
+        return None
+    return {"requests": [dict(e) for e in log.entries], "page": page.evaluate(PROBE_JS)}
+
+
+# ===========================================
+# Analysis
+# ===========================================
+
+def public_source(url):
+    """The public/ path an image was served from, directly or through next/image"""
+    parsed = urlparse(url)
+    path = parsed.path
+    if path == "/_next/image":
+        path = parse_qs(parsed.query).get("url", [""])[0]
+    return path if path.startswith("/images/") else None
+
+
+def max_age(headers):
+    cache_control = headers.get("cache-control", "")
+    if "no-store" in cache_control or "no-cache" in cache_control:
+        return 0
+    ages = [int(v) for v in re.findall(r"(?:s-)?max-age=(\d+)", cache_control)]
+    return max(ages) if ages else 0
+
+
+def critical_chain(requests):
+    """The deepest chain of high-priority requests, root first"""
+    critical = [
+        r for r in requests
+        if r["type"] in CRITICAL_TYPES and r["priority"] in CRITICAL_PRIORITIES and r["end"] and not r["error"]
+    ]
+    first = {}
+    for r in critical:
+        first.setdefault(r["url"], r)
+
+    chains = {}
+
+    def chain(request):
+        if request["url"] not in chains:
+            chains[request["url"]] = []  # Guards initiator cycles
+            parent = first.get(request["initiator"])
+            chains[request["url"]] = (chain(parent) if parent and parent is not request else []) + [request]
+        return chains[request["url"]]
+
+    return max((chain(r) for r in critical), key=lambda c: (len(c), c[-1]["end"]), default=[])
+
+
+def oversized_images(requests, probe):
+    drawn = {image["url"]: image for image in probe.get("images", [])}
+    dpr = probe.get("dpr", 1)
+    found = []
+    for r in requests:
+        if r["type"] != "Image" or r["status"] != 200:
+            continue
+        reasons = []
+        if r["encoded_bytes"] > IMAGE_BYTES:
+            reasons.append(f"{r['encoded_bytes'] / 1024:.0f} KB transferred")
+        image = drawn.get(r["url"])
+        if image:
+            (nw, nh), (dw, dh) = image["natural"], image["drawn"]
+            if nw * nh > OVERSIZE_AREA * dw * dh * dpr * dpr:
+                reasons.append(f"{nw}x{nh} decoded for {dw}x{dh} drawn")
+        source = public_source(r["url"])
+        path = os.path.join(PUBLIC_DIR, source.lstrip("/")) if source else None
+        if path and os.path.isfile(path) and os.path.getsize(path) > SOURCE_IMAGE_BYTES:
+            reasons.append(f"public{source} is {os.path.getsize(path) / 1024:.0f} KB")
+        if reasons:
+            found.append({"url": r["url"], "source": source, "bytes": r["encoded_bytes"], "reasons": reasons})
+    return found
+
+
+def analyze(log):
+    """Totals and findings for one visit's request log"""
+    requests, probe = log["requests"], log["page"]
+    origin = min((r["start"] for r in requests), default=0)
+
+    def ms(t):
+        return round((t - origin) * 1000, 1) if t else None
+
+    by_type = {}
+    counts = {}
+    for r in requests:
+        kind = by_type.setdefault(r["type"], {"requests": 0, "transfer_bytes": 0})
+        kind["requests"] += 1
+        kind["transfer_bytes"] += r["encoded_bytes"]
+        if r["method"] == "GET" and r["status"] and not 300 <= r["status"] < 400:
+            counts[r["url"]] = counts.get(r["url"], 0) + 1
+
+    responses = [r for r in requests if r["status"] == 200 and not r["from_cache"]]
+    chain = critical_chain(requests)
+    ends = {r["url"]: r["end"] for r in requests}
+    return {
+        "requests": len(requests),
+        "transfer_bytes": sum(r["encoded_bytes"] for r in requests),
+        "decoded_bytes": sum(r["decoded_bytes"] for r in requests),
+        "failed": [{"url": r["url"], "error": r["error"]} for r in requests if r["error"]],
+        "by_type": by_type,
+        "duplicates": [{"url": url, "count": n} for url, n in counts.items() if n > 1],
+        "uncompressed": [
+            {"url": r["url"], "bytes": r["decoded_bytes"]}
+            for r in responses
+            if COMPRESSIBLE.search(r["mime"] or "") and r["decoded_bytes"] >= MIN_COMPRESS_BYTES
+            and not r["headers"].get("content-encoding")
+        ],
+        "uncached": [
+            {"url": r["url"], "cache_control": r["headers"].get("cache-control")}
+            for r in responses
+            if urlparse(r["url"]).path.startswith(STATIC_PATHS) and max_age(r["headers"]) <= 0
+        ],
+        "render_blocking": [{"url": url, "end_ms": ms(ends.get(url))} for url in probe.get("blocking", [])],
+        "critical_path": {
+            "depth": len(chain),
+            "ms": ms(chain[-1]["end"]) if chain else None,
+            "chain": [r["url"] for r in chain],
+        },
+        "oversized_images": oversized_images(requests, probe),
+    }
+
+
+FINDINGS = {
+    "duplicates": "duplicate requests",
+    "uncompressed": "uncompressed text responses",
+    "uncached": "static assets without cache headers",
+    "render_blocking": "render-blocking resources",
+    "oversized_images": "oversized images",
+}
+
+
+# ===========================================
+# HAR export
+# ===========================================
+
+def to_har(visit):
+    """A HAR 1.2 document for one visit, for DevTools or any HAR viewer"""
+    entries = []
+    for r in visit["network"]["requests"]:
+        t = r["timing"] or {}
+
+        def span(a, b):
+            return round(t[b] - t[a], 3) if t.get(a, -1) >= 0 and t.get(b, -1) >= 0 else -1
+
+        end = r["end"] or r["start"]
+        headers_end = t["requestTime"] + t["receiveHeadersEnd"] / 1000 if t else end
+        entries.append({
+            "pageref": "page_1",
+            "startedDateTime": datetime.fromtimestamp(r["wall_time"], timezone.utc).isoformat(),
+            "time": round((end - r["start"]) * 1000, 3),
+            "request": {
+                "method": r["method"], "url": r["url"], "httpVersion": r["protocol"] or "",
+                "headers": [], "queryString": [], "cookies": [], "headersSize": -1, "bodySize": -1,
+            },
+            "response": {
+                "status": r["status"] or 0, "statusText": r["error"] or "", "httpVersion": r["protocol"] or "",
+                "headers": [{"name": k, "value": v} for k, v in r["headers"].items()],
+                "cookies": [], "content": {"size": r["decoded_bytes"], "mimeType": r["mime"] or ""},
+                "redirectURL": r["headers"].get("location", ""), "headersSize": -1, "bodySize": r["encoded_bytes"],
+            },
+            "cache": {},
+            "timings": {
+                "blocked": -1,
+                "dns": span("dnsStart", "dnsEnd"),
+                "connect": span("connectStart", "connectEnd"),
+                "ssl": span("sslStart", "sslEnd"),
+                "send": max(0, span("sendStart", "sendEnd")),
+                "wait": max(0, span("sendEnd", "receiveHeadersEnd")),
+                "receive": max(0, round((end - headers_end) * 1000, 3)),
+            },
+            "_resourceType": r["type"].lower(),
+            "_priority": r["priority"],
+            "_initiator": r["initiator"],
+        })
+
+    started = entries[0]["startedDateTime"] if entries else datetime.now(timezone.utc).isoformat()
+    return {"log": {
+        "version": "1.2",
+        "creator": {"name": "sfimc-e2e", "version": "1.0"},
+        "pages": [{
+            "id": "page_1",
+            "startedDateTime": started,
+            "title": f"{visit['route']} @ {visit['viewport']}",
+            "pageTimings": {"onContentLoad": visit["dom_content_loaded"] or -1, "onLoad": visit["load"] or -1},
+        }],
+        "entries": entries,
+    }}
+
+
+def save_har(visit):
+    os.makedirs(HAR_DIR, exist_ok=True)
+    slug = visit["route"].strip("/").replace("/", "_") or "home"
+    path = f"{HAR_DIR}/{slug}@{visit['viewport']}.har"
+    with open(path, "w") as f:
+        json.dump(to_har(visit), f)
+    return path
+
+
+# ===========================================
+# Report
+# ===========================================
+
+def check(results, visits):
+    """
+    Analyze every cold visit's waterfall, adding a results["network"] report
+    per route and viewport and a warning per kind of finding.
+    """
+    groups = {}
+    for visit in visits:
+        if not visit["warm"] and visit.get("network"):
+            groups.setdefault(f"{visit['route']} @ {visit['viewport']}", []).append(visit)
+
+    print("\n\n🌐 NETWORK WATERFALL")
+    print("-"*40)
+    print(f"  {'Route':<24}{'Reqs':>6}{'KB':>8}{'Dup':>5}{'Gzip':>6}{'Cache':>7}{'Block':>7}{'Chain':>7}{'Img':>5}")
+
+    report = {}
+    for key, group in sorted(groups.items()):
+        analyses = [analyze(v["network"]) for v in group]
+        first = analyses[0]
+        entry = {
+            "samples": len(group),
+            "requests": median(a["requests"] for a in analyses),
+            "transfer_bytes": median(a["transfer_bytes"] for a in analyses),
+            "decoded_bytes": median(a["decoded_bytes"] for a in analyses),
+            **{k: v for k, v in first.items() if k not in ("requests", "transfer_bytes", "decoded_bytes")},
+            "har": save_har(group[0]),
+        }
+        report[key] = entry
+
+        chain = entry["critical_path"]
+        print(f"  {key:<24}{entry['requests']:>6.0f}{entry['transfer_bytes'] / 1024:>8.0f}"
+              f"{len(entry['duplicates']):>5}{len(entry['uncompressed']):>6}{len(entry['uncached']):>7}"
+              f"{len(entry['render_blocking']):>7}{chain['depth']:>7}{len(entry['oversized_images']):>5}")
+
+        findings = []
+        for finding, label in FINDINGS.items():
+            if entry[finding]:
+                worst = entry[finding][0]
+                detail = {
+                    "duplicates": lambda: f" ({worst['count']} times)",
+                    "oversized_images": lambda: f" ({'; '.join(worst['reasons'])})",
+                }.get(finding, lambda: "")()
+                findings.append(f"{len(entry[finding])} {label}, e.g. {worst['url']}{detail}")
+        if chain["depth"] > MAX_CHAIN_DEPTH:
+            findings.append(f"critical request chain {chain['depth']} deep, ends at {chain['ms']:.0f}ms")
+        if entry["failed"]:
+            findings.append(f"{len(entry['failed'])} failed requests, e.g. {entry['failed'][0]['url']}")
+
+        for finding in findings:
+            results["warnings"].append(f"network {key}: {finding}")
+            print(f"    ⚠️ {finding}")
+        if not findings:
+            results["passed"].append(f"network {key}: no waterfall findings")
+
+    results["network"] = report
+    print(f"\n  HAR files saved to: {HAR_DIR}")
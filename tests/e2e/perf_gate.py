@@ -0,0 +1,211 @@
+#!/usr/bin/env python3
+"""
+SFIMC E2E Performance Gate
+Compares each route's vitals against perf_budgets.json and against a rolling
+baseline of previous runs, failing a route when a metric's median exceeds
+its budget or has regressed by a statistically meaningful amount.
+
+Budgets are keyed by route and viewport. Samples come from dedicated units
+that load each budgeted route several times with the HTTP cache disabled;
+those visits are tagged "sample", and only they are gated or enter the
+baseline (the suites' other loads use the cache and recycled contexts).
+Regression uses a one-sided Mann-Whitney U test (current > baseline) plus a
+minimum relative increase, so a tiny but consistent shift doesn't fail CI.
+"""
+
+from statistics import median
+import json
+import math
+import os
+
+from suite import BASE_URL, SCREENSHOT_DIR
+import vitals
+
+BUDGETS_FILE = os.environ.get(
+    "SFIMC_PERF_BUDGETS", os.path.join(os.path.dirname(os.path.abspath(__file__)), "perf_budgets.json")
+)
+BASELINE_FILE = os.environ.get("SFIMC_PERF_BASELINE", f"{SCREENSHOT_DIR}/perf_baseline.json")
+
+# Budgeted metrics and how to read them from a recorded visit
+METRICS = {
+    "lcp_ms": lambda v: v["lcp"],
+    "js_bytes": lambda v: v["bytes"]["script"],
+    "image_bytes": lambda v: v["bytes"]["img"],
+    "requests": lambda v: v["requests"],
+}
+
+
+def sample_count():
+    """Cold loads per budgeted route/viewport (the runner's --perf-samples)"""
+    return int(os.environ.get("SFIMC_PERF_SAMPLES", "5"))
+
+
+def load_budgets(path=BUDGETS_FILE):
+    with open(path) as f:
+        return json.load(f)
+
+
+def parse_viewport(key):
+    width, height = key.split("x")
+    return {"width": int(width), "height": int(height)}
+
+
+def budget_targets(budgets):
+    """Every (route, viewport) pair the budget file names explicitly"""
+    return [
+        (route, viewport)
+        for route, viewports in budgets["routes"].items()
+        for viewport in viewports
+        if viewport != "*"
+    ]
+
+
+def budget_for(budgets, route, viewport):
+    routes = budgets["routes"].get(route, {})
+    return {**budgets["defaults"], **routes.get("*", {}), **routes.get(viewport, {})}
+
+
+def sample_route(page, route):
+    """Load `route` sample_count() times with the HTTP cache disabled, tagging each visit as a sample"""
+    cdp = page.context.new_cdp_session(page)
+    cdp.send("Network.enable")
+    cdp.send("Network.setCacheDisabled", {"cacheDisabled": True})
+    for _ in range(sample_count()):
+        visit = vitals.navigate(page, f"{BASE_URL}{route}")
+        visit["sample"] = True
+    cdp.detach()
+
+
+# ===========================================
+# Statistics
+# ===========================================
+
+def mann_whitney_greater(current, baseline):
+    """
+    One-sided p-value that `current` tends to be larger than `baseline`
+    (Mann-Whitney U, normal approximation with tie and continuity correction).
+    """
+    n1, n2 = len(current), len(baseline)
+    combined = sorted([(x, 0) for x in current] + [(x, 1) for x in baseline])
+
+    # Average ranks over ties
+    ranks = [0.0] * len(combined)
+    tie_term = 0
+    i = 0
+    while i < len(combined):
+        j = i
+        while j + 1 < len(combined) and combined[j + 1][0] == combined[i][0]:
+            j += 1
+        for k in range(i, j + 1):
+            ranks[k] = (i + j) / 2 + 1
+        size = j - i + 1
+        tie_term += size ** 3 - size
+        i = j + 1
+
+    rank_sum = sum(r for r, (_, group) in zip(ranks, combined) if group == 0)
+    u = rank_sum - n1 * (n1 + 1) / 2
+    mean = n1 * n2 / 2
+    n = n1 + n2
+    variance = n1 * n2 / 12 * ((n + 1) - tie_term / (n * (n - 1)))
+    if variance <= 0:
+        return 1.0
+    z = (u - mean - 0.5) / math.sqrt(variance)
+    return 0.5 * math.erfc(z / math.sqrt(2))
+
+
+# ===========================================
+# Baseline store
+# ===========================================
+
+def load_baseline(path=BASELINE_FILE):
+    if not os.path.exists(path):
+        return {}
+    with open(path) as f:
+        return json.load(f)
+
+
+def save_baseline(baseline, path=BASELINE_FILE):
+    with open(path, "w") as f:
+        json.dump(baseline, f, indent=2)
+
+
+# ===========================================
+# Gate
+# ===========================================
+
+def check(results, visits, budgets=None, baseline_path=BASELINE_FILE, update_baseline=True):
+    """
+    Gate every budgeted (route, viewport) sampled in `visits`, appending to
+    results["passed"/"failed"/"warnings"] and adding a results["performance"]
+    report. The baseline only absorbs this run's samples if nothing failed.
+    """
+    budgets = budgets or load_budgets()
+    regression = budgets["regression"]
+    baseline = load_baseline(baseline_path)
+    targets = set(budget_targets(budgets))
+
+    groups = {}
+    for visit in visits:
+        if visit.get("sample") and (visit["route"], visit["viewport"]) in targets:
+            groups.setdefault((visit["route"], visit["viewport"]), []).append(visit)
+
+    print("\n\n📈 PERFORMANCE BUDGETS")
+    print("-"*40)
+
+    report = {}
+    perf_failed = False
+    for (route, viewport), group in sorted(groups.items()):
+        key = f"{route} @ {viewport}"
+        limits = budget_for(budgets, route, viewport)
+        history = baseline.get(key, {})
+        report[key] = {}
+        route_failed = False
+
+        for metric, read in METRICS.items():
+            samples = [value for value in (read(v) for v in group) if value is not None]
+            if not samples:
+                continue
+            current = median(samples)
+            past = history.get(metric, [])
+            entry = {"samples": samples, "median": current, "budget": limits.get(metric)}
+
+            if entry["budget"] is not None and current > entry["budget"]:
+                results["failed"].append(f"perf {key}: {metric} median {current:.0f} exceeds budget {entry['budget']}")
+                print(f"  ❌ {key}: {metric} {current:.0f} > budget {entry['budget']}")
+                route_failed = True
+
+            if len(past) >= regression["min_baseline_samples"] and len(samples) >= 3:
+                base = median(past)
+                p_value = mann_whitney_greater(samples, past)
+                increase = (current - base) / base if base else 0.0
+                entry.update(baseline_median=base, p_value=round(p_value, 4), relative_change=round(increase, 3))
+                if p_value < regression["p_value"] and increase > regression["min_relative_increase"]:
+                    results["failed"].append(
+                        f"perf {key}: {metric} regressed {increase:+.0%} vs baseline "
+                        f"({current:.0f} vs {base:.0f}, p={p_value:.3f})"
+                    )
+                    print(f"  ❌ {key}: {metric} regressed {increase:+.0%} (p={p_value:.3f})")
+                    route_failed = True
+
+            report[key][metric] = entry
+
+        if all(len(history.get(m, [])) < regression["min_baseline_samples"] for m in METRICS):
+            results["warnings"].append(f"perf {key}: baseline too small for regression check")
+            print(f"  ⚠️ {key}: baseline has too few samples, regression check skipped")
+
+        if not route_failed:
+            results["passed"].append(f"perf {key}: within budget and baseline")
+            print(f"  ✅ {key}: within budget ({len(group)} samples)")
+        perf_failed = perf_failed or route_failed
+
+    results["performance"] = report
+
+    if update_baseline and report and not perf_failed:
+        for key, metrics in report.items():
+            stored = baseline.setdefault(key, {})
+            for metric, entry in metrics.items():
+                stored[metric] = (stored.get(metric, []) + entry["samples"])[-regression["max_baseline_samples"]:]
+        save_baseline(baseline, baseline_path)
+        print(f"  📄 Baseline updated: {baseline_path}")
+
+    return report
@@ -0,0 +1,302 @@
+#!/usr/bin/env python3
+"""
+SFIMC E2E Interaction Profiling
+Records a Chromium trace around each interaction the suites exercise and
+reports how smoothly it ran.
+
+    with profiling.interaction(page, "card_hover"):
+        card.hover()
+        readiness.settle(page, budget_ms=400)
+
+traces the block, optionally under CPU throttling (SFIMC_CPU_THROTTLE, the
+runner's --cpu-throttle; 4 is a mid-range phone). The trace is written to
+SCREENSHOT_DIR/traces/<name>.json, which loads in the DevTools Performance
+panel, and reduced to per-interaction metrics:
+
+    long_tasks    main-thread tasks over 50ms, each with what took most of it
+    tbt_ms        the part of each long task over 50ms, summed
+    frames        frames presented vs dropped by the compositor
+    main_thread   main-thread self time by kind: scripting, style, layout,
+                  paint, gc, other
+    scripts       scripting self time by script URL
+    components    CPU-profile time by the innermost PascalCase function on
+                  the stack (React components; names only survive in
+                  development or unminified builds)
+
+The runner collects every unit's interactions into the suite's results JSON
+under "interaction_profiles". SFIMC_PROFILE=0 (--no-profile) turns tracing
+off; the wrapped steps still run.
+"""
+
+from contextlib import contextmanager
+import json
+import os
+import re
+import time
+
+from suite import SCREENSHOT_DIR
+
+TRACE_DIR = f"{SCREENSHOT_DIR}/traces"
+LONG_TASK_US = 50_000
+
+CATEGORIES = [
+    "devtools.timeline",
+    "disabled-by-default-devtools.timeline",
+    "disabled-by-default-devtools.timeline.frame",
+    "disabled-by-default-devtools.timeline.stack",
+    "disabled-by-default-v8.cpu_profiler",
+    "v8.execute",
+    "blink.user_timing",
+    "benchmark",
+    "toplevel",
+]
+
+# Main-thread trace event -> the kind of work its self time counts as
+KINDS = {
+    "FunctionCall": "scripting",
+    "EvaluateScript": "scripting",
+    "v8.compile": "scripting",
+    "v8.compileModule": "scripting",
+    "V8.Execute": "scripting",
+    "TimerFire": "scripting",
+    "EventDispatch": "scripting",
+    "FireAnimationFrame": "scripting",
+    "FireIdleCallback": "scripting",
+    "RunMicrotasks": "scripting",
+    "UpdateLayoutTree": "style",
+    "RecalculateStyles": "style",
+    "Layout": "layout",
+    "HitTest": "layout",
+    "PrePaint": "paint",
+    "Paint": "paint",
+    "PaintImage": "paint",
+    "Layerize": "paint",
+    "Decode Image": "paint",
+    "MinorGC": "gc",
+    "MajorGC": "gc",
+    "V8.GC_SCAVENGER": "gc",
+    "BlinkGC.AtomicPhase": "gc",
+}
+TASKS = ("RunTask", "ThreadControllerImpl::RunTask")
+COMPONENT_NAME = re.compile(r"[A-Z][a-z0-9]+(?:[A-Z][A-Za-z0-9]*)*")
+BUILTINS = {"Promise", "Array", "Object", "Function", "Error", "Date", "Map", "Set", "String", "Number", "Reflect"}
+
+
+def enabled():
+    return os.environ.get("SFIMC_PROFILE", "1") != "0"
+
+
+def cpu_throttle():
+    """CPU slowdown applied while tracing (the runner's --cpu-throttle)"""
+    return float(os.environ.get("SFIMC_CPU_THROTTLE", "1"))
+
+
+_profiles = []
+
+
+def start_unit():
+    """Begin a fresh list of interaction profiles; the runner calls this before every unit"""
+    global _profiles
+    _profiles = []
+    return _profiles
+
+
+def finish_unit():
+    """The current unit's interaction profiles, as plain data for the runner"""
+    return list(_profiles)
+
+
+@contextmanager
+def interaction(page, name):
+    """Trace the wrapped steps as one interaction called `name`"""
+    tracing = _start(page) if enabled() else None
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        if tracing:
+            _stop(tracing, name, (time.perf_counter() - start) * 1000)
+
+
+def _start(page):
+    """Throttle and start tracing; None when the browser can't trace (not Chromium, already tracing)"""
+    browser = page.context.browser
+    try:
+        session = page.context.new_cdp_session(page)
+        if cpu_throttle() > 1:
+            session.send("Emulation.setCPUThrottlingRate", {"rate": cpu_throttle()})
+        browser.start_tracing(page=page, categories=CATEGORIES)
+    except Exception as e:
+        print(f"  ⚠️ Not profiling: {type(e).__name__}: {e}")
+        return None
+    return browser, session
+
+
+def _stop(tracing, name, duration_ms):
+    browser, session = tracing
+    profile = {"name": name, "duration_ms": round(duration_ms, 1), "cpu_throttle": cpu_throttle()}
+    try:
+        data = browser.stop_tracing()
+        if cpu_throttle() > 1:
+            session.send("Emulation.setCPUThrottlingRate", {"rate": 1})
+        session.detach()
+    except Exception as e:
+        # Page or browser went away mid-interaction: the unit's own error says why
+        _profiles.append({**profile, "error": f"{type(e).__name__}: {e}"})
+        return
+
+    os.makedirs(TRACE_DIR, exist_ok=True)
+    profile["trace"] = f"{TRACE_DIR}/{name}.json"
+    with open(profile["trace"], "wb") as f:
+        f.write(data)
+    profile.update(analyze(json.loads(data)))
+    _profiles.append(profile)
+    print(f"  ⏱️ {name}: {profile['long_task_count']} long tasks, TBT {profile['tbt_ms']:.0f}ms, "
+          f"{profile['frames']['dropped']} dropped frames")
+
+
+# ===========================================
+# Trace analysis
+# ===========================================
+
+def _data(event):
+    return (event.get("args") or {}).get("data") or {}
+
+
+def main_thread(events):
+    """(pid, tid) of the busiest renderer main thread"""
+    names = {
+        (e["pid"], e["tid"]): e["args"]["name"]
+        for e in events if e.get("ph") == "M" and e.get("name") == "thread_name"
+    }
+    counts = {}
+    for e in events:
+        key = (e.get("pid"), e.get("tid"))
+        if e.get("ph") == "X" and names.get(key) == "CrRendererMain":
+            counts[key] = counts.get(key, 0) + 1
+    return max(counts, key=counts.get) if counts else None
+
+
+def self_times(events):
+    """
+    (event, self time, script URL, root task) for nested complete events,
+    with the time of each event's children taken out of its own.
+    """
+    stack, done = [], []
+    for e in sorted(events, key=lambda e: (e["ts"], -e["dur"])):
+        while stack and stack[-1][0]["ts"] + stack[-1][0]["dur"] <= e["ts"]:
+            done.append(stack.pop())
+        if stack:
+            parent = stack[-1]
+            parent[1] -= min(e["dur"], parent[0]["ts"] + parent[0]["dur"] - e["ts"])
+        url = _data(e).get("url") or (stack[-1][2] if stack else None)
+        stack.append([e, e["dur"], url, stack[0][0] if stack else e])
+    return done + stack[::-1]
+
+
+def count_frames(events, pid):
+    """Presented and dropped frames, from PipelineReporter or the older DrawFrame/DroppedFrame events"""
+    reporters = [e for e in events if e.get("name") == "PipelineReporter" and e.get("ph") == "b"]
+    own = [e for e in reporters if e.get("pid") == pid] or reporters
+    if own:
+        states = [(e.get("args") or {}).get("chrome_frame_reporter", {}).get("state", "") for e in own]
+        presented = sum(1 for s in states if s.startswith("STATE_PRESENTED"))
+        dropped = sum(1 for s in states if s == "STATE_DROPPED")
+    else:
+        presented = sum(1 for e in events if e.get("name") == "DrawFrame")
+        dropped = sum(1 for e in events if e.get("name") == "DroppedFrame")
+    total = presented + dropped
+    return {"presented": presented, "dropped": dropped, "dropped_pct": round(100 * dropped / total, 1) if total else 0.0}
+
+
+def component_times(events, pid):
+    """CPU-profile milliseconds by the innermost PascalCase function on each sampled stack"""
+    nodes, parents = {}, {}
+    samples = []
+    for e in events:
+        if e.get("name") != "ProfileChunk" or e.get("pid") != pid:
+            continue
+        data = _data(e)
+        profile = data.get("cpuProfile") or {}
+        for node in profile.get("nodes", []):
+            nodes[node["id"]] = node["callFrame"].get("functionName", "")
+            if "parent" in node:
+                parents[node["id"]] = node["parent"]
+        samples.extend(zip(profile.get("samples", []), data.get("timeDeltas", [])))
+
+    # A sample's time is the gap to the next one
+    times = {}
+    for (node, _), (_, delta) in zip(samples, samples[1:]):
+        component = node
+        while component is not None:
+            name = nodes.get(component, "")
+            if COMPONENT_NAME.fullmatch(name) and name not in BUILTINS:
+                times[name] = times.get(name, 0) + max(0, delta)
+                break
+            component = parents.get(component)
+    return sorted(({"name": n, "ms": round(us / 1000, 1)} for n, us in times.items()), key=lambda c: -c["ms"])[:10]
+
+
+def analyze(trace):
+    """Per-interaction metrics from a Chromium trace"""
+    events = trace["traceEvents"] if isinstance(trace, dict) else trace
+    main = main_thread(events)
+    main_events = [
+        e for e in events
+        if (e.get("pid"), e.get("tid")) == main and e.get("ph") == "X" and "dur" in e
+    ]
+
+    by_kind = dict.fromkeys(("scripting", "style", "layout", "paint", "gc", "other"), 0)
+    scripts = {}
+    task_sources = {}
+    for event, own, url, root in self_times(main_events):
+        kind = KINDS.get(event["name"], "other")
+        by_kind[kind] += own
+        source = (url or "(anonymous)") if kind == "scripting" else kind
+        if kind == "scripting":
+            scripts[source] = scripts.get(source, 0) + own
+        if root["name"] in TASKS and root["dur"] > LONG_TASK_US:
+            sources = task_sources.setdefault(id(root), {})
+            sources[source] = sources.get(source, 0) + own
+
+    origin = min((e["ts"] for e in main_events), default=0)
+    long_tasks = []
+    for task in (e for e in main_events if e["name"] in TASKS and e["dur"] > LONG_TASK_US):
+        sources = task_sources.get(id(task), {})
+        top = max(sources, key=sources.get) if sources else None
+        long_tasks.append({
+            "start_ms": round((task["ts"] - origin) / 1000, 1),
+            "duration_ms": round(task["dur"] / 1000, 1),
+            "top": top,
+            "top_ms": round(sources[top] / 1000, 1) if top else None,
+        })
+
+    return {
+        "long_task_count": len(long_tasks),
+        "long_tasks": sorted(long_tasks, key=lambda t: -t["duration_ms"])[:10],
+        "tbt_ms": round(sum(t["duration_ms"] - LONG_TASK_US / 1000 for t in long_tasks), 1),
+        "frames": count_frames(events, main[0] if main else None),
+        "main_thread_ms": {kind: round(us / 1000, 1) for kind, us in by_kind.items()},
+        "scripts": sorted(
+            ({"url": url, "ms": round(us / 1000, 1)} for url, us in scripts.items()), key=lambda s: -s["ms"]
+        )[:10],
+        "components": component_times(events, main[0]) if main else [],
+    }
+
+
+# ===========================================
+# Reporting
+# ===========================================
+
+def print_table(profiles):
+    print(f"\n🎞️  INTERACTION PROFILES (CPU throttle {profiles[0]['cpu_throttle']:g}x)")
+    print(f"  {'Interaction':<28}{'ms':>7}{'Long':>6}{'TBT':>7}{'Drop':>6}{'Script':>8}{'Style':>7}{'Layout':>8}  Top cost")
+    for p in profiles:
+        if "error" in p:
+            print(f"  {p['name']:<28}  ⚠️ {p['error']}")
+            continue
+        main = p["main_thread_ms"]
+        top = p["components"][0]["name"] if p["components"] else (p["scripts"][0]["url"].rsplit("/", 1)[-1] if p["scripts"] else "-")
+        print(f"  {p['name']:<28}{p['duration_ms']:>7.0f}{p['long_task_count']:>6}{p['tbt_ms']:>7.0f}"
+              f"{p['frames']['dropped']:>6}{main['scripting']:>8.0f}{main['style']:>7.0f}{main['layout']:>8.0f}  {top}")
+    print(f"  Traces saved to: {TRACE_DIR} (open in DevTools > Performance)")
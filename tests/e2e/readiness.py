@@ -0,0 +1,157 @@
+#!/usr/bin/env python3
+"""
+SFIMC E2E Readiness Waits
+Event-driven replacements for fixed wait_for_timeout sleeps.
+
+Each helper waits on a concrete signal (animations finishing, an attribute
+flipping, a status region appearing, the URL changing, frames settling) and
+records how long it actually waited against the fixed sleep it replaced, so
+the runner can report a per-unit sleep budget.
+"""
+
+import os
+import time
+
+from playwright.sync_api import TimeoutError as PlaywrightTimeoutError
+
+# Upper bound for any single readiness wait; generous so slow CI doesn't flake
+READY_TIMEOUT_MS = int(os.environ.get("SFIMC_READY_TIMEOUT_MS", "5000"))
+
+# Wait for two frames, then for every finite running CSS animation/transition
+# to finish; repeat until a pass finds nothing running (state changes often
+# start new transitions a frame later). Infinite animations such as the live
+# indicator pulse are ignored.
+SETTLE_JS = """async (timeout) => {
+    const frame = () => new Promise((resolve) => requestAnimationFrame(() => resolve()))
+    const deadline = performance.now() + timeout
+    const running = () => document.getAnimations().filter((a) => {
+        const timing = a.effect && a.effect.getComputedTiming()
+        return a.playState === 'running' && timing && Number.isFinite(timing.endTime)
+    })
+
+    while (performance.now() < deadline) {
+        await frame()
+        await frame()
+        const active = running()
+        if (active.length === 0) return true
+        await Promise.race([
+            Promise.allSettled(active.map((a) => a.finished)),
+            new Promise((resolve) => setTimeout(resolve, Math.max(0, deadline - performance.now()))),
+        ])
+    }
+    return running().length === 0
+}"""
+
+FRAMES_JS = """async (count) => {
+    for (let i = 0; i < count; i++) {
+        await new Promise((resolve) => requestAnimationFrame(() => resolve()))
+    }
+}"""
+
+
+class SleepBudget:
+    """Actual readiness wait time for one unit vs. the fixed sleeps it replaced"""
+
+    def __init__(self):
+        self.waits = []
+
+    def record(self, signal, budget_ms, waited_ms, ready):
+        self.waits.append({
+            "signal": signal,
+            "budget_ms": budget_ms,
+            "waited_ms": round(waited_ms, 1),
+            "ready": ready,
+        })
+
+    def summary(self):
+        budget = sum(w["budget_ms"] for w in self.waits)
+        waited = sum(w["waited_ms"] for w in self.waits)
+        by_signal = {}
+        for w in self.waits:
+            entry = by_signal.setdefault(w["signal"], {"count": 0, "budget_ms": 0, "waited_ms": 0.0})
+            entry["count"] += 1
+            entry["budget_ms"] += w["budget_ms"]
+            entry["waited_ms"] = round(entry["waited_ms"] + w["waited_ms"], 1)
+        return {
+            "waits": len(self.waits),
+            "budget_ms": budget,
+            "waited_ms": round(waited, 1),
+            "saved_ms": round(budget - waited, 1),
+            "timeouts": sum(1 for w in self.waits if not w["ready"]),
+            "by_signal": by_signal,
+        }
+
+
+_budget = SleepBudget()
+
+
+def start_budget():
+    """Begin a fresh sleep budget; the runner calls this before every unit"""
+    global _budget
+    _budget = SleepBudget()
+    return _budget
+
+
+def _timed(signal, budget_ms, wait):
+    start = time.perf_counter()
+    try:
+        ready = wait() is not False
+    except PlaywrightTimeoutError:
+        ready = False
+    _budget.record(signal, budget_ms, (time.perf_counter() - start) * 1000, ready)
+    return ready
+
+
+# ===========================================
+# Signals
+# ===========================================
+
+def settle(page, budget_ms, timeout_ms=READY_TIMEOUT_MS):
+    """Wait until CSS transitions/animations have finished and frames are painting"""
+    return _timed("animations", budget_ms, lambda: page.evaluate(SETTLE_JS, timeout_ms))
+
+
+def next_frame(page, budget_ms, frames=1):
+    """Wait for the next requestAnimationFrame(s), e.g. after focus or input changes"""
+    return _timed("frame", budget_ms, lambda: page.evaluate(FRAMES_JS, frames))
+
+
+def attribute(locator, name, value, budget_ms, timeout_ms=READY_TIMEOUT_MS, then_settle=True):
+    """Wait for an attribute such as aria-expanded to take `value`, then for its transition"""
+    page = locator.page
+
+    def wait():
+        page.wait_for_function(
+            "([el, name, value]) => el.getAttribute(name) === value",
+            arg=[locator.element_handle(timeout=timeout_ms), name, value],
+            timeout=timeout_ms,
+        )
+        return page.evaluate(SETTLE_JS, timeout_ms) if then_settle else True
+
+    return _timed(name, budget_ms, wait)
+
+
+def visible(page, selector, budget_ms, timeout_ms=READY_TIMEOUT_MS, signal=None):
+    """Wait for the first element matching `selector` to become visible"""
+    def wait():
+        page.locator(selector).first.wait_for(state="visible", timeout=timeout_ms)
+        return page.evaluate(SETTLE_JS, timeout_ms)
+
+    return _timed(signal or selector, budget_ms, wait)
+
+
+def route_change(page, from_url, budget_ms, timeout_ms=READY_TIMEOUT_MS):
+    """Wait for the URL to move away from `from_url` (full or client-side navigation)"""
+    return _timed("route", budget_ms, lambda: page.wait_for_url(lambda url: url != from_url,
+                                                                wait_until="commit", timeout=timeout_ms))
+
+
+def viewport(page, size, budget_ms, timeout_ms=READY_TIMEOUT_MS):
+    """Resize, then wait for the layout to see the new width and for animations to settle"""
+    page.set_viewport_size(size)
+
+    def wait():
+        page.wait_for_function("(width) => window.innerWidth === width", arg=size["width"], timeout=timeout_ms)
+        return page.evaluate(SETTLE_JS, timeout_ms)
+
+    return _timed("resize", budget_ms, wait)
@@ -0,0 +1,375 @@
+#!/usr/bin/env python3
+"""
+SFIMC E2E Parallel Runner
+Shards the homepage, interaction and multi-page suites into independent units
+and runs them across a pool of worker processes, each with its own browser.
+
+Usage:
+    python tests/e2e/runner.py                      # all suites, one worker per core
+    python tests/e2e/runner.py --workers 8 --suite pages
+    python tests/e2e/runner.py --shard 2/4          # CI: run the 2nd of 4 slices
+    python tests/e2e/runner.py --context-policy recycle --recycle-after 10
+    python tests/e2e/runner.py --no-nav-cache       # full navigation before every unit
+    python tests/e2e/runner.py --perf-samples 10 --no-update-baseline
+    python tests/e2e/runner.py --update-visual-baselines   # accept every visual change
+    python tests/e2e/runner.py --cpu-throttle 4     # profile interactions on a slow CPU
+    SFIMC_SCREENSHOT_FORMAT=jpeg python tests/e2e/runner.py   # small lossy screenshots
+"""
+
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from contextlib import redirect_stdout
+import argparse
+import atexit
+import io
+import json
+import multiprocessing
+import os
+import time
+
+from browser_pool import CONTEXT_POLICIES, BrowserPool
+from nav_cache import NavigationCache
+import network
+import perf_gate
+import profiling
+import readiness
+import screenshots
+import visual
+import vitals
+from suite import SCREENSHOT_DIR, new_results, merge_results, print_banner, print_summary, save_results
+
+
+def load_suites():
+    """Import the suite modules lazily so they can import this runner themselves"""
+    import test_homepage
+    import test_interactions
+    import test_pages
+
+    return {s.name: s for s in (test_homepage.SUITE, test_interactions.SUITE, test_pages.SUITE)}
+
+
+def run_unit(cache, unit):
+    """Run one unit on a page from the navigation cache and return its outcome as plain data"""
+    results = new_results()
+    console_errors = []
+    log = io.StringIO()
+    budget = readiness.start_budget()
+    screenshots.start_unit()
+    visual.start_unit()
+    profiling.start_unit()
+    recorder = vitals.start_recording()
+    start = time.perf_counter()
+    page = None
+
+    def on_console(msg):
+        if msg.type == "error":
+            console_errors.append({"page": msg.page.url if msg.page else "", "msg": msg.text})
+
+    try:
+        with redirect_stdout(log):
+            page, navigation = cache.checkout(unit.route, unit.viewport, on_console)
+            unit.run(page, results)
+    except Exception as e:
+        results["failed"].append(f"{unit.name}: crashed ({type(e).__name__}: {e})")
+        log.write(f"  ❌ Crashed: {type(e).__name__}: {e}\n")
+    finally:
+        if page is not None:
+            page.remove_listener("console", on_console)
+            try:
+                vitals.finish(page)
+            except Exception as e:
+                log.write(f"  ⚠️ Could not read final vitals: {type(e).__name__}: {e}\n")
+            loads, dirty = cache.checkin(unit.route, page)
+        else:
+            navigation, loads, dirty = {"restored": False, "saved_ms": 0.0}, 0, False
+
+    return {
+        "id": unit.id,
+        "results": results,
+        "console_errors": console_errors,
+        "log": log.getvalue(),
+        "duration": time.perf_counter() - start,
+        "worker": os.getpid(),
+        "pool": cache.pool.stats(),
+        "navigation": {**navigation, "full_navigations": loads, "dirty": dirty},
+        "sleep_budget": budget.summary(),
+        "screenshots": screenshots.finish_unit(),
+        "visual": visual.finish_unit(),
+        "profiles": profiling.finish_unit(),
+        "visits": recorder.visits,
+    }
+
+
+# ===========================================
+# Worker processes
+# ===========================================
+
+_worker = {}
+
+
+def _init_worker(policy, recycle_after, nav_cache):
+    """Launch one browser per worker process; it lives as long as the process"""
+    pool = BrowserPool(policy=policy, recycle_after=recycle_after).start()
+    cache = NavigationCache(pool, enabled=nav_cache)
+    # atexit runs last-registered first: warm pages go before the browser
+    atexit.register(pool.close)
+    atexit.register(cache.close)
+    atexit.register(screenshots.close)
+    _worker["cache"] = cache
+    _worker["units"] = {u.id: u for s in load_suites().values() for u in s.units}
+
+
+def _run_in_worker(unit_id):
+    return run_unit(_worker["cache"], _worker["units"][unit_id])
+
+
+def _run_serial(units, report, policy, recycle_after, nav_cache):
+    with BrowserPool(policy=policy, recycle_after=recycle_after) as pool:
+        cache = NavigationCache(pool, enabled=nav_cache)
+        try:
+            for unit in units:
+                report(run_unit(cache, unit))
+        finally:
+            cache.close()
+            screenshots.close()
+
+
+def _run_parallel(units, workers, report, policy, recycle_after, nav_cache):
+    ctx = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=workers, mp_context=ctx, initializer=_init_worker,
+                             initargs=(policy, recycle_after, nav_cache)) as pool:
+        futures = [pool.submit(_run_in_worker, unit.id) for unit in units]
+        for future in as_completed(futures):
+            report(future.result())
+
+
+# ===========================================
+# Scheduling & merging
+# ===========================================
+
+def select_shard(units, shard):
+    """Keep every Nth unit for a "K/N" shard spec (1-based K)"""
+    if not shard:
+        return units
+    index, count = (int(part) for part in shard.split("/"))
+    if not 1 <= index <= count:
+        raise ValueError(f"Invalid shard {shard!r}: expected K/N with 1 <= K <= N")
+    return [u for i, u in enumerate(units) if i % count == index - 1]
+
+
+def summarize_pools(outcomes):
+    """Reduce the cumulative pool stats each unit reports to one entry per worker"""
+    latest = {}
+    for outcome in outcomes.values():
+        stats = outcome["pool"]
+        current = latest.get(stats["pid"])
+        if current is None or stats["contexts_created"] + stats["contexts_reused"] > \
+                current["contexts_created"] + current["contexts_reused"]:
+            latest[stats["pid"]] = stats
+
+    pools = sorted(latest.values(), key=lambda s: s["pid"])
+    return {
+        "browsers_launched": len(pools),
+        "launch_time": round(sum(s["launch_time"] for s in pools), 3),
+        "contexts_created": sum(s["contexts_created"] for s in pools),
+        "contexts_reused": sum(s["contexts_reused"] for s in pools),
+        "context_create_time": round(sum(s["context_create_time"] for s in pools), 3),
+        "context_teardown_time": round(sum(s["context_teardown_time"] for s in pools), 3),
+        "peak_rss_mb": round(sum(s["peak_rss_mb"] or 0 for s in pools), 1),
+        "workers": pools,
+    }
+
+
+def print_pool_summary(pools, unit_count):
+    print_banner("BROWSER POOL")
+    print(f"🚀 Browsers launched:  {pools['browsers_launched']} ({pools['launch_time']:.2f}s total launch)")
+    print(f"🧪 Contexts:           {pools['contexts_created']} created, {pools['contexts_reused']} reused "
+          f"({pools['context_create_time']:.2f}s create, {pools['context_teardown_time']:.2f}s teardown)")
+    if pools["browsers_launched"]:
+        avoided = unit_count - pools["browsers_launched"]
+        per_launch = pools["launch_time"] / pools["browsers_launched"]
+        print(f"💾 Peak RSS:           {pools['peak_rss_mb']:.0f} MB across workers")
+        print(f"⏱️  Launches avoided:   {avoided} (~{avoided * per_launch:.1f}s vs. a browser per unit)")
+
+
+def summarize_navigation(outcomes):
+    """Full page loads vs. in-place restores for a set of unit outcomes"""
+    navigation = [o["navigation"] for o in outcomes]
+    return {
+        "full_navigations": sum(n["full_navigations"] for n in navigation),
+        "restored_in_place": sum(1 for n in navigation if n["restored"]),
+        "dirty_fallbacks": sum(1 for n in navigation if n["dirty"]),
+        "time_saved_ms": round(sum(n["saved_ms"] for n in navigation), 1),
+    }
+
+
+def print_sleep_budget(units, outcomes):
+    """Per-unit readiness wait time against the fixed sleeps it replaced"""
+    print_banner("SLEEP BUDGET (readiness waits vs. fixed sleeps)")
+    total_budget = total_waited = 0
+    for unit in units:
+        budget = outcomes[unit.id]["sleep_budget"]
+        if not budget["waits"]:
+            continue
+        total_budget += budget["budget_ms"]
+        total_waited += budget["waited_ms"]
+        timeouts = f", {budget['timeouts']} timed out" if budget["timeouts"] else ""
+        print(f"  {unit.id}: {budget['waited_ms']:.0f} ms waited / {budget['budget_ms']} ms budget "
+              f"({budget['waits']} waits{timeouts})")
+    print(f"\n⏳ Total: {total_waited / 1000:.1f}s waited vs. {total_budget / 1000:.1f}s of fixed sleeps")
+
+
+def run_suites(suites, workers=1, shard=None, policy="fresh", recycle_after=20, nav_cache=True,
+               update_baseline=True, update_visual=False):
+    """
+    Run the given suites and return {suite name: merged results}.
+
+    Each suite's merged results are written to its usual JSON file so
+    existing consumers keep working; per-unit timings and browser pool
+    costs go to run_summary.json.
+    """
+    units = select_shard([u for s in suites for u in s.units], shard)
+    workers = max(1, min(workers, len(units) or 1))
+    outcomes = {}
+    start = time.perf_counter()
+
+    def report(outcome):
+        outcomes[outcome["id"]] = outcome
+        print(f"\n[{len(outcomes)}/{len(units)}] {outcome['id']} ({outcome['duration']:.1f}s)")
+        print(outcome["log"], end="")
+
+    print_banner(f"SFIMC E2E RUN: {len(units)} units on {workers} worker(s)")
+
+    if workers == 1:
+        _run_serial(units, report, policy, recycle_after, nav_cache)
+    else:
+        _run_parallel(units, workers, report, policy, recycle_after, nav_cache)
+
+    wall_time = time.perf_counter() - start
+
+    merged = {}
+    for s in suites:
+        ran = [u for u in s.units if u.id in outcomes]
+        if not ran:
+            continue
+
+        print_banner(s.title)
+        results = new_results()
+        console_errors = []
+        for unit in ran:
+            merge_results(results, outcomes[unit.id]["results"])
+            console_errors.extend(outcomes[unit.id]["console_errors"])
+
+        if s.finalize:
+            s.finalize(results, console_errors)
+
+        if s.perf_gate:
+            visits = [v for u in ran for v in outcomes[u.id]["visits"]]
+            perf_gate.check(results, visits, update_baseline=update_baseline and not shard)
+
+        if s.network:
+            network.check(results, [v for u in ran for v in outcomes[u.id]["visits"]])
+
+        if s.visual:
+            visual.check(results, [c for u in ran for c in outcomes[u.id]["visual"]], s.name,
+                         update_baseline=update_visual)
+
+        profiles = [p for u in ran for p in outcomes[u.id]["profiles"]]
+        if profiles:
+            results["interaction_profiles"] = profiles
+
+        results["navigation"] = summarize_navigation(outcomes[u.id] for u in ran)
+        results["metrics"] = vitals.summarize_visits(v for u in ran for v in outcomes[u.id]["visits"])
+
+        print_summary(s.summary_title, results)
+        print("\n📈 PERFORMANCE BY ROUTE (median, ms)")
+        vitals.print_metrics_table(results["metrics"])
+        if profiles:
+            profiling.print_table(profiles)
+        save_results(results, s.results_file)
+        merged[s.name] = results
+
+    unit_time = sum(o["duration"] for o in outcomes.values())
+    pools = summarize_pools(outcomes)
+    summary = {
+        "workers": workers,
+        "shard": shard,
+        "context_policy": policy,
+        "browser_pool": pools,
+        "navigation": summarize_navigation(outcomes.values()),
+        "screenshots": screenshots.summarize(o["screenshots"] for o in outcomes.values()),
+        "metrics": vitals.summarize_visits(v for o in outcomes.values() for v in o["visits"]),
+        "wall_time": round(wall_time, 3),
+        "unit_time": round(unit_time, 3),
+        "units": [
+            {
+                "id": u.id,
+                "duration": round(outcomes[u.id]["duration"], 3),
+                "worker": outcomes[u.id]["worker"],
+                "sleep_budget": outcomes[u.id]["sleep_budget"],
+                "navigation": outcomes[u.id]["navigation"],
+            }
+            for u in units
+        ],
+    }
+    with open(f"{SCREENSHOT_DIR}/run_summary.json", "w") as f:
+        json.dump(summary, f, indent=2)
+
+    print_pool_summary(pools, len(units))
+    print_sleep_budget(units, outcomes)
+    nav = summary["navigation"]
+    print(f"🧭 Navigations: {nav['full_navigations']} full loads, {nav['restored_in_place']} restored in place "
+          f"(~{nav['time_saved_ms'] / 1000:.1f}s saved), {nav['dirty_fallbacks']} dirty fallbacks")
+    screenshots.print_summary(summary["screenshots"])
+    print(f"\n⏱️  Wall time {wall_time:.1f}s for {unit_time:.1f}s of unit time "
+          f"({unit_time / wall_time if wall_time else 0:.1f}x on {workers} worker(s))")
+
+    return merged
+
+
+def main():
+    suites = load_suites()
+
+    parser = argparse.ArgumentParser(description="Run the SFIMC E2E suites in parallel")
+    parser.add_argument("--workers", type=int,
+                        default=int(os.environ.get("SFIMC_E2E_WORKERS", os.cpu_count() or 1)),
+                        help="worker processes, each with its own browser (default: CPU count)")
+    parser.add_argument("--suite", action="append", choices=sorted(suites),
+                        help="suite to run (repeatable, default: all)")
+    parser.add_argument("--shard", help="run only slice K of N, e.g. 2/4")
+    parser.add_argument("--context-policy", choices=CONTEXT_POLICIES,
+                        default=os.environ.get("SFIMC_CONTEXT_POLICY", "fresh"),
+                        help="tear down each unit's context, or recycle contexts between units")
+    parser.add_argument("--recycle-after", type=int, default=20,
+                        help="units served by one context before it is replaced (recycle policy)")
+    parser.add_argument("--no-nav-cache", dest="nav_cache", action="store_false",
+                        default=os.environ.get("SFIMC_NAV_CACHE", "1") != "0",
+                        help="always do a full navigation instead of restoring warm pages in place")
+    parser.add_argument("--perf-samples", type=int, default=perf_gate.sample_count(),
+                        help="cold loads per budgeted route/viewport (0 disables sampling)")
+    parser.add_argument("--no-update-baseline", dest="update_baseline", action="store_false",
+                        help="gate against the performance baseline without adding this run to it")
+    parser.add_argument("--cpu-throttle", type=float, default=profiling.cpu_throttle(),
+                        help="CPU slowdown while profiling interactions, e.g. 4 (default: 1, none)")
+    parser.add_argument("--no-profile", dest="profile", action="store_false", default=profiling.enabled(),
+                        help="don't trace interactions")
+    parser.add_argument("--update-visual-baselines", dest="update_visual", action="store_true",
+                        help="replace the visual baselines with this run's screenshots")
+    args = parser.parse_args()
+
+    # Workers are spawned with this environment, so they see the same count
+    os.environ["SFIMC_PERF_SAMPLES"] = str(args.perf_samples)
+    os.environ["SFIMC_CPU_THROTTLE"] = str(args.cpu_throttle)
+    os.environ["SFIMC_PROFILE"] = "1" if args.profile else "0"
+
+    selected = [suites[name] for name in args.suite] if args.suite else list(suites.values())
+    merged = run_suites(selected, workers=args.workers, shard=args.shard,
+                        policy=args.context_policy, recycle_after=args.recycle_after,
+                        nav_cache=args.nav_cache, update_baseline=args.update_baseline,
+                        update_visual=args.update_visual)
+
+    failed = sum(len(r["failed"]) for r in merged.values())
+    raise SystemExit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,262 @@
+#!/usr/bin/env python3
+"""
+SFIMC E2E Screenshots
+Captures screenshots without making the test wait for them to be encoded
+and written.
+
+`capture()` replaces page.screenshot(path=...). It asks Chromium for the
+frame over CDP with optimizeForSpeed, which skips the slow zlib pass that
+makes full-page PNGs expensive, and hands the frame to a background thread
+pool that decodes it, hashes it and writes it to SCREENSHOT_DIR. The test
+carries on as soon as the frame is captured.
+
+Formats (SFIMC_SCREENSHOT_FORMAT, default jpeg on CI and png elsewhere):
+    png     lossless; use for baselines and visual regression
+    jpeg    lossy and much smaller, for CI artifacts
+
+A manifest of content hashes (screenshots_manifest.json) lets a frame be
+skipped when the same file already holds identical content, or hard-linked
+when another artifact does. Each unit reports how long its test blocked on
+captures and how many bytes were written; the runner totals them.
+"""
+
+from concurrent.futures import ThreadPoolExecutor, wait
+import base64
+import fcntl
+import hashlib
+import json
+import os
+import time
+import weakref
+
+from suite import SCREENSHOT_DIR
+
+FORMATS = {"png": "png", "jpeg": "jpg"}
+FORMAT = os.environ.get("SFIMC_SCREENSHOT_FORMAT") or ("jpeg" if os.environ.get("CI") else "png")
+JPEG_QUALITY = int(os.environ.get("SFIMC_SCREENSHOT_QUALITY", "80"))
+WRITER_THREADS = int(os.environ.get("SFIMC_SCREENSHOT_THREADS", "4"))
+MANIFEST = f"{SCREENSHOT_DIR}/screenshots_manifest.json"
+
+if FORMAT not in FORMATS:
+    raise ValueError(f"SFIMC_SCREENSHOT_FORMAT must be one of {', '.join(FORMATS)}, not {FORMAT!r}")
+
+
+class ScreenshotLog:
+    """Capture and write costs for one unit's screenshots"""
+
+    def __init__(self):
+        self.captures = []
+        self.pending = []
+
+    def record_capture(self, name, capture_ms):
+        entry = {"name": name, "capture_ms": round(capture_ms, 1), "outcome": None, "bytes": 0, "write_ms": 0.0}
+        self.captures.append(entry)
+        return entry
+
+    def summary(self):
+        outcomes = {}
+        for c in self.captures:
+            outcomes[c["outcome"]] = outcomes.get(c["outcome"], 0) + 1
+        return {
+            "captures": len(self.captures),
+            "capture_ms": round(sum(c["capture_ms"] for c in self.captures), 1),
+            "write_ms": round(sum(c["write_ms"] for c in self.captures), 1),
+            "bytes_written": sum(c["bytes"] for c in self.captures),
+            "written": outcomes.get("written", 0),
+            "unchanged": outcomes.get("unchanged", 0),
+            "linked": outcomes.get("linked", 0),
+            "failed": outcomes.get("failed", 0),
+        }
+
+
+class ArtifactManifest:
+    """
+    Content hash of every screenshot in SCREENSHOT_DIR. An entry only
+    counts while the file still has the size and mtime it was recorded
+    with, so files replaced by anything else are simply rewritten.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.entries = self._read()
+        self.updated = {}
+
+    def _read(self):
+        try:
+            with open(self.path) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def valid(self, filename):
+        entry = self.entries.get(filename)
+        if not entry:
+            return None
+        try:
+            stat = os.stat(f"{SCREENSHOT_DIR}/{filename}")
+        except OSError:
+            return None
+        return entry if stat.st_size == entry["bytes"] and stat.st_mtime_ns == entry["mtime_ns"] else None
+
+    def find(self, digest, exclude):
+        """Another valid artifact with this content, if any"""
+        for filename, entry in list(self.entries.items()):
+            if filename != exclude and entry["sha256"] == digest and self.valid(filename):
+                return filename
+        return None
+
+    def record(self, filename, digest):
+        stat = os.stat(f"{SCREENSHOT_DIR}/{filename}")
+        entry = {"sha256": digest, "bytes": stat.st_size, "mtime_ns": stat.st_mtime_ns}
+        self.entries[filename] = self.updated[filename] = entry
+
+    def save(self):
+        """Merge this process's entries into the manifest on disk (workers share it)"""
+        if not self.updated:
+            return
+        with open(f"{self.path}.lock", "w") as lock:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+            merged = {**self._read(), **self.updated}
+            with open(f"{self.path}.tmp", "w") as f:
+                json.dump(merged, f, indent=2, sort_keys=True)
+            os.replace(f"{self.path}.tmp", self.path)
+        self.updated = {}
+
+
+_executor = None
+_manifest = None
+_log = ScreenshotLog()
+_sessions = weakref.WeakKeyDictionary()
+
+
+def _writer():
+    global _executor, _manifest
+    if _executor is None:
+        _executor = ThreadPoolExecutor(max_workers=WRITER_THREADS, thread_name_prefix="screenshots")
+        _manifest = ArtifactManifest(MANIFEST)
+    return _executor, _manifest
+
+
+def start_unit():
+    """Begin a fresh screenshot log; the runner calls this before every unit"""
+    global _log
+    _log = ScreenshotLog()
+    return _log
+
+
+def finish_unit():
+    """Wait for the current unit's writes and return its summary"""
+    wait(_log.pending)
+    _log.pending = []
+    return _log.summary()
+
+
+def close():
+    """Finish every write and save the manifest; call once per process"""
+    global _executor
+    if _executor is None:
+        return
+    _executor.shutdown(wait=True)
+    _manifest.save()
+    _executor = None
+
+
+# ===========================================
+# Capture
+# ===========================================
+
+def _capture_cdp(page, full_page, image_format):
+    """Base64 frame straight from Chromium; raises when CDP isn't available"""
+    session = _sessions.get(page)
+    if session is None:
+        session = _sessions[page] = page.context.new_cdp_session(page)
+
+    params = {"format": image_format, "optimizeForSpeed": True}
+    if image_format == "jpeg":
+        params["quality"] = JPEG_QUALITY
+    if full_page:
+        size = session.send("Page.getLayoutMetrics")["cssContentSize"]
+        params["captureBeyondViewport"] = True
+        params["clip"] = {"x": 0, "y": 0, "width": size["width"], "height": size["height"], "scale": 1}
+    return session.send("Page.captureScreenshot", params)["data"]
+
+
+def capture(page, name, full_page=False, image_format=None):
+    """
+    Screenshot `page` to SCREENSHOT_DIR/<name>.<ext> in the background.
+    Returns the path the file will have once written.
+    """
+    image_format = image_format or FORMAT
+    filename = f"{name}.{FORMATS[image_format]}"
+    executor, manifest = _writer()
+
+    start = time.perf_counter()
+    page.evaluate("document.fonts.ready.then(() => true)")
+    try:
+        frame = _capture_cdp(page, full_page, image_format)
+    except Exception:
+        # Not Chromium, or the session went away: let Playwright encode it
+        options = {"quality": JPEG_QUALITY} if image_format == "jpeg" else {}
+        frame = page.screenshot(full_page=full_page, type=image_format, **options)
+    entry = _log.record_capture(filename, (time.perf_counter() - start) * 1000)
+
+    _log.pending.append(executor.submit(_store, manifest, filename, frame, entry))
+    return f"{SCREENSHOT_DIR}/{filename}"
+
+
+def _store(manifest, filename, frame, entry):
+    """Decode, dedupe and write one frame (background thread)"""
+    start = time.perf_counter()
+    path = f"{SCREENSHOT_DIR}/{filename}"
+    try:
+        data = base64.b64decode(frame) if isinstance(frame, str) else frame
+        digest = hashlib.sha256(data).hexdigest()
+
+        existing = manifest.valid(filename)
+        if existing and existing["sha256"] == digest:
+            entry["outcome"] = "unchanged"
+            return
+
+        tmp = f"{path}.{os.getpid()}.tmp"
+        source = manifest.find(digest, exclude=filename)
+        if source:
+            try:
+                os.link(f"{SCREENSHOT_DIR}/{source}", tmp)
+                entry["outcome"] = "linked"
+            except OSError:
+                source = None
+        if not source:
+            with open(tmp, "wb") as f:
+                f.write(data)
+            entry["outcome"] = "written"
+            entry["bytes"] = len(data)
+        os.replace(tmp, path)
+        manifest.record(filename, digest)
+    except Exception as e:
+        entry["outcome"] = "failed"
+        entry["error"] = f"{type(e).__name__}: {e}"
+    finally:
+        entry["write_ms"] = round((time.perf_counter() - start) * 1000, 1)
+
+
+# ===========================================
+# Reporting
+# ===========================================
+
+def summarize(summaries):
+    """Totals over per-unit summaries"""
+    summaries = list(summaries)
+    keys = ("captures", "capture_ms", "write_ms", "bytes_written", "written", "unchanged", "linked", "failed")
+    totals = {key: sum(s[key] for s in summaries) for key in keys}
+    totals["capture_ms"] = round(totals["capture_ms"], 1)
+    totals["write_ms"] = round(totals["write_ms"], 1)
+    totals["format"] = FORMAT
+    return totals
+
+
+def print_summary(totals):
+    print(f"📸 Screenshots: {totals['captures']} captured as {totals['format']}, "
+          f"{totals['capture_ms'] / 1000:.1f}s blocking tests, {totals['write_ms'] / 1000:.1f}s writing in the background")
+    print(f"   {totals['bytes_written'] / 1e6:.1f} MB written ({totals['written']} files), "
+          f"{totals['unchanged']} unchanged, {totals['linked']} linked to identical artifacts"
+          + (f", {totals['failed']} failed" if totals["failed"] else ""))
@@ -0,0 +1,353 @@
+#!/usr/bin/env python3
+"""
+SFIMC E2E Soak Test
+Holds pages open for hours the way newsroom displays do, and fails when
+their memory or listener counts keep growing.
+
+Each route (/ and /news by default) gets its own page in one browser. Every
+--interval the page's garbage is collected (HeapProfiler.collectGarbage) and
+Performance.getMetrics is sampled for JSHeapUsedSize, Nodes,
+JSEventListeners and Documents. Collecting first makes the heap figure what
+the page retains rather than what it hasn't freed yet. --snapshots heap
+snapshots spread over the run are written to SCREENSHOT_DIR/soak, and the
+constructors whose instance counts grew most between the first and last one
+are reported; that usually names the leak (a detached element, a handler
+closure, an EventSource).
+
+Samples taken during --warmup are kept but not fitted. For each metric:
+    trend    Mann-Kendall test for a monotonic increase (one-sided p-value)
+    slope    Theil-Sen slope per hour, robust to GC and refresh spikes
+    tail     Theil-Sen slope over the last third of the samples
+A metric leaks when the trend is significant, the slope is over its hourly
+limit (LIMITS) and the tail is still growing at half that rate or more.
+Growth that levels off before the end is a warning.
+
+Usage:
+    python tests/e2e/soak.py                          # 30 minutes, a sample every 30s
+    python tests/e2e/soak.py --duration 8h --interval 2m --snapshots 5
+    python tests/e2e/soak.py --routes /news --duration 10m --warmup 1m
+"""
+
+from statistics import median
+import argparse
+import json
+import math
+import os
+import re
+import sys
+import time
+
+from playwright.sync_api import Error as PlaywrightError
+
+from browser_pool import BrowserPool
+from suite import BASE_URL, DEFAULT_VIEWPORT, SCREENSHOT_DIR, print_banner
+
+SOAK_DIR = f"{SCREENSHOT_DIR}/soak"
+
+# Largest growth per hour that isn't a leak, and how to print each metric
+LIMITS = {
+    "JSHeapUsedSize": 5 * 1024 * 1024,
+    "Nodes": 500,
+    "JSEventListeners": 100,
+    "Documents": 1,
+}
+FORMATS = {
+    "JSHeapUsedSize": lambda v: f"{v / (1024 * 1024):.1f} MB",
+    "Nodes": lambda v: f"{v:,.0f}",
+    "JSEventListeners": lambda v: f"{v:,.0f}",
+    "Documents": lambda v: f"{v:,.0f}",
+}
+P_VALUE = 0.01
+MIN_SAMPLES = 8
+
+
+def parse_duration(text):
+    """Seconds in "90", "45s", "30m" or "8h" """
+    match = re.fullmatch(r"(\d+(?:\.\d+)?)([smh]?)", text.strip())
+    if not match:
+        raise argparse.ArgumentTypeError(f"invalid duration {text!r}: use e.g. 45s, 30m or 8h")
+    return float(match.group(1)) * {"": 1, "s": 1, "m": 60, "h": 3600}[match.group(2)]
+
+
+# ===========================================
+# Trend statistics
+# ===========================================
+
+def mann_kendall_increasing(values):
+    """One-sided p-value that `values` trend upward (normal approximation, tie-corrected)"""
+    n = len(values)
+    s = sum(
+        (values[j] > values[i]) - (values[j] < values[i])
+        for i in range(n - 1) for j in range(i + 1, n)
+    )
+    ties = {}
+    for v in values:
+        ties[v] = ties.get(v, 0) + 1
+    variance = (n * (n - 1) * (2 * n + 5) - sum(t * (t - 1) * (2 * t + 5) for t in ties.values())) / 18
+    if variance <= 0 or s <= 0:
+        return 1.0
+    z = (s - 1) / math.sqrt(variance)
+    return 0.5 * math.erfc(z / math.sqrt(2))
+
+
+def theil_sen(times, values):
+    """Median of pairwise slopes, per unit of `times`"""
+    slopes = [
+        (values[j] - values[i]) / (times[j] - times[i])
+        for i in range(len(times) - 1) for j in range(i + 1, len(times))
+        if times[j] != times[i]
+    ]
+    return median(slopes) if slopes else 0.0
+
+
+def analyze(samples, metric, warmup):
+    """Trend, hourly slope and verdict for one metric's post-warmup samples"""
+    points = [(s["t"], s[metric]) for s in samples if s["t"] >= warmup and s[metric] is not None]
+    result = {"samples": len(points), "limit_per_hour": LIMITS[metric]}
+    if len(points) < MIN_SAMPLES:
+        return {**result, "verdict": "too_short"}
+
+    times = [t / 3600 for t, _ in points]
+    values = [v for _, v in points]
+    tail = points[-max(3, len(points) // 3):]
+    result.update(
+        start=values[0],
+        end=values[-1],
+        p_value=round(mann_kendall_increasing(values), 5),
+        slope_per_hour=theil_sen(times, values),
+        tail_slope_per_hour=theil_sen([t / 3600 for t, _ in tail], [v for _, v in tail]),
+    )
+
+    growing = result["p_value"] < P_VALUE and result["slope_per_hour"] > LIMITS[metric]
+    if growing and result["tail_slope_per_hour"] >= LIMITS[metric] / 2:
+        result["verdict"] = "leak"
+    elif growing:
+        result["verdict"] = "levelled_off"
+    else:
+        result["verdict"] = "stable"
+    return result
+
+
+# ===========================================
+# Sampling & heap snapshots
+# ===========================================
+
+class SoakTarget:
+    """One long-lived page and the CDP session its samples come from"""
+
+    def __init__(self, pool, route):
+        self.route = route
+        self.page = pool.open_page(DEFAULT_VIEWPORT)
+        self.crashed = False
+        self.page.on("crash", lambda _: setattr(self, "crashed", True))
+        self.page.goto(f"{BASE_URL}{route}")
+        self.page.wait_for_load_state("networkidle")
+
+        self.session = self.page.context.new_cdp_session(self.page)
+        self.session.send("Performance.enable")
+        self.session.send("HeapProfiler.enable")
+        self._chunks = []
+        self.session.on("HeapProfiler.addHeapSnapshotChunk", lambda e: self._chunks.append(e["chunk"]))
+        self.samples = []
+        self.snapshots = []
+
+    def sample(self, t):
+        self.session.send("HeapProfiler.collectGarbage")
+        metrics = {m["name"]: m["value"] for m in self.session.send("Performance.getMetrics")["metrics"]}
+        sample = {"t": round(t, 1), **{name: metrics.get(name) for name in LIMITS}}
+        self.samples.append(sample)
+        return sample
+
+    def snapshot(self, t):
+        """Write a heap snapshot and return its per-constructor summary"""
+        self._chunks = []
+        self.session.send("HeapProfiler.takeHeapSnapshot", {"reportProgress": False})
+        data = "".join(self._chunks)
+        self._chunks = []
+
+        slug = self.route.strip("/").replace("/", "_") or "home"
+        path = f"{SOAK_DIR}/{slug}_{int(t):07d}s.heapsnapshot"
+        with open(path, "w") as f:
+            f.write(data)
+        summary = {"t": round(t, 1), "path": path, **summarize_snapshot(json.loads(data))}
+        self.snapshots.append(summary)
+        return summary
+
+
+def summarize_snapshot(snapshot):
+    """Instance counts and self sizes per constructor, plus detached DOM nodes"""
+    meta = snapshot["snapshot"]["meta"]
+    fields = meta["node_fields"]
+    width = len(fields)
+    node_types = meta["node_types"][0]
+    strings, nodes = snapshot["strings"], snapshot["nodes"]
+
+    kinds = nodes[fields.index("type")::width]
+    names = nodes[fields.index("name")::width]
+    sizes = nodes[fields.index("self_size")::width]
+    counted = {i for i, kind in enumerate(node_types) if kind in ("object", "closure", "native")}
+
+    constructors = {}
+    for kind, name, size in zip(kinds, names, sizes):
+        if kind in counted:
+            entry = constructors.setdefault(strings[name], [0, 0])
+            entry[0] += 1
+            entry[1] += size
+
+    # Newer V8 marks DOM wrappers as attached (1) or detached (2)
+    detached = None
+    if "detachedness" in fields:
+        detached = sum(1 for d in nodes[fields.index("detachedness")::width] if d == 2)
+
+    return {"constructors": constructors, "detached_nodes": detached}
+
+
+def top_growth(first, last, limit=10):
+    """Constructors whose instance count grew most between two snapshot summaries"""
+    before, after = first["constructors"], last["constructors"]
+    grown = [
+        {"name": name, "before": before.get(name, [0, 0])[0], "after": count, "bytes_added": size - before.get(name, [0, 0])[1]}
+        for name, (count, size) in after.items()
+        if count > before.get(name, [0, 0])[0]
+    ]
+    return sorted(grown, key=lambda g: g["after"] - g["before"], reverse=True)[:limit]
+
+
+# ===========================================
+# Run
+# ===========================================
+
+def soak(routes, duration, interval, warmup, snapshot_count):
+    """Sample every route until `duration` has passed; returns the targets"""
+    os.makedirs(SOAK_DIR, exist_ok=True)
+    snapshot_at = [
+        warmup + (duration - warmup) * i / max(1, snapshot_count - 1) for i in range(snapshot_count)
+    ]
+
+    with BrowserPool() as pool:
+        targets = [SoakTarget(pool, route) for route in routes]
+        start = time.monotonic()
+        tick = 0
+        while True:
+            elapsed = time.monotonic() - start
+            take_snapshot = bool(snapshot_at) and elapsed >= snapshot_at[0] - interval / 2
+            if take_snapshot:
+                snapshot_at.pop(0)
+
+            for target in targets:
+                if target.crashed:
+                    continue
+                # A renderer that dies mid-call (often collecting garbage or
+                # snapshotting a leaking heap) ends that route, not the run
+                try:
+                    sample = target.sample(elapsed)
+                    print(f"  [{elapsed / 60:6.1f}m] {target.route:<8} "
+                          + "  ".join(f"{name} {FORMATS[name](sample[name] or 0)}" for name in LIMITS), flush=True)
+                    if take_snapshot:
+                        summary = target.snapshot(elapsed)
+                        detached = summary["detached_nodes"]
+                        print(f"           📷 heap snapshot: {summary['path']}"
+                              + (f" ({detached:,} detached DOM nodes)" if detached is not None else ""), flush=True)
+                except PlaywrightError as e:
+                    target.crashed = True
+                    print(f"  [{elapsed / 60:6.1f}m] {target.route:<8} 💥 page crashed: {e}", flush=True)
+                except ValueError as e:
+                    print(f"           ⚠️ heap snapshot unreadable: {e}", flush=True)
+
+            if elapsed >= duration or all(t.crashed for t in targets):
+                break
+            tick += 1
+            wait = start + min(tick * interval, duration) - time.monotonic()
+            if wait > 0:
+                # Wait on a live page so Playwright keeps dispatching events (crashes) meanwhile
+                live = next(t for t in targets if not t.crashed)
+                try:
+                    live.page.wait_for_timeout(wait * 1000)
+                except PlaywrightError:
+                    # It crashed during the wait; sleep out the rest
+                    time.sleep(max(0, start + min(tick * interval, duration) - time.monotonic()))
+
+        for target in targets:
+            try:
+                pool.release(target.page)
+            except PlaywrightError:
+                pass  # Already gone with its renderer
+    return targets
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Hold pages open and fail on unbounded memory or listener growth")
+    parser.add_argument("--routes", default="/,/news", help="comma-separated routes to hold open (default: /,/news)")
+    parser.add_argument("--duration", type=parse_duration, default="30m", help="how long to soak (default: 30m)")
+    parser.add_argument("--interval", type=parse_duration, default="30s", help="time between samples (default: 30s)")
+    parser.add_argument("--warmup", type=parse_duration, default="2m",
+                        help="initial period left out of the trend fit (default: 2m)")
+    parser.add_argument("--snapshots", type=int, default=2,
+                        help="heap snapshots spread from the end of warmup to the end (default: 2, 0 disables)")
+    args = parser.parse_args()
+    routes = [r.strip() for r in args.routes.split(",") if r.strip()]
+    warmup = min(args.warmup, args.duration / 2)
+
+    print_banner("SFIMC SOAK TEST")
+    print(f"  Target:   {BASE_URL} {', '.join(routes)}")
+    print(f"  Duration: {args.duration / 60:g} min, a sample every {args.interval:g}s after a {warmup / 60:g} min warmup")
+
+    targets = soak(routes, args.duration, args.interval, warmup, args.snapshots)
+
+    failures = []
+    report = {}
+    for target in targets:
+        print(f"\n\n🧪 {target.route}")
+        print("-"*40)
+        print(f"  {'Metric':<18}{'Start':>12}{'End':>12}{'Per hour':>14}{'p':>9}  Verdict")
+        analysis = {metric: analyze(target.samples, metric, warmup) for metric in LIMITS}
+        for metric, a in analysis.items():
+            if a["verdict"] == "too_short":
+                print(f"  {metric:<18}{'':>12}{'':>12}{'':>14}{'':>9}  ⚠️ only {a['samples']} samples after warmup")
+                continue
+            fmt = FORMATS[metric]
+            slope = a["slope_per_hour"]
+            icon = {"leak": "❌ leak", "levelled_off": "⚠️ grew, then levelled off", "stable": "✅ stable"}[a["verdict"]]
+            print(f"  {metric:<18}{fmt(a['start']):>12}{fmt(a['end']):>12}"
+                  f"{('+' if slope >= 0 else '-') + fmt(abs(slope)):>14}{a['p_value']:>9.3f}  {icon}")
+            if a["verdict"] == "leak":
+                failures.append(f"{target.route}: {metric} grows {fmt(slope)}/h (limit {fmt(LIMITS[metric])}/h)")
+
+        growth = top_growth(target.snapshots[0], target.snapshots[-1]) if len(target.snapshots) > 1 else []
+        if growth:
+            print("\n  Most grown constructors between the first and last heap snapshot:")
+            for g in growth:
+                print(f"    {g['name'][:40]:<40} {g['before']:>8,} -> {g['after']:>8,}  (+{g['bytes_added'] / 1024:,.0f} KB)")
+        if target.crashed:
+            failures.append(f"{target.route}: page crashed")
+
+        report[target.route] = {
+            "crashed": target.crashed,
+            "samples": target.samples,
+            "analysis": analysis,
+            "snapshots": [{k: v for k, v in s.items() if k != "constructors"} for s in target.snapshots],
+            "constructor_growth": growth,
+        }
+
+    print()
+    for failure in failures:
+        print(f"  ❌ {failure}")
+    if not failures:
+        print(f"  ✅ No unbounded growth over {args.duration / 60:g} min")
+
+    path = f"{SCREENSHOT_DIR}/soak_results.json"
+    with open(path, "w") as f:
+        json.dump({
+            "base_url": BASE_URL,
+            "duration_s": args.duration,
+            "interval_s": args.interval,
+            "warmup_s": warmup,
+            "routes": report,
+            "failures": failures,
+        }, f, indent=2)
+    print(f"\n📄 Results saved to: {path}")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
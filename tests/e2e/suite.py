@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+SFIMC E2E Suite Plumbing
+Shared configuration, result helpers and the Unit/Suite types that split the
+suites into independently schedulable checks.
+"""
+
+from dataclasses import dataclass, field
+import json
+import os
+
+# Test configuration
+BASE_URL = os.environ.get("SFIMC_BASE_URL", "http://localhost:3000")
+SCREENSHOT_DIR = os.environ.get("SFIMC_SCREENSHOT_DIR", "/tmp/sfimc-tests")
+DEFAULT_VIEWPORT = {"width": 1280, "height": 720}
+
+# Ensure screenshot directory exists
+os.makedirs(SCREENSHOT_DIR, exist_ok=True)
+
+
+@dataclass
+class Unit:
+    """
+    One schedulable check.
+
+    The runner opens a fresh page at `viewport`, navigates to `route`
+    (skipped when None) and then calls `run(page, results)`.
+    """
+    suite: str
+    name: str
+    run: object
+    route: str = "/"
+    viewport: dict = field(default_factory=lambda: dict(DEFAULT_VIEWPORT))
+
+    @property
+    def id(self):
+        return f"{self.suite}::{self.name}"
+
+
+@dataclass
+class Suite:
+    """An ordered list of units plus how their merged results are reported"""
+    name: str
+    title: str
+    summary_title: str
+    results_file: str
+    units: list
+    # Called once with the merged results and every unit's console errors
+    finalize: object = None
+    # Gate this suite's visits against perf_budgets.json and the baseline
+    perf_gate: bool = False
+    # Compare this suite's visual.capture() screenshots with their baselines
+    visual: bool = False
+    # Analyze the request waterfall of every route this suite loads
+    network: bool = False
+
+
+def new_results():
+    return {
+        "passed": [],
+        "failed": [],
+        "warnings": []
+    }
+
+
+def merge_results(into, other):
+    """Append every list in `other` onto `into`, keeping the passed/failed/warnings shape"""
+    for key, values in other.items():
+        into.setdefault(key, []).extend(values)
+    return into
+
+
+def print_banner(title):
+    print("\n" + "="*60)
+    print(title)
+    print("="*60)
+
+
+def print_summary(title, results):
+    print_banner(title)
+    print(f"✅ Passed:   {len(results['passed'])}")
+    print(f"❌ Failed:   {len(results['failed'])}")
+    print(f"⚠️  Warnings: {len(results['warnings'])}")
+    print(f"\n📸 Screenshots saved to: {SCREENSHOT_DIR}")
+
+    if results["failed"]:
+        print("\n❌ FAILURES:")
+        for failure in results["failed"]:
+            print(f"  - {failure}")
+
+    if results["warnings"]:
+        print("\n⚠️ WARNINGS:")
+        for warning in results["warnings"]:
+            print(f"  - {warning}")
+
+
+def save_results(results, filename):
+    path = f"{SCREENSHOT_DIR}/{filename}"
+    with open(path, "w") as f:
+        json.dump(results, f, indent=2)
+    print(f"\n📄 Results saved to: {path}")
+    return path
@@ -0,0 +1,468 @@
+#!/usr/bin/env python3
+"""
+SFIMC E2E Visual Regression
+Compares the responsive_* and page_* screenshots with stored baselines and
+fails the suite on a visible change.
+
+`capture()` replaces screenshots.capture() for those shots. It always writes
+lossless PNG and records where the regions that change on their own are (the
+RotatingWord hero line and the LiveStoryFeed) so they can be masked out.
+After the run, `check()` diffs each capture against baselines/<name>.png
+with whole-array NumPy operations:
+
+    pixels   share of unmasked pixels whose largest channel difference is
+             over PIXEL_THRESHOLD. Anti-aliased edges are forgiven: a pixel
+             inside the range of the other image's 3x3 neighbourhood (plus
+             the threshold) isn't counted
+    ssim     structural similarity of the luma over 8x8 windows, averaged
+             per 64px tile
+    hash     64-bit average hash per 64px tile (each 8x8 window's mean
+             against the tile's); bits that flip mean the tile's layout
+             changed, even when too few pixels changed to move the others
+
+A capture fails when too many pixels are counted, or when a tile with
+counted pixels falls below MIN_SSIM or moves more than HASH_TOLERANCE hash
+bits. Counted pixels below those limits are a warning. Perceptual metrics
+are only computed inside the bounding box of the differences, and files
+that are byte-identical to their baseline aren't decoded at all, so a run
+of mostly unchanged full-page shots takes seconds.
+
+Every capture that differs gets a heatmap in SCREENSHOT_DIR/visual_diffs:
+red for counted differences, yellow for forgiven anti-aliasing and blue
+for masked regions. Missing baselines are created from the current capture.
+To accept intentional changes, review the heatmaps and run:
+
+    python tests/e2e/visual.py --update
+
+Each suite's reports go to SCREENSHOT_DIR/visual_results_<suite>.json;
+--update re-checks (or accepts) the captures from all of them. Comparing
+needs NumPy and Pillow (pip install numpy pillow). They are imported on
+the first comparison, so suites without visual checks run without them.
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+import argparse
+import glob
+import hashlib
+import io
+import json
+import os
+import shutil
+import time
+
+import screenshots
+from suite import SCREENSHOT_DIR, print_banner
+
+BASELINE_DIR = os.environ.get(
+    "SFIMC_VISUAL_BASELINES", os.path.join(os.path.dirname(os.path.abspath(__file__)), "baselines")
+)
+REGIONS_FILE = f"{BASELINE_DIR}/regions.json"
+DIFF_DIR = f"{SCREENSHOT_DIR}/visual_diffs"
+RESULTS_PATTERN = f"{SCREENSHOT_DIR}/visual_results_{{}}.json"
+THREADS = int(os.environ.get("SFIMC_VISUAL_THREADS", os.cpu_count() or 4))
+
+# Elements whose content changes between runs by design
+MASKS = {
+    "RotatingWord hero": ".hero-headline-highlight",
+    "LiveStoryFeed": ".live-story-feed",
+}
+MASK_PADDING = 8  # device pixels around each masked element
+
+PIXEL_THRESHOLD = int(os.environ.get("SFIMC_VISUAL_PIXEL_THRESHOLD", "24"))
+MAX_PIXEL_RATIO = float(os.environ.get("SFIMC_VISUAL_MAX_PIXELS", "0.001"))
+MIN_SSIM = float(os.environ.get("SFIMC_VISUAL_MIN_SSIM", "0.99"))
+HASH_TOLERANCE = 6
+WINDOW = 8
+TILE = 64
+
+# SSIM stabilizers for 8-bit luma
+C1 = (0.01 * 255) ** 2
+C2 = (0.03 * 255) ** 2
+
+# Document-space boxes [x0, y0, x1, y1] in device pixels for each mask selector
+REGIONS_JS = """([selectors, fullPage, padding]) => {
+    const dpr = window.devicePixelRatio || 1
+    const dx = fullPage ? window.scrollX : 0
+    const dy = fullPage ? window.scrollY : 0
+    return selectors
+        .flatMap((s) => Array.from(document.querySelectorAll(s)))
+        .map((el) => el.getBoundingClientRect())
+        .filter((r) => r.width > 0 && r.height > 0)
+        .map((r) => [
+            Math.max(0, Math.floor((r.left + dx) * dpr) - padding),
+            Math.max(0, Math.floor((r.top + dy) * dpr) - padding),
+            Math.ceil((r.right + dx) * dpr) + padding,
+            Math.ceil((r.bottom + dy) * dpr) + padding,
+        ])
+}"""
+
+# NumPy and Pillow, bound by load_imaging()
+np = Image = None
+
+_captures = []
+
+
+def start_unit():
+    """Begin a fresh list of visual captures; the runner calls this before every unit"""
+    global _captures
+    _captures = []
+    return _captures
+
+
+def finish_unit():
+    """The current unit's captures, as plain data for the runner"""
+    return list(_captures)
+
+
+def capture(page, name, full_page=False):
+    """
+    Screenshot `page` as PNG for comparison (see screenshots.capture) and
+    record its masked regions. Returns the path the file will have.
+    """
+    regions = page.evaluate(REGIONS_JS, [list(MASKS.values()), full_page, MASK_PADDING])
+    path = screenshots.capture(page, name, full_page=full_page, image_format="png")
+    _captures.append({"name": name, "path": path, "regions": regions})
+    return path
+
+
+# ===========================================
+# Metrics
+# ===========================================
+
+def load_imaging():
+    """Import NumPy and Pillow, which only the comparison needs"""
+    global np, Image
+    if np is None:
+        try:
+            import numpy
+            from PIL import Image as pil_image
+        except ImportError as e:
+            raise ImportError(f"visual comparison needs numpy and pillow (pip install numpy pillow): {e}") from e
+        np, Image = numpy, pil_image
+
+
+def decode(data):
+    with Image.open(io.BytesIO(data)) as image:
+        return np.asarray(image.convert("RGB"))
+
+
+def luma(image):
+    return image @ np.array([0.299, 0.587, 0.114], dtype=np.float32)
+
+
+def region_mask(shape, regions):
+    mask = np.zeros(shape, dtype=bool)
+    for x0, y0, x1, y1 in regions:
+        mask[y0:y1, x0:x1] = True
+    return mask
+
+
+def pad_to(image, height, width, fill):
+    """`image` grown to height x width; new pixels are `fill` so they always differ"""
+    h, w = image.shape[:2]
+    if (h, w) == (height, width):
+        return image
+    padded = np.full((height, width, 3), fill, dtype=np.uint8)
+    padded[:h, :w] = image
+    return padded
+
+
+def extremes(image):
+    """Per-channel min and max over each pixel's 3x3 neighbourhood (separable)"""
+    p = np.pad(image, ((1, 1), (1, 1), (0, 0)), mode="edge")
+    result = []
+    for op in (np.minimum, np.maximum):
+        rows = op(op(p[:-2], p[1:-1]), p[2:])
+        result.append(op(op(rows[:, :-2], rows[:, 1:-1]), rows[:, 2:]).astype(np.int16))
+    return result
+
+
+def channel_max(image):
+    # Much faster than .max(axis=2): NumPy reduces a length-3 last axis slowly
+    return np.maximum(np.maximum(image[..., 0], image[..., 1]), image[..., 2])
+
+
+def within(image, lo, hi):
+    """Pixels of `image` whose every channel is inside [lo, hi] widened by the threshold"""
+    image = image.astype(np.int16)
+    inside = (image >= lo - PIXEL_THRESHOLD) & (image <= hi + PIXEL_THRESHOLD)
+    return inside[..., 0] & inside[..., 1] & inside[..., 2]
+
+
+def bounds(flags, align, shape):
+    """Bounding box of the True cells of `flags`, grown out to multiples of `align`"""
+    rows, cols = np.flatnonzero(flags.any(axis=1)), np.flatnonzero(flags.any(axis=0))
+    y0, x0 = rows[0] // align * align, cols[0] // align * align
+    y1 = min(-(-(rows[-1] + 1) // align) * align, -(-shape[0] // align) * align)
+    x1 = min(-(-(cols[-1] + 1) // align) * align, -(-shape[1] // align) * align)
+    return y0, y1, x0, x1
+
+
+def tiles(baseline, current, counted):
+    """
+    Per-tile SSIM and hash distance inside the box around the counted
+    pixels. Returns (ssim, hash bits changed, tile has counted pixels, box).
+    """
+    y0, y1, x0, x1 = bounds(counted, TILE, counted.shape)
+    h, w = y1 - y0, x1 - x0
+
+    def crop(array):
+        part = array[y0:y1, x0:x1]
+        extra = ((0, h - part.shape[0]), (0, w - part.shape[1])) + ((0, 0),) * (array.ndim - 2)
+        return np.pad(part, extra, mode="edge") if extra[0][1] or extra[1][1] else part
+
+    x, y = luma(crop(baseline)), luma(crop(current))
+    windows = (h // WINDOW, WINDOW, w // WINDOW, WINDOW)
+
+    def mean(a):
+        return a.reshape(windows).mean(axis=(1, 3))
+
+    mu_x, mu_y = mean(x), mean(y)
+    var_x, var_y = mean(x * x) - mu_x ** 2, mean(y * y) - mu_y ** 2
+    cov = mean(x * y) - mu_x * mu_y
+    ssim = ((2 * mu_x * mu_y + C1) * (2 * cov + C2)) / ((mu_x ** 2 + mu_y ** 2 + C1) * (var_x + var_y + C2))
+
+    per_tile = TILE // WINDOW
+    grid = (h // TILE, per_tile, w // TILE, per_tile)
+
+    def tile_bits(mu):
+        blocks = mu.reshape(grid)
+        return blocks > blocks.mean(axis=(1, 3), keepdims=True)
+
+    distance = (tile_bits(mu_x) != tile_bits(mu_y)).sum(axis=(1, 3))
+    flagged = crop(counted).reshape(h // TILE, TILE, w // TILE, TILE).any(axis=(1, 3))
+    return ssim.reshape(grid).mean(axis=(1, 3)), distance, flagged, (x0, y0)
+
+
+def compare(baseline, current, regions):
+    """Metrics for two RGB arrays, plus the arrays a heatmap is drawn from"""
+    height, width = max(baseline.shape[0], current.shape[0]), max(baseline.shape[1], current.shape[1])
+    resized = baseline.shape != current.shape
+    baseline, current = pad_to(baseline, height, width, 0), pad_to(current, height, width, 255)
+
+    mask = region_mask((height, width), regions)
+    if regions:
+        current = current.copy()
+        for x0, y0, x1, y1 in regions:
+            current[y0:y1, x0:x1] = baseline[y0:y1, x0:x1]
+
+    diff = channel_max(np.maximum(baseline, current) - np.minimum(baseline, current))
+    over = diff > PIXEL_THRESHOLD
+    counted = over.copy()
+    if over.any():
+        # Forgive differences an anti-aliased edge or a subpixel shift explains
+        y0, y1, x0, x1 = bounds(over, 1, over.shape)
+        y0, x0, y1, x1 = max(0, y0 - 1), max(0, x0 - 1), min(height, y1 + 1), min(width, x1 + 1)
+        b, c = baseline[y0:y1, x0:x1], current[y0:y1, x0:x1]
+        b_lo, b_hi = extremes(b)
+        c_lo, c_hi = extremes(c)
+        counted[y0:y1, x0:x1] &= ~(within(c, b_lo, b_hi) & within(b, c_lo, c_hi))
+
+    metrics = {
+        "pixels": float(counted.sum() / max(1, mask.size - mask.sum())),
+        "ssim": 1.0,
+        "hash_bits": 0,
+        "changed_tiles": [],
+        "resized": resized,
+    }
+    if counted.any():
+        ssim, distance, flagged, (x0, y0) = tiles(baseline, current, counted)
+        bad = flagged & ((ssim < MIN_SSIM) | (distance > HASH_TOLERANCE))
+        metrics["ssim"] = round(float(ssim[flagged].min()), 4)
+        metrics["hash_bits"] = int(distance[flagged].max())
+        metrics["changed_tiles"] = [[int(x0 + c * TILE), int(y0 + r * TILE)] for r, c in np.argwhere(bad)]
+    return metrics, (current, diff, over, counted, regions)
+
+
+def heatmap(path, current, diff, over, counted, regions):
+    """The current capture washed out, with differences and masks painted over it"""
+    grey = (current[..., 1] >> 2) + 191
+    image = np.stack([grey, grey, grey], axis=-1)
+    image[over & ~counted] = (255, 200, 0)
+    changed = np.nonzero(counted)
+    alpha = (0.4 + 0.6 * diff[changed] / 255.0)[:, None]
+    image[changed] = (image[changed] * (1 - alpha) + np.array([230, 0, 0]) * alpha).astype(np.uint8)
+    for x0, y0, x1, y1 in regions:
+        area = image[y0:y1, x0:x1]
+        area[:] = area * 0.6 + np.array([0, 90, 255]) * 0.4
+    Image.fromarray(image).save(path, compress_level=1)
+
+
+def verdict(metrics):
+    if metrics["resized"] or metrics["pixels"] > MAX_PIXEL_RATIO or metrics["changed_tiles"]:
+        return "failed"
+    return "warning" if metrics["pixels"] > 0 else "passed"
+
+
+# ===========================================
+# Baselines
+# ===========================================
+
+def load_regions():
+    try:
+        with open(REGIONS_FILE) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def compare_capture(capture, baseline_regions, update):
+    """Compare one capture with its baseline (or replace the baseline); returns a report"""
+    start = time.perf_counter()
+    name = capture["name"]
+    baseline_path = f"{BASELINE_DIR}/{name}.png"
+    report = {"name": name, "path": capture["path"], "regions": capture["regions"], "baseline": baseline_path}
+
+    try:
+        with open(capture["path"], "rb") as f:
+            data = f.read()
+    except OSError:
+        return {**report, "status": "missing", "ms": 0.0}
+
+    if update or not os.path.exists(baseline_path):
+        report["status"] = "updated" if os.path.exists(baseline_path) else "new"
+        shutil.copyfile(capture["path"], baseline_path)
+    else:
+        with open(baseline_path, "rb") as f:
+            baseline = f.read()
+        if hashlib.sha256(baseline).digest() == hashlib.sha256(data).digest():
+            report["status"] = "identical"
+        else:
+            regions = capture["regions"] + baseline_regions.get(name, [])
+            metrics, layers = compare(decode(baseline), decode(data), regions)
+            report.update(metrics, status=verdict(metrics))
+            if layers[2].any() or metrics["resized"]:
+                report["heatmap"] = f"{DIFF_DIR}/{name}.png"
+                heatmap(report["heatmap"], *layers)
+
+    report["ms"] = round((time.perf_counter() - start) * 1000, 1)
+    return report
+
+
+def compare_all(captures, update=False, threads=THREADS):
+    """
+    Compare every capture on a thread pool (decoding and NumPy release the
+    GIL). Baselines are updated for new captures, or all with `update`.
+    """
+    load_imaging()
+    os.makedirs(BASELINE_DIR, exist_ok=True)
+    os.makedirs(DIFF_DIR, exist_ok=True)
+    regions = load_regions()
+
+    # A capture taken more than once in a run (e.g. by a retried unit) is compared once, last one wins
+    captures = list({c["name"]: c for c in captures}.values())
+    with ThreadPoolExecutor(max_workers=threads, thread_name_prefix="visual") as executor:
+        reports = list(executor.map(lambda c: compare_capture(c, regions, update), captures))
+
+    for capture, report in zip(captures, reports):
+        if report["status"] in ("new", "updated"):
+            regions[capture["name"]] = capture["regions"]
+    with open(REGIONS_FILE, "w") as f:
+        json.dump(regions, f, indent=2, sort_keys=True)
+    return reports
+
+
+def describe(report):
+    if report["status"] == "missing":
+        return "screenshot was not written"
+    if report.get("resized"):
+        return "size changed from the baseline"
+    tiles = report.get("changed_tiles", [])
+    where = f", {len(tiles)} tiles changed from {tuple(tiles[0])}" if tiles else ""
+    return f"{report['pixels']:.3%} pixels, ssim {report['ssim']:.3f}, {report['hash_bits']} hash bits{where}"
+
+
+def count_statuses(reports):
+    totals = {}
+    for r in reports:
+        totals[r["status"]] = totals.get(r["status"], 0) + 1
+    return totals
+
+
+def save_reports(path, reports, elapsed):
+    totals = count_statuses(reports)
+    with open(path, "w") as f:
+        json.dump({"seconds": round(elapsed, 3), "totals": totals, "captures": reports}, f, indent=2)
+    return totals
+
+
+def check(results, captures, suite, update_baseline=False):
+    """
+    Compare a suite's captures with their baselines, adding a passed,
+    failed or warning entry per capture to `results`.
+    """
+    print("\n\n🖼️  VISUAL REGRESSION")
+    print("-"*40)
+    start = time.perf_counter()
+    try:
+        reports = compare_all(captures, update=update_baseline)
+    except ImportError as e:
+        results["failed"].append(f"Visual: not compared, {e}")
+        print(f"  ❌ {e}")
+        return
+    elapsed = time.perf_counter() - start
+
+    for report in sorted(reports, key=lambda r: r["name"]):
+        name, status = report["name"], report["status"]
+        if status in ("identical", "passed"):
+            results["passed"].append(f"Visual: {name} matches baseline")
+        elif status in ("new", "updated"):
+            results["warnings"].append(f"Visual: {name} baseline {'created' if status == 'new' else 'updated'}")
+            print(f"  📌 {name}: baseline {'created' if status == 'new' else 'updated'}")
+        elif status == "warning":
+            results["warnings"].append(f"Visual: {name} differs slightly ({describe(report)})")
+            print(f"  ⚠️ {name}: {describe(report)}")
+        else:
+            results["failed"].append(f"Visual: {name} differs from baseline ({describe(report)})")
+            print(f"  ❌ {name}: {describe(report)}")
+            if report.get("heatmap"):
+                print(f"     heatmap: {report['heatmap']}")
+
+    results["visual"] = save_reports(RESULTS_PATTERN.format(suite), reports, elapsed)
+    print(f"  Compared {len(reports)} captures in {elapsed:.2f}s "
+          f"({sum(r['status'] == 'identical' for r in reports)} byte-identical)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Re-check or accept the last run's visual captures")
+    parser.add_argument("--update", action="store_true",
+                        help="make the last run's captures the new baselines")
+    parser.add_argument("--threads", type=int, default=THREADS, help=f"comparison threads (default: {THREADS})")
+    args = parser.parse_args()
+
+    # Every suite's last captures, remembering which results file each came from
+    captures, sources = [], {}
+    for path in sorted(glob.glob(RESULTS_PATTERN.format("*"))):
+        try:
+            with open(path) as f:
+                last = json.load(f)["captures"]
+        except (OSError, ValueError, KeyError):
+            print(f"⚠️ Skipping unreadable {path}")
+            continue
+        for c in last:
+            captures.append({"name": c["name"], "path": c["path"], "regions": c["regions"]})
+            sources[c["name"]] = path
+    if not captures:
+        raise SystemExit(f"No {RESULTS_PATTERN.format('<suite>')}: run the interactions or pages suite first")
+
+    print_banner(f"SFIMC VISUAL REGRESSION: {len(captures)} captures from {len(set(sources.values()))} suite(s)")
+    start = time.perf_counter()
+    try:
+        reports = compare_all(captures, update=args.update, threads=args.threads)
+    except ImportError as e:
+        raise SystemExit(str(e))
+    elapsed = time.perf_counter() - start
+    totals = count_statuses(reports)
+    for path in set(sources.values()):
+        save_reports(path, [r for r in reports if sources[r["name"]] == path], elapsed)
+
+    for report in sorted(reports, key=lambda r: r["name"]):
+        if report["status"] not in ("identical", "passed", "new", "updated"):
+            print(f"  {'⚠️' if report['status'] == 'warning' else '❌'} {report['name']}: {describe(report)}")
+    print(f"\n⏱️  {len(reports)} captures in {elapsed:.2f}s: "
+          + ", ".join(f"{count} {status}" for status, count in sorted(totals.items())))
+    raise SystemExit(1 if totals.get("failed") or totals.get("missing") else 0)
+
+
+if __name__ == "__main__":
+    main()
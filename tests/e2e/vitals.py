@@ -0,0 +1,217 @@
+#!/usr/bin/env python3
+"""
+SFIMC E2E Web Vitals
+Records Core Web Vitals and navigation/resource timing for every page the
+suites load.
+
+An init script installs buffered PerformanceObservers before any page script
+runs. `navigate()` replaces the suites' page.goto + networkidle pairs and
+records a visit once the page is idle, with the load's request waterfall
+(network.py); `finish()` re-reads the current document when a unit ends so
+CLS, INP and TBT include the unit's interactions.
+"""
+
+from statistics import median
+from urllib.parse import urlparse
+import weakref
+
+import network
+from suite import BASE_URL
+
+# Runs at document start on every navigation of a page it is attached to
+INIT_JS = """(() => {
+    if (window.__sfimcVitals) return
+    const v = window.__sfimcVitals = { lcp: null, shifts: [], longTasks: [], inp: null, interactions: 0 }
+    const observe = (type, callback, options = {}) => {
+        try {
+            new PerformanceObserver((list) => list.getEntries().forEach(callback))
+                .observe({ type, buffered: true, ...options })
+        } catch (e) {}
+    }
+    observe('largest-contentful-paint', (e) => { v.lcp = e.renderTime || e.loadTime || e.startTime })
+    observe('layout-shift', (e) => { if (!e.hadRecentInput) v.shifts.push([e.startTime, e.value]) })
+    observe('longtask', (e) => { v.longTasks.push([e.startTime, e.duration]) })
+    observe('event', (e) => {
+        if (!e.interactionId) return
+        v.interactions += 1
+        v.inp = Math.max(v.inp || 0, e.duration)
+    }, { durationThreshold: 16 })
+})()"""
+
+COLLECT_JS = """() => {
+    const v = window.__sfimcVitals || { lcp: null, shifts: [], longTasks: [], inp: null, interactions: 0 }
+    const nav = performance.getEntriesByType('navigation')[0]
+    const fcpEntry = performance.getEntriesByName('first-contentful-paint')[0]
+    const fcp = fcpEntry ? fcpEntry.startTime : null
+
+    // CLS: largest session window (shifts < 1s apart, window <= 5s)
+    let cls = 0, windowValue = 0, windowStart = 0, last = -Infinity
+    for (const [time, value] of v.shifts) {
+        if (time - last > 1000 || time - windowStart > 5000) {
+            windowStart = time
+            windowValue = 0
+        }
+        windowValue += value
+        last = time
+        cls = Math.max(cls, windowValue)
+    }
+
+    // TBT: blocking portion of long tasks after first contentful paint
+    const tbt = v.longTasks
+        .filter(([start]) => fcp === null || start >= fcp)
+        .reduce((sum, [, duration]) => sum + Math.max(0, duration - 50), 0)
+
+    const bytes = { document: nav ? nav.transferSize : 0, script: 0, img: 0, css: 0, font: 0, fetch: 0, other: 0 }
+    const resources = performance.getEntriesByType('resource')
+    for (const r of resources) {
+        const type = r.initiatorType === 'script' ? 'script'
+            : r.initiatorType === 'img' || r.initiatorType === 'image' ? 'img'
+            : r.initiatorType === 'css' || /\\.css(\\?|$)/.test(r.name) ? 'css'
+            : /\\.(woff2?|ttf|otf)(\\?|$)/.test(r.name) ? 'font'
+            : r.initiatorType === 'fetch' || r.initiatorType === 'xmlhttprequest' ? 'fetch'
+            : 'other'
+        bytes[type] += r.transferSize || 0
+    }
+
+    return {
+        timeOrigin: performance.timeOrigin,
+        url: location.href,
+        ttfb: nav ? nav.responseStart : null,
+        fcp,
+        lcp: v.lcp,
+        cls: Math.round(cls * 10000) / 10000,
+        tbt,
+        inp: v.inp,
+        interactions: v.interactions,
+        dom_content_loaded: nav ? nav.domContentLoadedEventEnd : null,
+        load: nav ? nav.loadEventEnd : null,
+        requests: resources.length + 1,
+        transfer_bytes: Object.values(bytes).reduce((a, b) => a + b, 0),
+        bytes,
+    }
+}"""
+
+# Load metrics reported per route, in milliseconds
+TIMING_METRICS = ("ttfb", "fcp", "lcp", "dom_content_loaded", "load", "tbt")
+
+_attached = weakref.WeakSet()
+
+
+class VitalsRecorder:
+    """Visits recorded during one unit"""
+
+    def __init__(self):
+        self.visits = []
+
+    def record(self, page, warm=False):
+        data = page.evaluate(COLLECT_JS)
+        size = page.viewport_size or {}
+        visit = {
+            "route": urlparse(data.pop("url")).path or "/",
+            "viewport": f"{size.get('width')}x{size.get('height')}",
+            "warm": warm,
+            **data,
+        }
+        self.visits.append(visit)
+        return visit
+
+
+_recorder = VitalsRecorder()
+
+
+def start_recording():
+    """Begin a fresh visit list; the runner calls this before every unit"""
+    global _recorder
+    _recorder = VitalsRecorder()
+    return _recorder
+
+
+def attach(page):
+    """Install the observers on a page; must run before its first navigation"""
+    if page not in _attached:
+        page.add_init_script(INIT_JS)
+        _attached.add(page)
+
+
+def navigate(page, url=None):
+    """page.goto + networkidle, recording the visit's vitals and requests once the page is idle"""
+    attach(page)
+    network.start(page)
+    page.goto(url or BASE_URL)
+    page.wait_for_load_state("networkidle")
+    visit = _recorder.record(page)
+    visit["network"] = network.stop(page)
+    return visit
+
+
+def snapshot(page):
+    """Current vitals of the loaded document without recording a visit"""
+    return page.evaluate(COLLECT_JS)
+
+
+def finish(page):
+    """
+    Re-read the page's document at the end of a unit. Updates the matching
+    visit's interaction metrics, or records a warm visit for a page that was
+    restored in place rather than navigated during this unit.
+    """
+    try:
+        data = page.evaluate(COLLECT_JS)
+    except Exception:
+        return  # Closed or mid-navigation: keep what the visit recorded
+    for visit in reversed(_recorder.visits):
+        if visit["timeOrigin"] == data["timeOrigin"]:
+            for key in ("cls", "tbt", "inp", "interactions"):
+                visit[key] = data[key]
+            return
+    if data["interactions"] or data["cls"]:
+        _recorder.record(page, warm=True)
+
+
+# ===========================================
+# Aggregation
+# ===========================================
+
+def summarize_visits(visits):
+    """
+    Per-route metrics table: the median of every cold visit's load metrics,
+    plus interaction metrics from every visit (warm ones included). The
+    perf gate's cache-disabled samples are left out; its own report has them.
+    """
+    by_route = {}
+    for visit in visits:
+        if not visit.get("sample"):
+            by_route.setdefault(visit["route"], []).append(visit)
+
+    table = {}
+    for route in sorted(by_route):
+        route_visits = by_route[route]
+        cold = [v for v in route_visits if not v["warm"]]
+        row = {"samples": len(cold)}
+        for metric in TIMING_METRICS + ("requests", "transfer_bytes"):
+            row[metric] = _median(v[metric] for v in cold)
+        row["inp"] = _median(v["inp"] for v in route_visits if v["interactions"])
+        row["cls"] = _median((v["cls"] for v in route_visits), digits=4)
+        row["bytes"] = {
+            kind: _median(v["bytes"][kind] for v in cold)
+            for kind in (cold[0]["bytes"] if cold else {})
+        }
+        table[route] = row
+    return table
+
+
+def _median(values, digits=1):
+    values = [v for v in values if v is not None]
+    return round(median(values), digits) if values else None
+
+
+def print_metrics_table(table):
+    print(f"  {'Route':<12}{'n':>3}{'TTFB':>8}{'FCP':>8}{'LCP':>8}{'CLS':>8}{'TBT':>8}{'INP':>8}{'Reqs':>6}{'KB':>8}")
+    for route, row in table.items():
+        def ms(metric):
+            return "-" if row[metric] is None else f"{row[metric]:.0f}"
+        cls = "-" if row["cls"] is None else f"{row['cls']:.3f}"
+        kb = "-" if row["transfer_bytes"] is None else f"{row['transfer_bytes'] / 1024:.0f}"
+        reqs = "-" if row["requests"] is None else f"{row['requests']:.0f}"
+        print(f"  {route:<12}{row['samples']:>3}{ms('ttfb'):>8}{ms('fcp'):>8}{ms('lcp'):>8}{cls:>8}"
+              f"{ms('tbt'):>8}{ms('inp'):>8}{reqs:>6}{kb:>8}")
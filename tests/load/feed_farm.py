@@ -0,0 +1,410 @@
+#!/usr/bin/env python3
+"""
+SFIMC RSS Feed Farm
+A hermetic stand-in for the member sites: serves synthetic WordPress-style
+RSS 2.0 (content:encoded, dc:creator, media:content, enclosures) and Atom
+feeds so the poll pipeline can be exercised offline and at scale.
+
+Endpoints:
+    /feeds.json              feed list for the poll route's RSS_FEED_LIST_URL
+    /feed/<n>.xml            feed n (RSS or Atom depending on --atom-ratio)
+    /_control/configure      POST ?feeds=&items=&run= to reshape the farm
+    /_control/advance        POST to publish new items on --churn of the feeds
+    /_control/stats          GET request/fault/byte counters
+
+Every feed answers conditional requests (ETag / Last-Modified -> 304).
+Faults are assigned per feed, deterministically from --seed:
+    --latency-ms / --jitter-ms   delay before every response
+    --fault-403                  fraction of feeds that always return 403
+    --fault-truncate             fraction that cut the body off mid-document
+    --fault-slowloris            fraction that trickle the body out slowly
+
+Usage:
+    python tests/load/feed_farm.py --feeds 200 --items 50
+    python tests/load/feed_farm.py --feeds 11 --items 30 --latency-ms 150 --fault-403 0.1
+    python tests/load/feed_farm.py --feeds 20 --items 500 --span-days 365   # archive feeds
+
+Then start the site with RSS_FEED_LIST_URL=http://127.0.0.1:8765/feeds.json.
+"""
+
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+from xml.sax.saxutils import escape
+import argparse
+import hashlib
+import json
+import random
+import threading
+import time
+
+CATEGORIES = ["Housing", "Politics", "Education", "Public Safety", "Culture", "Business", "Health", "Transit"]
+WORDS = (
+    "mission district supervisors housing tenants rent board election ballot school district "
+    "teachers police commission transit muni bart budget mayor community neighborhood "
+    "small business festival mural artists library park recreation health clinic"
+).split()
+
+# Slow-loris responses send this many bytes per tick
+SLOWLORIS_CHUNK = 64
+SLOWLORIS_TICK_S = 0.25
+
+
+class Farm:
+    """The farm's shape, fault assignment and counters; shared by all handler threads"""
+
+    def __init__(self, args):
+        self.args = args
+        self.lock = threading.Lock()
+        self.started = datetime.now(timezone.utc).replace(microsecond=0)
+        self.configure(args.feeds, args.items, run="r0")
+
+    def configure(self, feeds, items, run=None):
+        with self.lock:
+            self.feeds = feeds
+            self.items = items
+            self.run = run or f"r{int(time.time())}"
+            # Each feed's published-item count grows as it churns
+            self.published = [0] * feeds
+            self.modified = [self.started] * feeds
+            self.cache = {}
+            rng = random.Random(self.args.seed)
+            self.faults = []
+            for _ in range(feeds):
+                roll = rng.random()
+                if roll < self.args.fault_403:
+                    self.faults.append("403")
+                elif roll < self.args.fault_403 + self.args.fault_truncate:
+                    self.faults.append("truncate")
+                elif roll < self.args.fault_403 + self.args.fault_truncate + self.args.fault_slowloris:
+                    self.faults.append("slowloris")
+                else:
+                    self.faults.append(None)
+            self.atom = [rng.random() < self.args.atom_ratio for _ in range(feeds)]
+            self.stats = {"requests": 0, "304": 0, "403": 0, "truncated": 0, "slowloris": 0, "bytes": 0}
+
+    def advance(self):
+        """Publish 1-3 new items on a --churn fraction of feeds"""
+        rng = random.Random()
+        now = datetime.now(timezone.utc).replace(microsecond=0)
+        changed = 0
+        with self.lock:
+            for n in range(self.feeds):
+                if rng.random() < self.args.churn:
+                    self.published[n] += rng.randint(1, 3)
+                    self.modified[n] = now
+                    self.cache.pop(n, None)
+                    changed += 1
+        return changed
+
+    def count(self, key, amount=1):
+        with self.lock:
+            self.stats[key] += amount
+
+    def feed_list(self, base):
+        return [
+            {
+                "memberId": f"farm-{n}",
+                "memberName": f"Farm Publication {n}",
+                "memberSlug": f"farm-{n}",
+                "rssUrl": f"{base}/feed/{n}.xml",
+            }
+            for n in range(self.feeds)
+        ]
+
+    def document(self, n, base):
+        """(body, etag, last_modified) for feed n, cached until it churns"""
+        with self.lock:
+            cached = self.cache.get(n)
+            if cached:
+                return cached
+            published, modified, atom = self.published[n], self.modified[n], self.atom[n]
+        body = (render_atom if atom else render_rss)(self, n, published, base).encode("utf-8")
+        entry = (body, f'"{hashlib.sha1(body).hexdigest()[:16]}"', modified)
+        with self.lock:
+            self.cache[n] = entry
+        return entry
+
+
+# ===========================================
+# Feed rendering
+# ===========================================
+
+def item_fields(farm, n, index, newest):
+    """Deterministic fields for item `index` of feed n (higher index = newer)"""
+    rng = random.Random(f"{farm.args.seed}-{n}-{index}")
+    title = " ".join(rng.choice(WORDS) for _ in range(rng.randint(5, 10))).capitalize()
+    paragraphs = [
+        " ".join(rng.choice(WORDS) for _ in range(rng.randint(40, 90))).capitalize() + "."
+        for _ in range(rng.randint(3, 8))
+    ]
+    image = f"https://images.example.org/farm-{n}/{index}.jpg"
+    # Newest item is a few minutes old; older ones spread across the poller's
+    # 7-day window, or across --span-days to model archive feeds
+    if farm.args.span_days:
+        spacing = farm.args.span_days * 24 * 60 / max(farm.items, 1)
+    else:
+        spacing = min(37, (7 * 24 * 60 - 60) / max(farm.items, 1))
+    published = farm.started - timedelta(minutes=5 + (newest - index) * spacing)
+    return {
+        "guid": f"https://farm-{n}.example.org/?p={farm.run}-{index}",
+        "link": f"https://farm-{n}.example.org/{farm.run}/story-{index}/",
+        "title": title,
+        "creator": f"Reporter {rng.randint(1, 40)}",
+        "categories": rng.sample(CATEGORIES, rng.randint(1, 3)),
+        "summary": paragraphs[0][:240],
+        "content": (
+            f'<figure><img src="{image}" alt="" width="1200" height="800" /></figure>'
+            + "".join(f"<p>{p}</p>" for p in paragraphs)
+            + '<script>window.dataLayer = window.dataLayer || []</script>'
+        ),
+        "image": image,
+        "published": published,
+    }
+
+
+def render_rss(farm, n, published, base):
+    newest = farm.items + published - 1
+    items = []
+    for index in range(newest, newest - farm.items, -1):
+        f = item_fields(farm, n, index, newest)
+        categories = "".join(f"<category><![CDATA[{c}]]></category>" for c in f["categories"])
+        items.append(f"""
+    <item>
+      <title>{escape(f['title'])}</title>
+      <link>{f['link']}</link>
+      <dc:creator><![CDATA[{f['creator']}]]></dc:creator>
+      <pubDate>{format_datetime(f['published'])}</pubDate>
+      {categories}
+      <guid isPermaLink="false">{f['guid']}</guid>
+      <description><![CDATA[{f['summary']} [&#8230;]]]></description>
+      <content:encoded><![CDATA[{f['content']}]]></content:encoded>
+      <media:content url="{f['image']}" medium="image" />
+      <enclosure url="{f['image']}" length="123456" type="image/jpeg" />
+    </item>""")
+    return f"""<?xml version="1.0" encoding="UTF-8"?>
+<rss version="2.0"
+  xmlns:content="http://purl.org/rss/1.0/modules/content/"
+  xmlns:dc="http://purl.org/dc/elements/1.1/"
+  xmlns:media="http://search.yahoo.com/mrss/"
+  xmlns:atom="http://www.w3.org/2005/Atom">
+  <channel>
+    <title>Farm Publication {n}</title>
+    <atom:link href="{base}/feed/{n}.xml" rel="self" type="application/rss+xml" />
+    <link>https://farm-{n}.example.org</link>
+    <description>Synthetic feed {n}</description>
+    <language>en-US</language>
+    <generator>https://wordpress.org/?v=6.4</generator>{''.join(items)}
+  </channel>
+</rss>
+"""
+
+
+def render_atom(farm, n, published, base):
+    newest = farm.items + published - 1
+    entries = []
+    for index in range(newest, newest - farm.items, -1):
+        f = item_fields(farm, n, index, newest)
+        categories = "".join(f'<category term="{escape(c)}" />' for c in f["categories"])
+        entries.append(f"""
+  <entry>
+    <title>{escape(f['title'])}</title>
+    <link href="{f['link']}" />
+    <id>{f['guid']}</id>
+    <updated>{f['published'].isoformat()}</updated>
+    <published>{f['published'].isoformat()}</published>
+    <author><name>{f['creator']}</name></author>
+    {categories}
+    <summary>{escape(f['summary'])}</summary>
+    <content type="html">{escape(f['content'])}</content>
+  </entry>""")
+    return f"""<?xml version="1.0" encoding="utf-8"?>
+<feed xmlns="http://www.w3.org/2005/Atom">
+  <title>Farm Publication {n}</title>
+  <link href="https://farm-{n}.example.org" />
+  <link rel="self" href="{base}/feed/{n}.xml" />
+  <id>{base}/feed/{n}.xml</id>
+  <updated>{farm.started.isoformat()}</updated>{''.join(entries)}
+</feed>
+"""
+
+
+# ===========================================
+# HTTP
+# ===========================================
+
+class FarmHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    farm = None
+
+    def log_message(self, format, *args):
+        if self.farm.args.verbose:
+            super().log_message(format, *args)
+
+    @property
+    def base(self):
+        return f"http://{self.headers.get('Host', 'localhost')}"
+
+    def send_body(self, status, body, content_type, headers=None):
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+        self.farm.count("bytes", len(body))
+
+    def send_json(self, data, status=200):
+        self.send_body(status, json.dumps(data).encode(), "application/json")
+
+    def do_GET(self):
+        url = urlsplit(self.path)
+        if url.path == "/feeds.json":
+            return self.send_json(self.farm.feed_list(self.base))
+        if url.path == "/_control/stats":
+            with self.farm.lock:
+                return self.send_json(dict(self.farm.stats, feeds=self.farm.feeds, items=self.farm.items, run=self.farm.run))
+        if url.path.startswith("/feed/") and url.path.endswith(".xml"):
+            try:
+                n = int(url.path[len("/feed/"):-len(".xml")])
+            except ValueError:
+                n = -1
+            if 0 <= n < self.farm.feeds:
+                return self.serve_feed(n)
+        self.send_body(404, b"Not found", "text/plain")
+
+    def do_POST(self):
+        url = urlsplit(self.path)
+        query = {k: v[0] for k, v in parse_qs(url.query).items()}
+        if url.path == "/_control/configure":
+            self.farm.configure(
+                int(query.get("feeds", self.farm.feeds)),
+                int(query.get("items", self.farm.items)),
+                run=query.get("run"),
+            )
+            return self.send_json({"feeds": self.farm.feeds, "items": self.farm.items, "run": self.farm.run})
+        if url.path == "/_control/advance":
+            return self.send_json({"changed": self.farm.advance()})
+        self.send_body(404, b"Not found", "text/plain")
+
+    def serve_feed(self, n):
+        farm = self.farm
+        farm.count("requests")
+        args = farm.args
+        delay = args.latency_ms + (random.uniform(0, args.jitter_ms) if args.jitter_ms else 0)
+        if delay:
+            time.sleep(delay / 1000)
+
+        fault = farm.faults[n]
+        if fault == "403":
+            farm.count("403")
+            return self.send_body(403, b"<html><body>Forbidden</body></html>", "text/html")
+
+        body, etag, modified = farm.document(n, self.base)
+        if self.not_modified(etag, modified):
+            farm.count("304")
+            self.send_response(304)
+            self.send_header("ETag", etag)
+            self.send_header("Last-Modified", format_datetime(modified, usegmt=True))
+            self.end_headers()
+            return
+
+        self.send_response(200)
+        self.send_header("Content-Type", "application/rss+xml; charset=UTF-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("ETag", etag)
+        self.send_header("Last-Modified", format_datetime(modified, usegmt=True))
+        if fault:
+            self.send_header("Connection", "close")
+            self.close_connection = True
+        self.end_headers()
+
+        try:
+            if fault == "truncate":
+                farm.count("truncated")
+                self.wfile.write(body[:len(body) // 2])
+                farm.count("bytes", len(body) // 2)
+            elif fault == "slowloris":
+                farm.count("slowloris")
+                for start in range(0, len(body), SLOWLORIS_CHUNK):
+                    self.wfile.write(body[start:start + SLOWLORIS_CHUNK])
+                    self.wfile.flush()
+                    farm.count("bytes", len(body[start:start + SLOWLORIS_CHUNK]))
+                    time.sleep(SLOWLORIS_TICK_S)
+            else:
+                self.wfile.write(body)
+                farm.count("bytes", len(body))
+        except (BrokenPipeError, ConnectionResetError):
+            # The poller gave up on us (deadline hit), which is the point
+            self.close_connection = True
+
+    def not_modified(self, etag, modified):
+        if_none_match = self.headers.get("If-None-Match")
+        if if_none_match:
+            return etag in [tag.strip() for tag in if_none_match.split(",")]
+        if_modified_since = self.headers.get("If-Modified-Since")
+        if if_modified_since:
+            try:
+                return modified <= parsedate_to_datetime(if_modified_since)
+            except (TypeError, ValueError):
+                return False
+        return False
+
+
+def start_farm(args):
+    """Start the farm on a background thread; returns (server, farm)"""
+    farm = Farm(args)
+    handler = type("Handler", (FarmHandler,), {"farm": farm})
+    server = ThreadingHTTPServer((args.host, args.port), handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, farm
+
+
+def add_farm_arguments(parser, shape=True):
+    """Farm options; `shape=False` leaves --feeds/--items to the caller"""
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    if shape:
+        parser.add_argument("--feeds", type=int, default=11, help="Number of feeds (default: 11)")
+        parser.add_argument("--items", type=int, default=30, help="Items per feed (default: 30)")
+    parser.add_argument("--seed", type=int, default=1, help="Seed for content and fault assignment")
+    parser.add_argument("--atom-ratio", type=float, default=0.1, help="Fraction of feeds served as Atom")
+    parser.add_argument("--span-days", type=float, default=0,
+                        help="Spread each feed's items over this many days (default: inside the 7-day window)")
+    parser.add_argument("--churn", type=float, default=0.3, help="Fraction of feeds that change per advance")
+    parser.add_argument("--latency-ms", type=float, default=0, help="Delay before every feed response")
+    parser.add_argument("--jitter-ms", type=float, default=0, help="Extra random delay up to this much")
+    parser.add_argument("--fault-403", type=float, default=0, help="Fraction of feeds that return 403")
+    parser.add_argument("--fault-truncate", type=float, default=0, help="Fraction of feeds with truncated bodies")
+    parser.add_argument("--fault-slowloris", type=float, default=0, help="Fraction of feeds that trickle their body")
+    parser.add_argument("--verbose", action="store_true", help="Log every request")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve synthetic RSS/Atom feeds for poll benchmarks")
+    add_farm_arguments(parser)
+    args = parser.parse_args()
+
+    server, farm = start_farm(args)
+    faults = {kind: farm.faults.count(kind) for kind in ("403", "truncate", "slowloris")}
+
+    print("\n" + "="*60)
+    print("SFIMC RSS FEED FARM")
+    print("="*60)
+    print(f"  Feeds:     {farm.feeds} x {farm.items} items ({sum(farm.atom)} Atom)")
+    print(f"  Faults:    {faults['403']} x 403, {faults['truncate']} truncated, {faults['slowloris']} slow-loris")
+    print(f"  Latency:   {args.latency_ms}ms + up to {args.jitter_ms}ms jitter")
+    print(f"\n📡 Feed list: http://{args.host}:{args.port}/feeds.json")
+    print("   Press Ctrl+C to stop")
+
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,152 @@
+#!/usr/bin/env python3
+"""
+SFIMC Load Harness HTTP Client
+A minimal asyncio HTTP/1.1 client with keep-alive connections, built on the
+standard library so the load scripts run without extra dependencies.
+
+Only what the harness needs: GET and POST requests, Content-Length,
+chunked and read-until-close bodies, and a bounded pool of reusable
+connections.
+"""
+
+from urllib.parse import urlsplit
+import asyncio
+import ssl
+
+
+class HTTPError(Exception):
+    """The server sent something that isn't a parsable HTTP/1.1 response"""
+
+
+class Response:
+    def __init__(self, status, headers, body):
+        self.status = status
+        self.headers = headers
+        self.body = body
+
+
+class Connection:
+    """One keep-alive connection to the target host"""
+
+    def __init__(self, host, port, use_ssl):
+        self.host = host
+        self.port = port
+        self.use_ssl = use_ssl
+        self.reader = None
+        self.writer = None
+
+    @property
+    def open(self):
+        return self.writer is not None and not self.writer.is_closing()
+
+    async def connect(self):
+        context = ssl.create_default_context() if self.use_ssl else None
+        self.reader, self.writer = await asyncio.open_connection(self.host, self.port, ssl=context)
+
+    async def get(self, path, headers=None):
+        return await self.request("GET", path, headers=headers)
+
+    async def request(self, method, path, body=None, headers=None):
+        if not self.open:
+            await self.connect()
+
+        lines = [f"{method} {path} HTTP/1.1", f"Host: {self.host}:{self.port}", "Connection: keep-alive"]
+        if body is not None:
+            lines.append(f"Content-Length: {len(body)}")
+        lines += [f"{name}: {value}" for name, value in (headers or {}).items()]
+        self.writer.write(("\r\n".join(lines) + "\r\n\r\n").encode("latin-1") + (body or b""))
+        await self.writer.drain()
+
+        status_line = await self.reader.readline()
+        if not status_line:
+            raise HTTPError("connection closed before response")
+        parts = status_line.decode("latin-1").split(" ", 2)
+        if len(parts) < 2 or not parts[0].startswith("HTTP/"):
+            raise HTTPError(f"bad status line: {status_line[:80]!r}")
+        status = int(parts[1])
+
+        response_headers = {}
+        while True:
+            line = await self.reader.readline()
+            if line in (b"\r\n", b"\n", b""):
+                break
+            name, _, value = line.decode("latin-1").partition(":")
+            response_headers[name.strip().lower()] = value.strip()
+
+        if response_headers.get("transfer-encoding", "").lower() == "chunked":
+            body = await self._read_chunked()
+        elif "content-length" in response_headers:
+            body = await self.reader.readexactly(int(response_headers["content-length"]))
+        elif status in (204, 304) or 100 <= status < 200:
+            body = b""
+        else:
+            body = await self.reader.read()
+            self.close()
+
+        if response_headers.get("connection", "").lower() == "close":
+            self.close()
+        return Response(status, response_headers, body)
+
+    async def _read_chunked(self):
+        chunks = []
+        while True:
+            size_line = await self.reader.readline()
+            size = int(size_line.split(b";")[0].strip() or b"0", 16)
+            if size == 0:
+                # Skip trailers up to the terminating blank line
+                while (await self.reader.readline()) not in (b"\r\n", b"\n", b""):
+                    pass
+                return b"".join(chunks)
+            chunks.append(await self.reader.readexactly(size))
+            await self.reader.readexactly(2)
+
+    def close(self):
+        if self.writer is not None:
+            self.writer.close()
+        self.reader = self.writer = None
+
+
+class ConnectionPool:
+    """
+    At most `size` connections to one origin. `get()` waits for an idle
+    connection when all are busy, so callers see pool queueing as latency.
+    """
+
+    def __init__(self, base_url, size):
+        parts = urlsplit(base_url)
+        self.host = parts.hostname
+        self.use_ssl = parts.scheme == "https"
+        self.port = parts.port or (443 if self.use_ssl else 80)
+        self.size = size
+        self._idle = asyncio.Queue()
+        self._created = 0
+        self.connects = 0
+
+    async def _acquire(self):
+        if self._idle.empty() and self._created < self.size:
+            self._created += 1
+            return Connection(self.host, self.port, self.use_ssl)
+        return await self._idle.get()
+
+    async def get(self, path, headers=None, timeout=10.0):
+        return await self.request("GET", path, headers=headers, timeout=timeout)
+
+    async def post(self, path, body, headers=None, timeout=10.0):
+        return await self.request("POST", path, body=body, headers=headers, timeout=timeout)
+
+    async def request(self, method, path, body=None, headers=None, timeout=10.0):
+        conn = await self._acquire()
+        try:
+            if not conn.open:
+                self.connects += 1
+            return await asyncio.wait_for(conn.request(method, path, body, headers), timeout)
+        except BaseException:
+            # A half-read response poisons the connection; start over next time
+            conn.close()
+            raise
+        finally:
+            self._idle.put_nowait(conn)
+
+    def close(self):
+        while not self._idle.empty():
+            self._idle.get_nowait().close()
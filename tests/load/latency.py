@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""
+SFIMC Load Harness Latency Stats
+Percentiles, per-second timelines and log-scale histograms shared by the
+load scripts.
+"""
+
+import math
+
+
+def percentile(sorted_values, pct):
+    """Nearest-rank percentile of an already sorted list"""
+    if not sorted_values:
+        return None
+    rank = max(1, math.ceil(pct / 100 * len(sorted_values)))
+    return sorted_values[rank - 1]
+
+
+def describe(latencies_ms):
+    """count/min/mean/p50/p95/p99/max of a list of latencies in milliseconds"""
+    values = sorted(latencies_ms)
+    if not values:
+        return {"count": 0}
+    return {
+        "count": len(values),
+        "min": round(values[0], 2),
+        "mean": round(sum(values) / len(values), 2),
+        "p50": round(percentile(values, 50), 2),
+        "p95": round(percentile(values, 95), 2),
+        "p99": round(percentile(values, 99), 2),
+        "max": round(values[-1], 2),
+    }
+
+
+class LatencyRecorder:
+    """
+    Every request's outcome, tagged by scenario and by the second of the run
+    it completed in.
+    """
+
+    def __init__(self):
+        self.samples = []  # (elapsed_s, scenario, latency_ms, ok)
+        self.errors = {}
+        self.bytes = 0
+
+    def record(self, elapsed_s, scenario, latency_ms, ok, error=None, size=0):
+        self.samples.append((elapsed_s, scenario, latency_ms, ok))
+        self.bytes += size
+        if error:
+            self.errors[error] = self.errors.get(error, 0) + 1
+
+    def summary(self, duration_s):
+        ok = [s for s in self.samples if s[3]]
+        scenarios = {}
+        for _, scenario, latency, success in self.samples:
+            entry = scenarios.setdefault(scenario, {"latencies": [], "errors": 0})
+            entry["latencies"].append(latency)
+            entry["errors"] += not success
+        return {
+            "requests": len(self.samples),
+            "errors": len(self.samples) - len(ok),
+            "error_rate": round((len(self.samples) - len(ok)) / len(self.samples), 4) if self.samples else 0.0,
+            "throughput_rps": round(len(ok) / duration_s, 2) if duration_s else 0.0,
+            "bytes": self.bytes,
+            "latency_ms": describe([s[2] for s in ok]),
+            "error_types": dict(sorted(self.errors.items(), key=lambda e: -e[1])),
+            "scenarios": {
+                name: {**describe(entry["latencies"]), "errors": entry["errors"]}
+                for name, entry in sorted(scenarios.items())
+            },
+            "timeline": self.timeline(),
+            "histogram": histogram([s[2] for s in ok]),
+        }
+
+    def timeline(self):
+        """Per-second request count, errors and latency percentiles"""
+        buckets = {}
+        for elapsed, _, latency, ok in self.samples:
+            bucket = buckets.setdefault(int(elapsed), {"latencies": [], "errors": 0})
+            if ok:
+                bucket["latencies"].append(latency)
+            else:
+                bucket["errors"] += 1
+        rows = []
+        for second in sorted(buckets):
+            stats = describe(buckets[second]["latencies"])
+            rows.append({
+                "second": second,
+                "requests": len(buckets[second]["latencies"]) + buckets[second]["errors"],
+                "errors": buckets[second]["errors"],
+                "p50": stats.get("p50"),
+                "p95": stats.get("p95"),
+                "p99": stats.get("p99"),
+            })
+        return rows
+
+
+def histogram(latencies_ms):
+    """Counts per power-of-two millisecond bucket: {"<1": n, "1-2": n, "2-4": n, ...}"""
+    counts = {}
+    for latency in latencies_ms:
+        if latency < 1:
+            label = "<1"
+        else:
+            low = 2 ** int(math.log2(latency))
+            label = f"{low}-{low * 2}"
+        counts[label] = counts.get(label, 0) + 1
+    return dict(sorted(counts.items(), key=lambda item: 0 if item[0] == "<1" else int(item[0].split("-")[0])))
+
+
+def bar(value, peak, width=30):
+    return "█" * (round(value / peak * width) if peak else 0)
+
+
+def print_histogram(counts):
+    peak = max(counts.values(), default=0)
+    for label, count in counts.items():
+        print(f"  {label + ' ms':>14} {count:>7}  {bar(count, peak)}")
+
+
+def print_timeline(rows):
+    peak = max((row["p95"] or 0 for row in rows), default=0)
+    print(f"  {'t(s)':>5}{'reqs':>7}{'errs':>6}{'p50':>9}{'p95':>9}{'p99':>9}")
+    for row in rows:
+        def ms(key):
+            return "-" if row[key] is None else f"{row[key]:.0f}"
+        print(f"  {row['second']:>5}{row['requests']:>7}{row['errors']:>6}{ms('p50'):>9}{ms('p95'):>9}{ms('p99'):>9}"
+              f"  {bar(row['p95'] or 0, peak, 20)}")
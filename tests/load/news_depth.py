@@ -0,0 +1,208 @@
+#!/usr/bin/env python3
+"""
+SFIMC /api/news Pagination Depth Benchmark
+Measures how page latency grows with depth into the archive, for cursor
+pagination (`cursor=`) and the legacy `offset=`, at several archive sizes.
+
+For each size the archive is reseeded with scripts/seed-news-items.ts,
+then at each depth (a fraction of the archive) the same page is fetched
+both ways:
+    offset  GET /api/news?offset=D
+    cursor  GET /api/news?cursor=C, where C is the nextCursor of the page
+            ending at D (taken from an untimed offset request)
+and the two pages are checked to hold the same stories. A short walk
+along nextCursor from the first page checks that pages never repeat or
+go back in time.
+
+Every request is sent with Cache-Control: no-cache so the route's page
+cache is skipped and each sample is a real query. Cursor latency should
+stay flat with depth; offset latency grows with it.
+
+Usage:
+    python tests/load/news_depth.py                                  # 10k, 100k, 1M
+    python tests/load/news_depth.py --sizes 10000 --samples 20
+    python tests/load/news_depth.py --no-seed --depths 0,0.5,0.99    # current archive
+"""
+
+from urllib.parse import urlencode
+import argparse
+import asyncio
+import json
+import os
+import shlex
+import subprocess
+import sys
+import time
+
+from http_client import ConnectionPool
+from latency import describe
+
+# Test configuration
+BASE_URL = os.environ.get("SFIMC_BASE_URL", "http://localhost:3000")
+RESULTS_DIR = os.environ.get("SFIMC_SCREENSHOT_DIR", "/tmp/sfimc-tests")
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+SEED_COMMAND = "npx tsx scripts/seed-news-items.ts {count}"
+NO_CACHE = {"Cache-Control": "no-cache"}
+
+# Ensure results directory exists
+os.makedirs(RESULTS_DIR, exist_ok=True)
+
+
+def seed(command, count):
+    print(f"\n🌱 Seeding {count:,} news items...")
+    started = time.perf_counter()
+    subprocess.run(shlex.split(command.format(count=count)), cwd=REPO_ROOT, check=True)
+    print(f"  ✅ Seeded in {time.perf_counter() - started:.1f}s")
+
+
+async def fetch(pool, params, timeout):
+    """GET /api/news; returns (latency ms, parsed body)"""
+    started = time.perf_counter()
+    response = await pool.get(f"/api/news?{urlencode(params)}", headers=NO_CACHE, timeout=timeout)
+    latency = (time.perf_counter() - started) * 1000
+    if response.status >= 400:
+        raise RuntimeError(f"HTTP {response.status} for {params}: {response.body[:200]!r}")
+    return latency, json.loads(response.body)
+
+
+async def timed(pool, params, samples, timeout):
+    """Latency stats over `samples` requests, plus the last body"""
+    latencies, body = [], None
+    for _ in range(samples):
+        latency, body = await fetch(pool, params, timeout)
+        latencies.append(latency)
+    return describe(latencies), body
+
+
+async def walk(pool, limit, pages, timeout):
+    """Follow nextCursor from the first page; returns a list of problems"""
+    problems, seen, previous = [], set(), None
+    params = {"limit": limit}
+    for page in range(pages):
+        _, body = await fetch(pool, params, timeout)
+        for story in body["stories"]:
+            key = (story["pubDate"], story["id"])
+            if story["id"] in seen:
+                problems.append(f"page {page + 1}: story {story['id']} repeated")
+            if previous and key > previous:
+                problems.append(f"page {page + 1}: story {story['id']} is newer than the one before it")
+            seen.add(story["id"])
+            previous = key
+        if not body.get("nextCursor"):
+            break
+        params = {"limit": limit, "cursor": body["nextCursor"]}
+    return problems
+
+
+async def measure(args, size):
+    pool = ConnectionPool(args.base_url, 1)
+    try:
+        _, first = await fetch(pool, {"limit": args.limit, "count": "true"}, args.timeout)
+        total = first.get("total", 0)
+        print(f"  Archive: {total:,} stories")
+
+        last_page = max(0, (total - 1) // args.limit * args.limit)
+        depths = sorted({min(last_page, int(f * total) // args.limit * args.limit) for f in args.depths})
+
+        print(f"\n  {'depth':>9}{'offset p50':>12}{'p95':>8}{'cursor p50':>12}{'p95':>8}  same page")
+        rows = []
+        for depth in depths:
+            if depth == 0:
+                # Both are the first page
+                offset_stats, offset_body = await timed(pool, {"limit": args.limit}, args.samples, args.timeout)
+                cursor_stats, cursor_body = offset_stats, offset_body
+            else:
+                offset_stats, offset_body = await timed(
+                    pool, {"limit": args.limit, "offset": depth}, args.samples, args.timeout)
+                _, before = await fetch(pool, {"limit": args.limit, "offset": depth - args.limit}, args.timeout)
+                cursor_stats, cursor_body = await timed(
+                    pool, {"limit": args.limit, "cursor": before["nextCursor"]}, args.samples, args.timeout)
+
+            same = [s["id"] for s in offset_body["stories"]] == [s["id"] for s in cursor_body["stories"]]
+            rows.append({"depth": depth, "offset": offset_stats, "cursor": cursor_stats, "same_page": same})
+            print(f"  {depth:>9,}{offset_stats['p50']:>12.1f}{offset_stats['p95']:>8.1f}"
+                  f"{cursor_stats['p50']:>12.1f}{cursor_stats['p95']:>8.1f}  {'✅' if same else '❌'}")
+
+        problems = await walk(pool, args.limit, args.walk, args.timeout)
+        for problem in problems[:5]:
+            print(f"  ❌ Walk: {problem}")
+        if not problems:
+            print(f"\n  ✅ Walked {args.walk} pages along nextCursor: no repeats, newest first")
+    finally:
+        pool.close()
+
+    def growth(mode):
+        base = rows[0][mode]["p50"]
+        return round(rows[-1][mode]["p50"] / base, 2) if base else None
+
+    return {
+        "size": size,
+        "total": total,
+        "depths": rows,
+        "cursor_growth": growth("cursor"),
+        "offset_growth": growth("offset"),
+        "walk_problems": problems,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark /api/news latency against pagination depth")
+    parser.add_argument("--sizes", default="10000,100000,1000000",
+                        help="Comma-separated archive sizes to seed (default: 10000,100000,1000000)")
+    parser.add_argument("--depths", default="0,0.01,0.1,0.5,0.99",
+                        help="Comma-separated depths as fractions of the archive (default: 0,0.01,0.1,0.5,0.99)")
+    parser.add_argument("--limit", type=int, default=20, help="Page size (default: 20)")
+    parser.add_argument("--samples", type=int, default=10, help="Requests per page and mode (default: 10)")
+    parser.add_argument("--walk", type=int, default=25, help="Pages to walk along nextCursor (default: 25)")
+    parser.add_argument("--max-growth", type=float, default=2.0,
+                        help="Fail when cursor p50 at the deepest page exceeds the first page's by this factor")
+    parser.add_argument("--seed-command", default=SEED_COMMAND,
+                        help=f"Reseeds the archive; {{count}} is replaced (default: {SEED_COMMAND})")
+    parser.add_argument("--no-seed", action="store_true", help="Measure the current archive once")
+    parser.add_argument("--base-url", default=BASE_URL, help=f"Site origin (default: {BASE_URL})")
+    parser.add_argument("--timeout", type=float, default=60, help="Per-request timeout in seconds")
+    args = parser.parse_args()
+    args.depths = [float(v) for v in args.depths.split(",")]
+    sizes = [None] if args.no_seed else [int(v) for v in args.sizes.split(",")]
+
+    print("\n" + "="*60)
+    print("SFIMC /api/news PAGINATION DEPTH")
+    print("="*60)
+    print(f"  Target:  {args.base_url}/api/news (limit {args.limit}, {args.samples} samples per page)")
+
+    results = []
+    for size in sizes:
+        if size is not None:
+            seed(args.seed_command, size)
+        print(f"\n\n📚 {'CURRENT ARCHIVE' if size is None else f'{size:,} ITEMS'}")
+        print("-"*40)
+        results.append(asyncio.run(measure(args, size)))
+
+    print("\n\n📈 DEEPEST PAGE vs FIRST PAGE (p50)")
+    print("-"*40)
+    print(f"  {'archive':>10}{'offset':>9}{'cursor':>9}")
+    for result in results:
+        print(f"  {result['total']:>10,}{result['offset_growth'] or 0:>8.1f}x{result['cursor_growth'] or 0:>8.1f}x")
+
+    failures = []
+    for result in results:
+        if result["cursor_growth"] and result["cursor_growth"] > args.max_growth:
+            failures.append(f"{result['total']:,} items: cursor latency grew {result['cursor_growth']}x with depth")
+        if not all(row["same_page"] for row in result["depths"]):
+            failures.append(f"{result['total']:,} items: cursor and offset pages differ")
+        if result["walk_problems"]:
+            failures.append(f"{result['total']:,} items: {len(result['walk_problems'])} problems walking nextCursor")
+    for failure in failures:
+        print(f"  ❌ {failure}")
+    if not failures:
+        print(f"\n  ✅ Cursor latency stayed within {args.max_growth}x of the first page at every size")
+
+    path = f"{RESULTS_DIR}/news_depth_results.json"
+    with open(path, "w") as f:
+        json.dump({"base_url": args.base_url, "limit": args.limit, "results": results}, f, indent=2)
+    print(f"\n📄 Results saved to: {path}")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
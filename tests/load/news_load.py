@@ -0,0 +1,384 @@
+#!/usr/bin/env python3
+"""
+SFIMC /api/news Load Generator
+Replays a weighted mix of the queries NewsGrid and NewsFeedMasonry send
+(limit/offset/member/category/search/featured) against /api/news and reports
+latency percentiles, throughput, error rates and latency over time.
+
+Two load models:
+  --concurrency N   closed loop: N clients, each sending its next request as
+                    soon as the previous one returns
+  --rps R           open loop: requests start on a fixed schedule whether or
+                    not earlier ones have finished; latency is measured from
+                    the scheduled start so a stalled server can't hide its
+                    queueing (no coordinated omission)
+
+--ramp runs one step per value (concurrency, or RPS with --rps) and prints
+where throughput stops scaling, i.e. where the route saturates.
+
+A mix file can point at another route with "endpoint" and name a "metrics"
+path whose JSON counters are read before and after each step; the step
+reports how much each counter moved (e.g. feed cache hits and misses for
+stories_mix.json). The metrics path gets ?secret=$CRON_SECRET (default
+"bench"), which /api/stories/metrics requires. "headers" are sent with
+every request, e.g. {"Cache-Control": "no-cache"} to measure the queries
+behind the page cache.
+
+Usage:
+    python tests/load/news_load.py --concurrency 8 --duration 30
+    python tests/load/news_load.py --rps 50 --duration 60
+    python tests/load/news_load.py --ramp 1,2,4,8,16,32 --duration 15
+    python tests/load/news_load.py --mix my_mix.json --seed 7
+    python tests/load/news_load.py --mix tests/load/stories_mix.json --rps 20
+"""
+
+from urllib.parse import urlencode
+import argparse
+import asyncio
+import json
+import os
+import random
+import sys
+import time
+
+from http_client import ConnectionPool
+from latency import LatencyRecorder, print_histogram, print_timeline
+
+# Test configuration
+BASE_URL = os.environ.get("SFIMC_BASE_URL", "http://localhost:3000")
+RESULTS_DIR = os.environ.get("SFIMC_SCREENSHOT_DIR", "/tmp/sfimc-tests")
+CRON_SECRET = os.environ.get("CRON_SECRET", "bench")
+MIX_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "news_mix.json")
+ENDPOINT = "/api/news"
+
+# Ensure results directory exists
+os.makedirs(RESULTS_DIR, exist_ok=True)
+
+# A step saturates when throughput grows less than this...
+SATURATION_THROUGHPUT_GAIN = 1.1
+# ...while p95 latency grows by more than this
+SATURATION_LATENCY_GROWTH = 1.5
+
+
+# ===========================================
+# Query mix
+# ===========================================
+
+class QueryMix:
+    """Weighted scenarios from news_mix.json, with $placeholders filled per request"""
+
+    def __init__(self, config, rng):
+        self.rng = rng
+        page_size = int(config.get("page_size", 20))
+        self.values = {
+            "$offset": [str(o) for o in range(page_size, int(config.get("max_offset", 100)) + 1, page_size)],
+            "$member": list(config.get("members", [])),
+            "$category": list(config.get("categories", [])),
+            "$search": list(config.get("search_terms", [])),
+        }
+        self.scenarios = config["scenarios"]
+        self.endpoint = config.get("endpoint", ENDPOINT)
+        self.headers = config.get("headers")
+
+    def uses(self, placeholder):
+        return any(placeholder in s["params"].values() for s in self.scenarios)
+
+    def prune(self):
+        """Drop scenarios whose placeholders have nothing to draw from"""
+        usable = []
+        for scenario in self.scenarios:
+            missing = [v for v in scenario["params"].values() if v in self.values and not self.values[v]]
+            if missing:
+                print(f"  ⚠️ Skipping scenario '{scenario['name']}': no values for {', '.join(missing)}")
+            else:
+                usable.append(scenario)
+        self.scenarios = usable
+        self.weights = [s["weight"] for s in usable]
+
+    def next(self):
+        scenario = self.rng.choices(self.scenarios, weights=self.weights)[0]
+        params = {
+            key: self.rng.choice(self.values[value]) if value in self.values else value
+            for key, value in scenario["params"].items()
+        }
+        return scenario["name"], f"{self.endpoint}?{urlencode(params)}"
+
+
+async def discover(pool, mix, timeout):
+    """Fill empty member/category lists from a first page of real results"""
+    wanted = [p for p in ("$member", "$category") if mix.uses(p) and not mix.values[p]]
+    if not wanted:
+        return
+    print("\n🔍 Discovering members and categories...")
+    try:
+        response = await pool.get(f"{mix.endpoint}?limit=100", timeout=timeout)
+        data = json.loads(response.body)
+    except Exception as e:
+        print(f"  ⚠️ Discovery failed: {type(e).__name__}: {e}")
+        return
+    if not mix.values["$member"]:
+        mix.values["$member"] = sorted({s["publicationSlug"] for s in data.get("stories", []) if s.get("publicationSlug")})
+    if not mix.values["$category"]:
+        mix.values["$category"] = list(data.get("filters", {}).get("categories", []))
+    print(f"  ✅ {len(mix.values['$member'])} members, {len(mix.values['$category'])} categories")
+
+
+async def read_metrics(pool, path, timeout):
+    """Flattened numeric counters from a metrics route, or None when unavailable"""
+    try:
+        separator = "&" if "?" in path else "?"
+        response = await pool.get(f"{path}{separator}{urlencode({'secret': CRON_SECRET})}", timeout=timeout)
+        data = json.loads(response.body) if response.status < 400 else None
+    except Exception:
+        data = None
+    if not isinstance(data, dict):
+        return None
+
+    counters = {}
+    def flatten(prefix, value):
+        if isinstance(value, bool):
+            return
+        if isinstance(value, (int, float)):
+            counters[prefix] = value
+        elif isinstance(value, dict):
+            for key, inner in value.items():
+                flatten(f"{prefix}.{key}" if prefix else key, inner)
+    flatten("", data)
+    return counters
+
+
+def metrics_delta(before, after):
+    if before is None or after is None:
+        return None
+    return {key: round(after[key] - before.get(key, 0), 3) for key in after}
+
+
+# ===========================================
+# Load models
+# ===========================================
+
+async def send(pool, mix, run_start, started, timeout):
+    """One request; `started` is when it should have begun (scheduled or actual)"""
+    scenario, path = mix.next()
+    ok, error, size = False, None, 0
+    try:
+        response = await pool.get(path, headers=mix.headers, timeout=timeout)
+        size = len(response.body)
+        ok = response.status < 400
+        if not ok:
+            error = f"HTTP {response.status}"
+    except asyncio.TimeoutError:
+        error = "timeout"
+    except Exception as e:
+        error = type(e).__name__
+    finished = time.perf_counter()
+    return (finished - run_start, scenario, (finished - started) * 1000, ok, error, size)
+
+
+async def closed_loop(pool, mix, concurrency, duration, warmup, timeout):
+    recorder = LatencyRecorder()
+    run_start = time.perf_counter()
+    measure_from = run_start + warmup
+    deadline = measure_from + duration
+
+    async def client():
+        while time.perf_counter() < deadline:
+            started = time.perf_counter()
+            sample = await send(pool, mix, measure_from, started, timeout)
+            if started >= measure_from:
+                recorder.record(*sample)
+
+    await asyncio.gather(*(client() for _ in range(concurrency)))
+    return recorder
+
+
+async def open_loop(pool, mix, rps, duration, warmup, timeout):
+    recorder = LatencyRecorder()
+    run_start = time.perf_counter()
+    measure_from = run_start + warmup
+    total = int((warmup + duration) * rps)
+    in_flight = set()
+
+    async def scheduled(started):
+        sample = await send(pool, mix, measure_from, started, timeout)
+        if started >= measure_from:
+            recorder.record(*sample)
+
+    for i in range(total):
+        started = run_start + i / rps
+        delay = started - time.perf_counter()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        task = asyncio.create_task(scheduled(started))
+        in_flight.add(task)
+        task.add_done_callback(in_flight.discard)
+
+    if in_flight:
+        await asyncio.wait(in_flight)
+    return recorder
+
+
+async def run_step(args, config, level, seed):
+    mix = QueryMix(config, random.Random(seed))
+    connections = args.max_connections or (level if args.rps is None else max(1, int(level)))
+    pool = ConnectionPool(args.base_url, connections)
+    try:
+        await discover(pool, mix, args.timeout)
+        mix.prune()
+        if not mix.scenarios:
+            raise SystemExit("❌ No usable scenarios in the mix")
+        metrics_path = config.get("metrics")
+        before = await read_metrics(pool, metrics_path, args.timeout) if metrics_path else None
+        if args.rps is None:
+            recorder = await closed_loop(pool, mix, level, args.duration, args.warmup, args.timeout)
+        else:
+            recorder = await open_loop(pool, mix, level, args.duration, args.warmup, args.timeout)
+        after = await read_metrics(pool, metrics_path, args.timeout) if metrics_path else None
+    finally:
+        pool.close()
+
+    summary = recorder.summary(args.duration)
+    summary["connections_opened"] = pool.connects
+    if metrics_path:
+        # Warmup requests are included: the counters can't tell them apart
+        summary["server_metrics"] = metrics_delta(before, after)
+    return summary
+
+
+# ===========================================
+# Reporting
+# ===========================================
+
+def print_step(label, summary):
+    latency = summary["latency_ms"]
+    print(f"\n\n📊 {label}")
+    print("-"*40)
+    print(f"  Requests:    {summary['requests']} ({summary['throughput_rps']} req/s ok)")
+    print(f"  Errors:      {summary['errors']} ({summary['error_rate']:.2%})")
+    if latency["count"]:
+        print(f"  Latency:     p50 {latency['p50']:.0f}ms  p95 {latency['p95']:.0f}ms  "
+              f"p99 {latency['p99']:.0f}ms  max {latency['max']:.0f}ms")
+    for error, count in summary["error_types"].items():
+        print(f"    ❌ {error}: {count}")
+
+    print(f"\n  {'Scenario':<14}{'n':>7}{'errs':>6}{'p50':>9}{'p95':>9}{'p99':>9}")
+    for name, stats in summary["scenarios"].items():
+        def ms(key):
+            return f"{stats[key]:.0f}" if key in stats else "-"
+        print(f"  {name:<14}{stats['count']:>7}{stats['errors']:>6}{ms('p50'):>9}{ms('p95'):>9}{ms('p99'):>9}")
+
+    if "server_metrics" in summary:
+        counters = summary["server_metrics"]
+        if counters is None:
+            print("\n  ⚠️ Server metrics unavailable (is CRON_SECRET the server's?)")
+        else:
+            print("\n  Server counters (change over step):")
+            for key, value in counters.items():
+                print(f"    {key:<32}{value:>10}")
+
+    print("\n  Latency over time (ms):")
+    print_timeline(summary["timeline"])
+    print("\n  Latency distribution:")
+    print_histogram(summary["histogram"])
+
+
+def find_saturation(steps):
+    """First step where throughput flattens while p95 climbs"""
+    for previous, current in zip(steps, steps[1:]):
+        before, after = previous["summary"], current["summary"]
+        if not before["latency_ms"]["count"] or not after["latency_ms"]["count"]:
+            continue
+        gain = after["throughput_rps"] / before["throughput_rps"] if before["throughput_rps"] else 0
+        growth = after["latency_ms"]["p95"] / before["latency_ms"]["p95"] if before["latency_ms"]["p95"] else 0
+        if gain < SATURATION_THROUGHPUT_GAIN and growth > SATURATION_LATENCY_GROWTH:
+            return previous["level"]
+    return None
+
+
+def print_ramp(steps, unit):
+    print("\n\n📈 RAMP")
+    print("-"*40)
+    print(f"  {unit:>12}{'req/s':>9}{'err%':>7}{'p50':>9}{'p95':>9}{'p99':>9}")
+    for step in steps:
+        s = step["summary"]
+        latency = s["latency_ms"]
+        def ms(key):
+            return f"{latency[key]:.0f}" if key in latency else "-"
+        print(f"  {step['level']:>12}{s['throughput_rps']:>9}{s['error_rate']:>7.1%}{ms('p50'):>9}{ms('p95'):>9}{ms('p99'):>9}")
+
+    knee = find_saturation(steps)
+    if knee is None:
+        print(f"\n  ✅ Throughput kept scaling across every step")
+    else:
+        print(f"\n  ⚠️ Saturates around {unit.lower()} {knee}: more load adds latency, not throughput")
+    return knee
+
+
+# ===========================================
+# Main
+# ===========================================
+
+def main():
+    parser = argparse.ArgumentParser(description="Load test /api/news with a realistic query mix")
+    load = parser.add_mutually_exclusive_group()
+    load.add_argument("--concurrency", type=int, default=8, help="Closed-loop clients (default: 8)")
+    load.add_argument("--rps", type=float, help="Open-loop arrival rate instead of fixed concurrency")
+    parser.add_argument("--ramp", help="Comma-separated levels to step through, e.g. 1,2,4,8,16")
+    parser.add_argument("--duration", type=float, default=30, help="Measured seconds per step (default: 30)")
+    parser.add_argument("--warmup", type=float, default=3, help="Unmeasured seconds before each step (default: 3)")
+    parser.add_argument("--timeout", type=float, default=10, help="Per-request timeout in seconds (default: 10)")
+    parser.add_argument("--max-connections", type=int,
+                        help="Connection pool size (default: concurrency, or the RPS in open-loop mode)")
+    parser.add_argument("--mix", default=MIX_FILE, help="Query mix file (default: news_mix.json)")
+    parser.add_argument("--seed", type=int, default=1, help="Seed for the query mix (default: 1)")
+    parser.add_argument("--base-url", default=BASE_URL, help=f"Target origin (default: {BASE_URL})")
+    parser.add_argument("--max-error-rate", type=float, default=0.01,
+                        help="Exit non-zero when any step's error rate exceeds this (default: 0.01)")
+    args = parser.parse_args()
+
+    with open(args.mix) as f:
+        config = json.load(f)
+
+    unit = "Concurrency" if args.rps is None else "RPS"
+    cast = int if args.rps is None else float
+    levels = [cast(v) for v in args.ramp.split(",")] if args.ramp else [args.concurrency if args.rps is None else args.rps]
+
+    print("\n" + "="*60)
+    endpoint = config.get("endpoint", ENDPOINT)
+    print(f"SFIMC {endpoint} LOAD TEST")
+    print("="*60)
+    print(f"  Target:   {args.base_url}{endpoint}")
+    print(f"  Mode:     {'closed loop' if args.rps is None else 'open loop'}, {unit.lower()} {', '.join(map(str, levels))}")
+    print(f"  Duration: {args.duration}s per step (+{args.warmup}s warmup)")
+
+    steps = []
+    for index, level in enumerate(levels):
+        summary = asyncio.run(run_step(args, config, level, args.seed + index))
+        steps.append({"level": level, "summary": summary})
+        print_step(f"{unit.upper()} {level}", summary)
+
+    knee = print_ramp(steps, unit) if len(steps) > 1 else None
+
+    output = {
+        "target": f"{args.base_url}{endpoint}",
+        "mode": "closed" if args.rps is None else "open",
+        "duration": args.duration,
+        "warmup": args.warmup,
+        "mix": config,
+        "saturation": knee,
+        "steps": steps,
+    }
+    name = os.path.basename(args.mix).rsplit(".", 1)[0].removesuffix("_mix")
+    path = f"{RESULTS_DIR}/{name}_load_results.json"
+    with open(path, "w") as f:
+        json.dump(output, f, indent=2)
+    print(f"\n📄 Results saved to: {path}")
+
+    failed = [s for s in steps if s["summary"]["error_rate"] > args.max_error_rate]
+    for step in failed:
+        print(f"❌ {unit} {step['level']}: error rate {step['summary']['error_rate']:.2%} exceeds {args.max_error_rate:.2%}")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
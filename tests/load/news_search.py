@@ -0,0 +1,177 @@
+#!/usr/bin/env python3
+"""
+SFIMC /api/news Search Benchmark
+Runs the search scenarios of the news_load.py query mix against both
+search paths of /api/news as the archive grows:
+    contains  searchMode=contains, substring match on title/description
+    index     the default, ranked full-text search (lib/news/search)
+
+For each size the archive is reseeded with scripts/seed-news-items.ts, then
+each path gets the same closed-loop run (same seed, same terms). Requests
+carry Cache-Control: no-cache so every one reaches the database.
+
+A match check also runs every search term, plus a one-letter typo of it,
+through both paths with count=true: the index should find everything
+`contains` finds for whole words, and still find stories for the typos.
+
+Usage:
+    python tests/load/news_search.py                         # 10k, 100k, 1M
+    python tests/load/news_search.py --sizes 10000 --duration 10 --concurrency 4
+    python tests/load/news_search.py --no-seed               # current archive
+"""
+
+from urllib.parse import urlencode
+import argparse
+import asyncio
+import copy
+import json
+import os
+import random
+import sys
+
+from http_client import ConnectionPool
+from news_depth import SEED_COMMAND, seed
+from news_load import MIX_FILE, QueryMix, closed_loop
+
+# Test configuration
+BASE_URL = os.environ.get("SFIMC_BASE_URL", "http://localhost:3000")
+RESULTS_DIR = os.environ.get("SFIMC_SCREENSHOT_DIR", "/tmp/sfimc-tests")
+MODES = ("contains", "index")
+NO_CACHE = {"Cache-Control": "no-cache"}
+
+# Ensure results directory exists
+os.makedirs(RESULTS_DIR, exist_ok=True)
+
+
+def search_mix(config, mode):
+    """The mix's search scenarios only, pinned to one search path"""
+    mix = copy.deepcopy(config)
+    mix["scenarios"] = [
+        {**s, "params": {**s["params"], "searchMode": mode}}
+        for s in mix["scenarios"] if "$search" in s["params"].values()
+    ]
+    mix["headers"] = NO_CACHE
+    return mix
+
+
+def typo(term):
+    """Drop one letter from the middle: "housing" -> "houing" """
+    middle = len(term) // 2
+    return term[:middle] + term[middle + 1:]
+
+
+async def match_counts(pool, terms, timeout):
+    """Stories each path finds per term, from count=true first pages"""
+    rows = []
+    for term in terms:
+        row = {"term": term}
+        for mode in MODES:
+            params = {"limit": 1, "count": "true", "search": term, "searchMode": mode}
+            response = await pool.get(f"/api/news?{urlencode(params)}", headers=NO_CACHE, timeout=timeout)
+            row[mode] = json.loads(response.body).get("total") if response.status < 400 else None
+        rows.append(row)
+    return rows
+
+
+async def measure(args, config):
+    results = {}
+    for mode in MODES:
+        mix = QueryMix(search_mix(config, mode), random.Random(args.seed))
+        mix.prune()
+        if not mix.scenarios:
+            raise SystemExit("❌ The mix has no search scenarios")
+        pool = ConnectionPool(args.base_url, args.concurrency)
+        try:
+            recorder = await closed_loop(pool, mix, args.concurrency, args.duration, args.warmup, args.timeout)
+        finally:
+            pool.close()
+        results[mode] = recorder.summary(args.duration)
+
+    pool = ConnectionPool(args.base_url, 1)
+    try:
+        terms = config.get("search_terms", [])
+        results["matches"] = await match_counts(pool, terms + [typo(t) for t in terms if len(t) >= 5], args.timeout)
+    finally:
+        pool.close()
+    return results
+
+
+def print_size(results):
+    print(f"\n  {'path':<10}{'req/s':>8}{'err%':>7}{'p50':>9}{'p95':>9}{'p99':>9}")
+    for mode in MODES:
+        s = results[mode]
+        latency = s["latency_ms"]
+        def ms(key):
+            return f"{latency[key]:.0f}" if key in latency else "-"
+        print(f"  {mode:<10}{s['throughput_rps']:>8}{s['error_rate']:>7.1%}{ms('p50'):>9}{ms('p95'):>9}{ms('p99'):>9}")
+
+    print(f"\n  {'term':<14}{'contains':>10}{'index':>10}")
+    for row in results["matches"]:
+        print(f"  {row['term']:<14}{row['contains'] if row['contains'] is not None else '-':>10}"
+              f"{row['index'] if row['index'] is not None else '-':>10}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark /api/news search paths against archive size")
+    parser.add_argument("--sizes", default="10000,100000,1000000",
+                        help="Comma-separated archive sizes to seed (default: 10000,100000,1000000)")
+    parser.add_argument("--concurrency", type=int, default=8, help="Closed-loop clients (default: 8)")
+    parser.add_argument("--duration", type=float, default=20, help="Measured seconds per path (default: 20)")
+    parser.add_argument("--warmup", type=float, default=3, help="Unmeasured seconds before each run (default: 3)")
+    parser.add_argument("--timeout", type=float, default=30, help="Per-request timeout in seconds")
+    parser.add_argument("--mix", default=MIX_FILE, help="Query mix file (default: news_mix.json)")
+    parser.add_argument("--seed", type=int, default=1, help="Seed for the query mix (default: 1)")
+    parser.add_argument("--seed-command", default=SEED_COMMAND,
+                        help=f"Reseeds the archive; {{count}} is replaced (default: {SEED_COMMAND})")
+    parser.add_argument("--no-seed", action="store_true", help="Measure the current archive once")
+    parser.add_argument("--base-url", default=BASE_URL, help=f"Site origin (default: {BASE_URL})")
+    args = parser.parse_args()
+
+    with open(args.mix) as f:
+        config = json.load(f)
+    sizes = [None] if args.no_seed else [int(v) for v in args.sizes.split(",")]
+
+    print("\n" + "="*60)
+    print("SFIMC /api/news SEARCH BENCHMARK")
+    print("="*60)
+    print(f"  Target:  {args.base_url}/api/news")
+    print(f"  Load:    {args.concurrency} clients, {args.duration}s per path (+{args.warmup}s warmup)")
+
+    steps = []
+    for size in sizes:
+        if size is not None:
+            seed(args.seed_command, size)
+        label = "CURRENT ARCHIVE" if size is None else f"{size:,} ITEMS"
+        print(f"\n\n🔎 {label}")
+        print("-"*40)
+        results = asyncio.run(measure(args, config))
+        print_size(results)
+        steps.append({"size": size, **results})
+
+    print("\n\n📈 INDEX vs CONTAINS (p50)")
+    print("-"*40)
+    failures = []
+    for step in steps:
+        contains, index = step["contains"]["latency_ms"], step["index"]["latency_ms"]
+        label = "current" if step["size"] is None else f"{step['size']:,}"
+        if contains.get("count") and index.get("count"):
+            print(f"  {label:>12}  {contains['p50']:>8.0f}ms -> {index['p50']:>6.0f}ms  "
+                  f"({contains['p50'] / max(index['p50'], 0.01):.1f}x)")
+        for mode in MODES:
+            if step[mode]["error_rate"] > 0.01:
+                failures.append(f"{label}: {mode} error rate {step[mode]['error_rate']:.2%}")
+        missed = [r["term"] for r in step["matches"] if r["contains"] and not r["index"]]
+        if missed:
+            failures.append(f"{label}: index found nothing for {', '.join(missed)}")
+    for failure in failures:
+        print(f"  ❌ {failure}")
+
+    path = f"{RESULTS_DIR}/news_search_results.json"
+    with open(path, "w") as f:
+        json.dump({"base_url": args.base_url, "mix": config, "steps": steps}, f, indent=2)
+    print(f"\n📄 Results saved to: {path}")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
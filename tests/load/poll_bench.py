@@ -0,0 +1,220 @@
+#!/usr/bin/env python3
+"""
+SFIMC RSS Poll Benchmark
+Drives /api/rss/poll against the local feed farm and records end-to-end
+poll time, items/sec ingested and the site server's peak memory as the
+number of feeds and items per feed grow.
+
+The site must be started with the farm as its feed source:
+
+    RSS_FEED_LIST_URL=http://127.0.0.1:8765/feeds.json CRON_SECRET=bench npm run start
+
+Each (feeds, items) step reshapes the farm under a fresh run id, so every
+step ingests new GUIDs, then polls three times:
+    cold    force=true, every item is new
+    warm    nothing changed, feeds should answer 304
+    churn   --churn of the feeds published a few new items
+
+Usage:
+    python tests/load/poll_bench.py --server-pid $(pgrep -f "next start")
+    python tests/load/poll_bench.py --feeds 11,50,200 --items 20,100 --latency-ms 100
+    python tests/load/poll_bench.py --feeds 20 --items 100,500 --span-days 365   # archive feeds
+"""
+
+from urllib.error import HTTPError, URLError
+from urllib.request import Request, urlopen
+import argparse
+import json
+import os
+import sys
+import threading
+import time
+
+from feed_farm import add_farm_arguments, start_farm
+
+# Test configuration
+BASE_URL = os.environ.get("SFIMC_BASE_URL", "http://localhost:3000")
+RESULTS_DIR = os.environ.get("SFIMC_SCREENSHOT_DIR", "/tmp/sfimc-tests")
+CRON_SECRET = os.environ.get("CRON_SECRET", "bench")
+
+# Ensure results directory exists
+os.makedirs(RESULTS_DIR, exist_ok=True)
+
+MEMORY_SAMPLE_INTERVAL_S = 0.05
+
+
+def process_tree_rss_mb(root_pid):
+    """Resident memory of a process and all its descendants, in MB (Linux /proc)"""
+    children = {}
+    for entry in os.listdir("/proc"):
+        if not entry.isdigit():
+            continue
+        try:
+            with open(f"/proc/{entry}/stat") as f:
+                ppid = int(f.read().rsplit(")", 1)[1].split()[1])
+        except (OSError, IndexError, ValueError):
+            continue
+        children.setdefault(ppid, []).append(int(entry))
+
+    total_kb = 0
+    stack = [root_pid]
+    while stack:
+        pid = stack.pop()
+        try:
+            with open(f"/proc/{pid}/status") as f:
+                for line in f:
+                    if line.startswith("VmRSS:"):
+                        total_kb += int(line.split()[1])
+                        break
+        except OSError:
+            continue
+        stack.extend(children.get(pid, []))
+    return total_kb / 1024
+
+
+class MemorySampler:
+    """Samples a process tree's RSS on a background thread and keeps the peak"""
+
+    def __init__(self, pid):
+        self.pid = pid
+        self.peak_mb = None
+        self._stop = threading.Event()
+        self._thread = None
+
+    def __enter__(self):
+        if self.pid:
+            self._thread = threading.Thread(target=self._run, daemon=True)
+            self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._stop.set()
+        if self._thread:
+            self._thread.join()
+
+    def _run(self):
+        while not self._stop.is_set():
+            rss = process_tree_rss_mb(self.pid)
+            self.peak_mb = rss if self.peak_mb is None else max(self.peak_mb, rss)
+            self._stop.wait(MEMORY_SAMPLE_INTERVAL_S)
+
+
+def control(farm_url, action, **params):
+    query = "&".join(f"{k}={v}" for k, v in params.items())
+    with urlopen(Request(f"{farm_url}/_control/{action}?{query}", method="POST"), timeout=10) as response:
+        return json.load(response)
+
+
+def poll(base_url, force, timeout, server_pid):
+    """One poll request; returns wall time, peak server memory and the route's stats"""
+    url = f"{base_url}/api/rss/poll?secret={CRON_SECRET}" + ("&force=true" if force else "")
+    started = time.perf_counter()
+    with MemorySampler(server_pid) as memory:
+        try:
+            with urlopen(url, timeout=timeout) as response:
+                body = json.load(response)
+        except HTTPError as e:
+            body = {"success": False, "error": f"HTTP {e.code}: {e.read()[:200]!r}"}
+        except (URLError, OSError) as e:
+            body = {"success": False, "error": f"{type(e).__name__}: {e}"}
+    seconds = time.perf_counter() - started
+
+    stats = body.get("stats", {})
+    return {
+        "success": body.get("success", False),
+        "error": body.get("error"),
+        "seconds": round(seconds, 3),
+        "peak_rss_mb": round(memory.peak_mb, 1) if memory.peak_mb is not None else None,
+        "created": stats.get("created", 0),
+        "items_per_sec": round(stats.get("created", 0) / seconds, 1) if seconds else 0.0,
+        "stats": stats,
+    }
+
+
+def print_poll(label, result):
+    if not result["success"]:
+        print(f"  ❌ {label:<6} failed: {result['error']}")
+        return
+    stats = result["stats"]
+    memory = f"{result['peak_rss_mb']:.0f}MB" if result["peak_rss_mb"] is not None else "-"
+    print(f"  ✅ {label:<6} {result['seconds']:>7.2f}s  created {result['created']:>6}  "
+          f"{result['items_per_sec']:>8.1f} items/s  304s {stats.get('feedsNotModified', 0):>4}  "
+          f"{stats.get('bytesDownloaded', 0) / 1024:>8.0f}KB  peak {memory}")
+    if stats.get("itemsOutsideWindow"):
+        print(f"           {stats['itemsOutsideWindow']} items outside the window, "
+              f"{stats.get('feedsStoppedEarly', 0)} feeds stopped early")
+    timings = stats.get("timings")
+    if timings:
+        print("           " + "  ".join(f"{phase} {ms}ms" for phase, ms in timings.items()))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark /api/rss/poll against the local feed farm")
+    add_farm_arguments(parser, shape=False)
+    parser.add_argument("--feeds", dest="feed_steps", default="11,50,200",
+                        help="Comma-separated feed counts (default: 11,50,200)")
+    parser.add_argument("--items", dest="item_steps", default="20,100",
+                        help="Comma-separated items per feed (default: 20,100)")
+    parser.add_argument("--base-url", default=BASE_URL, help=f"Site origin (default: {BASE_URL})")
+    parser.add_argument("--server-pid", type=int, help="PID of the site server, for peak memory")
+    parser.add_argument("--timeout", type=float, default=600, help="Per-poll timeout in seconds")
+    args = parser.parse_args()
+
+    feed_steps = [int(v) for v in args.feed_steps.split(",")]
+    item_steps = [int(v) for v in args.item_steps.split(",")]
+    args.feeds, args.items = feed_steps[0], item_steps[0]
+
+    server, farm = start_farm(args)
+    farm_url = f"http://{args.host}:{args.port}"
+
+    print("\n" + "="*60)
+    print("SFIMC RSS POLL BENCHMARK")
+    print("="*60)
+    print(f"  Site:  {args.base_url}/api/rss/poll")
+    print(f"  Farm:  {farm_url}/feeds.json")
+    if not args.server_pid:
+        print("  ⚠️ No --server-pid: peak memory won't be recorded")
+
+    steps = []
+    run_id = int(time.time())
+    for feeds in feed_steps:
+        for items in item_steps:
+            run = f"b{run_id}-{feeds}x{items}"
+            control(farm_url, "configure", feeds=feeds, items=items, run=run)
+
+            print(f"\n\n📡 {feeds} FEEDS x {items} ITEMS")
+            print("-"*40)
+            step = {"feeds": feeds, "items": items, "run": run}
+            step["cold"] = poll(args.base_url, True, args.timeout, args.server_pid)
+            print_poll("cold", step["cold"])
+            step["warm"] = poll(args.base_url, False, args.timeout, args.server_pid)
+            print_poll("warm", step["warm"])
+            step["changed_feeds"] = control(farm_url, "advance")["changed"]
+            step["churn"] = poll(args.base_url, False, args.timeout, args.server_pid)
+            print_poll("churn", step["churn"])
+            with urlopen(f"{farm_url}/_control/stats", timeout=10) as response:
+                step["farm"] = json.load(response)
+            steps.append(step)
+
+    server.shutdown()
+
+    print("\n\n📈 SCALING (cold polls)")
+    print("-"*40)
+    print(f"  {'feeds':>6}{'items':>7}{'poll s':>9}{'items/s':>10}{'peak MB':>9}{'warm s':>8}{'churn s':>9}")
+    for step in steps:
+        cold = step["cold"]
+        memory = f"{cold['peak_rss_mb']:.0f}" if cold["peak_rss_mb"] is not None else "-"
+        print(f"  {step['feeds']:>6}{step['items']:>7}{cold['seconds']:>9.2f}{cold['items_per_sec']:>10.1f}"
+              f"{memory:>9}{step['warm']['seconds']:>8.2f}{step['churn']['seconds']:>9.2f}")
+
+    path = f"{RESULTS_DIR}/poll_bench_results.json"
+    with open(path, "w") as f:
+        json.dump({"base_url": args.base_url, "steps": steps}, f, indent=2)
+    print(f"\n📄 Results saved to: {path}")
+
+    failed = [s for s in steps for label in ("cold", "warm", "churn") if not s[label]["success"]]
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
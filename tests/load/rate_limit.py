@@ -0,0 +1,219 @@
+#!/usr/bin/env python3
+"""
+SFIMC Rate Limiter Benchmark
+Floods POST /api/newsletter/subscribe from a stream of distinct client IPs
+and checks that latency stays flat as the limiter's key count grows, then
+checks that the limit itself holds.
+
+    flood   open-loop --rps for --duration, every request from a new
+            X-Forwarded-For address. Bodies carry an invalid email, so
+            the route answers 400 right after the rate limit check and no
+            subscribers are created. Per-second p99 is compared between
+            the first and last thirds of the run.
+    limit   --limit-ips addresses each send --limit + 2 requests; exactly
+            --limit per address should get through, the rest 429.
+
+With several --base-url origins (comma-separated, e.g. two `next start`
+instances on one database) requests are spread round-robin across them,
+so the limit check shows whether limits hold across instances: they do
+with RATE_LIMIT_STORE=postgres (the default), not with memory.
+
+Usage:
+    python tests/load/rate_limit.py
+    python tests/load/rate_limit.py --rps 500 --duration 60
+    python tests/load/rate_limit.py --base-url http://localhost:3000,http://localhost:3001
+"""
+
+import argparse
+import asyncio
+import itertools
+import json
+import os
+import sys
+import time
+
+from http_client import ConnectionPool
+from latency import LatencyRecorder, describe, print_timeline
+
+# Test configuration
+BASE_URL = os.environ.get("SFIMC_BASE_URL", "http://localhost:3000")
+RESULTS_DIR = os.environ.get("SFIMC_SCREENSHOT_DIR", "/tmp/sfimc-tests")
+PATH = "/api/newsletter/subscribe"
+INVALID_BODY = json.dumps({"email": "not-an-email", "source": "rate-limit-bench"}).encode()
+
+# Ensure results directory exists
+os.makedirs(RESULTS_DIR, exist_ok=True)
+
+
+def addresses(run):
+    """Distinct IPv4 addresses, different for every run"""
+    for n in itertools.count(run * 1_000_003 % (1 << 24)):
+        n %= 1 << 24
+        yield f"10.{n >> 16 & 255}.{n >> 8 & 255}.{n & 255}"
+
+
+async def subscribe(pool, ip, timeout):
+    """One request from `ip`; returns (latency ms, status or error name)"""
+    started = time.perf_counter()
+    try:
+        response = await pool.post(PATH, INVALID_BODY, timeout=timeout, headers={
+            "Content-Type": "application/json",
+            "X-Forwarded-For": ip,
+        })
+        outcome = response.status
+    except asyncio.TimeoutError:
+        outcome = "timeout"
+    except Exception as e:
+        outcome = type(e).__name__
+    return (time.perf_counter() - started) * 1000, outcome
+
+
+async def flood(pools, ips, rps, duration, warmup, timeout):
+    """Open-loop requests from a new address each; returns the recorder and status counts"""
+    recorder = LatencyRecorder()
+    statuses = {}
+    run_start = time.perf_counter()
+    measure_from = run_start + warmup
+    targets = itertools.cycle(pools)
+    in_flight = set()
+
+    async def scheduled(pool, ip, started):
+        latency, outcome = await subscribe(pool, ip, timeout)
+        if started < measure_from:
+            return
+        statuses[str(outcome)] = statuses.get(str(outcome), 0) + 1
+        # 400 is the expected answer to the invalid body; 429 means a fresh address was limited
+        ok = outcome == 400
+        error = None if ok else f"HTTP {outcome}" if isinstance(outcome, int) else outcome
+        recorder.record(time.perf_counter() - measure_from, "subscribe", latency, ok, error)
+
+    for i in range(int((warmup + duration) * rps)):
+        started = run_start + i / rps
+        delay = started - time.perf_counter()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        task = asyncio.create_task(scheduled(next(targets), next(ips), started))
+        in_flight.add(task)
+        task.add_done_callback(in_flight.discard)
+
+    if in_flight:
+        await asyncio.wait(in_flight)
+    return recorder, statuses
+
+
+async def limit_check(pools, ips, count, limit, timeout):
+    """Send limit + 2 requests from each of `count` addresses; returns per-address pass counts"""
+    targets = itertools.cycle(pools)
+    passed = {}
+    for ip in itertools.islice(ips, count):
+        passed[ip] = 0
+        for _ in range(limit + 2):
+            _, outcome = await subscribe(next(targets), ip, timeout)
+            if outcome == 400:
+                passed[ip] += 1
+    return passed
+
+
+def thirds_p99(timeline):
+    """Median per-second p99 of the first and last thirds of the run"""
+    values = [row["p99"] for row in timeline if row["p99"] is not None]
+    if len(values) < 3:
+        return None, None
+    third = len(values) // 3
+    first, last = sorted(values[:third]), sorted(values[-third:])
+    return first[len(first) // 2], last[len(last) // 2]
+
+
+async def measure(args, urls, run):
+    pools = [ConnectionPool(url, args.connections) for url in urls]
+    ips = addresses(run)
+    try:
+        recorder, statuses = await flood(pools, ips, args.rps, args.duration, args.warmup, args.timeout)
+        passed = await limit_check(pools, ips, args.limit_ips, args.limit, args.timeout)
+    finally:
+        for pool in pools:
+            pool.close()
+    return recorder.summary(args.duration), statuses, passed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the newsletter rate limiter under distinct-IP floods")
+    parser.add_argument("--rps", type=float, default=200, help="Requests per second (default: 200)")
+    parser.add_argument("--duration", type=float, default=60, help="Measured seconds (default: 60)")
+    parser.add_argument("--warmup", type=float, default=5, help="Unmeasured seconds first (default: 5)")
+    parser.add_argument("--connections", type=int, default=64, help="Connections per origin (default: 64)")
+    parser.add_argument("--limit", type=int, default=5, help="The route's per-IP limit (default: 5)")
+    parser.add_argument("--limit-ips", type=int, default=20, help="Addresses in the limit check (default: 20)")
+    parser.add_argument("--max-drift", type=float, default=2.0,
+                        help="Fail when last-third p99 exceeds first-third p99 by this factor (default: 2)")
+    parser.add_argument("--max-p99", type=float, default=250, help="Fail when overall p99 exceeds this, ms")
+    parser.add_argument("--timeout", type=float, default=10, help="Per-request timeout in seconds")
+    parser.add_argument("--base-url", default=BASE_URL,
+                        help=f"Site origin(s), comma-separated (default: {BASE_URL})")
+    args = parser.parse_args()
+    urls = args.base_url.split(",")
+
+    print("\n" + "="*60)
+    print("SFIMC RATE LIMITER BENCHMARK")
+    print("="*60)
+    print(f"  Target:  {', '.join(urls)} {PATH}")
+    print(f"  Flood:   {args.rps:g} req/s from distinct IPs for {args.duration:g}s (+{args.warmup:g}s warmup)")
+
+    summary, statuses, passed = asyncio.run(measure(args, urls, int(time.time())))
+
+    print("\n\n🌊 FLOOD")
+    print("-"*40)
+    latency = summary["latency_ms"]
+    print(f"  Requests: {summary['requests']:,}  ({summary['throughput_rps']} ok/s)")
+    print(f"  Statuses: {', '.join(f'{k}: {v:,}' for k, v in sorted(statuses.items()))}")
+    if latency.get("count"):
+        print(f"  Latency:  p50 {latency['p50']:.1f}ms  p95 {latency['p95']:.1f}ms  p99 {latency['p99']:.1f}ms"
+              f"  max {latency['max']:.1f}ms")
+    print()
+    print_timeline(summary["timeline"])
+    first, last = thirds_p99(summary["timeline"])
+
+    print("\n\n🚦 LIMIT")
+    print("-"*40)
+    through = describe(list(passed.values()))
+    leaked = {ip: n for ip, n in passed.items() if n > args.limit}
+    short = {ip: n for ip, n in passed.items() if n < args.limit}
+    print(f"  {len(passed)} addresses x {args.limit + 2} requests across {len(urls)} origin(s): "
+          f"{through.get('min', 0):.0f}-{through.get('max', 0):.0f} got through (limit {args.limit})")
+
+    failures = []
+    if summary["error_rate"] > 0.01:
+        failures.append(f"flood error rate {summary['error_rate']:.2%} ({summary['error_types']})")
+    if latency.get("p99", 0) > args.max_p99:
+        failures.append(f"flood p99 {latency['p99']:.0f}ms over {args.max_p99:g}ms")
+    if first and last and last > first * args.max_drift:
+        failures.append(f"p99 drifted from {first:.0f}ms to {last:.0f}ms as keys accumulated")
+    if leaked:
+        failures.append(f"{len(leaked)} addresses got more than {args.limit} requests through")
+    if short:
+        failures.append(f"{len(short)} addresses were limited before {args.limit} requests")
+
+    print()
+    for failure in failures:
+        print(f"  ❌ {failure}")
+    if not failures:
+        print(f"  ✅ p99 stayed flat ({first:.0f}ms -> {last:.0f}ms) and the limit held at {args.limit}"
+              if first and last else f"  ✅ The limit held at {args.limit}")
+
+    path = f"{RESULTS_DIR}/rate_limit_results.json"
+    with open(path, "w") as f:
+        json.dump({
+            "base_urls": urls,
+            "rps": args.rps,
+            "flood": summary,
+            "statuses": statuses,
+            "p99_first_third": first,
+            "p99_last_third": last,
+            "limit_check": passed,
+        }, f, indent=2)
+    print(f"\n📄 Results saved to: {path}")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,332 @@
+#!/usr/bin/env python3
+"""
+SFIMC Story Stream Subscriber Benchmark
+Measures what it costs the site to hold many concurrent subscribers on
+GET /api/stories/stream, and how long a published story takes to reach
+all of them.
+
+For each step (a subscriber count) the harness:
+    connect   opens N streams at --connect-rate per second and records
+              the time from request to the first byte (the `retry:` line)
+    hold      keeps them open for --hold seconds, sampling the server's
+              memory, and records the gaps between frames (heartbeats)
+    publish   POSTs --publishes small batches to /api/rss/import and
+              records, per subscriber, the time from the POST to the
+              `stories` event arriving
+then closes every stream and reads the broadcaster counters from
+/api/stories/metrics.
+
+The import and metrics routes need CRON_SECRET. Published items use `seed:` guids, so
+`npx tsx scripts/seed-news-items.ts 0 --clear` removes them afterwards.
+Heartbeats only show up in holds longer than the server's interval (25s).
+
+Usage:
+    python tests/load/sse_subscribers.py --server-pid $(pgrep -f "next start")
+    python tests/load/sse_subscribers.py --steps 1000,10000 --hold 30 --publishes 5
+    python tests/load/sse_subscribers.py --steps 200 --hold 5 --no-publish
+"""
+
+from urllib.error import HTTPError, URLError
+from urllib.parse import urlsplit
+from urllib.request import Request, urlopen
+import argparse
+import asyncio
+import json
+import os
+import resource
+import sys
+import time
+
+from latency import describe
+from poll_bench import MemorySampler, process_tree_rss_mb
+
+# Test configuration
+BASE_URL = os.environ.get("SFIMC_BASE_URL", "http://localhost:3000")
+RESULTS_DIR = os.environ.get("SFIMC_SCREENSHOT_DIR", "/tmp/sfimc-tests")
+CRON_SECRET = os.environ.get("CRON_SECRET", "bench")
+
+# Ensure results directory exists
+os.makedirs(RESULTS_DIR, exist_ok=True)
+
+
+class Subscriber:
+    """One raw-socket SSE client; records when each frame arrives"""
+
+    def __init__(self, host, port):
+        self.host = host
+        self.port = port
+        self.writer = None
+        self.connect_ms = None
+        self.error = None
+        self.events = []  # (arrival perf_counter, event name, data)
+        self.pings = 0
+        self.max_gap_s = 0.0
+        self._last_frame = None
+        self.ready = asyncio.Event()
+
+    async def run(self):
+        started = time.perf_counter()
+        try:
+            reader, self.writer = await asyncio.open_connection(self.host, self.port)
+            self.writer.write(
+                (f"GET /api/stories/stream HTTP/1.1\r\nHost: {self.host}:{self.port}\r\n"
+                 "Accept: text/event-stream\r\nCache-Control: no-cache\r\n\r\n").encode("latin-1"))
+            await self.writer.drain()
+
+            status_line = await reader.readline()
+            parts = status_line.decode("latin-1").split(" ", 2)
+            if len(parts) < 2 or parts[1] != "200":
+                raise ConnectionError(f"bad response: {status_line[:80]!r}")
+            chunked = False
+            while True:
+                line = await reader.readline()
+                if line in (b"\r\n", b"\n", b""):
+                    break
+                name, _, value = line.decode("latin-1").partition(":")
+                if name.strip().lower() == "transfer-encoding" and "chunked" in value.lower():
+                    chunked = True
+
+            buffer = b""
+            async for data in self._body(reader, chunked):
+                if self.connect_ms is None:
+                    self.connect_ms = (time.perf_counter() - started) * 1000
+                    self.ready.set()
+                buffer += data
+                while b"\n\n" in buffer:
+                    frame, buffer = buffer.split(b"\n\n", 1)
+                    self._frame(frame.decode("utf-8"))
+        except (OSError, ConnectionError, asyncio.IncompleteReadError) as e:
+            self.error = f"{type(e).__name__}: {e}"
+        finally:
+            self.ready.set()
+            self.close()
+
+    async def _body(self, reader, chunked):
+        while True:
+            if chunked:
+                size_line = await reader.readline()
+                size = int(size_line.split(b";")[0].strip() or b"0", 16)
+                if size == 0:
+                    return
+                data = await reader.readexactly(size)
+                await reader.readexactly(2)
+            else:
+                data = await reader.read(65536)
+                if not data:
+                    return
+            yield data
+
+    def _frame(self, frame):
+        now = time.perf_counter()
+        if self._last_frame is not None and self.connect_ms is not None:
+            self.max_gap_s = max(self.max_gap_s, now - self._last_frame)
+        self._last_frame = now
+
+        event, data = "message", []
+        for line in frame.split("\n"):
+            if line.startswith(":"):
+                self.pings += 1
+            elif line.startswith("event:"):
+                event = line[6:].strip()
+            elif line.startswith("data:"):
+                data.append(line[5:].lstrip())
+        if data:
+            self.events.append((now, event, "\n".join(data)))
+
+    def close(self):
+        if self.writer is not None:
+            self.writer.close()
+            self.writer = None
+
+
+def raise_fd_limit(needed):
+    """Lift the open-file soft limit as far as allowed; returns the new limit"""
+    soft, hard = resource.getrlimit(resource.RLIMIT_NOFILE)
+    target = hard if hard != resource.RLIM_INFINITY else max(soft, needed)
+    if soft < target:
+        resource.setrlimit(resource.RLIMIT_NOFILE, (target, hard))
+    return resource.getrlimit(resource.RLIMIT_NOFILE)[0]
+
+
+def metrics(base_url):
+    try:
+        with urlopen(f"{base_url}/api/stories/metrics?secret={CRON_SECRET}", timeout=10) as response:
+            return json.load(response).get("stream")
+    except (HTTPError, URLError, OSError):
+        return None
+
+
+def publish(base_url, run, index, timeout):
+    """Import one new item; returns its story url, which identifies it in events"""
+    url = f"https://example.com/sse-bench/{run}/{index}"
+    items = [{
+        "guid": f"seed:sse:{run}:{index}",
+        "title": f"Stream benchmark story {index}",
+        "url": url,
+        "pubDate": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+        "description": "Published by tests/load/sse_subscribers.py",
+        "memberSlug": "mission-local",
+    }]
+    request = Request(f"{base_url}/api/rss/import?secret={CRON_SECRET}", method="POST",
+                      data=json.dumps(items).encode(), headers={"Content-Type": "application/json"})
+    with urlopen(request, timeout=timeout) as response:
+        body = json.load(response)
+    if body.get("stats", {}).get("created") != 1:
+        raise RuntimeError(f"import created nothing: {body}")
+    return url
+
+
+async def run_step(args, count, run):
+    parts = urlsplit(args.base_url)
+    subscribers = [Subscriber(parts.hostname, parts.port or 80) for _ in range(count)]
+    before_metrics = metrics(args.base_url)
+    baseline_mb = process_tree_rss_mb(args.server_pid) if args.server_pid else None
+
+    # Connect at a steady rate so the step measures holding, not a SYN flood
+    tasks = []
+    connect_started = time.perf_counter()
+    for i, subscriber in enumerate(subscribers):
+        tasks.append(asyncio.create_task(subscriber.run()))
+        if args.connect_rate and (i + 1) % max(1, args.connect_rate // 20) == 0:
+            await asyncio.sleep(max(0, (i + 1) / args.connect_rate - (time.perf_counter() - connect_started)))
+    await asyncio.wait_for(asyncio.gather(*(s.ready.wait() for s in subscribers)), args.timeout)
+    connect_s = time.perf_counter() - connect_started
+    connected = [s for s in subscribers if s.connect_ms is not None and s.error is None]
+    print(f"  Connected {len(connected):,}/{count:,} in {connect_s:.1f}s")
+
+    # Hold, then publish
+    with MemorySampler(args.server_pid) as memory:
+        await asyncio.sleep(args.hold)
+        held_mb = process_tree_rss_mb(args.server_pid) if args.server_pid else None
+
+        deliveries, publish_errors = [], []
+        for index in range(0 if args.no_publish else args.publishes):
+            for s in connected:
+                s.events.clear()
+            sent = time.perf_counter()
+            try:
+                href = await asyncio.to_thread(publish, args.base_url, run, index, args.timeout)
+            except (HTTPError, URLError, OSError, RuntimeError) as e:
+                publish_errors.append(f"{type(e).__name__}: {e}")
+                continue
+            deadline = time.perf_counter() + args.delivery_timeout
+            while time.perf_counter() < deadline:
+                if all(any(href in data for _, _, data in s.events) for s in connected if s.error is None):
+                    break
+                await asyncio.sleep(0.05)
+            latencies, missed = [], 0
+            for s in connected:
+                arrival = next((t for t, event, data in s.events if event == "stories" and href in data), None)
+                if arrival is None:
+                    missed += 1
+                else:
+                    latencies.append((arrival - sent) * 1000)
+            stats = describe(latencies)
+            deliveries.append({"index": index, "latency_ms": stats, "missed": missed})
+            print(f"  Publish {index + 1}: p50 {stats.get('p50', 0):.0f}ms, "
+                  f"p99 {stats.get('p99', 0):.0f}ms, missed {missed}")
+            await asyncio.sleep(args.publish_interval)
+
+    for s in subscribers:
+        s.close()
+    await asyncio.gather(*tasks, return_exceptions=True)
+    await asyncio.sleep(1)  # Let the server see the disconnects
+    after_metrics = metrics(args.base_url)
+
+    all_latencies = [d["latency_ms"] for d in deliveries]
+    per_subscriber_kb = None
+    if baseline_mb is not None and held_mb is not None and connected:
+        per_subscriber_kb = round((held_mb - baseline_mb) * 1024 / len(connected), 2)
+
+    return {
+        "subscribers": count,
+        "connected": len(connected),
+        "errors": sorted({s.error for s in subscribers if s.error})[:10],
+        "connect_seconds": round(connect_s, 2),
+        "connect_ms": describe([s.connect_ms for s in connected]),
+        "max_frame_gap_s": round(max((s.max_gap_s for s in connected), default=0), 2),
+        "pings": sum(s.pings for s in connected),
+        "server_rss_mb": {
+            "baseline": baseline_mb and round(baseline_mb, 1),
+            "held": held_mb and round(held_mb, 1),
+            "peak": memory.peak_mb and round(memory.peak_mb, 1),
+        },
+        "per_subscriber_kb": per_subscriber_kb,
+        "deliveries": deliveries,
+        "delivery_p99_ms": max((d.get("p99", 0) for d in all_latencies), default=None),
+        "missed": sum(d["missed"] for d in deliveries),
+        "publish_errors": publish_errors,
+        "stream_metrics": {"before": before_metrics, "after": after_metrics},
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark concurrent /api/stories/stream subscribers")
+    parser.add_argument("--steps", default="1000,2500,5000,10000",
+                        help="Comma-separated subscriber counts (default: 1000,2500,5000,10000)")
+    parser.add_argument("--connect-rate", type=int, default=500, help="New streams per second (default: 500)")
+    parser.add_argument("--hold", type=float, default=30, help="Seconds to hold before publishing (default: 30)")
+    parser.add_argument("--publishes", type=int, default=3, help="Stories published per step (default: 3)")
+    parser.add_argument("--publish-interval", type=float, default=1, help="Seconds between publishes")
+    parser.add_argument("--delivery-timeout", type=float, default=30,
+                        help="Seconds to wait for a story to reach every subscriber")
+    parser.add_argument("--no-publish", action="store_true", help="Only connect and hold")
+    parser.add_argument("--max-delivery-ms", type=float, default=2000,
+                        help="Fail when delivery p99 exceeds this (default: 2000)")
+    parser.add_argument("--server-pid", type=int, help="PID of the site server, for memory per subscriber")
+    parser.add_argument("--base-url", default=BASE_URL, help=f"Site origin (default: {BASE_URL})")
+    parser.add_argument("--timeout", type=float, default=120, help="Seconds allowed to connect a step")
+    args = parser.parse_args()
+    steps = [int(v) for v in args.steps.split(",")]
+
+    limit = raise_fd_limit(max(steps) + 256)
+
+    print("\n" + "="*60)
+    print("SFIMC STORY STREAM SUBSCRIBERS")
+    print("="*60)
+    print(f"  Target:  {args.base_url}/api/stories/stream")
+    print(f"  Steps:   {', '.join(f'{s:,}' for s in steps)} subscribers, {args.hold}s hold")
+    if limit < max(steps) + 256:
+        print(f"  ⚠️ Open file limit is {limit:,}; larger steps will fail to connect")
+    if not args.server_pid:
+        print("  ⚠️ No --server-pid: server memory won't be recorded")
+
+    run = int(time.time())
+    results = []
+    for count in steps:
+        print(f"\n\n📡 {count:,} SUBSCRIBERS")
+        print("-"*40)
+        results.append(asyncio.run(run_step(args, count, f"{run}-{count}")))
+
+    print("\n\n📈 SCALING")
+    print("-"*40)
+    print(f"  {'subs':>7}{'connected':>11}{'conn p99':>10}{'held MB':>9}{'KB/sub':>8}{'deliv p99':>11}{'missed':>8}")
+    for r in results:
+        held = r["server_rss_mb"]["held"]
+        print(f"  {r['subscribers']:>7,}{r['connected']:>11,}{r['connect_ms'].get('p99', 0):>9.0f}ms"
+              f"{held if held is not None else '-':>9}{r['per_subscriber_kb'] if r['per_subscriber_kb'] is not None else '-':>8}"
+              f"{r['delivery_p99_ms'] if r['delivery_p99_ms'] is not None else '-':>9}ms{r['missed']:>8}")
+
+    failures = []
+    for r in results:
+        if r["connected"] < r["subscribers"]:
+            failures.append(f"{r['subscribers']:,}: only {r['connected']:,} connected ({', '.join(r['errors'][:2])})")
+        if r["missed"]:
+            failures.append(f"{r['subscribers']:,}: {r['missed']} deliveries missed")
+        if r["delivery_p99_ms"] and r["delivery_p99_ms"] > args.max_delivery_ms:
+            failures.append(f"{r['subscribers']:,}: delivery p99 {r['delivery_p99_ms']:.0f}ms")
+        failures += [f"{r['subscribers']:,}: {e}" for e in r["publish_errors"][:2]]
+    for failure in failures:
+        print(f"  ❌ {failure}")
+    if not failures:
+        print(f"\n  ✅ Every subscriber received every story within {args.max_delivery_ms:.0f}ms (p99)")
+
+    path = f"{RESULTS_DIR}/sse_subscribers_results.json"
+    with open(path, "w") as f:
+        json.dump({"base_url": args.base_url, "steps": results}, f, indent=2)
+    print(f"\n📄 Results saved to: {path}")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())